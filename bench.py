@@ -0,0 +1,35 @@
+import json
+import argparse
+
+from jcd_manage.Method.benchmark import run_benchmarks
+from jcd_manage.Method.synthetic import SYNTHETIC_PRESETS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JCD parser benchmark on synthetic files')
+    parser.add_argument('--preset', action='append', choices=sorted(SYNTHETIC_PRESETS),
+                        help='scenario to run, may be repeated (default: all)')
+    parser.add_argument('--scale', type=float, default=1.0, help='entity count scale factor')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage, best is reported')
+    parser.add_argument('--no-render', action='store_true', help='skip render geometry construction')
+    parser.add_argument('--work-dir', default=None, help='keep generated .jcd files in this folder')
+    parser.add_argument('--output', default=None, help='write JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    presets = SYNTHETIC_PRESETS
+    if args.preset:
+        presets = {name: SYNTHETIC_PRESETS[name] for name in args.preset}
+
+    report = run_benchmarks(presets, args.scale, args.repeat, not args.no_render, args.work_dir)
+
+    report_str = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output is None:
+        print(report_str)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report_str)
+    return True
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,21 @@
 JCD_HEADER = 'SILKIDEASIGN0100'
+
+# 常用首饰材质密度 (g/cm³)，材质名称不区分大小写
+MATERIAL_DENSITIES = {
+    'gold': 19.32,
+    '24k': 19.32,
+    '22k': 17.8,
+    '18k': 15.6,
+    '14k': 13.1,
+    '10k': 11.6,
+    'silver': 10.49,
+    '925': 10.36,
+    'platinum': 21.45,
+    'pt950': 20.7,
+    'palladium': 12.02,
+    'titanium': 4.51,
+    'diamond': 3.51,
+}
+
+# 1克拉的质量 (g)
+CARAT_GRAMS = 0.2
@@ -1,6 +1,10 @@
+import logging
 from enum import Enum, auto
 
 
+logger = logging.getLogger(__name__)
+
+
 class SurfaceType(Enum):
     CURVE = 2 #曲线
     SURFACE = 3 #曲面
@@ -13,7 +17,7 @@ class SurfaceType(Enum):
 
     @classmethod
     def _missing_(cls, value):
-        print(f"unkown surface type: {value}")
+        logger.warning('unknown surface type: %r', value)
         return cls.UNKNOWN
 
 class DiamondType(Enum):
@@ -0,0 +1,288 @@
+"""基于数组的紧凑DAG表示
+
+CSGDAG 中每个节点都是带 children 列表的Python对象，操作数达到数万个的布尔模型
+占用大量内存，遍历也很慢。CompactDAG 将节点按拓扑顺序（子节点在前）存放在并行的
+整数数组中：
+
+    node_types   uint8   节点类型在 COMPACT_NODE_TYPES 中的编号
+    ops          int8    布尔操作在 COMPACT_BOOL_OPS 中的编号，非布尔节点为 -1
+    lefts/rights int32   布尔节点的左右子节点下标，其余为 -1
+    refs         int32   原始曲面在外部实体列表中的下标，或分组在 group_offsets 中的下标
+    group_offsets/group_items int32  分组子节点的CSR存储
+
+原始曲面只保存实体下标，实体本身由调用方（如加载器的实体列表）持有，
+因此整个结构可以一次写出为单个缓冲区，也可以低成本地序列化给进程池。
+"""
+import struct
+import numpy as np
+from typing import Any, List, Optional, Tuple
+
+from jcd_manage.Config.types import DAGNodeType, DAGBoolType
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+
+
+COMPACT_NODE_TYPES = list(DAGNodeType)
+COMPACT_BOOL_OPS = list(DAGBoolType)
+
+PRIMITIVE_CODE = COMPACT_NODE_TYPES.index(DAGNodeType.PRIMITIVE)
+GROUP_CODE = COMPACT_NODE_TYPES.index(DAGNodeType.GROUP)
+BOOLEAN_CODE = COMPACT_NODE_TYPES.index(DAGNodeType.BOOLEAN)
+
+COMPACT_DAG_MAGIC = b'JCDCDAG\0'
+COMPACT_DAG_VERSION = 1
+# magic, 版本, 节点数, 分组数, 分组子节点数, 根节点
+COMPACT_DAG_HEADER = struct.Struct('<8sIqqqq')
+
+# 写入缓冲区的数组及其类型，按8字节对齐依次存放
+COMPACT_DAG_FIELDS = [
+    ('node_types', np.uint8),
+    ('ops', np.int8),
+    ('lefts', np.int32),
+    ('rights', np.int32),
+    ('refs', np.int32),
+    ('group_offsets', np.int32),
+    ('group_items', np.int32),
+]
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class CompactDAG:
+    """数组存储的CSG DAG，节点下标即拓扑顺序"""
+
+    def __init__(
+        self,
+        node_types: Optional[np.ndarray] = None,
+        ops: Optional[np.ndarray] = None,
+        lefts: Optional[np.ndarray] = None,
+        rights: Optional[np.ndarray] = None,
+        refs: Optional[np.ndarray] = None,
+        group_offsets: Optional[np.ndarray] = None,
+        group_items: Optional[np.ndarray] = None,
+        root: int = -1,
+    ):
+        self.node_types = np.zeros(0, dtype=np.uint8) if node_types is None else node_types
+        self.ops = np.zeros(0, dtype=np.int8) if ops is None else ops
+        self.lefts = np.zeros(0, dtype=np.int32) if lefts is None else lefts
+        self.rights = np.zeros(0, dtype=np.int32) if rights is None else rights
+        self.refs = np.zeros(0, dtype=np.int32) if refs is None else refs
+        self.group_offsets = np.zeros(1, dtype=np.int32) if group_offsets is None else group_offsets
+        self.group_items = np.zeros(0, dtype=np.int32) if group_items is None else group_items
+        self.root = root  # 根节点下标，-1 表示未设置
+
+    def __len__(self) -> int:
+        return len(self.node_types)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_types)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name, _ in COMPACT_DAG_FIELDS)
+
+    @classmethod
+    def from_dag(cls, dag: CSGDAG, root_node_id: Optional[int] = None, entities: Optional[List[Any]] = None):
+        """从 CSGDAG 创建紧凑表示
+
+        Args:
+            dag: CSG DAG
+            root_node_id: 根节点ID，给出时只保留其子树，否则保留全部节点
+            entities: 实体列表，原始曲面按对象身份查找下标，不存在的实体追加到末尾
+
+        Returns:
+            CompactDAG
+        """
+        if entities is None:
+            entities = []
+        entity_indices = {id(entity): i for i, entity in enumerate(entities)}
+
+        order = dag.topological_order(None if root_node_id is None else [root_node_id])
+        node_indices = {node_id: i for i, node_id in enumerate(order)}
+        node_count = len(order)
+
+        node_types = np.empty(node_count, dtype=np.uint8)
+        ops = np.full(node_count, -1, dtype=np.int8)
+        lefts = np.full(node_count, -1, dtype=np.int32)
+        rights = np.full(node_count, -1, dtype=np.int32)
+        refs = np.full(node_count, -1, dtype=np.int32)
+        group_offsets = [0]
+        group_items = []
+
+        for i, node_id in enumerate(order):
+            node = dag.get(node_id)
+            if isinstance(node, PrimitiveSurface):
+                node_types[i] = PRIMITIVE_CODE
+                key = id(node.surface_data)
+                if key not in entity_indices:
+                    entity_indices[key] = len(entities)
+                    entities.append(node.surface_data)
+                refs[i] = entity_indices[key]
+            elif isinstance(node, BooleanOp):
+                node_types[i] = BOOLEAN_CODE
+                ops[i] = COMPACT_BOOL_OPS.index(node.op)
+                lefts[i] = node_indices[node.left]
+                rights[i] = node_indices[node.right]
+            else:
+                node_types[i] = GROUP_CODE
+                refs[i] = len(group_offsets) - 1
+                group_items += [node_indices[item] for item in node.items]
+                group_offsets.append(len(group_items))
+
+        return cls(
+            node_types, ops, lefts, rights, refs,
+            np.asarray(group_offsets, dtype=np.int32), np.asarray(group_items, dtype=np.int32),
+            -1 if root_node_id is None else node_indices[root_node_id],
+        )
+
+    @classmethod
+    def from_bool_surface(cls, bool_surface, entities: Optional[List[Any]] = None):
+        """从布尔曲面的DAG创建紧凑表示，只保留根节点的子树"""
+        if bool_surface.root_node_id is None:
+            return cls()
+        return cls.from_dag(bool_surface.dag, bool_surface.root_node_id, entities)
+
+    def to_dag(self, entities: List[Any], hash_consing: bool = True) -> Tuple[CSGDAG, Optional[int]]:
+        """还原为 CSGDAG
+
+        Args:
+            entities: 与 refs 对应的实体列表
+            hash_consing: 新DAG是否合并相同的子表达式
+
+        Returns:
+            (dag, 根节点ID)，未设置根节点时根节点ID为 None
+        """
+        dag = CSGDAG(hash_consing)
+        node_ids = []
+        node_types, ops, refs = self.node_types.tolist(), self.ops.tolist(), self.refs.tolist()
+        lefts, rights = self.lefts.tolist(), self.rights.tolist()
+        group_offsets, group_items = self.group_offsets.tolist(), self.group_items.tolist()
+
+        for i, node_type in enumerate(node_types):
+            if node_type == PRIMITIVE_CODE:
+                node = PrimitiveSurface(entities[refs[i]])
+            elif node_type == BOOLEAN_CODE:
+                node = BooleanOp(COMPACT_BOOL_OPS[ops[i]], node_ids[lefts[i]], node_ids[rights[i]])
+            else:
+                start, end = group_offsets[refs[i]], group_offsets[refs[i] + 1]
+                node = SurfaceGroup([node_ids[item] for item in group_items[start:end]])
+            node_ids.append(dag.add(node))
+
+        return dag, (node_ids[self.root] if self.root >= 0 else None)
+
+    def get_children(self, index: int) -> List[int]:
+        """节点的子节点下标"""
+        node_type = int(self.node_types[index])
+        if node_type == BOOLEAN_CODE:
+            return [int(self.lefts[index]), int(self.rights[index])]
+        if node_type == GROUP_CODE:
+            group = int(self.refs[index])
+            return self.group_items[self.group_offsets[group]:self.group_offsets[group + 1]].tolist()
+        return []
+
+    def get_primitive_indices(self) -> np.ndarray:
+        """原始曲面节点的下标"""
+        return np.nonzero(self.node_types == PRIMITIVE_CODE)[0]
+
+    def get_parent_counts(self) -> np.ndarray:
+        """每个节点被引用的次数"""
+        children = np.concatenate([self.lefts[self.lefts >= 0], self.rights[self.rights >= 0], self.group_items])
+        return np.bincount(children, minlength=self.node_count)
+
+    def get_reachable_mask(self, root: Optional[int] = None) -> np.ndarray:
+        """从根节点可达的节点"""
+        root = self.root if root is None else root
+        reachable = np.zeros(self.node_count, dtype=bool)
+        if root < 0:
+            return reachable
+
+        reachable_list = [False] * self.node_count
+        reachable_list[root] = True
+        lefts, rights, refs = self.lefts.tolist(), self.rights.tolist(), self.refs.tolist()
+        node_types, group_offsets, group_items = self.node_types.tolist(), self.group_offsets.tolist(), self.group_items.tolist()
+        # 父节点下标总大于子节点，逆序一次扫描即可
+        for i in range(root, -1, -1):
+            if not reachable_list[i]:
+                continue
+            if node_types[i] == BOOLEAN_CODE:
+                reachable_list[lefts[i]] = reachable_list[rights[i]] = True
+            elif node_types[i] == GROUP_CODE:
+                for item in group_items[group_offsets[refs[i]]:group_offsets[refs[i] + 1]]:
+                    reachable_list[item] = True
+        reachable[:] = reachable_list
+        return reachable
+
+    def get_depths(self) -> np.ndarray:
+        """每个节点的子树深度，原始曲面为1"""
+        depths = [1] * self.node_count
+        lefts, rights, refs = self.lefts.tolist(), self.rights.tolist(), self.refs.tolist()
+        node_types, group_offsets, group_items = self.node_types.tolist(), self.group_offsets.tolist(), self.group_items.tolist()
+        for i, node_type in enumerate(node_types):
+            if node_type == BOOLEAN_CODE:
+                depths[i] = 1 + max(depths[lefts[i]], depths[rights[i]])
+            elif node_type == GROUP_CODE:
+                items = group_items[group_offsets[refs[i]]:group_offsets[refs[i] + 1]]
+                depths[i] = 1 + max((depths[item] for item in items), default=0)
+        return np.asarray(depths, dtype=np.int64)
+
+    def to_bytes(self) -> bytes:
+        """序列化为单个缓冲区"""
+        group_count = len(self.group_offsets) - 1
+        header = COMPACT_DAG_HEADER.pack(
+            COMPACT_DAG_MAGIC, COMPACT_DAG_VERSION, self.node_count, group_count, len(self.group_items), self.root,
+        )
+        buffer = bytearray(self._get_buffer_size(self.node_count, group_count, len(self.group_items)))
+        buffer[:len(header)] = header
+        offset = _align(len(header))
+        for name, dtype in COMPACT_DAG_FIELDS:
+            data = np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes()
+            buffer[offset:offset + len(data)] = data
+            offset = _align(offset + len(data))
+        return bytes(buffer)
+
+    def write(self, file) -> int:
+        """写入已打开的二进制文件，返回写入的字节数"""
+        return file.write(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, buffer, offset: int = 0):
+        """从缓冲区读取，数组直接引用缓冲区内存而不复制
+
+        Raises:
+            ValueError: 缓冲区格式或版本不匹配
+        """
+        if len(buffer) - offset < COMPACT_DAG_HEADER.size:
+            raise ValueError("compact dag buffer too short")
+        magic, version, node_count, group_count, group_item_count, root = COMPACT_DAG_HEADER.unpack_from(buffer, offset)
+        if magic != COMPACT_DAG_MAGIC:
+            raise ValueError("not a compact dag buffer")
+        if version != COMPACT_DAG_VERSION:
+            raise ValueError(f"unsupported compact dag version: {version}")
+        if len(buffer) - offset < cls._get_buffer_size(node_count, group_count, group_item_count):
+            raise ValueError("compact dag buffer truncated")
+
+        counts = {'group_offsets': group_count + 1, 'group_items': group_item_count}
+        arrays = {}
+        position = offset + _align(COMPACT_DAG_HEADER.size)
+        for name, dtype in COMPACT_DAG_FIELDS:
+            count = counts.get(name, node_count)
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+            position = offset + _align(position - offset + count * np.dtype(dtype).itemsize)
+        return cls(root=root, **arrays)
+
+    @staticmethod
+    def _get_buffer_size(node_count: int, group_count: int, group_item_count: int) -> int:
+        counts = {'group_offsets': group_count + 1, 'group_items': group_item_count}
+        size = _align(COMPACT_DAG_HEADER.size)
+        for name, dtype in COMPACT_DAG_FIELDS:
+            size = _align(size + counts.get(name, node_count) * np.dtype(dtype).itemsize)
+        return size
+
+    def __reduce__(self):
+        # 进程池传输时只序列化一个字节串
+        return (CompactDAG.from_bytes, (self.to_bytes(),))
+
+    def __repr__(self):
+        return f"CompactDAG(node_count={self.node_count}, root={self.root}, nbytes={self.nbytes})"
@@ -1,3 +1,5 @@
+from collections import deque
+
 from jcd_manage.Config.types import DAGNodeType, DAGBoolType
 
 # ---------------------------------------------------------
@@ -5,15 +7,14 @@ from jcd_manage.Config.types import DAGNodeType, DAGBoolType
 # ---------------------------------------------------------
 
 class Node:
-    _id_counter = 0
-
     def __init__(self, node_type: DAGNodeType):
-        self.id = Node._id_counter
-        Node._id_counter += 1
+        self.id = None  # assigned by the CSGDAG the node is added to
 
         self.type = node_type
         self.children = []         # dependency nodes
+        self.parents = set()       # ids of nodes that depend on this one
         self.cached_result = None  # place to store computed B-Rep or mesh
+        self.dirty = True          # cached_result is missing or out of date
 
     def __repr__(self):
         return f"<Node {self.id} type={self.type}>"
@@ -69,27 +70,160 @@ class BooleanOp(Node):
 # ---------------------------------------------------------
 
 class CSGDAG:
-    def __init__(self):
-        self.nodes = {}  # id -> node
-
+    def __init__(self, hash_consing: bool = True):
+        self.nodes = {}  # id -> node, ids are compact and in insertion order
+        self.next_id = 0
+        self.hash_consing = hash_consing
+        self.node_keys = {}  # structural key -> id, used for hash-consing
+        self.cache = {}  # data derived from the nodes, cleared whenever the DAG changes
+
+    # primitives are identified by their data object, groups and booleans by op and child ids
+    @staticmethod
+    def get_node_key(node: Node):
+        if isinstance(node, PrimitiveSurface):
+            return (node.type, id(node.surface_data))
+        if isinstance(node, BooleanOp):
+            return (node.type, node.op, node.left, node.right)
+        return (node.type, tuple(node.children))
+
+    # add a node and return its id; with hash-consing an identical existing node is reused,
+    # the passed node is not stored and its id is set to the canonical node's id
     def add(self, node: Node):
+        if self.hash_consing:
+            key = self.get_node_key(node)
+            if key in self.node_keys:
+                node.id = self.node_keys[key]
+                return node.id
+            self.node_keys[key] = self.next_id
+
+        node.id = self.next_id
+        self.next_id += 1
         self.nodes[node.id] = node
+        self.cache.clear()
+        for child in node.children:
+            if child in self.nodes:
+                self.nodes[child].parents.add(node.id)
         return node.id
 
     def get(self, node_id):
         return self.nodes[node_id]
 
-    # recursively print dependency tree
-    def print_tree(self, node_id, indent=0, visited=None):
-        if visited is None:
-            visited = set()
-        if node_id in visited:
-            print(" " * indent + f"{node_id} (revisited)")
-            return
-        visited.add(node_id)
-
+    # all nodes whose result depends on node_id, nearest first
+    def get_ancestors(self, node_id):
+        ancestors = []
+        visited = {node_id}
+        queue = deque([node_id])
+        while queue:
+            current = queue.popleft()
+            for parent in sorted(self.get(current).parents):
+                if parent not in visited:
+                    visited.add(parent)
+                    ancestors.append(parent)
+                    queue.append(parent)
+        return ancestors
+
+    # invalidate node_id and every ancestor; returns the ids that were invalidated.
+    # a dirty node's ancestors are always dirty, so propagation stops there
+    def mark_dirty(self, node_id):
+        self.cache.clear()
+        invalidated = []
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            node = self.get(current)
+            if current != node_id and node.dirty:
+                continue
+            node.dirty = True
+            node.cached_result = None
+            invalidated.append(current)
+            stack.extend(parent for parent in node.parents if parent in self.nodes)
+        return invalidated
+
+    # replace (or edit in place and pass None) the data of a primitive
+    def update_primitive(self, node_id, surface_data=None):
         node = self.get(node_id)
-        print(" " * indent + repr(node))
-
-        for child in node.children:
-            self.print_tree(child, indent + 4, visited)
+        if not isinstance(node, PrimitiveSurface):
+            raise TypeError(f"node {node_id} is not a primitive surface")
+        if surface_data is not None:
+            if self.hash_consing:
+                self.node_keys.pop(self.get_node_key(node), None)
+                self.node_keys.setdefault((node.type, id(surface_data)), node_id)
+            node.surface_data = surface_data
+        return self.mark_dirty(node_id)
+
+    def get_dirty_nodes(self, node_id=None):
+        if node_id is None:
+            return [i for i, node in self.nodes.items() if node.dirty]
+        # a clean node has clean descendants
+        return list(self.iter_postorder(node_id, expand=lambda node: node.dirty))
+
+    # yield node_id and its descendants children-first, each node once.
+    # expand(node) returning False skips a node together with its subtree
+    def iter_postorder(self, node_id, expand=None):
+        visited = set()
+        stack = [(node_id, False)]
+        while stack:
+            current, is_expanded = stack.pop()
+            if is_expanded:
+                yield current
+                continue
+            if current in visited:
+                continue
+            visited.add(current)
+            node = self.get(current)
+            if expand is not None and not expand(node):
+                continue
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(node.children) if child not in visited)
+
+    # every node after all of its children; roots default to all nodes without parents
+    def topological_order(self, node_ids=None):
+        if node_ids is None:
+            node_ids = self.get_roots()
+        order = []
+        emitted = set()
+        for node_id in node_ids:
+            for current in self.iter_postorder(node_id):
+                if current not in emitted:
+                    emitted.add(current)
+                    order.append(current)
+        return order
+
+    # drop every node that cannot be reached from root_ids; returns the removed ids
+    def remove_unreachable(self, root_ids):
+        reachable = set(self.topological_order(root_ids))
+        removed = [node_id for node_id in self.nodes if node_id not in reachable]
+        for node_id in removed:
+            node = self.nodes.pop(node_id)
+            for child in node.children:
+                if child in self.nodes:
+                    self.nodes[child].parents.discard(node_id)
+        if removed:
+            self.cache.clear()
+        if removed and self.hash_consing:
+            self.node_keys = {key: node_id for key, node_id in self.node_keys.items() if node_id in self.nodes}
+        return removed
+
+    def get_roots(self):
+        return [node_id for node_id, node in self.nodes.items() if not node.parents]
+
+    def get_depth(self, node_id):
+        depths = {}
+        for current in self.iter_postorder(node_id):
+            children = self.get(current).children
+            depths[current] = 1 + max((depths[child] for child in children), default=0)
+        return depths[node_id]
+
+    # print dependency tree, shared nodes are expanded only once
+    def print_tree(self, node_id, indent=0):
+        visited = set()
+        stack = [(node_id, indent)]
+        while stack:
+            current, current_indent = stack.pop()
+            if current in visited:
+                print(" " * current_indent + f"{current} (revisited)")
+                continue
+            visited.add(current)
+
+            print(" " * current_indent + repr(self.get(current)))
+            stack.extend((child, current_indent + 4) for child in reversed(self.get(current).children))
@@ -16,6 +16,12 @@ class JCDBaseData:
         self.matrices: np.ndarray = np.array([]).reshape(0, 4, 4)  # 变换矩阵
         self.meta_info: bytes = b''  # 元信息
         self.hide: bool = False  # 是否隐藏
+        self.matrix_padding: bytes = b''  # 相邻矩阵之间的填充字节
+
+        # 源文件信息，用于写出时直接复制未修改实体的原始字节
+        self.source_span: Optional[tuple] = None  # (源文件路径, 起始偏移, 结束偏移)
+        self.source_state: Optional[tuple] = None  # 加载时的状态快照
+        self.source_offsets: Dict[str, int] = {}  # 元信息、矩阵块和变换矩阵在源文件中的偏移，用于原位修改
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
@@ -41,6 +47,7 @@ class JCDBaseData:
         self.matrices = data.get('matrices', np.array([]).reshape(0, 4, 4))
         self.meta_info = data.get('meta_info', b'')
         self.hide = data.get('hide', False)
+        self.matrix_padding = data.get('matrix_padding', b'')
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典（用于序列化）
@@ -53,8 +60,17 @@ class JCDBaseData:
             'matrices': self.matrices,
             'meta_info': self.meta_info,
             'hide': self.hide,
+            'matrix_padding': self.matrix_padding,
         }
 
+    def mark_modified(self):
+        """标记实体已被修改，写出时将重新编码而不是复制源文件字节
+
+        重新赋值和对数组的原地修改（如 points[0] = ...）在写出时会被自动检测，
+        此方法用于强制重新编码，例如修改了快照无法比较的嵌套对象
+        """
+        self.source_state = None
+
     def get_bounding_box(self) -> Optional[tuple]:
         """获取边界框（子类应重写此方法）
 
@@ -79,6 +95,10 @@ class JCDBaseData:
         else:
             self.matrices = matrix.reshape(1, 4, 4)
 
+    def get_material_name(self) -> str:
+        """获取材质名称，没有材质的实体为空字符串"""
+        return getattr(self, 'material_name', '')
+
     def get_points(self) -> Optional[np.ndarray]:
         """获取原始点数据（子类应重写此方法）
 
@@ -96,10 +116,20 @@ class JCDBaseData:
         points = self.get_points()
         if points is None or len(points) == 0:
             return None
+        return self.apply_transform(points)
 
+    def apply_transform(self, points: np.ndarray) -> np.ndarray:
+        """对任意点应用与 get_transformed_points 相同的变换
+
+        Args:
+            points: 点数组 (n, 3) 或齐次坐标 (n, 4)
+
+        Returns:
+            变换后的点数组 (n, 3)
+        """
         # 如果没有变换矩阵，直接返回原始点
         if len(self.matrices) == 0:
-            return points
+            return points[:, :3]
 
         # 转换为齐次坐标
         if points.shape[1] == 3:
@@ -1,4 +1,5 @@
 """JCD布尔曲面数据类 - 基于DAG结构"""
+import numpy as np
 from typing import Dict, Any, Optional, List
 from jcd_manage.Data.jcd_base import JCDBaseData
 from jcd_manage.Config.types import BoolType, DAGBoolType
@@ -15,15 +16,19 @@ class JCDBoolSurface(JCDBaseData):
         super().__init__()
         self.bool_type: Optional[BoolType] = None  # 布尔操作类型
         self.unknown_data1: bytes = b''
+        self.unknown_data2: bytes = b''
         self.dag = CSGDAG()  # DAG管理器实例
         self.root_node_id: Optional[int] = None  # 根节点ID
         self.surface_count: int = 0  # 曲面数量计数器
+        # 源文件中的记录片段 [(起始偏移, 结束偏移, 原始曲面或None)]，None 表示原样保留的字节
+        self.source_segments: List[tuple] = []
 
     def _load_from_dict(self, data: Dict[str, Any]):
         """从字典加载布尔曲面数据"""
         super()._load_from_dict(data)
         self.bool_type = data.get('bool_type')
         self.unknown_data1 = data.get('unknown_data1', b'')
+        self.unknown_data2 = data.get('unknown_data2', b'')
         self.surface_count = data.get('surface_count', 0)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -32,6 +37,7 @@ class JCDBoolSurface(JCDBaseData):
         data.update({
             'bool_type': self.bool_type,
             'unknown_data1': self.unknown_data1,
+            'unknown_data2': self.unknown_data2,
             'surface_count': self.surface_count,
             'root_node_id': self.root_node_id,
         })
@@ -44,12 +50,14 @@ class JCDBoolSurface(JCDBaseData):
             surface_data: 曲面数据字典
 
         Returns:
-            添加的节点ID
+            添加的节点ID，同一曲面对象已在DAG中时返回已有的节点ID
         """
-        # 创建原始曲面节点
+        # 创建原始曲面节点，哈希合并复用已有节点时不计入曲面数量
         primitive_node = PrimitiveSurface(surface_data)
+        node_count = len(self.dag.nodes)
         node_id = self.dag.add(primitive_node)
-        self.surface_count += 1
+        if len(self.dag.nodes) > node_count:
+            self.surface_count += 1
 
         # 如果是第一个曲面，设置为根节点
         if self.root_node_id is None:
@@ -87,6 +95,22 @@ class JCDBoolSurface(JCDBaseData):
         self.root_node_id = node_id
         return node_id
     
+    def update_surface(self, node_id: int, surface_data: Any = None) -> List[int]:
+        """替换或原地修改原始曲面后调用，使其到根节点路径上的计算结果失效
+
+        Args:
+            node_id: 原始曲面节点ID
+            surface_data: 新的曲面数据，None 表示曲面（点或变换矩阵）已被原地修改
+
+        Returns:
+            被标记为 dirty 的节点ID列表
+        """
+        return self.dag.update_primitive(node_id, surface_data)
+
+    def is_dirty(self) -> bool:
+        """根节点的计算结果是否需要重新计算"""
+        return self.root_node_id is not None and self.dag.get(self.root_node_id).dirty
+
     def get_bool_type_name(self) -> str:
         """获取布尔操作类型名称"""
         if self.bool_type is None:
@@ -107,25 +131,76 @@ class JCDBoolSurface(JCDBaseData):
         else:
             print("布尔曲面DAG结构为空")
     
+    def get_aggregated_geometry(self) -> Dict[str, Any]:
+        """获取DAG中所有原始曲面的聚合几何
+
+        结果缓存在DAG上，添加节点、调用 update_surface 或替换DAG后自动失效；
+        原地修改原始曲面而未调用 update_surface 时需调用 invalidate_geometry。
+
+        Returns:
+            {'surfaces': 原始曲面列表, 'points': 拼接的变换后点 (n, 3),
+             'offsets': 各曲面在 points 中的起始位置 (曲面数 + 1,), 'bounding_box': (min, max) 或 None}
+        """
+        geometry = self.dag.cache.get('aggregated_geometry')
+        if geometry is not None:
+            return geometry
+
+        surfaces = self.get_surfaces()
+        point_list = []
+        offsets = [0]
+        for surface in surfaces:
+            points = surface.get_transformed_points() if isinstance(surface, JCDBaseData) else None
+            points = np.zeros((0, 3)) if points is None else np.asarray(points, dtype=np.float64)[:, :3]
+            point_list.append(points)
+            offsets.append(offsets[-1] + len(points))
+
+        points = np.concatenate(point_list) if point_list else np.zeros((0, 3), dtype=np.float64)
+        points.flags.writeable = False
+        geometry = {
+            'surfaces': surfaces,
+            'points': points,
+            'offsets': np.asarray(offsets, dtype=np.int64),
+            'bounding_box': (points.min(axis=0), points.max(axis=0)) if len(points) > 0 else None,
+        }
+        self.dag.cache['aggregated_geometry'] = geometry
+        return geometry
+
+    def invalidate_geometry(self):
+        """丢弃缓存的聚合几何"""
+        self.dag.cache.pop('aggregated_geometry', None)
+
+    def get_points(self) -> Optional[np.ndarray]:
+        """所有原始曲面变换后的点"""
+        points = self.get_aggregated_geometry()['points']
+        return points if len(points) > 0 else None
+
+    def get_transformed_points(self) -> Optional[np.ndarray]:
+        """原始曲面的点已经过各自的变换"""
+        return self.get_points()
+
+    def get_bounding_box(self) -> Optional[tuple]:
+        """所有原始曲面的边界框"""
+        return self.get_aggregated_geometry()['bounding_box']
+
     def get_surfaces(self) -> List[Dict[str, Any]]:
         """获取保存在DAG中的所有原始曲面
         
         Returns:
             原始曲面数据字典列表
         """
-        surfaces = []
-        
         if not self.dag or not self.dag.nodes:
-            return surfaces
-        
-        # 遍历DAG中的所有节点
-        for node_id, node in self.dag.nodes.items():
-            # 如果是原始曲面节点，添加其数据
-            if isinstance(node, PrimitiveSurface):
-                surfaces.append(node.surface_data)
-        
-        return surfaces
+            return []
+
+        # 遍历DAG中的所有节点，只收集原始曲面，不计算聚合几何
+        return [node.surface_data for node in self.dag.nodes.values() if isinstance(node, PrimitiveSurface)]
     
+    def get_material_name(self) -> str:
+        """布尔曲面没有自身的材质，使用第一个原始曲面的材质"""
+        surfaces = self.get_surfaces()
+        if len(surfaces) == 0 or not isinstance(surfaces[0], JCDBaseData):
+            return ''
+        return surfaces[0].get_material_name()
+
     def get_surface_count(self) -> int:
         """获取曲面数量"""
         return self.surface_count
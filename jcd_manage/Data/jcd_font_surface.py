@@ -25,6 +25,7 @@ class JCDFontSurface(JCDBaseData):
         self.radius: float = 0.0  # 半径
         self.outline_sizes: np.ndarray = np.array([], dtype=np.int32)  # 每个轮廓的点数
         self.points: np.ndarray = np.array([]).reshape(0, 3)  # 所有轮廓点 (n, 3)
+        self.unknown_data: bytes = b''  # 每个轮廓大小之后的4个未知字节
     
     def _load_from_dict(self, data: Dict[str, Any]):
         """从字典加载字体面片数据"""
@@ -45,6 +46,7 @@ class JCDFontSurface(JCDBaseData):
         self.radius = data.get('radius', 0.0)
         self.outline_sizes = data.get('outline_sizes', np.array([], dtype=np.int32))
         self.points = data.get('points', np.array([]).reshape(0, 3))
+        self.unknown_data = data.get('unknown_data', b'')
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -62,6 +64,7 @@ class JCDFontSurface(JCDBaseData):
             'radius': self.radius,
             'outline_sizes': self.outline_sizes,
             'points': self.points,
+            'unknown_data': self.unknown_data,
         })
         return data
     
@@ -176,9 +179,19 @@ class JCDFontSurface(JCDBaseData):
         points = self.get_points()
         if points is None or len(points) == 0:
             return None
-        
+        return self.apply_transform(points)
+
+    def apply_transform(self, points: np.ndarray) -> np.ndarray:
+        """对任意点（如拉伸后的网格顶点）应用自身matrix和继承的matrices
+
+        Args:
+            points: 点数组 (n, 3)
+
+        Returns:
+            变换后的点数组 (n, 3)
+        """
         # 转换为齐次坐标
-        homogeneous = np.hstack([points, np.ones((len(points), 1))])
+        homogeneous = np.hstack([points[:, :3], np.ones((len(points), 1))])
         
         # 先应用自身的matrix
         transformed = (self.matrix @ homogeneous.T).T
@@ -48,6 +48,7 @@ class JCDSurface(JCDBaseData):
             'is_path_closed': self.is_path_closed,
             'is_cross_section_closed': self.is_cross_section_closed,
             'normal_direction': self.normal_direction,
+            'unknown_data': self.unknown_data,
         })
         return data
     
@@ -1,3 +1,5 @@
+import logging
+
 from jcd_manage.Module.jcd_loader import JCDLoader
 
 def demo():
@@ -6,6 +8,9 @@ def demo():
     save_txt_file_path = '/Users/chli/Downloads/001_0002.txt'
     overwrite = True
 
+    # 实体摘要以INFO级别输出
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     jcd_loader = JCDLoader(jcd_txt_file_path, output_info)
     jcd_loader.renderAllData()
     jcd_loader.saveAsTXTFile(save_txt_file_path, overwrite)
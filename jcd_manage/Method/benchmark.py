@@ -0,0 +1,257 @@
+"""JCD解析基准测试模块
+
+对合成文件测量加载、io 读取函数、变换点计算、整体包围盒和渲染几何体构建的耗时，
+结果以吞吐量（MB/s、实体/s）和峰值内存报告，输出为可跨版本比较的JSON。
+
+open3d不可用时渲染阶段使用最小的替身模块：只实现几何体和向量容器的构造（复制为float64/int32数组），
+仍然测量网格与线集数据的构建，结果中以 'stubbed': True 标记，不能与真实open3d的耗时直接比较。
+"""
+import os
+import sys
+import time
+import platform
+import tempfile
+import tracemalloc
+import numpy as np
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from jcd_manage.Method.io import read_by_surface_type
+from jcd_manage.Method.scan import scan_jcd_file
+from jcd_manage.Method.synthetic import SYNTHETIC_PRESETS, write_synthetic_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+BENCHMARK_VERSION = 1
+
+# 按比例缩放的实体数量参数，其余参数描述单个实体的规模，保持不变
+ENTITY_COUNT_KEYS = (
+    'curve_count', 'surface_count', 'diamond_count', 'quad_count',
+    'font_count', 'guide_line_count', 'bool_count',
+)
+
+
+def scale_preset(preset: Dict[str, int], scale: float) -> Dict[str, int]:
+    """按比例缩放预设中的实体数量，非零数量至少保留1个"""
+    scaled = dict(preset)
+    for key in ENTITY_COUNT_KEYS:
+        if scaled.get(key, 0) > 0:
+            scaled[key] = max(1, int(round(scaled[key] * scale)))
+    return scaled
+
+
+def is_open3d_available() -> bool:
+    try:
+        import open3d
+        # 其他模块可能已注册延迟导入的open3d，访问属性以触发真正的加载
+        open3d.geometry
+    except Exception:
+        return False
+    return True
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """测量函数耗时和峰值内存
+
+    耗时取 repeat 次运行的最小值；峰值内存在单独一次运行中通过 tracemalloc 统计，不影响计时
+
+    Args:
+        func: 无参函数
+        repeat: 计时运行次数
+
+    Returns:
+        {'seconds', 'peak_memory_mb'}
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_memory_mb': peak / 1024 / 1024}
+
+
+def _get_throughput(result: Dict[str, float], byte_count: Optional[int], entity_count: int) -> Dict[str, float]:
+    seconds = max(result['seconds'], 1e-9)
+    if byte_count is not None:
+        result['mb_per_s'] = byte_count / 1024 / 1024 / seconds
+    result['entities_per_s'] = entity_count / seconds
+    result['entity_count'] = entity_count
+    return result
+
+
+def read_records(jcd_file_path: str, records: List[Dict[str, Any]]) -> int:
+    """逐条记录调用 read_by_surface_type，不构建数据类和DAG"""
+    with open(jcd_file_path, 'rb') as jcd_file:
+        for record in records:
+            jcd_file.seek(record['start'] + 9)
+            read_by_surface_type(jcd_file, record['surface_type'])
+    return len(records)
+
+
+class _StubGeometry(object):
+    """open3d几何体的替身，只保存赋值的数组"""
+
+    def paint_uniform_color(self, color):
+        self.color = np.asarray(color, dtype=np.float64)
+        return self
+
+    def compute_vertex_normals(self):
+        return self
+
+
+def create_open3d_stub() -> ModuleType:
+    """创建只包含渲染几何体构建所需构造函数的open3d替身模块"""
+    stub = ModuleType('open3d_stub')
+
+    class TriangleMesh(_StubGeometry):
+        @staticmethod
+        def create_coordinate_frame(size=1.0, origin=None):
+            return TriangleMesh()
+
+    stub.geometry = SimpleNamespace(
+        Geometry=_StubGeometry,
+        TriangleMesh=TriangleMesh,
+        LineSet=type('LineSet', (_StubGeometry,), {}),
+        PointCloud=type('PointCloud', (_StubGeometry,), {}),
+    )
+    # 与open3d一样复制为固定类型的连续数组
+    stub.utility = SimpleNamespace(
+        Vector3dVector=lambda array: np.array(array, dtype=np.float64).reshape(-1, 3),
+        Vector2iVector=lambda array: np.array(array, dtype=np.int32).reshape(-1, 2),
+        Vector3iVector=lambda array: np.array(array, dtype=np.int32).reshape(-1, 3),
+    )
+    return stub
+
+
+def build_render_geometries(objects, o3d_module: Optional[ModuleType] = None) -> int:
+    """构建渲染几何体（不打开窗口）
+
+    Args:
+        objects: 实体列表
+        o3d_module: 替代open3d的模块，为 None 时使用open3d
+    """
+    import jcd_manage.Method.render as render
+
+    module = render.o3d
+    if o3d_module is not None:
+        render.o3d = o3d_module
+    try:
+        renderer = render.JCDRenderer()
+        renderer.add_data(objects)
+        renderer._flush_line_groups()
+        return len(renderer.geometries)
+    finally:
+        render.o3d = module
+
+
+def benchmark_jcd_file(jcd_file_path: str, repeat: int = 3, render: bool = True) -> Dict[str, Any]:
+    """对一个JCD文件运行各阶段基准测试
+
+    Args:
+        jcd_file_path: 文件路径
+        repeat: 每个阶段的计时运行次数
+        render: 是否测量渲染几何体构建，open3d不可用时使用替身模块并标记 'stubbed'
+
+    Returns:
+        {'file_size', 'record_count', 'entity_count', 'stages': {阶段名: 结果}}
+    """
+    file_size = os.path.getsize(jcd_file_path)
+    records = scan_jcd_file(jcd_file_path)
+    jcd_loader = JCDLoader(jcd_file_path)
+    objects = jcd_loader.objects
+
+    stages = {}
+    stages['load'] = _get_throughput(
+        measure(lambda: JCDLoader().loadJCDFile(jcd_file_path), repeat), file_size, len(objects)
+    )
+    stages['read'] = _get_throughput(
+        measure(lambda: read_records(jcd_file_path, records), repeat), file_size, len(records)
+    )
+    stages['transformed_points'] = _get_throughput(
+        measure(lambda: [obj.get_transformed_points() for obj in objects], repeat), None, len(objects)
+    )
+    stages['bounding_box'] = _get_throughput(
+        measure(jcd_loader.get_overall_bounding_box, repeat), None, len(objects)
+    )
+
+    if not render:
+        stages['render_geometry'] = {'skipped': 'disabled'}
+    else:
+        o3d_module = None if is_open3d_available() else create_open3d_stub()
+        stages['render_geometry'] = _get_throughput(
+            measure(lambda: build_render_geometries(objects, o3d_module), repeat), None, len(objects)
+        )
+        stages['render_geometry']['stubbed'] = o3d_module is not None
+
+    return {
+        'file_size': file_size,
+        'record_count': len(records),
+        'entity_count': len(objects),
+        'stages': stages,
+    }
+
+
+def get_environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'executable': sys.executable,
+    }
+
+
+def run_benchmarks(
+    presets: Optional[Dict[str, Dict[str, int]]] = None,
+    scale: float = 1.0,
+    repeat: int = 3,
+    render: bool = True,
+    work_folder_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """生成合成文件并运行基准测试
+
+    Args:
+        presets: 场景名 -> create_synthetic_objects 参数，默认使用 SYNTHETIC_PRESETS
+        scale: 实体数量缩放比例
+        repeat: 每个阶段的计时运行次数
+        render: 是否测量渲染几何体构建
+        work_folder_path: 合成文件的保存目录，默认使用临时目录并在结束后删除
+
+    Returns:
+        可直接序列化为JSON的结果
+    """
+    if presets is None:
+        presets = SYNTHETIC_PRESETS
+
+    report = {
+        'version': BENCHMARK_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': get_environment(),
+        'scale': scale,
+        'repeat': repeat,
+        'scenarios': {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        folder_path = work_folder_path or tmp_folder_path
+        os.makedirs(folder_path, exist_ok=True)
+
+        for name, preset in presets.items():
+            preset = scale_preset(preset, scale)
+            jcd_file_path = os.path.join(folder_path, name + '.jcd')
+            write_synthetic_jcd_file(jcd_file_path, **preset)
+
+            scenario = benchmark_jcd_file(jcd_file_path, repeat, render)
+            scenario['preset'] = preset
+            report['scenarios'][name] = scenario
+
+    return report
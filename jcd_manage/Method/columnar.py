@@ -0,0 +1,510 @@
+"""JCD列式二进制存储模块
+
+将实体列表无损转换为列式数组：
+- 变长数组（矩阵、控制点、顶点索引、轮廓点）按列拼接，并以 offsets 记录每个实体的范围
+- 类型、隐藏、材质及各类型的标量属性各占一列，材质名称存入字符串表
+- 未知字节和矩阵填充字节按字节列拼接，保证可以写回原始JCD记录
+- 布尔曲面的DAG结构存为节点表，节点引用使用布尔曲面内的局部序号
+
+支持两种容器：
+- .jcdc：文件头 + JSON目录 + 64字节对齐的原始数组，读取时直接内存映射，不做解码
+- .npz：numpy标准压缩包，便于与其他工具交换
+"""
+import os
+import json
+import numpy as np
+from typing import Dict, List, Tuple
+
+from jcd_manage.Config.types import (
+    SurfaceType, DiamondType, BlockType, BoolType, CurveType, DAGNodeType, DAGBoolType
+)
+from jcd_manage.Data import (
+    JCDCurve, JCDSurface, JCDDiamond, JCDFontSurface,
+    JCDGuideLine, JCDBoolSurface, JCDQuadType, JCDBaseData
+)
+from jcd_manage.Data.dag import PrimitiveSurface, SurfaceGroup, BooleanOp
+
+
+COLUMNAR_FILE_FORMATS = ['jcdc', 'npz']
+
+JCDC_MAGIC = b'JCDC'
+JCDC_VERSION = 1
+JCDC_ALIGNMENT = 64
+
+ENTITY_CLASS_MAP = {
+    SurfaceType.CURVE: JCDCurve,
+    SurfaceType.SURFACE: JCDSurface,
+    SurfaceType.DIAMOND: JCDDiamond,
+    SurfaceType.FONT_SURFACE: JCDFontSurface,
+    SurfaceType.GUIDE_LINE: JCDGuideLine,
+    SurfaceType.BOOL_SURFACE: JCDBoolSurface,
+    SurfaceType.QUAD_TYPE: JCDQuadType,
+}
+
+# 变长数组列：列名 -> (实体属性, 单个元素形状, 数据类型)
+PACKED_COLUMNS = {
+    'matrices': ('matrices', (4, 4), np.float32),
+    'points': ('points', (4,), np.float32),
+    'indices': ('indices', (4,), np.int32),
+    'outline_points': ('points', (3,), np.float32),
+    'outline_sizes': ('outline_sizes', (), np.int32),
+}
+
+# 标量列：列名 -> (数据类型, 默认值)
+SCALAR_COLUMNS = {
+    'ring_count': (np.int32, 0),
+    'original_point_count': (np.int32, 0),
+    'is_path_closed': (np.bool_, False),
+    'is_cross_section_closed': (np.bool_, False),
+    'normal_direction': (np.int32, 1),
+    'outline_count': (np.int32, 0),
+    'type2': (np.int32, 0),
+    'type3': (np.int32, 0),
+    'type4': (np.int32, 0),
+    'thickness': (np.float32, 0.0),
+    'radius': (np.float32, 0.0),
+    'surface_count': (np.int32, 0),
+}
+
+# 字节列，按实体拼接为uint8数组；整数类型的未知字段存为4字节小端整数
+BYTES_COLUMNS = ['matrix_padding', 'unknown_data', 'unknown_data1', 'unknown_data2', 'unknown_data3']
+
+# 枚举列，以枚举值存储，None 存为 -1
+ENUM_COLUMNS = {
+    'curve_type': CurveType,
+    'diamond_type': DiamondType,
+    'foreground_type': BlockType,
+    'background_type': BlockType,
+    'bool_type': BoolType,
+}
+
+DAG_NODE_TYPES = list(DAGNodeType)
+DAG_BOOL_TYPES = list(DAGBoolType)
+
+
+def _get_class_fields(entity_class: type) -> dict:
+    """获取数据类实例拥有的属性及其默认值"""
+    return vars(entity_class())
+
+
+CLASS_FIELDS = {entity_class: _get_class_fields(entity_class) for entity_class in ENTITY_CLASS_MAP.values()}
+CLASS_FIELDS[JCDBaseData] = _get_class_fields(JCDBaseData)
+
+
+def _get_packed_column_names(entity_class: type) -> List[str]:
+    """获取数据类使用的变长数组列"""
+    if issubclass(entity_class, JCDFontSurface):
+        return ['matrices', 'outline_points', 'outline_sizes']
+    if issubclass(entity_class, JCDQuadType):
+        return ['matrices', 'points', 'indices']
+    if issubclass(entity_class, (JCDCurve, JCDSurface)):
+        return ['matrices', 'points']
+    return ['matrices']
+
+
+def get_surface_type(entity: JCDBaseData) -> SurfaceType:
+    """获取实体的曲面类型，未设置时根据数据类推断
+
+    布尔曲面加载时 surface_type 会被其子曲面类型覆盖，因此总是返回 BOOL_SURFACE
+    """
+    if isinstance(entity, JCDBoolSurface):
+        return SurfaceType.BOOL_SURFACE
+    if entity.surface_type is not None:
+        return entity.surface_type
+    for surface_type, entity_class in ENTITY_CLASS_MAP.items():
+        if type(entity) is entity_class:
+            return surface_type
+    return SurfaceType.UNKNOWN
+
+
+def _flatten_entities(objects: List[JCDBaseData]) -> Tuple[List[JCDBaseData], List[int]]:
+    """展开实体列表，布尔曲面的原始曲面紧随其后
+
+    Returns:
+        (实体列表, 所属布尔曲面的实体序号，顶层实体为-1)
+    """
+    entities = []
+    parents = []
+    for obj in objects:
+        index = len(entities)
+        entities.append(obj)
+        parents.append(-1)
+        if isinstance(obj, JCDBoolSurface):
+            for node in obj.dag.nodes.values():
+                if isinstance(node, PrimitiveSurface):
+                    entities.append(node.surface_data)
+                    parents.append(index)
+    return entities, parents
+
+
+def _pack(arrays: List[np.ndarray], shape: tuple, dtype: type) -> Tuple[np.ndarray, np.ndarray]:
+    """拼接变长数组，返回 (数据, offsets)"""
+    sizes = [len(array) for array in arrays]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.empty((0,) + shape, dtype=dtype), offsets
+    data = np.concatenate([np.asarray(array, dtype=dtype).reshape((-1,) + shape) for array in arrays if len(array) > 0])
+    return data, offsets
+
+
+def entities_to_columns(objects: List[JCDBaseData]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """将实体列表转换为列式数组
+
+    Args:
+        objects: 顶层实体列表
+
+    Returns:
+        (列名 -> 数组, 字符串表)
+    """
+    entities, parents = _flatten_entities(objects)
+    entity_count = len(entities)
+
+    strings = []
+    string_index_map = {}
+
+    def get_string_index(value: str) -> int:
+        if value not in string_index_map:
+            string_index_map[value] = len(strings)
+            strings.append(value)
+        return string_index_map[value]
+
+    columns = {
+        'type': np.empty(entity_count, dtype=np.int16),
+        'hide': np.empty(entity_count, dtype=np.bool_),
+        'material': np.full(entity_count, -1, dtype=np.int32),
+        'parent': np.asarray(parents, dtype=np.int32).reshape(-1),
+        'meta_info': np.zeros((entity_count, 8), dtype=np.uint8),
+        'meta_info_size': np.zeros(entity_count, dtype=np.uint8),
+        'matrix': np.tile(np.eye(4, dtype=np.float32), (entity_count, 1, 1)),
+    }
+    for name, (dtype, default) in SCALAR_COLUMNS.items():
+        columns[name] = np.full(entity_count, default, dtype=dtype)
+    for name in ENUM_COLUMNS:
+        columns[name] = np.full(entity_count, -1, dtype=np.int8)
+
+    packed_arrays = {name: [] for name in PACKED_COLUMNS}
+    bytes_arrays = {name: [] for name in BYTES_COLUMNS}
+    entity_index_map = {id(entity): i for i, entity in enumerate(entities)}
+
+    dag_offsets = np.zeros(entity_count + 1, dtype=np.int64)
+    dag_root = np.full(entity_count, -1, dtype=np.int32)
+    dag_nodes = []
+    dag_items = []
+
+    for i, entity in enumerate(entities):
+        columns['type'][i] = get_surface_type(entity).value
+        columns['hide'][i] = entity.hide
+        if isinstance(getattr(entity, 'material_name', None), str):
+            columns['material'][i] = get_string_index(entity.material_name)
+
+        meta_info = bytes(entity.meta_info)[:8]
+        columns['meta_info'][i, :len(meta_info)] = np.frombuffer(meta_info, dtype=np.uint8)
+        columns['meta_info_size'][i] = len(meta_info)
+
+        if hasattr(entity, 'matrix'):
+            columns['matrix'][i] = np.asarray(entity.matrix).reshape(4, 4)
+
+        for name in SCALAR_COLUMNS:
+            if hasattr(entity, name):
+                columns[name][i] = getattr(entity, name)
+        for name in ENUM_COLUMNS:
+            value = getattr(entity, name, None)
+            if value is not None:
+                columns[name][i] = value.value
+
+        packed_names = _get_packed_column_names(type(entity))
+        for name, (attr, shape, _) in PACKED_COLUMNS.items():
+            if name in packed_names:
+                packed_arrays[name].append(np.asarray(getattr(entity, attr)).reshape((-1,) + shape))
+            else:
+                packed_arrays[name].append(())
+
+        for name in BYTES_COLUMNS:
+            value = getattr(entity, name, b'')
+            if isinstance(value, int):
+                value = value.to_bytes(4, 'little')
+            bytes_arrays[name].append(np.frombuffer(bytes(value), dtype=np.uint8))
+
+        # 布尔曲面的DAG节点表
+        if isinstance(entity, JCDBoolSurface):
+            node_index_map = {node_id: j for j, node_id in enumerate(entity.dag.nodes)}
+            for node in entity.dag.nodes.values():
+                item_start = len(dag_items)
+                left = right = primitive = op = -1
+                if isinstance(node, PrimitiveSurface):
+                    primitive = entity_index_map[id(node.surface_data)]
+                elif isinstance(node, BooleanOp):
+                    op = DAG_BOOL_TYPES.index(node.op)
+                    left = node_index_map[node.left]
+                    right = node_index_map[node.right]
+                elif isinstance(node, SurfaceGroup):
+                    dag_items += [node_index_map[item] for item in node.items]
+                dag_nodes.append((DAG_NODE_TYPES.index(node.type), op, left, right, primitive, item_start))
+            if entity.root_node_id is not None:
+                dag_root[i] = node_index_map[entity.root_node_id]
+        dag_offsets[i + 1] = len(dag_nodes)
+
+    for name, (_, shape, dtype) in PACKED_COLUMNS.items():
+        columns[name], columns[name + '_offsets'] = _pack(packed_arrays[name], shape, dtype)
+
+    for name in BYTES_COLUMNS:
+        columns[name], columns[name + '_offsets'] = _pack(bytes_arrays[name], (), np.uint8)
+
+    dag_nodes = np.asarray(dag_nodes, dtype=np.int64).reshape(-1, 6)
+    columns['dag_offsets'] = dag_offsets
+    columns['dag_root'] = dag_root
+    columns['dag_node_type'] = dag_nodes[:, 0].astype(np.int8)
+    columns['dag_node_op'] = dag_nodes[:, 1].astype(np.int8)
+    columns['dag_node_left'] = dag_nodes[:, 2].astype(np.int32)
+    columns['dag_node_right'] = dag_nodes[:, 3].astype(np.int32)
+    columns['dag_node_entity'] = dag_nodes[:, 4].astype(np.int32)
+    columns['dag_item_offsets'] = np.append(dag_nodes[:, 5], len(dag_items)).astype(np.int64)
+    columns['dag_items'] = np.asarray(dag_items, dtype=np.int32)
+
+    return columns, strings
+
+
+def columns_to_entities(columns: Dict[str, np.ndarray], strings: List[str]) -> List[JCDBaseData]:
+    """将列式数组还原为顶层实体列表
+
+    变长数组以切片视图的形式赋给实体，内存映射的数据不会被复制
+
+    Args:
+        columns: 列名 -> 数组
+        strings: 字符串表
+
+    Returns:
+        顶层实体列表
+    """
+    entity_count = len(columns['type'])
+    types = columns['type'].tolist()
+    hides = columns['hide'].tolist()
+    materials = columns['material'].tolist()
+    parents = columns['parent'].tolist()
+    meta_info_sizes = columns['meta_info_size'].tolist()
+    scalars = {name: columns[name].tolist() for name in SCALAR_COLUMNS}
+    enums = {name: columns[name].tolist() for name in ENUM_COLUMNS}
+    offsets = {name: columns[name + '_offsets'].tolist() for name in list(PACKED_COLUMNS) + BYTES_COLUMNS}
+
+    entities = []
+    for i in range(entity_count):
+        surface_type = SurfaceType(types[i])
+        entity_class = ENTITY_CLASS_MAP.get(surface_type, JCDBaseData)
+        fields = CLASS_FIELDS[entity_class]
+
+        data = {
+            'surface_type': surface_type,
+            'hide': hides[i],
+            'meta_info': columns['meta_info'][i, :meta_info_sizes[i]].tobytes(),
+        }
+        if 'material_name' in fields:
+            data['material_name'] = strings[materials[i]] if materials[i] >= 0 else ''
+        if 'matrix' in fields:
+            data['matrix'] = columns['matrix'][i:i + 1]
+
+        for name in SCALAR_COLUMNS:
+            if name in fields:
+                data[name] = type(SCALAR_COLUMNS[name][1])(scalars[name][i])
+        for name, enum_class in ENUM_COLUMNS.items():
+            if name in fields and enums[name][i] >= 0:
+                data[name] = enum_class(enums[name][i])
+
+        for name in BYTES_COLUMNS:
+            if name in fields:
+                value = columns[name][offsets[name][i]:offsets[name][i + 1]].tobytes()
+                data[name] = int.from_bytes(value, 'little') if isinstance(fields[name], int) else value
+
+        for name in _get_packed_column_names(entity_class):
+            data[PACKED_COLUMNS[name][0]] = columns[name][offsets[name][i]:offsets[name][i + 1]]
+
+        entities.append(entity_class.from_dict(data))
+
+    # 重建布尔曲面的DAG
+    dag_offsets = columns['dag_offsets'].tolist()
+    dag_root = columns['dag_root'].tolist()
+    node_types = columns['dag_node_type'].tolist()
+    node_ops = columns['dag_node_op'].tolist()
+    node_lefts = columns['dag_node_left'].tolist()
+    node_rights = columns['dag_node_right'].tolist()
+    node_entities = columns['dag_node_entity'].tolist()
+    item_offsets = columns['dag_item_offsets'].tolist()
+    items = columns['dag_items'].tolist()
+
+    for i, entity in enumerate(entities):
+        if not isinstance(entity, JCDBoolSurface):
+            continue
+        node_ids = []
+        for j in range(dag_offsets[i], dag_offsets[i + 1]):
+            node_type = DAG_NODE_TYPES[node_types[j]]
+            if node_type == DAGNodeType.PRIMITIVE:
+                node = PrimitiveSurface(entities[node_entities[j]])
+            elif node_type == DAGNodeType.BOOLEAN:
+                node = BooleanOp(DAG_BOOL_TYPES[node_ops[j]], node_ids[node_lefts[j]], node_ids[node_rights[j]])
+            else:
+                node = SurfaceGroup([node_ids[item] for item in items[item_offsets[j]:item_offsets[j + 1]]])
+            node_ids.append(entity.dag.add(node))
+        if dag_root[i] >= 0:
+            entity.root_node_id = node_ids[dag_root[i]]
+
+    return [entity for entity, parent in zip(entities, parents) if parent < 0]
+
+
+def _align(offset: int) -> int:
+    return (offset + JCDC_ALIGNMENT - 1) // JCDC_ALIGNMENT * JCDC_ALIGNMENT
+
+
+def _get_jcdc_layout(columns: Dict[str, np.ndarray], strings: List[str]) -> Tuple[bytes, dict, int, int]:
+    """计算.jcdc布局
+
+    Returns:
+        (JSON目录, 数组信息, 数组区起点, 总字节数)
+    """
+    arrays = {}
+    offset = 0
+    for name, array in columns.items():
+        arrays[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+
+    directory = json.dumps({'strings': strings, 'arrays': arrays}, ensure_ascii=False).encode('utf-8')
+    data_start = _align(16 + len(directory))
+    return directory, arrays, data_start, data_start + offset
+
+
+def _get_jcdc_header(directory: bytes) -> bytes:
+    return JCDC_MAGIC + np.uint32(JCDC_VERSION).tobytes() + np.uint64(len(directory)).tobytes()
+
+
+def write_jcdc_file(columns: Dict[str, np.ndarray], strings: List[str], jcdc_file_path: str) -> bool:
+    """写出.jcdc文件
+
+    文件布局：magic(4) + version(u4) + 目录长度(u8) + JSON目录，之后为按64字节对齐的原始数组，
+    目录中的 offset 相对于数组区起点
+    """
+    for name, array in columns.items():
+        columns[name] = np.ascontiguousarray(array)
+    directory, arrays, data_start, size = _get_jcdc_layout(columns, strings)
+
+    with open(jcdc_file_path, 'wb') as f:
+        f.write(_get_jcdc_header(directory))
+        f.write(directory)
+        for name, array in columns.items():
+            f.seek(data_start + arrays[name]['offset'])
+            f.write(array.data)
+        f.truncate(size)
+    return True
+
+
+def encode_columns(columns: Dict[str, np.ndarray], strings: List[str]) -> bytes:
+    """将列式数组编码为与.jcdc文件布局相同的字节串，用于缓存和进程间传输"""
+    columns = {name: np.ascontiguousarray(array) for name, array in columns.items()}
+    directory, arrays, data_start, size = _get_jcdc_layout(columns, strings)
+
+    buffer = bytearray(size)
+    header = _get_jcdc_header(directory)
+    buffer[:len(header)] = header
+    buffer[len(header):len(header) + len(directory)] = directory
+    for name, array in columns.items():
+        start = data_start + arrays[name]['offset']
+        buffer[start:start + array.nbytes] = array.tobytes()
+    return bytes(buffer)
+
+
+def decode_columns(buffer, offset: int = 0) -> Tuple[Dict[str, np.ndarray], List[str], int]:
+    """从缓冲区解码.jcdc布局的列式数组，数组为缓冲区的视图，不复制数据
+
+    Args:
+        buffer: bytes、memoryview 或内存映射数组
+        offset: 编码数据在缓冲区中的起点，需按64字节对齐以保证数组对齐
+
+    Returns:
+        (列名 -> 数组, 字符串表, 编码数据的字节数)
+    """
+    header = bytes(buffer[offset:offset + 16])
+    if header[:4] != JCDC_MAGIC:
+        raise ValueError("not a jcdc buffer")
+    version = int(np.frombuffer(header, dtype='<u4', count=1, offset=4)[0])
+    if version != JCDC_VERSION:
+        raise ValueError(f"unsupported jcdc version: {version}")
+    directory_size = int(np.frombuffer(header, dtype='<u8', count=1, offset=8)[0])
+    directory = json.loads(bytes(buffer[offset + 16:offset + 16 + directory_size]).decode('utf-8'))
+
+    data_start = offset + _align(16 + directory_size)
+    end = data_start
+    columns = {}
+    for name, info in directory['arrays'].items():
+        dtype = np.dtype(info['dtype'])
+        shape = tuple(info['shape'])
+        count = int(np.prod(shape))
+        columns[name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + info['offset']
+        ).reshape(shape)
+        end = max(end, data_start + _align(info['offset'] + count * dtype.itemsize))
+    return columns, directory['strings'], end - offset
+
+
+def read_jcdc_file(jcdc_file_path: str) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """内存映射读取.jcdc文件，所有数组均为只读的映射视图
+
+    Returns:
+        (列名 -> 数组, 字符串表)
+    """
+    with open(jcdc_file_path, 'rb') as f:
+        if f.read(4) != JCDC_MAGIC:
+            raise ValueError(f"not a jcdc file: {jcdc_file_path}")
+
+    buffer = np.memmap(jcdc_file_path, dtype=np.uint8, mode='r')
+    columns, strings, _ = decode_columns(buffer)
+    return columns, strings
+
+
+def write_npz_file(columns: Dict[str, np.ndarray], strings: List[str], npz_file_path: str) -> bool:
+    """写出.npz文件，字符串表以JSON编码存入 __strings__ 数组"""
+    strings_array = np.frombuffer(json.dumps(strings, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+    with open(npz_file_path, 'wb') as f:
+        np.savez(f, __strings__=strings_array, **columns)
+    return True
+
+
+def read_npz_file(npz_file_path: str) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """读取.npz文件
+
+    Returns:
+        (列名 -> 数组, 字符串表)
+    """
+    with np.load(npz_file_path) as npz:
+        columns = {name: npz[name] for name in npz.files}
+    strings = json.loads(columns.pop('__strings__').tobytes().decode('utf-8'))
+    return columns, strings
+
+
+def save_columnar_file(objects: List[JCDBaseData], save_file_path: str) -> Dict[str, int]:
+    """将实体列表保存为列式文件（按扩展名选择.jcdc或.npz）
+
+    Returns:
+        统计 {'entity_count', 'column_count', 'byte_count'}
+    """
+    columns, strings = entities_to_columns(objects)
+    byte_count = sum(array.nbytes for array in columns.values())
+
+    if os.path.splitext(save_file_path)[1].lower() == '.npz':
+        write_npz_file(columns, strings, save_file_path)
+    else:
+        write_jcdc_file(columns, strings, save_file_path)
+
+    return {
+        'entity_count': len(columns['type']),
+        'column_count': len(columns),
+        'byte_count': byte_count,
+    }
+
+
+def read_columnar_file(file_path: str) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """读取列式文件（按扩展名选择.jcdc或.npz）
+
+    Returns:
+        (列名 -> 数组, 字符串表)
+    """
+    if os.path.splitext(file_path)[1].lower() == '.npz':
+        return read_npz_file(file_path)
+    return read_jcdc_file(file_path)
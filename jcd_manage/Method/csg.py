@@ -0,0 +1,850 @@
+"""CSG求值模块
+
+将布尔曲面DAG的原始曲面三角化，并自底向上在三角网格上计算并集、交集和差集，
+每个节点的结果保存在 node.cached_result 中，被多个节点共享的子树只计算一次。
+
+默认后端（winding）在纯numpy中构建两个网格的交线排列：
+- 按位置合并顶点后，用包围盒网格找出候选三角形对，以带误差界的 orient3d 判断
+  一个网格的边是否穿过另一网格的三角形，交点以 (边, 三角形) 为键，被共享这条边的三角形共用
+- 判断结果不确定（顶点落在平面上、共面等退化情况）时，将 B 平移一个微小的确定偏移后重试
+- 被交线穿过的三角形在各自平面内沿交线切分：交点与交线段构成平面图，按半边遍历得到各个面，
+  再逐个耳切，切分只改变连接关系，不丢弃任何三角形，因此结果沿交线严格水密
+- 交线把每个网格分成若干片，每片只取一个代表三角形的重心计算关于另一网格的广义环绕数，
+  整片保留或丢弃
+操作数需为封闭网格；安装了open3d时可选用其张量网格布尔运算。
+"""
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDBoolSurface, JCDSurface, JCDQuadType, JCDFontSurface, JCDDiamond
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Method.lazy import lazy_import
+from jcd_manage.Method.mesh import (
+    create_empty_mesh, merge_meshes, create_surface_mesh, create_quad_type_mesh,
+    create_font_surface_mesh, create_diamond_mesh,
+)
+
+o3d = lazy_import('open3d')
+
+
+CSG_BACKENDS = ['winding', 'open3d']
+
+# 环绕数计算时每块 查询点数 x 三角形数 的上限，控制临时内存
+WINDING_CHUNK_SIZE = 1 << 18
+
+# orient3d 的静态误差界系数（Shewchuk），行列式绝对值超过 系数 x 积和式 时符号确定
+ORIENT3D_ERROR_BOUND = (7.0 + 56.0 * 2.0 ** -53) * 2.0 ** -53
+
+# 退化时 B 的平移量（相对于两个网格整体包围盒的对角线长度），依次尝试
+PERTURBATION_SCALES = (1e-9, 1e-7, 1e-5)
+
+# 顶点合并的量化步长，相对于包围盒对角线
+WELD_TOLERANCE = 1e-12
+
+# 包围盒网格中单个三角形最多覆盖的单元数，超过时与另一网格的全部三角形逐一比较
+MAX_BOX_CELLS = 64
+
+# 耳切时视为平角（不可作为耳尖）的夹角正弦
+FLAT_SINE = 1e-9
+
+
+def get_mesh_volume(vertices: np.ndarray, triangles: np.ndarray) -> float:
+    """封闭网格的有向体积，外法向时为正"""
+    if len(triangles) == 0:
+        return 0.0
+    v0, v1, v2 = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    return float(np.sum(np.einsum('ij,ij->i', v0, np.cross(v1, v2)))) / 6.0
+
+
+def compact_mesh(vertices: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """删除未被引用的顶点"""
+    if len(triangles) == 0:
+        return create_empty_mesh()
+    used, inverse = np.unique(triangles, return_inverse=True)
+    return vertices[used], inverse.reshape(-1, 3).astype(np.int64)
+
+
+def weld_mesh(vertices: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按包围盒对角线的 WELD_TOLERANCE 倍量化合并顶点，并删除有重复顶点的三角形
+
+    三角函数生成的极点等位置只在舍入误差内重合，不合并会留下面积接近0的三角形，
+    其上的方向判断无论怎样扰动都无法确定
+    """
+    if len(triangles) == 0:
+        return create_empty_mesh()
+    vertices = np.asarray(vertices, dtype=np.float64)
+    step = max(float(np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0))), 1.0) * WELD_TOLERANCE
+    _, index, inverse = np.unique(np.round(vertices / step).astype(np.int64), axis=0, return_index=True, return_inverse=True)
+    triangles = inverse.reshape(-1)[triangles]
+    valid = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 2] != triangles[:, 0])
+    return compact_mesh(vertices[index], triangles[valid])
+
+
+def tessellate_entity(entity) -> Tuple[np.ndarray, np.ndarray]:
+    """将原始曲面实体三角化，并统一为外法向
+
+    所有类型都先在实体自身的坐标系中生成网格，再经 entity.apply_transform 变换，
+    与 get_transformed_points、布尔曲面的包围盒和STEP导出使用同一坐标系
+    """
+    if isinstance(entity, JCDSurface):
+        mesh = create_surface_mesh(entity)
+    elif isinstance(entity, JCDQuadType):
+        mesh = create_quad_type_mesh(entity)
+    elif isinstance(entity, JCDFontSurface):
+        mesh = create_font_surface_mesh(entity, apply_matrix=False)
+    elif isinstance(entity, JCDDiamond):
+        mesh = create_diamond_mesh(entity)
+    else:
+        return create_empty_mesh()
+
+    vertices, triangles = mesh
+    if len(triangles) == 0:
+        return create_empty_mesh()
+    vertices = np.asarray(entity.apply_transform(np.asarray(vertices, dtype=np.float64)), dtype=np.float64)
+    if get_mesh_volume(vertices, triangles) < 0.0:
+        triangles = triangles[:, ::-1]
+    return vertices, np.ascontiguousarray(triangles, dtype=np.int64)
+
+
+def get_winding_numbers(points: np.ndarray, vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """计算点关于三角网格的广义环绕数
+
+    每个三角形贡献其相对查询点的立体角（Van Oosterom-Strackee 公式），总和除以 4π；
+    封闭外法向网格内部为1，外部为0，对开口和自交不敏感。
+
+    Args:
+        points: 查询点 (n, 3)
+        vertices / triangles: 网格
+
+    Returns:
+        环绕数 (n,)
+    """
+    winding_numbers = np.zeros(len(points), dtype=np.float64)
+    if len(points) == 0 or len(triangles) == 0:
+        return winding_numbers
+
+    # 包围盒之外的点环绕数接近0，可跳过（开口网格除外，但开口对远处点的贡献很小）
+    bbox_min, bbox_max = vertices.min(axis=0), vertices.max(axis=0)
+    candidate = np.all((points >= bbox_min) & (points <= bbox_max), axis=1)
+    query_indices = np.nonzero(candidate)[0]
+
+    corners = vertices[triangles]  # (m, 3, 3)
+    chunk_size = max(1, WINDING_CHUNK_SIZE // len(triangles))
+    for start in range(0, len(query_indices), chunk_size):
+        indices = query_indices[start:start + chunk_size]
+        relative = corners[None, :, :, :] - points[indices, None, None, :]  # (k, m, 3, 3)
+        a, b, c = relative[:, :, 0], relative[:, :, 1], relative[:, :, 2]
+        la, lb, lc = np.linalg.norm(a, axis=2), np.linalg.norm(b, axis=2), np.linalg.norm(c, axis=2)
+        numerator = np.einsum('kmi,kmi->km', a, np.cross(b, c))
+        denominator = (
+            la * lb * lc
+            + np.einsum('kmi,kmi->km', a, b) * lc
+            + np.einsum('kmi,kmi->km', b, c) * la
+            + np.einsum('kmi,kmi->km', c, a) * lb
+        )
+        winding_numbers[indices] = np.arctan2(numerator, denominator).sum(axis=1) / (2.0 * np.pi)
+    return winding_numbers
+
+
+def orient3d(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """批量计算 d 相对于平面 abc 的方向
+
+    Returns:
+        (行列式 (n,), 符号 (n,))：符号为 ±1 时确定正确，为 0 时结果不确定（含恰好共面）
+    """
+    ad, bd, cd = a - d, b - d, c - d
+    bc = bd[:, 1] * cd[:, 2] - bd[:, 2] * cd[:, 1]
+    ca = cd[:, 1] * ad[:, 2] - cd[:, 2] * ad[:, 1]
+    ab = ad[:, 1] * bd[:, 2] - ad[:, 2] * bd[:, 1]
+    det = ad[:, 0] * bc + bd[:, 0] * ca + cd[:, 0] * ab
+
+    permanent = (
+        (np.abs(bd[:, 1] * cd[:, 2]) + np.abs(bd[:, 2] * cd[:, 1])) * np.abs(ad[:, 0])
+        + (np.abs(cd[:, 1] * ad[:, 2]) + np.abs(cd[:, 2] * ad[:, 1])) * np.abs(bd[:, 0])
+        + (np.abs(ad[:, 1] * bd[:, 2]) + np.abs(ad[:, 2] * bd[:, 1])) * np.abs(cd[:, 0])
+    )
+    bound = ORIENT3D_ERROR_BOUND * permanent
+    sign = np.where(det > bound, 1, np.where(det < -bound, -1, 0)).astype(np.int8)
+    return det, sign
+
+
+def get_box_pairs(boxes_a: np.ndarray, boxes_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """找出包围盒相交的 (a, b) 对
+
+    B 的包围盒放入均匀网格，A 的包围盒只与所在单元中的 B 比较；覆盖单元过多的大三角形单独与全部 B 比较。
+
+    Args:
+        boxes_a / boxes_b: 包围盒 (n, 2, 3)
+
+    Returns:
+        (a 的索引, b 的索引)
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return empty, empty
+
+    extents = np.concatenate([boxes_a[:, 1] - boxes_a[:, 0], boxes_b[:, 1] - boxes_b[:, 0]])
+    cell_size = max(float(np.median(extents.max(axis=1))), 1e-12)
+    origin = np.minimum(boxes_a[:, 0].min(axis=0), boxes_b[:, 0].min(axis=0))
+
+    def get_cells(boxes):
+        low = np.floor((boxes[:, 0] - origin) / cell_size).astype(np.int64)
+        high = np.floor((boxes[:, 1] - origin) / cell_size).astype(np.int64)
+        return low, high, np.prod(high - low + 1, axis=1)
+
+    def expand(low, high, counts, indices):
+        # 每个包围盒展开为其覆盖的所有单元
+        ids = np.repeat(indices, counts[indices])
+        offsets = np.arange(len(ids)) - np.repeat(np.cumsum(counts[indices]) - counts[indices], counts[indices])
+        size = (high - low + 1)[ids]
+        cells = low[ids] + np.stack([
+            offsets % size[:, 0], (offsets // size[:, 0]) % size[:, 1], offsets // (size[:, 0] * size[:, 1]),
+        ], axis=1)
+        keys = (cells[:, 0] * 2097152 + cells[:, 1]) * 2097152 + cells[:, 2]
+        return keys, ids
+
+    low_a, high_a, counts_a = get_cells(boxes_a)
+    low_b, high_b, counts_b = get_cells(boxes_b)
+    large_a = counts_a > MAX_BOX_CELLS
+    large_b = counts_b > MAX_BOX_CELLS
+
+    pair_list = []
+    keys_a, ids_a = expand(low_a, high_a, counts_a, np.nonzero(~large_a)[0])
+    keys_b, ids_b = expand(low_b, high_b, counts_b, np.nonzero(~large_b)[0])
+    order = np.argsort(keys_b, kind='stable')
+    keys_b, ids_b = keys_b[order], ids_b[order]
+    lo = np.searchsorted(keys_b, keys_a, 'left')
+    counts = np.searchsorted(keys_b, keys_a, 'right') - lo
+    starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+    pair_list.append((np.repeat(ids_a, counts), ids_b[np.arange(counts.sum()) + starts]))
+
+    # 大三角形与全部三角形比较
+    for large, boxes, other_boxes, swap in [(large_a, boxes_a, boxes_b, False), (large_b, boxes_b, boxes_a, True)]:
+        for index in np.nonzero(large)[0].tolist():
+            others = np.nonzero(np.all(
+                (other_boxes[:, 0] <= boxes[index, 1]) & (other_boxes[:, 1] >= boxes[index, 0]), axis=1,
+            ))[0]
+            ids = np.full(len(others), index, dtype=np.int64)
+            pair_list.append((others, ids) if swap else (ids, others))
+
+    a = np.concatenate([pair[0] for pair in pair_list]).astype(np.int64)
+    b = np.concatenate([pair[1] for pair in pair_list]).astype(np.int64)
+    keys = np.unique(a * len(boxes_b) + b)
+    a, b = keys // len(boxes_b), keys % len(boxes_b)
+    overlap = np.all((boxes_a[a, 0] <= boxes_b[b, 1]) & (boxes_a[a, 1] >= boxes_b[b, 0]), axis=1)
+    return a[overlap], b[overlap]
+
+
+def _get_triangle_boxes(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    corners = vertices[triangles]
+    return np.stack([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+
+def _intersect_meshes(
+    vertices: np.ndarray,
+    triangles: np.ndarray,
+    edges: np.ndarray,
+    triangle_edges: np.ndarray,
+    count_a: int,
+    strict: bool,
+) -> Optional[Dict[str, np.ndarray]]:
+    """计算合并网格中 A（前 count_a 个三角形）与 B 的交点和交线段
+
+    Args:
+        vertices / triangles: 合并后的网格，A 与 B 不共用顶点
+        edges: 所有边 (e, 2)，顶点按编号升序
+        triangle_edges: 每个三角形三条边 (v0v1, v1v2, v2v0) 的边编号 (t, 3)
+        count_a: A 的三角形数
+        strict: 为 True 时遇到不确定的判断返回 None，否则将其视为不相交
+
+    Returns:
+        {'points', 'point_edges', 'point_params', 'segments', 'segment_triangles'} 或 None
+    """
+    triangle_count = len(triangles)
+    boxes = _get_triangle_boxes(vertices, triangles)
+    pair_a, pair_b = get_box_pairs(boxes[:count_a], boxes[count_a:])
+    pair_b = pair_b + count_a
+
+    # 候选的 (边, 三角形)：A 三角形的边对 B 三角形，以及 B 三角形的边对 A 三角形
+    test_keys = np.unique(np.concatenate([
+        triangle_edges[pair_a].reshape(-1) * triangle_count + np.repeat(pair_b, 3),
+        triangle_edges[pair_b].reshape(-1) * triangle_count + np.repeat(pair_a, 3),
+    ]))
+    test_edges, test_triangles = test_keys // triangle_count, test_keys % triangle_count
+
+    p, q = vertices[edges[test_edges, 0]], vertices[edges[test_edges, 1]]
+    corners = vertices[triangles[test_triangles]]
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    det_p, sign_p = orient3d(a, b, c, p)
+    det_q, sign_q = orient3d(a, b, c, q)
+
+    # 端点确定位于平面两侧时，再判断边是否从三角形内部穿过
+    straddle = sign_p * sign_q < 0
+    degenerate = (sign_p == 0) | (sign_q == 0)
+    signs = np.zeros((len(test_keys), 3), dtype=np.int8)
+    index = np.nonzero(straddle)[0]
+    for j, (u, v) in enumerate([(a, b), (b, c), (c, a)]):
+        signs[index, j] = orient3d(p[index], q[index], u[index], v[index])[1]
+    has_positive = np.any(signs > 0, axis=1)
+    has_negative = np.any(signs < 0, axis=1)
+    crossing = straddle & np.all(signs != 0, axis=1) & (has_positive != has_negative)
+    degenerate |= straddle & np.any(signs == 0, axis=1) & ~(has_positive & has_negative)
+    if strict and np.any(degenerate):
+        return None
+
+    index = np.nonzero(crossing)[0]
+    params = det_p[index] / (det_p[index] - det_q[index])
+    point_keys = test_keys[index]
+    points = p[index] + params[:, None] * (q[index] - p[index])
+
+    # 每个三角形对的交线段连接其两个交点
+    pair_keys = np.concatenate([
+        triangle_edges[pair_a] * triangle_count + pair_b[:, None],
+        triangle_edges[pair_b] * triangle_count + pair_a[:, None],
+    ], axis=1)
+    positions = np.minimum(np.searchsorted(point_keys, pair_keys), max(len(point_keys) - 1, 0))
+    found = (point_keys[positions] == pair_keys) if len(point_keys) > 0 else np.zeros(pair_keys.shape, dtype=bool)
+    found_counts = found.sum(axis=1)
+    if strict and np.any((found_counts != 0) & (found_counts != 2)):
+        return None
+
+    valid = found_counts == 2
+    order = np.argsort(~found[valid], axis=1, kind='stable')[:, :2]
+    segments = np.take_along_axis(positions[valid], order, axis=1)
+
+    return {
+        'points': points,
+        'point_edges': test_edges[index],
+        'point_params': params,
+        'segments': segments,
+        'segment_triangles': np.stack([pair_a[valid], pair_b[valid]], axis=1),
+    }
+
+
+def _cross_2d(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _segments_cross(p1: np.ndarray, p2: np.ndarray, q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
+    """线段 p1p2 与多条线段 q1q2 是否严格相交"""
+    d1 = _cross_2d(p2 - p1, q1 - p1)
+    d2 = _cross_2d(p2 - p1, q2 - p1)
+    d3 = _cross_2d(q2 - q1, p1 - q1)
+    d4 = _cross_2d(q2 - q1, p2 - q1)
+    return (d1 * d2 < 0) & (d3 * d4 < 0)
+
+
+def _clip_polygon(coords: np.ndarray, polygon: List[int]) -> List[Tuple[int, int, int]]:
+    """对逆时针多边形耳切，可包含重复顶点（洞的桥接边）
+
+    每次切除夹角最接近直角且内部没有其他顶点的耳朵，平角顶点不作为耳尖；
+    找不到合法耳朵时切除最凸的顶点。无论几何如何，输出三角形的边界之和都等于多边形边界，
+    因此相邻多边形之间不会出现缝隙
+    """
+    polygon = list(polygon)
+    triangles = []
+    while len(polygon) > 3:
+        ids = np.asarray(polygon)
+        points = coords[ids]
+        prev_points, next_points = np.roll(points, 1, axis=0), np.roll(points, -1, axis=0)
+        e1, e2 = points - prev_points, next_points - points
+        lengths = np.linalg.norm(e1, axis=1) * np.linalg.norm(e2, axis=1)
+        sines = _cross_2d(e1, e2) / np.maximum(lengths, 1e-300)
+
+        ear = None
+        for i in np.argsort(-sines, kind='stable').tolist():
+            if sines[i] <= FLAT_SINE:
+                break
+            a, b, c = prev_points[i], points[i], next_points[i]
+            others = (ids != ids[i - 1]) & (ids != ids[i]) & (ids != ids[(i + 1) % len(ids)])
+            tolerance = 1e-12 * lengths[i]
+            inside = (
+                (_cross_2d(b - a, points[others] - a) >= -tolerance)
+                & (_cross_2d(c - b, points[others] - b) >= -tolerance)
+                & (_cross_2d(a - c, points[others] - c) >= -tolerance)
+            )
+            if not np.any(inside):
+                ear = i
+                break
+        if ear is None:
+            ear = int(np.argmax(sines))
+
+        triangles.append((polygon[ear - 1], polygon[ear], polygon[(ear + 1) % len(polygon)]))
+        del polygon[ear]
+    triangles.append(tuple(polygon))
+    return triangles
+
+
+def _find_bridge(
+    coords: np.ndarray,
+    neighbors: List[set],
+    component: set,
+    connected: set,
+) -> Optional[Tuple[int, int]]:
+    """找一条从 component 到 connected、不穿过任何已有边的最短桥接边"""
+    edge_list = np.asarray([(i, j) for i in range(len(neighbors)) for j in neighbors[i] if i < j], dtype=np.int64)
+    targets = np.asarray(sorted(connected), dtype=np.int64)
+    for h in sorted(component):
+        distances = np.linalg.norm(coords[targets] - coords[h], axis=1)
+        for o in targets[np.argsort(distances, kind='stable')].tolist():
+            others = ~np.isin(edge_list, [h, o]).any(axis=1)
+            if not np.any(_segments_cross(
+                coords[h], coords[o], coords[edge_list[others, 0]], coords[edge_list[others, 1]],
+            )):
+                return h, o
+    return None
+
+
+def _get_component(neighbors: List[set], start: int) -> set:
+    component, stack = {start}, [start]
+    while stack:
+        for j in neighbors[stack.pop()]:
+            if j not in component:
+                component.add(j)
+                stack.append(j)
+    return component
+
+
+def split_triangle(
+    vertices: np.ndarray,
+    corners: np.ndarray,
+    boundary: List[int],
+    segments: List[Tuple[int, int]],
+) -> List[Tuple[int, int, int]]:
+    """沿交线段切分一个三角形
+
+    Args:
+        vertices: 全部顶点（含交点）
+        corners: 三角形的3个顶点
+        boundary: 三角形边界上的全部顶点（角点和边上的交点），按三角形的朝向排列，以 corners[0] 开头
+        segments: 三角形内部的交线段
+
+    Returns:
+        与原三角形朝向一致的三角形列表（全局顶点编号）
+    """
+    ids = list(dict.fromkeys(list(boundary) + [i for segment in segments for i in segment]))
+    local = {vertex_id: i for i, vertex_id in enumerate(ids)}
+
+    # 在三角形平面内建立坐标系，原三角形在其中为逆时针
+    a, b, c = vertices[corners[0]], vertices[corners[1]], vertices[corners[2]]
+    u = (b - a) / np.linalg.norm(b - a)
+    v = np.cross(np.cross(b - a, c - a), u)
+    v /= max(np.linalg.norm(v), 1e-300)
+    coords = (vertices[ids] - a) @ np.stack([u, v], axis=1)
+
+    ring = [local[vertex_id] for vertex_id in boundary]
+    neighbors = [set() for _ in ids]
+    for i, j in list(zip(ring, ring[1:] + ring[:1])) + [(local[i], local[j]) for i, j in segments]:
+        if i != j:
+            neighbors[i].add(j)
+            neighbors[j].add(i)
+
+    # 去掉悬挂的交线段（操作数开口时出现）
+    ring_set = set(ring)
+    stack = [i for i in range(len(ids)) if i not in ring_set and len(neighbors[i]) == 1]
+    while stack:
+        i = stack.pop()
+        for j in list(neighbors[i]):
+            neighbors[j].discard(i)
+            if j not in ring_set and len(neighbors[j]) == 1:
+                stack.append(j)
+        neighbors[i].clear()
+
+    # 与边界不连通的交线环通过一条不穿过其他边的桥接边连到已连通的部分，使每个面都没有洞；
+    # 嵌套的环在外层环连通后才能找到桥接边
+    connected = _get_component(neighbors, ring[0])
+    components = []
+    for i in range(len(ids)):
+        if len(neighbors[i]) > 0 and i not in connected and not any(i in component for component in components):
+            components.append(_get_component(neighbors, i))
+    while components:
+        for component in list(components):
+            bridge = _find_bridge(coords, neighbors, component, connected)
+            if bridge is not None:
+                break
+        else:
+            component = components[0]
+            h = min(component)
+            targets = np.asarray(sorted(connected))
+            bridge = (h, int(targets[np.argmin(np.linalg.norm(coords[targets] - coords[h], axis=1))]))
+        neighbors[bridge[0]].add(bridge[1])
+        neighbors[bridge[1]].add(bridge[0])
+        connected |= component
+        components.remove(component)
+
+    # 邻点按逆时针排序；边界顶点的内部邻点限制在两侧边界邻点的夹角之内，数值误差不会使其落到三角形外
+    order = []
+    ring_next = {ring[k]: ring[(k + 1) % len(ring)] for k in range(len(ring))}
+    ring_prev = {ring[k]: ring[k - 1] for k in range(len(ring))}
+    for i in range(len(ids)):
+        others = list(neighbors[i])
+        if len(others) == 0:
+            order.append([])
+            continue
+        directions = coords[others] - coords[i]
+        if i in ring_set:
+            base = coords[ring_next[i]] - coords[i]
+            prev_direction = coords[ring_prev[i]] - coords[i]
+            wedge = float(np.mod(np.arctan2(_cross_2d(base, prev_direction), prev_direction @ base), 2.0 * np.pi))
+            if wedge <= 0.0:
+                wedge = np.pi
+            angles = np.mod(np.arctan2(_cross_2d(base, directions), directions @ base), 2.0 * np.pi)
+            angles = np.where(
+                angles > (wedge + 2.0 * np.pi) / 2.0, wedge * 1e-6, np.clip(angles, wedge * 1e-6, wedge * (1.0 - 1e-6)),
+            )
+            angles[others.index(ring_next[i])] = 0.0
+            angles[others.index(ring_prev[i])] = wedge
+        else:
+            angles = np.arctan2(directions[:, 1], directions[:, 0])
+        order.append([others[k] for k in np.argsort(angles, kind='stable').tolist()])
+    positions = [{j: k for k, j in enumerate(items)} for items in order]
+
+    def get_cycle(i: int, j: int) -> List[int]:
+        # 沿半边遍历，面位于半边左侧
+        cycle = []
+        while (i, j) not in visited:
+            visited.add((i, j))
+            cycle.append(i)
+            items = order[j]
+            i, j = j, items[(positions[j][i] - 1) % len(items)]
+        return cycle
+
+    # 外边界沿边界反向行进，不生成三角形
+    visited = set()
+    get_cycle(ring[1], ring[0])
+    triangles = []
+    for i in range(len(ids)):
+        for j in order[i]:
+            if (i, j) not in visited:
+                cycle = get_cycle(i, j)
+                if len(cycle) >= 3:
+                    triangles += _clip_polygon(coords, cycle)
+
+    return [(ids[i], ids[j], ids[k]) for i, j, k in triangles]
+
+
+def _label_components(count: int, pairs: np.ndarray) -> np.ndarray:
+    """按相连关系标记连通分量，每个分量的标号为其中的最小编号"""
+    labels = np.arange(count, dtype=np.int64)
+    if len(pairs) == 0:
+        return labels
+    while True:
+        smallest = np.minimum(labels[pairs[:, 0]], labels[pairs[:, 1]])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, pairs[:, 0], smallest)
+        np.minimum.at(new_labels, pairs[:, 1], smallest)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+def _get_patch_labels(triangles: np.ndarray, constraints: np.ndarray) -> np.ndarray:
+    """交线把网格分成若干片，同一片中的三角形通过不在交线上的边相连"""
+    edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    owners = np.repeat(np.arange(len(triangles)), 3)
+    vertex_count = int(max(triangles.max(initial=0), constraints.max(initial=0))) + 1
+    keys = edges[:, 0] * vertex_count + edges[:, 1]
+    if len(constraints) > 0:
+        constraints = np.sort(constraints, axis=1)
+        keep = ~np.isin(keys, constraints[:, 0] * vertex_count + constraints[:, 1])
+        keys, owners = keys[keep], owners[keep]
+
+    order = np.argsort(keys, kind='stable')
+    keys, owners = keys[order], owners[order]
+    shared = np.nonzero(keys[1:] == keys[:-1])[0]
+    return _label_components(len(triangles), np.stack([owners[shared], owners[shared + 1]], axis=1))
+
+
+def _split_meshes(
+    vertices: np.ndarray,
+    triangles: np.ndarray,
+    edges: np.ndarray,
+    triangle_edges: np.ndarray,
+    arrangement: Dict[str, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """沿交线切分被穿过的三角形
+
+    Returns:
+        (全部顶点（原顶点之后为交点）, 切分后的三角形, 每个三角形来自的原三角形)
+    """
+    vertex_count = len(vertices)
+    all_vertices = np.concatenate([vertices, arrangement['points']], axis=0)
+
+    # 每条边上的交点按参数排序
+    edge_points: Dict[int, List[int]] = {}
+    order = np.lexsort((arrangement['point_params'], arrangement['point_edges']))
+    for point_id, edge_id in zip(order.tolist(), arrangement['point_edges'][order].tolist()):
+        edge_points.setdefault(edge_id, []).append(point_id + vertex_count)
+
+    triangle_segments: Dict[int, List[Tuple[int, int]]] = {}
+    for segment, owners in zip((arrangement['segments'] + vertex_count).tolist(), arrangement['segment_triangles'].tolist()):
+        for owner in owners:
+            triangle_segments.setdefault(owner, []).append(tuple(segment))
+
+    affected = np.zeros(len(triangles), dtype=bool)
+    affected[list(triangle_segments)] = True
+    if len(edge_points) > 0:
+        affected |= np.isin(triangle_edges, list(edge_points)).any(axis=1)
+
+    new_triangles = [triangles[~affected]]
+    sources = [np.nonzero(~affected)[0]]
+    for triangle_id in np.nonzero(affected)[0].tolist():
+        boundary = []
+        for j in range(3):
+            start = int(triangles[triangle_id, j])
+            boundary.append(start)
+            points = edge_points.get(int(triangle_edges[triangle_id, j]), [])
+            # 边的顶点按编号升序存放，三角形沿反方向经过这条边时交点逆序
+            boundary += points if start == edges[triangle_edges[triangle_id, j], 0] else points[::-1]
+        split = split_triangle(all_vertices, triangles[triangle_id], boundary, triangle_segments.get(triangle_id, []))
+        new_triangles.append(np.asarray(split, dtype=np.int64).reshape(-1, 3))
+        sources.append(np.full(len(split), triangle_id, dtype=np.int64))
+
+    return all_vertices, np.concatenate(new_triangles, axis=0), np.concatenate(sources)
+
+
+def classify_patches(
+    vertices: np.ndarray,
+    triangles: np.ndarray,
+    constraints: np.ndarray,
+    other_vertices: np.ndarray,
+    other_triangles: np.ndarray,
+) -> np.ndarray:
+    """判断网格的每个三角形是否位于另一网格内部
+
+    同一片中的三角形内外一致，每片只对面积最大的三角形的重心计算一次环绕数，
+    重心在另一网格包围盒之外的片直接判为外部
+
+    Args:
+        vertices / triangles: 沿交线切分后的网格
+        constraints: 交线段 (s, 2)
+        other_vertices / other_triangles: 另一网格
+
+    Returns:
+        每个三角形是否在内部 (t,)
+    """
+    if len(triangles) == 0 or len(other_triangles) == 0:
+        return np.zeros(len(triangles), dtype=bool)
+
+    labels = _get_patch_labels(triangles, constraints)
+    corners = vertices[triangles]
+    areas = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+    patch_ids, inverse = np.unique(labels, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # 每片中面积最大的三角形：先按面积降序排序，再取每片第一次出现的位置
+    order = np.lexsort((-areas, inverse))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = inverse[order][1:] != inverse[order][:-1]
+    representatives = order[first]
+
+    # 重心在另一网格包围盒外的片一定在外部，不计算环绕数
+    centroids = corners[representatives].mean(axis=1)
+    other_points = other_vertices[np.unique(other_triangles)]
+    candidates = np.all((centroids >= other_points.min(axis=0)) & (centroids <= other_points.max(axis=0)), axis=1)
+    inside = np.zeros(len(centroids), dtype=bool)
+    if np.any(candidates):
+        inside[candidates] = np.abs(get_winding_numbers(centroids[candidates], other_vertices, other_triangles)) > 0.5
+    return inside[inverse]
+
+
+def _get_perturbation(attempt: int, scale: float) -> np.ndarray:
+    # 确定的无理方向，保证多进程下结果一致
+    direction = np.array([np.sqrt(2.0) - 1.0, np.sqrt(3.0) - 1.5, np.sqrt(5.0) - 2.0]) * (1.0 + 0.1 * attempt)
+    direction /= np.linalg.norm(direction)
+    return direction * PERTURBATION_SCALES[attempt] * scale
+
+
+def boolean_mesh_winding(
+    mesh_a: Tuple[np.ndarray, np.ndarray],
+    mesh_b: Tuple[np.ndarray, np.ndarray],
+    op: DAGBoolType,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """沿交线切分后按片分类的网格布尔运算，封闭的操作数得到封闭的结果
+
+    并集保留 A 在 B 外和 B 在 A 外的部分；交集保留互在内部的部分；
+    差集保留 A 在 B 外的部分和翻转朝向后 B 在 A 内的部分。
+    """
+    if op not in (DAGBoolType.UNION, DAGBoolType.INTERSECT, DAGBoolType.DIFFERENCE):
+        raise ValueError(f"unsupported boolean operation: {op}")
+
+    vertices_a, triangles_a = weld_mesh(*mesh_a)
+    vertices_b, triangles_b = weld_mesh(*mesh_b)
+    count_a = len(triangles_a)
+    triangles = np.concatenate([triangles_a, triangles_b + len(vertices_a)], axis=0)
+    all_edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    edges, triangle_edges = np.unique(all_edges, axis=0, return_inverse=True)
+    triangle_edges = triangle_edges.reshape(-1, 3)
+
+    # 判断不确定时平移 B 后重试，最后一次将不确定的情况视为不相交
+    bounds = np.concatenate([vertices_a, vertices_b], axis=0)
+    scale = float(np.linalg.norm(bounds.max(axis=0) - bounds.min(axis=0)))
+    offset = np.zeros(3)
+    for attempt in range(len(PERTURBATION_SCALES) + 1):
+        vertices = np.concatenate([vertices_a, vertices_b + offset], axis=0)
+        arrangement = _intersect_meshes(
+            vertices, triangles, edges, triangle_edges, count_a, strict=attempt < len(PERTURBATION_SCALES),
+        )
+        if arrangement is not None:
+            break
+        offset = _get_perturbation(attempt, scale)
+
+    all_vertices, split_triangles, sources = _split_meshes(vertices, triangles, edges, triangle_edges, arrangement)
+    constraints = arrangement['segments'] + len(vertices)
+    from_a = sources < count_a
+    inside_a = classify_patches(all_vertices, split_triangles[from_a], constraints, vertices, triangles[count_a:])
+    inside_b = classify_patches(all_vertices, split_triangles[~from_a], constraints, vertices, triangles[:count_a])
+    parts_a, parts_b = split_triangles[from_a], split_triangles[~from_a]
+
+    if op == DAGBoolType.UNION:
+        result = [parts_a[~inside_a], parts_b[~inside_b]]
+    elif op == DAGBoolType.INTERSECT:
+        result = [parts_a[inside_a], parts_b[inside_b]]
+    else:
+        result = [parts_a[~inside_a], parts_b[inside_b][:, ::-1]]
+
+    # B 的原顶点恢复到平移前的位置，交点保持不变
+    all_vertices[len(vertices_a):len(vertices)] -= offset
+    return compact_mesh(all_vertices, np.concatenate(result, axis=0))
+
+
+def boolean_mesh_open3d(
+    mesh_a: Tuple[np.ndarray, np.ndarray],
+    mesh_b: Tuple[np.ndarray, np.ndarray],
+    op: DAGBoolType,
+    tolerance: float = 1e-6,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """使用open3d张量网格的布尔运算，要求两个操作数都是封闭流形"""
+    def to_tensor_mesh(mesh):
+        tensor_mesh = o3d.t.geometry.TriangleMesh()
+        tensor_mesh.vertex.positions = o3d.core.Tensor(np.asarray(mesh[0], dtype=np.float32))
+        tensor_mesh.triangle.indices = o3d.core.Tensor(np.asarray(mesh[1], dtype=np.int32))
+        return tensor_mesh
+
+    tensor_a, tensor_b = to_tensor_mesh(mesh_a), to_tensor_mesh(mesh_b)
+    if op == DAGBoolType.UNION:
+        result = tensor_a.boolean_union(tensor_b, tolerance)
+    elif op == DAGBoolType.INTERSECT:
+        result = tensor_a.boolean_intersection(tensor_b, tolerance)
+    elif op == DAGBoolType.DIFFERENCE:
+        result = tensor_a.boolean_difference(tensor_b, tolerance)
+    else:
+        raise ValueError(f"unsupported boolean operation: {op}")
+
+    return (
+        result.vertex.positions.numpy().astype(np.float64),
+        result.triangle.indices.numpy().astype(np.int64),
+    )
+
+
+def boolean_mesh(
+    mesh_a: Tuple[np.ndarray, np.ndarray],
+    mesh_b: Tuple[np.ndarray, np.ndarray],
+    op: DAGBoolType,
+    backend: str = 'winding',
+) -> Tuple[np.ndarray, np.ndarray]:
+    """两个网格的布尔运算
+
+    Args:
+        mesh_a / mesh_b: (vertices, triangles)
+        op: 布尔操作
+        backend: 'winding'（纯numpy）或 'open3d'
+
+    Returns:
+        (vertices, triangles)
+    """
+    # 空操作数的结果可直接得到
+    if len(mesh_b[1]) == 0:
+        return create_empty_mesh() if op == DAGBoolType.INTERSECT else mesh_a
+    if len(mesh_a[1]) == 0:
+        return mesh_b if op == DAGBoolType.UNION else create_empty_mesh()
+
+    if backend == 'open3d':
+        return boolean_mesh_open3d(mesh_a, mesh_b, op)
+    if backend == 'winding':
+        return boolean_mesh_winding(mesh_a, mesh_b, op)
+    raise ValueError(f"unsupported csg backend: {backend}")
+
+
+def compute_node_mesh(
+    node,
+    child_meshes: List[Tuple[np.ndarray, np.ndarray]],
+    backend: str = 'winding',
+) -> Tuple[np.ndarray, np.ndarray]:
+    """由子节点网格计算单个节点的网格
+
+    Args:
+        node: DAG节点
+        child_meshes: 与 node.children 对应的子节点网格
+        backend: 布尔运算后端
+
+    Returns:
+        (vertices, triangles)
+    """
+    if isinstance(node, PrimitiveSurface):
+        return tessellate_entity(node.surface_data)
+    if isinstance(node, SurfaceGroup):
+        # 分组内的曲面共同构成一个实体，直接合并
+        return merge_meshes(child_meshes)
+    if isinstance(node, BooleanOp):
+        return boolean_mesh(child_meshes[0], child_meshes[1], node.op, backend)
+    return create_empty_mesh()
+
+
+def evaluate_node(
+    dag: CSGDAG,
+    node_id: int,
+    backend: str = 'winding',
+) -> Tuple[np.ndarray, np.ndarray]:
+    """自底向上计算DAG节点的网格，结果保存在各节点的 cached_result 中
+
+    未标记为 dirty 的节点直接复用 cached_result，因此共享子树只计算一次；
+    修改原始曲面后调用 CSGDAG.mark_dirty 使其祖先失效，再次计算时只重算失效的路径。
+
+    Args:
+        dag: CSG DAG
+        node_id: 要计算的节点
+        backend: 布尔运算后端，见 boolean_mesh
+
+    Returns:
+        (vertices, triangles)
+    """
+    # 迭代后序遍历只访问需要重算的节点，避免深层嵌套的布尔链超出递归深度
+    for current_id in dag.iter_postorder(node_id, expand=lambda node: node.dirty or node.cached_result is None):
+        node = dag.get(current_id)
+        child_meshes = [dag.get(child_id).cached_result for child_id in node.children]
+        node.cached_result = compute_node_mesh(node, child_meshes, backend)
+        node.dirty = False
+
+    return dag.get(node_id).cached_result
+
+
+def evaluate_bool_surface(
+    bool_surface: JCDBoolSurface,
+    backend: str = 'winding',
+) -> Tuple[np.ndarray, np.ndarray]:
+    """计算布尔曲面的结果网格
+
+    Args:
+        bool_surface: 布尔曲面
+        backend: 布尔运算后端
+
+    Returns:
+        (vertices, triangles)，DAG为空时返回空网格
+    """
+    if bool_surface.root_node_id is None:
+        return create_empty_mesh()
+    return evaluate_node(bool_surface.dag, bool_surface.root_node_id, backend)
+
+
+def clear_cached_results(dag: CSGDAG, node_ids: Optional[List[int]] = None):
+    """清除节点的计算结果，默认清除全部节点；指定节点时其祖先一并失效"""
+    if node_ids is None:
+        for node in dag.nodes.values():
+            node.cached_result = None
+            node.dirty = True
+        return
+    for node_id in node_ids:
+        dag.mark_dirty(node_id)
@@ -0,0 +1,338 @@
+"""CSG DAG优化模块
+
+加载器把每个布尔分组从左到右折叠成一条线性链，深度为 O(n)，求值时只能依次计算 n 次布尔运算。
+本模块在不改变结果几何的前提下重建布尔曲面的DAG：
+
+1. 为每个节点计算保守的包围盒：并集取外包，交集取重叠部分，差集取左操作数；
+2. 删除包围盒证明不会相互作用的操作数：与被减体不相交的减体、不相交的交集（结果为空），
+   互不相交的并集操作数改为直接合并的曲面组，无需布尔运算；
+   被减体为曲面组时，每个成员只减去与其相交的减体；
+3. 将结合的并集/交集链以及差集链 ((A - B) - C) = A - (B ∪ C) 重建为平衡树，
+   使深度降为 O(log n)，相互独立的子树可以并行计算。
+
+空结果用不含成员的 SurfaceGroup 表示，其网格为空网格；JCD格式无法表示空布尔曲面，
+因此原地优化遇到空结果时保持原DAG不变。
+"""
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Method.csg import tessellate_entity
+
+
+# 包围盒为 (min_point, max_point)，None 表示空集
+BoundingBox = Optional[Tuple[np.ndarray, np.ndarray]]
+
+ASSOCIATIVE_OPS = [DAGBoolType.UNION, DAGBoolType.INTERSECT]
+
+
+def get_mesh_bounding_box(mesh: Tuple[np.ndarray, np.ndarray]) -> BoundingBox:
+    """三角网格被引用顶点的包围盒，空网格返回 None"""
+    vertices, triangles = mesh
+    if len(triangles) == 0:
+        return None
+    used_vertices = np.asarray(vertices)[np.unique(triangles)]
+    return used_vertices.min(axis=0), used_vertices.max(axis=0)
+
+
+def merge_bounding_boxes(bboxes: List[BoundingBox]) -> BoundingBox:
+    """包围盒的外包"""
+    bboxes = [bbox for bbox in bboxes if bbox is not None]
+    if len(bboxes) == 0:
+        return None
+    return (
+        np.min([bbox[0] for bbox in bboxes], axis=0),
+        np.max([bbox[1] for bbox in bboxes], axis=0),
+    )
+
+
+def intersect_bounding_boxes(bboxes: List[BoundingBox]) -> BoundingBox:
+    """包围盒的重叠部分，不重叠时返回 None"""
+    if len(bboxes) == 0 or any(bbox is None for bbox in bboxes):
+        return None
+    min_point = np.max([bbox[0] for bbox in bboxes], axis=0)
+    max_point = np.min([bbox[1] for bbox in bboxes], axis=0)
+    if np.any(min_point > max_point):
+        return None
+    return min_point, max_point
+
+
+def is_bounding_box_overlapping(bbox_a: BoundingBox, bbox_b: BoundingBox) -> bool:
+    """两个包围盒是否相交（接触也视为相交）"""
+    return intersect_bounding_boxes([bbox_a, bbox_b]) is not None
+
+
+def get_overlapping_components(bboxes: List[BoundingBox]) -> List[List[int]]:
+    """按包围盒相交关系划分连通分量，分量内保持原有顺序
+
+    沿x轴排序后扫描，只比较x方向区间重叠的包围盒。
+    """
+    parents = list(range(len(bboxes)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    order = sorted((i for i, bbox in enumerate(bboxes) if bbox is not None), key=lambda i: bboxes[i][0][0])
+    active = []
+    for i in order:
+        active = [j for j in active if bboxes[j][1][0] >= bboxes[i][0][0]]
+        for j in active:
+            if is_bounding_box_overlapping(bboxes[i], bboxes[j]):
+                parents[find(i)] = find(j)
+        active.append(i)
+
+    components = {}
+    for i in range(len(bboxes)):
+        components.setdefault(find(i), []).append(i)
+    return sorted(components.values(), key=lambda component: component[0])
+
+
+class DAGOptimizer:
+    """将一个DAG子树重建到新的DAG中"""
+
+    def __init__(self, dag: CSGDAG, prune: bool = True, rebalance: bool = True):
+        self.dag = dag
+        self.prune = prune
+        self.rebalance = rebalance
+        self.target_dag = CSGDAG()
+        self.bboxes: Dict[int, BoundingBox] = {}  # 新节点ID -> 包围盒
+        self.empty_id: Optional[int] = None
+        self.pruned_operand_count = 0
+
+    def get_empty(self) -> int:
+        if self.empty_id is None:
+            self.empty_id = self.target_dag.add(SurfaceGroup([]))
+            self.bboxes[self.empty_id] = None
+        return self.empty_id
+
+    def add_primitive(self, node: PrimitiveSurface) -> int:
+        new_id = self.target_dag.add(PrimitiveSurface(node.surface_data))
+        new_node = self.target_dag.get(new_id)
+        if new_node.cached_result is None:
+            # 包围盒来自三角化结果，与求值使用的几何一致；三角化结果直接作为新节点的缓存
+            mesh = node.cached_result if not node.dirty and node.cached_result is not None else tessellate_entity(node.surface_data)
+            new_node.cached_result = mesh
+            new_node.dirty = False
+        self.bboxes[new_id] = get_mesh_bounding_box(new_node.cached_result)
+        return new_id
+
+    def add_group(self, item_ids: List[int]) -> int:
+        if self.prune:
+            item_ids = [item_id for item_id in item_ids if self.bboxes[item_id] is not None]
+            if len(item_ids) == 0:
+                return self.get_empty()
+            if len(item_ids) == 1:
+                return item_ids[0]
+        new_id = self.target_dag.add(SurfaceGroup(item_ids))
+        self.bboxes[new_id] = merge_bounding_boxes([self.bboxes[item_id] for item_id in item_ids])
+        return new_id
+
+    def add_boolean(self, op: DAGBoolType, left_id: int, right_id: int) -> int:
+        new_id = self.target_dag.add(BooleanOp(op, left_id, right_id))
+        left_bbox, right_bbox = self.bboxes[left_id], self.bboxes[right_id]
+        if op == DAGBoolType.UNION:
+            self.bboxes[new_id] = merge_bounding_boxes([left_bbox, right_bbox])
+        elif op == DAGBoolType.INTERSECT:
+            self.bboxes[new_id] = intersect_bounding_boxes([left_bbox, right_bbox])
+        else:
+            self.bboxes[new_id] = left_bbox
+        return new_id
+
+    def build_balanced(self, op: DAGBoolType, operand_ids: List[int]) -> int:
+        """按原顺序两两组合为平衡树"""
+        while len(operand_ids) > 1:
+            paired_ids = [
+                self.add_boolean(op, operand_ids[i], operand_ids[i + 1])
+                for i in range(0, len(operand_ids) - 1, 2)
+            ]
+            if len(operand_ids) % 2 == 1:
+                paired_ids.append(operand_ids[-1])
+            operand_ids = paired_ids
+        return operand_ids[0]
+
+    def build_chain(self, op: DAGBoolType, operand_ids: List[int]) -> int:
+        """保持左结合链的形式"""
+        result_id = operand_ids[0]
+        for operand_id in operand_ids[1:]:
+            result_id = self.add_boolean(op, result_id, operand_id)
+        return result_id
+
+    def build_associative(self, op: DAGBoolType, operand_ids: List[int]) -> int:
+        build = self.build_balanced if self.rebalance else self.build_chain
+        if not self.prune:
+            return build(op, operand_ids)
+
+        bboxes = [self.bboxes[operand_id] for operand_id in operand_ids]
+        if op == DAGBoolType.INTERSECT:
+            if intersect_bounding_boxes(bboxes) is None:
+                self.pruned_operand_count += len(operand_ids)
+                return self.get_empty()
+            return build(op, operand_ids)
+
+        # 空操作数不影响并集；包围盒互不相交的部分直接合并为曲面组
+        non_empty_ids = [operand_id for operand_id in operand_ids if self.bboxes[operand_id] is not None]
+        self.pruned_operand_count += len(operand_ids) - len(non_empty_ids)
+        if len(non_empty_ids) == 0:
+            return self.get_empty()
+        components = get_overlapping_components([self.bboxes[operand_id] for operand_id in non_empty_ids])
+        component_ids = [build(op, [non_empty_ids[i] for i in component]) for component in components]
+        return self.add_group(component_ids)
+
+    def subtract(self, base_id: int, cutter_ids: List[int]) -> int:
+        if len(cutter_ids) == 0:
+            return base_id
+        if not self.rebalance or len(cutter_ids) == 1:
+            return self.build_chain(DAGBoolType.DIFFERENCE, [base_id] + cutter_ids)
+        # (A - B) - C = A - (B ∪ C)：减体的并集可以并行计算
+        return self.add_boolean(DAGBoolType.DIFFERENCE, base_id, self.build_associative(DAGBoolType.UNION, cutter_ids))
+
+    def build_difference(self, base_id: int, cutter_ids: List[int]) -> int:
+        if not self.prune:
+            return self.subtract(base_id, cutter_ids)
+
+        base_bbox = self.bboxes[base_id]
+        if base_bbox is None:
+            self.pruned_operand_count += len(cutter_ids)
+            return self.get_empty()
+        kept_ids = [
+            cutter_id for cutter_id in cutter_ids
+            if is_bounding_box_overlapping(base_bbox, self.bboxes[cutter_id])
+        ]
+
+        base_node = self.target_dag.get(base_id)
+        if isinstance(base_node, SurfaceGroup) and len(kept_ids) > 0:
+            # 分组的外包可能远大于各成员，每个成员只减去与其相交的减体
+            used_ids = set()
+            item_ids = []
+            for item_id in base_node.items:
+                item_cutter_ids = [
+                    cutter_id for cutter_id in kept_ids
+                    if is_bounding_box_overlapping(self.bboxes[item_id], self.bboxes[cutter_id])
+                ]
+                used_ids.update(item_cutter_ids)
+                item_ids.append(self.subtract(item_id, item_cutter_ids))
+            self.pruned_operand_count += len(cutter_ids) - len([i for i in kept_ids if i in used_ids])
+            return self.add_group(item_ids)
+
+        self.pruned_operand_count += len(cutter_ids) - len(kept_ids)
+        return self.subtract(base_id, kept_ids)
+
+    def is_chain_interior(self, node_id: int) -> bool:
+        """节点是否为操作链的中间节点：只被一个同操作的布尔节点引用，差集还要求作为其左操作数"""
+        node = self.dag.get(node_id)
+        if not isinstance(node, BooleanOp) or len(node.parents) != 1:
+            return False
+        parent = self.dag.get(next(iter(node.parents)))
+        if not isinstance(parent, BooleanOp) or parent.op != node.op:
+            return False
+        if node.op == DAGBoolType.DIFFERENCE:
+            return parent.left == node_id and parent.right != node_id
+        return node.op in ASSOCIATIVE_OPS
+
+    def get_chain_operands(self, node_id: int) -> List[int]:
+        """按从左到右的顺序展开操作链，返回链外的操作数节点"""
+        operands = []
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            if current != node_id and not self.is_chain_interior(current):
+                operands.append(current)
+                continue
+            # 先展开左操作数；差集链的右操作数不是链的中间节点，不会被展开
+            node = self.dag.get(current)
+            stack += [node.right, node.left]
+        return operands
+
+    def run(self, root_node_id: int) -> int:
+        new_ids = {}
+        for node_id in self.dag.iter_postorder(root_node_id):
+            if node_id != root_node_id and self.is_chain_interior(node_id):
+                continue
+            node = self.dag.get(node_id)
+            if isinstance(node, PrimitiveSurface):
+                new_ids[node_id] = self.add_primitive(node)
+            elif isinstance(node, SurfaceGroup):
+                new_ids[node_id] = self.add_group([new_ids[item] for item in node.items])
+            elif node.op == DAGBoolType.DIFFERENCE:
+                operand_ids = [new_ids[operand] for operand in self.get_chain_operands(node_id)]
+                new_ids[node_id] = self.build_difference(operand_ids[0], operand_ids[1:])
+            else:
+                operand_ids = [new_ids[operand] for operand in self.get_chain_operands(node_id)]
+                new_ids[node_id] = self.build_associative(node.op, operand_ids)
+        return new_ids[root_node_id]
+
+
+def optimize_dag(
+    dag: CSGDAG,
+    root_node_id: int,
+    prune: bool = True,
+    rebalance: bool = True,
+) -> Tuple[CSGDAG, int, Dict[str, Any]]:
+    """重建DAG子树，删除不相互作用的操作数并平衡操作链
+
+    原DAG不被修改；新DAG只包含根节点可达的节点，其原始曲面节点引用相同的实体，并已带有三角化结果。
+
+    Args:
+        dag: 原DAG
+        root_node_id: 子树根节点
+        prune: 是否根据包围盒删除操作数
+        rebalance: 是否将操作链重建为平衡树
+
+    Returns:
+        (新DAG, 新根节点ID, 统计信息)
+    """
+    optimizer = DAGOptimizer(dag, prune, rebalance)
+    new_root_id = optimizer.run(root_node_id)
+    # 被删除的操作数在剪枝前已加入新DAG
+    optimizer.target_dag.remove_unreachable([new_root_id])
+    bbox = optimizer.bboxes[new_root_id]
+    stats = {
+        'node_count': len(dag.topological_order([root_node_id])),
+        'optimized_node_count': len(optimizer.target_dag.topological_order([new_root_id])),
+        'depth': dag.get_depth(root_node_id),
+        'optimized_depth': optimizer.target_dag.get_depth(new_root_id),
+        'pruned_operand_count': optimizer.pruned_operand_count,
+        'bounding_box': None if bbox is None else (bbox[0].tolist(), bbox[1].tolist()),
+        'is_empty': is_empty_node(optimizer.target_dag, new_root_id),
+    }
+    return optimizer.target_dag, new_root_id, stats
+
+
+def is_empty_node(dag: CSGDAG, node_id: int) -> bool:
+    """节点是否为表示空结果的无成员曲面组"""
+    node = dag.get(node_id)
+    return isinstance(node, SurfaceGroup) and len(node.items) == 0
+
+
+def optimize_bool_surface(
+    bool_surface: JCDBoolSurface,
+    prune: bool = True,
+    rebalance: bool = True,
+) -> Dict[str, Any]:
+    """原地优化布尔曲面的DAG
+
+    被删除的操作数不再出现在DAG中，写出JCD文件时也不会保留；
+    只需加速求值时可使用 optimize_dag 得到独立的DAG。
+    优化结果为空（例如不相交的交集）时不修改布尔曲面，统计中 is_empty 为 True。
+
+    Args:
+        bool_surface: 布尔曲面
+        prune: 是否根据包围盒删除操作数
+        rebalance: 是否将操作链重建为平衡树
+
+    Returns:
+        统计信息，见 optimize_dag；DAG为空时返回空字典
+    """
+    if bool_surface.root_node_id is None:
+        return {}
+    dag, root_node_id, stats = optimize_dag(bool_surface.dag, bool_surface.root_node_id, prune, rebalance)
+    if stats['is_empty']:
+        return stats
+    bool_surface.dag = dag
+    bool_surface.root_node_id = root_node_id
+    return stats
@@ -0,0 +1,142 @@
+"""布尔曲面二进制序列化模块
+
+将单个布尔曲面编码为一个自描述的二进制帧，用于缓存和进程间传输：
+- 帧头：magic + 版本 + 两个分段的字节数，读取方只需帧头即可跳过或截取整帧
+- DAG分段：CompactDAG 的节点表（节点类型、布尔操作、左右子节点、分组成员及根节点），
+  原始曲面节点以下标引用几何分段中的实体
+- 几何分段：与.jcdc文件相同布局的列式数组，第一个实体为布尔曲面自身的属性，
+  其后为按下标排列的原始曲面
+
+多个帧可以直接首尾相接写入同一个流，逐帧读取时不需要缓冲整个流。
+只序列化根节点可达的子树，DAG节点上的缓存结果不写出。
+"""
+import copy
+import struct
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Data.dag import CSGDAG
+from jcd_manage.Data.compact_dag import CompactDAG
+from jcd_manage.Method.columnar import JCDC_ALIGNMENT, entities_to_columns, columns_to_entities, encode_columns, decode_columns
+
+
+BOOL_SURFACE_MAGIC = b'JCDBOOL\0'
+BOOL_SURFACE_VERSION = 1
+
+# magic, 版本, 保留字段, DAG分段字节数, 几何分段字节数
+BOOL_SURFACE_HEADER = struct.Struct('<8sIIQQ')
+
+
+def _align(offset: int, alignment: int = JCDC_ALIGNMENT) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def serialize_bool_surface(bool_surface: JCDBoolSurface) -> bytes:
+    """将布尔曲面编码为一个二进制帧
+
+    Args:
+        bool_surface: 布尔曲面
+
+    Returns:
+        帧字节串，长度为64字节的整数倍
+    """
+    primitives = []
+    compact_dag = CompactDAG.from_bool_surface(bool_surface, primitives)
+
+    # 布尔曲面自身只保留记录属性，DAG由节点表单独描述
+    shell = copy.copy(bool_surface)
+    shell.dag = CSGDAG()
+    shell.root_node_id = None
+    shell.source_segments = []
+
+    dag_data = compact_dag.to_bytes()
+    dag_size = _align(len(dag_data))
+    geometry_data = encode_columns(*entities_to_columns([shell] + primitives))
+
+    header = BOOL_SURFACE_HEADER.pack(BOOL_SURFACE_MAGIC, BOOL_SURFACE_VERSION, 0, dag_size, len(geometry_data))
+    dag_start = _align(len(header))
+    buffer = bytearray(dag_start + dag_size + len(geometry_data))
+    buffer[:len(header)] = header
+    buffer[dag_start:dag_start + len(dag_data)] = dag_data
+    buffer[dag_start + dag_size:] = geometry_data
+    return bytes(buffer)
+
+
+def get_frame_size(buffer, offset: int = 0) -> int:
+    """根据帧头获取整帧的字节数
+
+    Raises:
+        ValueError: 帧头格式或版本不匹配
+    """
+    if len(buffer) - offset < BOOL_SURFACE_HEADER.size:
+        raise ValueError("bool surface buffer too short")
+    magic, version, _, dag_size, geometry_size = BOOL_SURFACE_HEADER.unpack_from(buffer, offset)
+    if magic != BOOL_SURFACE_MAGIC:
+        raise ValueError("not a bool surface buffer")
+    if version != BOOL_SURFACE_VERSION:
+        raise ValueError(f"unsupported bool surface version: {version}")
+    return _align(BOOL_SURFACE_HEADER.size) + dag_size + geometry_size
+
+
+def deserialize_bool_surface(buffer, offset: int = 0) -> Tuple[JCDBoolSurface, int]:
+    """从缓冲区解码一个布尔曲面，原始曲面的数组直接引用缓冲区内存
+
+    Args:
+        buffer: bytes、memoryview 或内存映射数组
+        offset: 帧在缓冲区中的起点
+
+    Returns:
+        (布尔曲面, 下一帧的起点)
+
+    Raises:
+        ValueError: 帧格式、版本不匹配或数据不完整
+    """
+    frame_size = get_frame_size(buffer, offset)
+    if len(buffer) - offset < frame_size:
+        raise ValueError("bool surface buffer truncated")
+    _, _, _, dag_size, _ = BOOL_SURFACE_HEADER.unpack_from(buffer, offset)
+
+    dag_start = offset + _align(BOOL_SURFACE_HEADER.size)
+    compact_dag = CompactDAG.from_bytes(buffer, dag_start)
+    columns, strings, _ = decode_columns(buffer, dag_start + dag_size)
+    entities = columns_to_entities(columns, strings)
+
+    bool_surface = entities[0]
+    bool_surface.dag, bool_surface.root_node_id = compact_dag.to_dag(entities[1:])
+    return bool_surface, offset + frame_size
+
+
+def write_bool_surfaces(file: BinaryIO, bool_surfaces: Iterable[JCDBoolSurface]) -> int:
+    """将布尔曲面依次写入已打开的二进制流
+
+    Returns:
+        写入的字节数
+    """
+    size = 0
+    for bool_surface in bool_surfaces:
+        size += file.write(serialize_bool_surface(bool_surface))
+    return size
+
+
+def read_bool_surfaces(file: BinaryIO) -> Iterator[JCDBoolSurface]:
+    """从二进制流中逐帧读取布尔曲面，每次只读取一帧的数据
+
+    Raises:
+        ValueError: 帧格式不匹配或流在帧中间结束
+    """
+    header_size = _align(BOOL_SURFACE_HEADER.size)
+    while True:
+        header = file.read(header_size)
+        if len(header) == 0:
+            return
+        frame_size = get_frame_size(header)
+        buffer = bytearray(frame_size)
+        buffer[:len(header)] = header
+        view = memoryview(buffer)
+        position = len(header)
+        while position < frame_size:
+            count = file.readinto(view[position:])
+            if not count:
+                raise ValueError("bool surface stream truncated")
+            position += count
+        yield deserialize_bool_surface(buffer)[0]
@@ -0,0 +1,299 @@
+"""JCD网格导出模块
+
+将可见几何体以流式方式写出为二进制PLY、OBJ或二进制STL。
+几何体按材质分组、按实体（钻石按批次）逐块生成并直接从numpy缓冲区写入磁盘，
+内存占用与单个块的大小相关，而与整个场景的大小无关。
+实体网格与CSG、STEP和体积估算一样由 tessellate_entity 生成并放置，
+布尔曲面导出求值后的结果网格。
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from jcd_manage.Data.jcd_base import JCDBaseData
+from jcd_manage.Data.jcd_surface import JCDSurface
+from jcd_manage.Data.jcd_diamond import JCDDiamond
+from jcd_manage.Data.jcd_font_surface import JCDFontSurface
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Data.jcd_quad_type import JCDQuadType
+from jcd_manage.Method.csg import tessellate_entity, evaluate_bool_surface
+from jcd_manage.Method.mesh import create_diamond_prototype, get_placed_diamond_matrices, instance_mesh
+
+
+MESH_FILE_FORMATS = ['ply', 'obj', 'stl']
+
+
+def collect_mesh_entities(
+    objects: List[JCDBaseData],
+    include_hidden: bool = False,
+    expand_bool_surfaces: bool = False,
+) -> List[JCDBaseData]:
+    """收集能够生成网格的实体
+
+    Args:
+        objects: 实体列表
+        include_hidden: 是否包含隐藏实体
+        expand_bool_surfaces: 为 True 时布尔曲面展开为其原始曲面（差集的切割体也作为实体导出），
+            默认保留布尔曲面并导出其求值结果
+
+    Returns:
+        实体列表
+    """
+    entities = []
+    for obj in objects:
+        if obj.hide and not include_hidden:
+            continue
+        if isinstance(obj, JCDBoolSurface):
+            if expand_bool_surfaces:
+                entities += collect_mesh_entities(obj.get_surfaces(), include_hidden, expand_bool_surfaces)
+            else:
+                entities.append(obj)
+        elif isinstance(obj, (JCDSurface, JCDQuadType, JCDFontSurface, JCDDiamond)):
+            entities.append(obj)
+    return entities
+
+
+def group_entities_by_material(entities: List[JCDBaseData]) -> Dict[str, List[JCDBaseData]]:
+    """按材质名称分组实体（材质按名称排序）"""
+    groups = {}
+    for entity in entities:
+        groups.setdefault(entity.get_material_name(), []).append(entity)
+    return {material_name: groups[material_name] for material_name in sorted(groups)}
+
+
+def iter_mesh_chunks(
+    entities: List[JCDBaseData],
+    diamond_chunk_size: int = 4096,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """逐块生成实体网格
+
+    曲面、四边形面片、字体面片和布尔曲面每个实体一块，钻石按类型分组后每 diamond_chunk_size 个实例一块。
+    钻石的实例矩阵由 get_placed_diamond_matrices 得到，镜像的实例翻转三角形，与 tessellate_entity 一致。
+
+    Args:
+        entities: 同一材质的实体列表
+        diamond_chunk_size: 每块钻石实例数量
+
+    Yields:
+        (vertices, triangles)
+    """
+    diamonds = []
+    for entity in entities:
+        if isinstance(entity, JCDDiamond):
+            diamonds.append(entity)
+            continue
+
+        if isinstance(entity, JCDBoolSurface):
+            mesh = evaluate_bool_surface(entity)
+        else:
+            mesh = tessellate_entity(entity)
+        if len(mesh[1]) > 0:
+            yield mesh
+
+    diamond_groups = {}
+    for diamond in diamonds:
+        diamond_groups.setdefault(diamond.diamond_type, []).append(diamond)
+    for diamond_type, members in diamond_groups.items():
+        vertices, triangles = create_diamond_prototype(diamond_type)
+        matrices = get_placed_diamond_matrices(members)
+        mirrored = np.linalg.det(matrices[:, :3, :3]) < 0.0
+        for selected, instance_triangles in ((~mirrored, triangles), (mirrored, triangles[:, ::-1])):
+            selected_matrices = matrices[selected]
+            for start in range(0, len(selected_matrices), diamond_chunk_size):
+                yield instance_mesh(vertices, instance_triangles, selected_matrices[start:start + diamond_chunk_size])
+
+
+class PLYMeshWriter(object):
+    """二进制PLY流式写出器
+
+    顶点直接写入目标文件，面片先写入同目录下的临时文件，关闭时拼接；
+    文件头预留定长的数量字段，关闭时原位回填。
+    """
+
+    FACE_DTYPE = np.dtype([('count', 'u1'), ('indices', '<i4', (3,)), ('material_index', '<u2')])
+    COUNT_WIDTH = 20
+
+    def __init__(self, file_path: str, material_names: List[str]):
+        self.file = open(file_path, 'wb')
+        self.face_file = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(file_path)))
+        self.material_names = material_names
+        self.vertex_count = 0
+        self.face_count = 0
+
+        self.header_size = len(self._get_header())
+        self.file.write(b'\0' * self.header_size)
+
+    def _get_header(self) -> bytes:
+        lines = ['ply', 'format binary_little_endian 1.0']
+        for i, material_name in enumerate(self.material_names):
+            lines.append(f"comment material {i} {material_name}")
+        lines += [
+            f"element vertex {self.vertex_count}".ljust(15 + self.COUNT_WIDTH),
+            'property float x',
+            'property float y',
+            'property float z',
+            f"element face {self.face_count}".ljust(13 + self.COUNT_WIDTH),
+            'property list uchar int vertex_indices',
+            'property ushort material_index',
+            'end_header',
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def write(self, vertices: np.ndarray, triangles: np.ndarray, material_index: int):
+        self.file.write(np.ascontiguousarray(vertices, dtype='<f4').tobytes())
+
+        faces = np.empty(len(triangles), dtype=self.FACE_DTYPE)
+        faces['count'] = 3
+        faces['indices'] = triangles + self.vertex_count
+        faces['material_index'] = material_index
+        self.face_file.write(faces.tobytes())
+
+        self.vertex_count += len(vertices)
+        self.face_count += len(triangles)
+
+    def close(self):
+        self.face_file.seek(0)
+        shutil.copyfileobj(self.face_file, self.file, 16 * 1024 * 1024)
+        self.face_file.close()
+
+        header = self._get_header()
+        assert len(header) == self.header_size
+        self.file.seek(0)
+        self.file.write(header)
+        self.file.close()
+
+
+class STLMeshWriter(object):
+    """二进制STL流式写出器，材质索引写入每个三角形的属性字段"""
+
+    TRIANGLE_DTYPE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('material_index', '<u2')])
+
+    def __init__(self, file_path: str, material_names: List[str]):
+        self.file = open(file_path, 'wb')
+        self.material_names = material_names
+        self.face_count = 0
+
+        header = ('JCD mesh export; materials: ' + ', '.join(material_names)).encode('utf-8')[:80]
+        self.file.write(header.ljust(80, b' '))
+        self.file.write(np.uint32(0).tobytes())
+
+    def write(self, vertices: np.ndarray, triangles: np.ndarray, material_index: int):
+        corners = vertices[triangles]
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+
+        records = np.empty(len(triangles), dtype=self.TRIANGLE_DTYPE)
+        records['normal'] = normals
+        records['vertices'] = corners
+        records['material_index'] = material_index
+        self.file.write(records.tobytes())
+
+        self.face_count += len(triangles)
+
+    def close(self):
+        self.file.seek(80)
+        self.file.write(np.uint32(self.face_count).tobytes())
+        self.file.close()
+
+
+class OBJMeshWriter(object):
+    """OBJ流式写出器，每个材质一个组，并生成同名mtl材质文件
+
+    顶点和面片按 CHUNK_SIZE 行一段格式化后直接写入文件，
+    单次生成的文本大小固定，与实体网格的大小无关。
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, file_path: str, material_names: List[str]):
+        self.file = open(file_path, 'w', encoding='utf-8')
+        self.material_names = material_names
+        self.vertex_count = 0
+        self.current_material_index = None
+
+        mtl_file_path = os.path.splitext(file_path)[0] + '.mtl'
+        with open(mtl_file_path, 'w', encoding='utf-8') as f:
+            for material_name in material_names:
+                f.write(f"newmtl {self._get_material_id(material_name)}\nKd 0.8 0.8 0.8\n\n")
+
+        self.file.write(f"mtllib {os.path.basename(mtl_file_path)}\n")
+
+    @staticmethod
+    def _get_material_id(material_name: str) -> str:
+        return material_name.replace(' ', '_') if material_name else 'default'
+
+    def write(self, vertices: np.ndarray, triangles: np.ndarray, material_index: int):
+        if material_index != self.current_material_index:
+            material_id = self._get_material_id(self.material_names[material_index])
+            self.file.write(f"g {material_id}\nusemtl {material_id}\n")
+            self.current_material_index = material_index
+
+        vertices = np.asarray(vertices, dtype=np.float64)
+        self._write_rows('v %.6f %.6f %.6f\n', vertices)
+        self._write_rows('f %d %d %d\n', np.asarray(triangles, dtype=np.int64) + (self.vertex_count + 1))
+
+        self.vertex_count += len(vertices)
+
+    def _write_rows(self, row_format: str, rows: np.ndarray):
+        for start in range(0, len(rows), self.CHUNK_SIZE):
+            chunk = rows[start:start + self.CHUNK_SIZE]
+            self.file.write((row_format * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def close(self):
+        self.file.close()
+
+
+MESH_WRITER_MAP = {
+    'ply': PLYMeshWriter,
+    'obj': OBJMeshWriter,
+    'stl': STLMeshWriter,
+}
+
+
+def save_mesh_file(
+    objects: List[JCDBaseData],
+    save_mesh_file_path: str,
+    file_format: Optional[str] = None,
+    include_hidden: bool = False,
+    diamond_chunk_size: int = 4096,
+    expand_bool_surfaces: bool = False,
+) -> Dict[str, int]:
+    """将实体网格流式写出到文件
+
+    Args:
+        objects: 实体列表
+        save_mesh_file_path: 保存路径
+        file_format: 'ply' / 'obj' / 'stl'，默认根据扩展名判断
+        include_hidden: 是否包含隐藏实体
+        diamond_chunk_size: 每块钻石实例数量
+        expand_bool_surfaces: 是否导出布尔曲面的原始曲面而不是求值结果
+
+    Returns:
+        写出统计 {'vertex_count', 'triangle_count', 'material_count'}
+    """
+    if file_format is None:
+        file_format = os.path.splitext(save_mesh_file_path)[1][1:].lower()
+    writer_class = MESH_WRITER_MAP[file_format]
+
+    material_groups = group_entities_by_material(collect_mesh_entities(objects, include_hidden, expand_bool_surfaces))
+    material_names = list(material_groups.keys())
+
+    writer = writer_class(save_mesh_file_path, material_names)
+    vertex_count = 0
+    triangle_count = 0
+    try:
+        for material_index, entities in enumerate(material_groups.values()):
+            for vertices, triangles in iter_mesh_chunks(entities, diamond_chunk_size):
+                writer.write(vertices, triangles, material_index)
+                vertex_count += len(vertices)
+                triangle_count += len(triangles)
+    finally:
+        writer.close()
+
+    return {
+        'vertex_count': vertex_count,
+        'triangle_count': triangle_count,
+        'material_count': len(material_names),
+    }
@@ -0,0 +1,325 @@
+"""JCD二进制glTF（GLB）导出模块
+
+非钻石几何体按材质合并为一个网格，与网格导出一样由 tessellate_entity 生成；
+每种钻石类型只写一份原型顶点和索引，不同材质的钻石只是引用同一数据的不同网格，
+通过 EXT_mesh_gpu_instancing 扩展以每颗钻石的平移/旋转/缩放实例化。
+带切变或非正交缩放的矩阵无法表示为平移/旋转/缩放，这些钻石直接写出变换后的网格。
+"""
+import json
+import struct
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from jcd_manage.Data.jcd_base import JCDBaseData
+from jcd_manage.Data.jcd_diamond import JCDDiamond
+from jcd_manage.Method.export import collect_mesh_entities, group_entities_by_material, iter_mesh_chunks
+from jcd_manage.Method.mesh import create_diamond_prototype, get_placed_diamond_matrices, merge_meshes
+
+
+GLB_MAGIC = 0x46546C67
+GLB_JSON_CHUNK = 0x4E4F534A
+GLB_BIN_CHUNK = 0x004E4942
+
+COMPONENT_FLOAT = 5126
+COMPONENT_UNSIGNED_INT = 5125
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+INSTANCING_EXTENSION = 'EXT_mesh_gpu_instancing'
+
+# 平移/旋转/缩放重新组合后与原矩阵线性部分的最大相对误差，超过时改为写出变换后的网格
+TRS_TOLERANCE = 1e-6
+
+
+def decompose_matrices(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """将JCD矩阵（行向量约定）批量分解为平移、旋转四元数和缩放
+
+    线性部分通过极分解取最近的旋转矩阵，带镜像的矩阵将镜像计入缩放的符号。
+
+    Args:
+        matrices: 矩阵数组 (n, 4, 4)
+
+    Returns:
+        (translations (n, 3), rotations (n, 4) 按xyzw排列, scales (n, 3))
+    """
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    translations = matrices[:, 3, :3]
+
+    # 转为列向量约定的线性部分
+    linear = np.transpose(matrices[:, :3, :3], (0, 2, 1))
+    u, _, vt = np.linalg.svd(linear)
+    rotations = u @ vt
+    mirrored = np.linalg.det(rotations) < 0
+    rotations[mirrored, :, 2] *= -1.0
+
+    # 缩放为旋转坐标系下线性部分的对角元素
+    scales = np.einsum('nji,nji->ni', rotations, linear)
+
+    m = rotations
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    quaternions = np.zeros((len(m), 4), dtype=np.float64)
+
+    # 根据最大对角元素选择数值稳定的分支
+    cases = np.stack([trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]], axis=1).argmax(axis=1)
+
+    k = cases == 0
+    s = np.sqrt(np.maximum(trace[k] + 1.0, 1e-12)) * 2.0
+    quaternions[k] = np.stack([
+        (m[k, 2, 1] - m[k, 1, 2]) / s,
+        (m[k, 0, 2] - m[k, 2, 0]) / s,
+        (m[k, 1, 0] - m[k, 0, 1]) / s,
+        0.25 * s,
+    ], axis=1)
+
+    k = cases == 1
+    s = np.sqrt(np.maximum(1.0 + m[k, 0, 0] - m[k, 1, 1] - m[k, 2, 2], 1e-12)) * 2.0
+    quaternions[k] = np.stack([
+        0.25 * s,
+        (m[k, 0, 1] + m[k, 1, 0]) / s,
+        (m[k, 0, 2] + m[k, 2, 0]) / s,
+        (m[k, 2, 1] - m[k, 1, 2]) / s,
+    ], axis=1)
+
+    k = cases == 2
+    s = np.sqrt(np.maximum(1.0 + m[k, 1, 1] - m[k, 0, 0] - m[k, 2, 2], 1e-12)) * 2.0
+    quaternions[k] = np.stack([
+        (m[k, 0, 1] + m[k, 1, 0]) / s,
+        0.25 * s,
+        (m[k, 1, 2] + m[k, 2, 1]) / s,
+        (m[k, 0, 2] - m[k, 2, 0]) / s,
+    ], axis=1)
+
+    k = cases == 3
+    s = np.sqrt(np.maximum(1.0 + m[k, 2, 2] - m[k, 0, 0] - m[k, 1, 1], 1e-12)) * 2.0
+    quaternions[k] = np.stack([
+        (m[k, 0, 2] + m[k, 2, 0]) / s,
+        (m[k, 1, 2] + m[k, 2, 1]) / s,
+        0.25 * s,
+        (m[k, 1, 0] - m[k, 0, 1]) / s,
+    ], axis=1)
+
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return translations, quaternions, scales
+
+
+def compose_matrices(translations: np.ndarray, rotations: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """由平移、旋转四元数（xyzw）和缩放组合为JCD矩阵（行向量约定），decompose_matrices 的逆运算"""
+    x, y, z, w = np.asarray(rotations, dtype=np.float64).T
+    rotation_matrices = np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], axis=1),
+        np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], axis=1),
+        np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], axis=1),
+    ], axis=1)
+    matrices = np.tile(np.eye(4), (len(rotation_matrices), 1, 1))
+    matrices[:, :3, :3] = np.transpose(rotation_matrices * np.asarray(scales)[:, None, :], (0, 2, 1))
+    matrices[:, 3, :3] = translations
+    return matrices
+
+
+def is_trs_matrices(matrices: np.ndarray, tolerance: float = TRS_TOLERANCE) -> np.ndarray:
+    """判断每个矩阵能否无损地分解为平移/旋转/缩放 (n,)"""
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    if len(matrices) == 0:
+        return np.zeros(0, dtype=bool)
+    linear = matrices[:, :3, :3]
+    errors = np.abs(compose_matrices(*decompose_matrices(matrices))[:, :3, :3] - linear).max(axis=(1, 2))
+    return errors <= tolerance * np.maximum(np.abs(linear).max(axis=(1, 2)), np.finfo(np.float64).tiny)
+
+
+class GLBBuilder(object):
+    """GLB文件构建器，所有数据写入同一个二进制缓冲区"""
+
+    def __init__(self):
+        self.gltf: Dict[str, Any] = {
+            'asset': {'version': '2.0', 'generator': 'jcd_manage'},
+            'scene': 0,
+            'scenes': [{'nodes': []}],
+            'nodes': [],
+            'meshes': [],
+            'materials': [],
+            'accessors': [],
+            'bufferViews': [],
+            'buffers': [],
+        }
+        self.chunks: List[bytes] = []
+        self.byte_length = 0
+        self.material_index_map: Dict[Tuple[str, Tuple[float, ...]], int] = {}
+
+    def add_accessor(self, data: np.ndarray, accessor_type: str, component_type: int,
+                     target: int = None, with_bounds: bool = False) -> int:
+        """添加数据访问器，返回访问器索引"""
+        raw = np.ascontiguousarray(data).tobytes()
+        buffer_view = {'buffer': 0, 'byteOffset': self.byte_length, 'byteLength': len(raw)}
+        if target is not None:
+            buffer_view['target'] = target
+
+        self.chunks.append(raw)
+        self.byte_length += len(raw)
+        padding = (-self.byte_length) % 4
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.byte_length += padding
+
+        self.gltf['bufferViews'].append(buffer_view)
+        accessor = {
+            'bufferView': len(self.gltf['bufferViews']) - 1,
+            'componentType': component_type,
+            'count': len(data),
+            'type': accessor_type,
+        }
+        if with_bounds:
+            accessor['min'] = np.min(data, axis=0).astype(float).tolist()
+            accessor['max'] = np.max(data, axis=0).astype(float).tolist()
+        self.gltf['accessors'].append(accessor)
+        return len(self.gltf['accessors']) - 1
+
+    def get_material(self, material_name: str, base_color: List[float]) -> int:
+        """获取或创建材质，返回材质索引；同名但颜色不同的材质分别创建"""
+        key = (material_name, tuple(float(value) for value in base_color))
+        if key not in self.material_index_map:
+            self.gltf['materials'].append({
+                'name': material_name,
+                'pbrMetallicRoughness': {
+                    'baseColorFactor': base_color,
+                    'metallicFactor': 1.0,
+                    'roughnessFactor': 0.3,
+                },
+            })
+            self.material_index_map[key] = len(self.gltf['materials']) - 1
+        return self.material_index_map[key]
+
+    def add_geometry(self, vertices: np.ndarray, triangles: np.ndarray) -> Tuple[int, int]:
+        """写入顶点和索引，返回 (位置访问器索引, 索引访问器索引)，可被多个网格共用"""
+        position = self.add_accessor(
+            vertices.astype(np.float32), 'VEC3', COMPONENT_FLOAT, TARGET_ARRAY_BUFFER, with_bounds=True
+        )
+        indices = self.add_accessor(
+            triangles.astype(np.uint32).ravel(), 'SCALAR', COMPONENT_UNSIGNED_INT, TARGET_ELEMENT_ARRAY_BUFFER
+        )
+        return position, indices
+
+    def add_mesh(self, name: str, vertices: np.ndarray, triangles: np.ndarray, material_index: int) -> int:
+        """添加网格，返回网格索引"""
+        return self.add_geometry_mesh(name, self.add_geometry(vertices, triangles), material_index)
+
+    def add_geometry_mesh(self, name: str, geometry: Tuple[int, int], material_index: int) -> int:
+        """添加引用已有顶点和索引的网格，返回网格索引"""
+        position, indices = geometry
+        self.gltf['meshes'].append({
+            'name': name,
+            'primitives': [{
+                'attributes': {'POSITION': position},
+                'indices': indices,
+                'material': material_index,
+            }],
+        })
+        return len(self.gltf['meshes']) - 1
+
+    def add_node(self, node: Dict[str, Any]) -> int:
+        """添加场景根节点，返回节点索引"""
+        self.gltf['nodes'].append(node)
+        node_index = len(self.gltf['nodes']) - 1
+        self.gltf['scenes'][0]['nodes'].append(node_index)
+        return node_index
+
+    def add_instanced_node(self, name: str, mesh_index: int, matrices: np.ndarray) -> int:
+        """添加使用GPU实例化的节点，返回节点索引"""
+        translations, rotations, scales = decompose_matrices(matrices)
+        attributes = {
+            'TRANSLATION': self.add_accessor(translations.astype(np.float32), 'VEC3', COMPONENT_FLOAT),
+            'ROTATION': self.add_accessor(rotations.astype(np.float32), 'VEC4', COMPONENT_FLOAT),
+            'SCALE': self.add_accessor(scales.astype(np.float32), 'VEC3', COMPONENT_FLOAT),
+        }
+        if INSTANCING_EXTENSION not in self.gltf.setdefault('extensionsUsed', []):
+            self.gltf['extensionsUsed'].append(INSTANCING_EXTENSION)
+        return self.add_node({
+            'name': name,
+            'mesh': mesh_index,
+            'extensions': {INSTANCING_EXTENSION: {'attributes': attributes}},
+        })
+
+    def save(self, file_path: str) -> bool:
+        """写出GLB文件"""
+        self.gltf['buffers'] = [{'byteLength': self.byte_length}]
+        gltf = {key: value for key, value in self.gltf.items() if value != []}
+
+        json_bytes = json.dumps(gltf, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        json_bytes += b' ' * ((-len(json_bytes)) % 4)
+        bin_bytes = b''.join(self.chunks)
+
+        total_length = 12 + 8 + len(json_bytes) + 8 + len(bin_bytes)
+        with open(file_path, 'wb') as f:
+            f.write(struct.pack('<III', GLB_MAGIC, 2, total_length))
+            f.write(struct.pack('<II', len(json_bytes), GLB_JSON_CHUNK))
+            f.write(json_bytes)
+            f.write(struct.pack('<II', len(bin_bytes), GLB_BIN_CHUNK))
+            f.write(bin_bytes)
+        return True
+
+
+def save_glb_file(objects: List[JCDBaseData], save_glb_file_path: str) -> Dict[str, int]:
+    """将可见实体导出为GLB文件
+
+    Args:
+        objects: 实体列表
+        save_glb_file_path: 保存路径
+
+    Returns:
+        导出统计 {'mesh_count', 'diamond_count', 'baked_diamond_count', 'triangle_count'}
+    """
+    builder = GLBBuilder()
+    entities = collect_mesh_entities(objects, include_hidden=False)
+    diamonds = [entity for entity in entities if isinstance(entity, JCDDiamond)]
+    others = [entity for entity in entities if not isinstance(entity, JCDDiamond)]
+
+    triangle_count = 0
+
+    # 每个材质一个网格
+    for material_name, material_entities in group_entities_by_material(others).items():
+        vertices, triangles = merge_meshes(list(iter_mesh_chunks(material_entities)))
+        if len(triangles) == 0:
+            continue
+        material_index = builder.get_material(material_name, [0.9, 0.75, 0.3, 1.0])
+        mesh_index = builder.add_mesh(material_name, vertices, triangles, material_index)
+        builder.add_node({'name': material_name, 'mesh': mesh_index})
+        triangle_count += len(triangles)
+
+    # 每种钻石类型一份原型数据，每个材质一个引用它的网格，通过实例化放置
+    diamond_groups = {}
+    for diamond in diamonds:
+        diamond_groups.setdefault((diamond.diamond_type, diamond.material_name), []).append(diamond)
+
+    prototype_geometries = {}
+    baked_diamond_count = 0
+    for (diamond_type, material_name), members in diamond_groups.items():
+        type_name = 'ROUND' if diamond_type is None else diamond_type.name
+        vertices, triangles = create_diamond_prototype(diamond_type)
+        material_index = builder.get_material(material_name, [1.0, 1.0, 1.0, 1.0])
+        triangle_count += len(triangles) * len(members)
+
+        matrices = get_placed_diamond_matrices(members)
+        is_trs = is_trs_matrices(matrices)
+        if np.any(is_trs):
+            if diamond_type not in prototype_geometries:
+                prototype_geometries[diamond_type] = builder.add_geometry(vertices, triangles)
+            mesh_index = builder.add_geometry_mesh(
+                f"diamond_{type_name}", prototype_geometries[diamond_type], material_index,
+            )
+            builder.add_instanced_node(f"diamonds_{type_name}_{material_name}", mesh_index, matrices[is_trs])
+
+        # 无法分解的钻石合并为一个变换后的网格
+        if not np.all(is_trs):
+            baked = [member for member, exact in zip(members, is_trs.tolist()) if not exact]
+            baked_vertices, baked_triangles = merge_meshes(list(iter_mesh_chunks(baked)))
+            mesh_index = builder.add_mesh(f"diamond_{type_name}_baked", baked_vertices, baked_triangles, material_index)
+            builder.add_node({'name': f"diamonds_{type_name}_{material_name}_baked", 'mesh': mesh_index})
+            baked_diamond_count += len(baked)
+
+    builder.save(save_glb_file_path)
+
+    return {
+        'mesh_count': len(builder.gltf['meshes']),
+        'diamond_count': len(diamonds),
+        'baked_diamond_count': baked_diamond_count,
+        'triangle_count': triangle_count,
+    }
@@ -2,67 +2,123 @@ from collections import Counter
 from typing import List, Dict, Any
 
 
-def print_entity_summary(entity_data: Dict[str, Any]) -> bool:
-    """打印单个实体的摘要信息"""
-    surface_type = entity_data.get('surface_type')
-    hide = entity_data.get('hide')
+def get_entity_summary(entity_data: Dict[str, Any]) -> Dict[str, Any]:
+    """获取单个实体的摘要信息
 
-    print(f"\n实体摘要:")
-    print(f"  类型: {surface_type}")
-    print(f"  隐藏: {hide}")
+    Args:
+        entity_data: read_by_surface_type 返回的实体数据字典（可含 hide）
+
+    Returns:
+        摘要字典，只包含实体具有的字段
+    """
+    summary = {
+        'surface_type': entity_data.get('surface_type'),
+        'hide': entity_data.get('hide'),
+    }
 
     if 'matrices' in entity_data and len(entity_data['matrices']) > 0:
-        print(f"  矩阵数量: {len(entity_data['matrices'])}")
+        summary['matrix_count'] = len(entity_data['matrices'])
 
     if 'material_name' in entity_data:
-        print(f"  材质: {entity_data['material_name']}")
+        summary['material_name'] = entity_data['material_name']
 
     if 'points' in entity_data and len(entity_data['points']) > 0:
-        print(f"  点数量: {len(entity_data['points'])}")
-        print(f"  点形状: {entity_data['points'].shape}")
+        summary['point_count'] = len(entity_data['points'])
+        summary['point_shape'] = tuple(entity_data['points'].shape)
 
     if 'ring_count' in entity_data:
-        print(f"  环数量: {entity_data['ring_count']}")
-        print(f"  原始点数: {entity_data['original_point_count']}")
+        summary['ring_count'] = entity_data['ring_count']
+        summary['original_point_count'] = entity_data['original_point_count']
 
-    if 'curve_type' in entity_data:
-        print(f"  曲线类型: {entity_data['curve_type']}")
+    for key in ['curve_type', 'diamond_type', 'bool_type']:
+        if key in entity_data:
+            summary[key] = entity_data[key]
 
-    if 'diamond_type' in entity_data:
-        print(f"  钻石类型: {entity_data['diamond_type']}")
+    if 'bool_type' in entity_data and 'sub_surface' in entity_data:
+        summary['sub_surface_type'] = entity_data['sub_surface'].get('surface_type')
+    return summary
 
-    if 'bool_type' in entity_data:
-        print(f"  布尔类型: {entity_data['bool_type']}")
-        if 'sub_surface' in entity_data:
-            print(f"  子曲面类型: {entity_data['sub_surface'].get('surface_type')}")
-    return True
 
+def get_overall_summary(all_entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """获取总体统计信息
 
-def print_overall_summary(all_entities: List[Dict[str, Any]]) -> bool:
-    """打印总体统计信息"""
+    Args:
+        all_entities: 实体数据字典列表
+
+    Returns:
+        {'type_counts': {类型: 数量}, 'total_point_count', 'materials': [材质名...]}
+    """
     # 统计类型分布
     type_counter = Counter(e['surface_type'] for e in all_entities)
 
-    print("\n类型分布:")
-    for surface_type, count in type_counter.items():
-        print(f"  {surface_type}: {count}")
-
     # 统计总点数
     total_points = sum(
-        len(e.get('points', [])) 
-        for e in all_entities 
+        len(e.get('points', []))
+        for e in all_entities
         if 'points' in e
     )
-    print(f"\n总控制点数: {total_points}")
 
     # 统计材质
     materials = set(
-        e.get('material_name') 
-        for e in all_entities 
+        e.get('material_name')
+        for e in all_entities
         if 'material_name' in e and e.get('material_name')
     )
-    if materials:
-        print(f"材质种类: {len(materials)}")
-        for material in sorted(materials):
+
+    return {
+        'type_counts': dict(type_counter),
+        'total_point_count': total_points,
+        'materials': sorted(materials),
+    }
+
+
+def print_entity_summary(entity_data: Dict[str, Any]) -> bool:
+    """打印单个实体的摘要信息"""
+    summary = get_entity_summary(entity_data)
+
+    print(f"\n实体摘要:")
+    print(f"  类型: {summary['surface_type']}")
+    print(f"  隐藏: {summary['hide']}")
+
+    if 'matrix_count' in summary:
+        print(f"  矩阵数量: {summary['matrix_count']}")
+
+    if 'material_name' in summary:
+        print(f"  材质: {summary['material_name']}")
+
+    if 'point_count' in summary:
+        print(f"  点数量: {summary['point_count']}")
+        print(f"  点形状: {summary['point_shape']}")
+
+    if 'ring_count' in summary:
+        print(f"  环数量: {summary['ring_count']}")
+        print(f"  原始点数: {summary['original_point_count']}")
+
+    if 'curve_type' in summary:
+        print(f"  曲线类型: {summary['curve_type']}")
+
+    if 'diamond_type' in summary:
+        print(f"  钻石类型: {summary['diamond_type']}")
+
+    if 'bool_type' in summary:
+        print(f"  布尔类型: {summary['bool_type']}")
+        if 'sub_surface_type' in summary:
+            print(f"  子曲面类型: {summary['sub_surface_type']}")
+    return True
+
+
+def print_overall_summary(all_entities: List[Dict[str, Any]]) -> bool:
+    """打印总体统计信息"""
+    summary = get_overall_summary(all_entities)
+
+    print("\n类型分布:")
+    for surface_type, count in summary['type_counts'].items():
+        print(f"  {surface_type}: {count}")
+
+    print(f"\n总控制点数: {summary['total_point_count']}")
+
+    if summary['materials']:
+        print(f"材质种类: {len(summary['materials'])}")
+        for material in summary['materials']:
             print(f"  - {material}")
     return True
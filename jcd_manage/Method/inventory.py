@@ -0,0 +1,191 @@
+"""JCD宝石清单统计模块
+
+按钻石类型、尺寸分档统计宝石数量和估算克拉重量，用于采购：
+- 单个文件只通过记录扫描定位钻石记录，不解析其他实体的几何数据，
+  钻石矩阵和类型从内存映射中按偏移一次性批量取出
+- 尺寸为腰线直径：原型腰线最大半径为1，直径为矩阵前两行（局部X、Y轴）长度较大者的2倍
+- 克拉重量由原型体积乘以矩阵行列式得到体积，再按钻石密度换算，结果依赖原型的切割比例
+- 批量统计时文件在进程池中分块处理（map），各文件的部分计数最后逐项相加（reduce）
+"""
+import mmap
+import numpy as np
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from jcd_manage.Config.constant import MATERIAL_DENSITIES, CARAT_GRAMS
+from jcd_manage.Config.types import SurfaceType, DiamondType
+from jcd_manage.Data import JCDDiamond
+from jcd_manage.Method.mesh import get_diamond_matrices
+from jcd_manage.Method.scan import scan_jcd_buffer
+from jcd_manage.Method.volume import get_stone_volumes
+
+
+UNKNOWN_DIAMOND_TYPE = 'UNKNOWN'
+
+
+def read_diamond_arrays(jcd_file_path: str, include_hidden: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """扫描JCD文件，只读取顶层钻石记录的类型和变换矩阵
+
+    Args:
+        jcd_file_path: JCD文件路径
+        include_hidden: 是否包含隐藏的钻石
+
+    Returns:
+        (类型编码 (n,) int16，未知类型为-1, 变换矩阵 (n, 4, 4) float32)
+    """
+    with open(jcd_file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            records = scan_jcd_buffer(buffer)
+            offsets = np.asarray([
+                record['matrix_offset'] for record in records
+                if record['surface_type'] == SurfaceType.DIAMOND and record['bool_level'] == 0
+                and (include_hidden or not record['hide'])
+            ], dtype=np.int64)
+
+            data = np.frombuffer(buffer, dtype=np.uint8)
+            try:
+                # 矩阵占64字节，紧随其后的1字节为钻石类型
+                matrix_bytes = data[offsets[:, None] + np.arange(64, dtype=np.int64)]
+                type_codes = data[offsets + 64].astype(np.int16)
+            finally:
+                del data
+
+    # 不属于 DiamondType 的编码记为未知类型，与 get_diamond_arrays 一致
+    type_codes[~np.isin(type_codes, [diamond_type.value for diamond_type in DiamondType])] = -1
+    matrices = matrix_bytes.view('<f4').reshape(-1, 4, 4)
+    return type_codes, matrices
+
+
+def get_diamond_arrays(diamonds: List[JCDDiamond], include_hidden: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """从已加载的钻石对象得到类型编码和变换矩阵，未知类型编码为-1"""
+    if not include_hidden:
+        diamonds = [diamond for diamond in diamonds if not diamond.hide]
+    type_codes = np.asarray(
+        [-1 if diamond.diamond_type is None else diamond.diamond_type.value for diamond in diamonds], dtype=np.int16,
+    )
+    return type_codes, get_diamond_matrices(diamonds)
+
+
+def get_diamond_sizes(matrices: np.ndarray) -> np.ndarray:
+    """由变换矩阵批量计算腰线直径 (n,)"""
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    return 2.0 * np.max(np.linalg.norm(matrices[:, :2, :3], axis=2), axis=1)
+
+
+def get_diamond_carats(type_codes: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    """由类型编码和变换矩阵批量估算克拉重量 (n,)，矩阵坐标单位为mm"""
+    volumes = get_stone_volumes(type_codes, matrices)
+    return volumes * MATERIAL_DENSITIES['diamond'] / 1000.0 / CARAT_GRAMS
+
+
+def _get_type_name(type_code: int) -> str:
+    return UNKNOWN_DIAMOND_TYPE if type_code < 0 else DiamondType(type_code).name
+
+
+def get_stone_inventory(type_codes: np.ndarray, matrices: np.ndarray, size_step: float = 0.1) -> Dict[str, Any]:
+    """按类型和尺寸分档统计宝石
+
+    Args:
+        type_codes: DiamondType 的值 (n,)，-1 表示未知类型
+        matrices: 变换矩阵 (n, 4, 4)
+        size_step: 尺寸分档步长 (mm)，直径四舍五入到最近的档位
+
+    Returns:
+        {
+            'count': 总数,
+            'carat': 总克拉重量,
+            'stones': {类型名称: {尺寸档位字符串: {'count', 'carat'}}},
+        }
+    """
+    type_codes = np.asarray(type_codes, dtype=np.int64).reshape(-1)
+    inventory = {'count': int(len(type_codes)), 'carat': 0.0, 'stones': {}}
+    if len(type_codes) == 0:
+        return inventory
+
+    carats = get_diamond_carats(type_codes, matrices)
+    buckets = np.rint(get_diamond_sizes(matrices) / size_step).astype(np.int64)
+
+    # 以 (类型, 档位) 为键分组，计数和克拉重量各一次 bincount
+    keys, inverse = np.unique(np.stack([type_codes, buckets], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, minlength=len(keys))
+    carat_sums = np.bincount(inverse, weights=carats, minlength=len(keys))
+
+    for (type_code, bucket), count, carat in zip(keys.tolist(), counts.tolist(), carat_sums.tolist()):
+        sizes = inventory['stones'].setdefault(_get_type_name(type_code), {})
+        sizes[f"{bucket * size_step:.2f}"] = {'count': count, 'carat': carat}
+    inventory['carat'] = float(np.sum(carats))
+    return inventory
+
+
+def merge_stone_inventories(inventories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """逐项相加多个宝石清单（尺寸分档步长需相同）"""
+    merged = {'count': 0, 'carat': 0.0, 'stones': {}}
+    for inventory in inventories:
+        merged['count'] += inventory['count']
+        merged['carat'] += inventory['carat']
+        for type_name, sizes in inventory['stones'].items():
+            merged_sizes = merged['stones'].setdefault(type_name, {})
+            for size, item in sizes.items():
+                merged_item = merged_sizes.setdefault(size, {'count': 0, 'carat': 0.0})
+                merged_item['count'] += item['count']
+                merged_item['carat'] += item['carat']
+
+    for type_name in merged['stones']:
+        merged['stones'][type_name] = dict(sorted(merged['stones'][type_name].items(), key=lambda item: float(item[0])))
+    merged['stones'] = dict(sorted(merged['stones'].items()))
+    return merged
+
+
+def get_file_stone_inventory(
+    jcd_file_path: str,
+    size_step: float = 0.1,
+    include_hidden: bool = False,
+) -> Dict[str, Any]:
+    """统计单个JCD文件的宝石清单
+
+    Returns:
+        {'jcd_file_path', 'status', 'error', 'inventory'}
+    """
+    result = {'jcd_file_path': jcd_file_path, 'status': 'counted', 'error': None, 'inventory': None}
+    try:
+        type_codes, matrices = read_diamond_arrays(jcd_file_path, include_hidden)
+        result['inventory'] = get_stone_inventory(type_codes, matrices, size_step)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+    return result
+
+
+def get_stone_inventories(
+    jcd_file_paths: List[str],
+    size_step: float = 0.1,
+    include_hidden: bool = False,
+    processes: Optional[int] = None,
+    chunk_size: int = 16,
+) -> Dict[str, Any]:
+    """批量统计宝石清单，每个文件单独统计后汇总
+
+    Args:
+        jcd_file_paths: JCD文件路径列表
+        size_step: 尺寸分档步长 (mm)
+        include_hidden: 是否包含隐藏的钻石
+        processes: 进程数，默认为CPU核数，为1时在当前进程中执行
+        chunk_size: 每次提交给工作进程的文件数
+
+    Returns:
+        {'files': 每个文件的统计结果, 'total': 汇总清单, 'failed_count': 失败的文件数}
+    """
+    args = ([size_step] * len(jcd_file_paths), [include_hidden] * len(jcd_file_paths))
+    if processes == 1:
+        results = list(map(get_file_stone_inventory, jcd_file_paths, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn')) as executor:
+            results = list(executor.map(get_file_stone_inventory, jcd_file_paths, *args, chunksize=chunk_size))
+
+    return {
+        'files': results,
+        'total': merge_stone_inventories([result['inventory'] for result in results if result['status'] == 'counted']),
+        'failed_count': sum(1 for result in results if result['status'] != 'counted'),
+    }
@@ -1,32 +1,52 @@
 import struct
+import logging
 import numpy as np
 from typing import Tuple, Dict, Any, List
 
 from jcd_manage.Config.types import SurfaceType, DiamondType, BlockType, BoolType, CurveType
 
 
-def read_matrix(jcd_file, matrix_count: int) -> np.ndarray:
+logger = logging.getLogger(__name__)
+
+
+def read_bytes(jcd_file, size: int) -> bytearray:
+    """读取指定长度的字节，返回可写缓冲区（numpy可直接在其上创建可写视图）
+
+    Args:
+        jcd_file: 文件对象
+        size: 字节数
+
+    Returns:
+        字节缓冲区
+    """
+    buffer = bytearray(size)
+    read_size = jcd_file.readinto(buffer)
+    if read_size != size:
+        raise EOFError(f"expected {size} bytes, got {read_size}")
+    return buffer
+
+def read_matrix(jcd_file, matrix_count: int, return_padding: bool = False):
     """读取矩阵数据
 
     Args:
         jcd_file: 文件对象
         matrix_count: 矩阵数量
+        return_padding: 是否同时返回矩阵之间的填充字节
 
     Returns:
-        矩阵数组，形状为 (matrix_count, 4, 4)
+        矩阵数组，形状为 (matrix_count, 4, 4)；return_padding 为 True 时返回 (矩阵数组, 填充字节)
     """
-    matrices = np.zeros((matrix_count, 4, 4), dtype=np.float32)
+    if matrix_count == 0:
+        matrices = np.zeros((0, 4, 4), dtype=np.float32)
+        return (matrices, b'') if return_padding else matrices
 
-    for i in range(matrix_count):
-        for j in range(4):
-            for k in range(4):
-                value = struct.unpack('<f', jcd_file.read(4))[0]
-                matrices[i, j, k] = value
-
-        # 两个矩阵之间间隔4个字节
-        if i != matrix_count - 1:
-            unkown_data = jcd_file.read(4)
+    # 两个矩阵之间间隔4个字节
+    buffer = read_bytes(jcd_file, 68 * matrix_count - 4) + bytearray(4)
+    records = np.frombuffer(buffer, dtype=np.uint8).reshape(matrix_count, 68)
+    matrices = np.ascontiguousarray(records[:, :64]).view('<f4').reshape(matrix_count, 4, 4)
 
+    if return_padding:
+        return matrices, records[:-1, 64:].tobytes()
     return matrices
 
 def read_points(jcd_file) -> np.ndarray:
@@ -39,13 +59,7 @@ def read_points(jcd_file) -> np.ndarray:
         点数组，形状为 (point_size, 4)
     """
     point_size = int.from_bytes(jcd_file.read(4), 'little')
-
-    points = np.zeros((point_size, 4), dtype=np.float32)
-    for i in range(point_size):
-        point = struct.unpack('<ffff', jcd_file.read(16))
-        points[i] = point
-
-    return points
+    return np.frombuffer(read_bytes(jcd_file, 16 * point_size), dtype='<f4').reshape(point_size, 4)
 
 def read_int_points(jcd_file) -> np.ndarray:
     """读取整数点数据（顶点索引）
@@ -57,13 +71,7 @@ def read_int_points(jcd_file) -> np.ndarray:
         整数点数组，形状为 (point_size, 4)
     """
     point_size = int.from_bytes(jcd_file.read(4), 'little')
-
-    points = np.zeros((point_size, 4), dtype=np.int32)
-    for i in range(point_size):
-        point = struct.unpack('<iiii', jcd_file.read(16))
-        points[i] = point
-
-    return points
+    return np.frombuffer(read_bytes(jcd_file, 16 * point_size), dtype='<i4').reshape(point_size, 4)
 
 def read_material(jcd_file) -> str:
     """读取材质名称
@@ -105,30 +113,32 @@ def read_curve_type(jcd_file) -> CurveType:
     curve_type = CurveType(int.from_bytes(jcd_file.read(1), 'little'))
     return curve_type
 
-def read_matrix_by_type(jcd_file, type: SurfaceType) -> np.ndarray:
+# 每种类型记录开头的矩阵数量
+MATRIX_COUNT_MAP = {
+    SurfaceType.CURVE: 2,
+    SurfaceType.SURFACE: 2,
+    SurfaceType.FONT_SURFACE: 2,
+    SurfaceType.BOOL_SURFACE: 3,
+    SurfaceType.DIAMOND: 2,
+    SurfaceType.GUIDE_LINE: 1,
+    SurfaceType.QUAD_TYPE: 2,
+}
+
+def read_matrix_by_type(jcd_file, type: SurfaceType, return_padding: bool = False):
     """根据类型读取对应数量的矩阵
 
     Args:
         jcd_file: 文件对象
         type: 曲面类型
+        return_padding: 是否同时返回矩阵之间的填充字节
 
     Returns:
-        矩阵数组
+        矩阵数组；return_padding 为 True 时返回 (矩阵数组, 填充字节)
     """
-    matrix_count_map = {
-        SurfaceType.CURVE: 2,
-        SurfaceType.SURFACE: 2,
-        SurfaceType.FONT_SURFACE: 2,
-        SurfaceType.BOOL_SURFACE: 3,
-        SurfaceType.DIAMOND: 2,
-        SurfaceType.GUIDE_LINE: 1,
-        SurfaceType.QUAD_TYPE: 2,
-    }
-
-    matrix_count = matrix_count_map.get(type, 0)
+    matrix_count = MATRIX_COUNT_MAP.get(type, 0)
     if matrix_count > 0:
-        return read_matrix(jcd_file, matrix_count)
-    return np.array([])
+        return read_matrix(jcd_file, matrix_count, return_padding)
+    return (np.array([]), b'') if return_padding else np.array([])
 
 def read_curve(jcd_file) -> Dict[str, Any]:
     """读取曲线数据
@@ -152,9 +162,12 @@ def read_curve(jcd_file) -> Dict[str, Any]:
         'ring_count': ring_count,
         'original_point_count': original_point_count,
         'curve_type': curve_type,
-        # 'unknown_data': unkown_data
+        'unknown_data': unkown_data
     }
 
+# 曲面记录中各段未知字节的长度，按顺序拼接保存在 unknown_data 中
+SURFACE_UNKNOWN_SIZES = (7, 19, 11, 6)
+
 def read_surface(jcd_file) -> Dict[str, Any]:
     """读取曲面数据
 
@@ -171,11 +184,11 @@ def read_surface(jcd_file) -> Dict[str, Any]:
 
     unkown_data = jcd_file.read(7)
     is_path_closed = int.from_bytes(jcd_file.read(1), 'little') == 1
-    unkown_data = jcd_file.read(19)
+    unkown_data += jcd_file.read(19)
     is_cross_section_closed = int.from_bytes(jcd_file.read(1), 'little') == 1
-    unkown_data = jcd_file.read(11)
+    unkown_data += jcd_file.read(11)
     normal_direction = int.from_bytes(jcd_file.read(4), 'little', signed=True)
-    unkown_data = jcd_file.read(6)
+    unkown_data += jcd_file.read(6)
 
     return {
         'material_name': material_name,
@@ -186,7 +199,7 @@ def read_surface(jcd_file) -> Dict[str, Any]:
         'is_path_closed': is_path_closed,
         'is_cross_section_closed': is_cross_section_closed,
         'normal_direction': normal_direction,
-        # 'unknown_data': unkown_data
+        'unknown_data': unkown_data
     }
 
 def read_diamond(jcd_file) -> Dict[str, Any]:
@@ -199,6 +212,7 @@ def read_diamond(jcd_file) -> Dict[str, Any]:
         包含钻石数据的字典
     """
     material_name = read_material(jcd_file)
+    matrix_offset = jcd_file.tell()
     matrix = read_matrix(jcd_file, 1)
     diamond_type = DiamondType(int.from_bytes(jcd_file.read(1), 'little'))
     unkown_data = jcd_file.read(3)
@@ -206,8 +220,9 @@ def read_diamond(jcd_file) -> Dict[str, Any]:
     return {
         'material_name': material_name,
         'matrix': matrix,
+        'matrix_offset': matrix_offset,
         'diamond_type': diamond_type,
-        # 'unknown_data': unkown_data
+        'unknown_data': unkown_data
     }
 
 def read_font_surface(jcd_file) -> Dict[str, Any]:
@@ -220,6 +235,7 @@ def read_font_surface(jcd_file) -> Dict[str, Any]:
         包含字体面片数据的字典
     """
     material_name = read_material(jcd_file)
+    matrix_offset = jcd_file.tell()
     matrix = read_matrix(jcd_file, 1)
 
     outline_count = int.from_bytes(jcd_file.read(4), 'little')
@@ -231,24 +247,19 @@ def read_font_surface(jcd_file) -> Dict[str, Any]:
     thickness = struct.unpack('<f', jcd_file.read(4))[0]
     radius = struct.unpack('<f', jcd_file.read(4))[0]
 
-    # 读取轮廓大小
-    outline_sizes = np.zeros(outline_count, dtype=np.int32)
-    point_size = 0
-    for i in range(outline_count):
-        size = int.from_bytes(jcd_file.read(4), 'little')
-        unkown_data = jcd_file.read(4)
-        outline_sizes[i] = size
-        point_size += size
+    # 读取轮廓大小，每个大小之后跟随4个未知字节
+    outline_records = np.frombuffer(read_bytes(jcd_file, 8 * outline_count), dtype='<i4').reshape(outline_count, 2)
+    outline_sizes = outline_records[:, 0].astype(np.int32)
+    unkown_data = outline_records[:, 1].tobytes()
+    point_size = int(outline_sizes.sum())
 
     # 读取所有轮廓点
-    points = np.zeros((point_size, 3), dtype=np.float32)
-    for i in range(point_size):
-        point = struct.unpack('<fff', jcd_file.read(12))
-        points[i] = point
+    points = np.frombuffer(read_bytes(jcd_file, 12 * point_size), dtype='<f4').reshape(point_size, 3)
 
     return {
         'material_name': material_name,
         'matrix': matrix,
+        'matrix_offset': matrix_offset,
         'outline_count': outline_count,
         'type2': type2,
         'type3': type3,
@@ -258,7 +269,8 @@ def read_font_surface(jcd_file) -> Dict[str, Any]:
         'thickness': thickness,
         'radius': radius,
         'outline_sizes': outline_sizes,
-        'points': points
+        'points': points,
+        'unknown_data': unkown_data
     }
 
 def read_guide_line(jcd_file) -> Dict[str, Any]:
@@ -270,6 +282,7 @@ def read_guide_line(jcd_file) -> Dict[str, Any]:
     Returns:
         包含辅助线数据的字典
     """
+    matrix_offset = jcd_file.tell()
     matrix = read_matrix(jcd_file, 1)
     unkown_data1 = jcd_file.read(4)
     unkwon_data2 = int.from_bytes(jcd_file.read(4), 'little')
@@ -277,16 +290,18 @@ def read_guide_line(jcd_file) -> Dict[str, Any]:
 
     return {
         'matrix': matrix,
-        # 'unknown_data1': unkown_data1,
-        # 'unknown_data2': unkwon_data2,
-        # 'unknown_data3': unkown_data3
+        'matrix_offset': matrix_offset,
+        'unknown_data1': unkown_data1,
+        'unknown_data2': unkwon_data2,
+        'unknown_data3': unkown_data3
     }
 
-def read_bool_surface(jcd_file) -> Dict[str, Any]:
+def read_bool_surface(jcd_file, profiler=None) -> Dict[str, Any]:
     """读取布尔曲面数据
 
     Args:
         jcd_file: 文件对象
+        profiler: 可选的 LoadProfiler，子曲面的统计计入各自类型
 
     Returns:
         包含布尔曲面数据的字典
@@ -297,14 +312,16 @@ def read_bool_surface(jcd_file) -> Dict[str, Any]:
     unkown_data2 = jcd_file.read(7)
 
     # 递归读取子曲面
-    sub_surface_data = read_by_surface_type(jcd_file, surface_type)
+    sub_surface_offset = jcd_file.tell()
+    sub_surface_data = read_by_surface_type(jcd_file, surface_type, profiler)
 
     return {
         'bool_type': bool_type,
-        # 'unknown_data1': unkown_data1,
+        'unknown_data1': unkown_data1,
         'surface_type': surface_type,
-        # 'unknown_data2': unkown_data2,
-        'sub_surface': sub_surface_data
+        'unknown_data2': unkown_data2,
+        'sub_surface': sub_surface_data,
+        'sub_surface_offset': sub_surface_offset
     }
 
 def read_quad_type(jcd_file) -> Dict[str, Any]:
@@ -327,18 +344,22 @@ def read_quad_type(jcd_file) -> Dict[str, Any]:
     }
 
 
-def read_by_surface_type(jcd_file, surface_type: SurfaceType) -> Dict[str, Any]:
+def read_by_surface_type(jcd_file, surface_type: SurfaceType, profiler=None) -> Dict[str, Any]:
     """根据曲面类型读取对应数据
 
     Args:
         jcd_file: 文件对象
         surface_type: 曲面类型
+        profiler: 可选的 LoadProfiler，记录该类型的字节数、解码耗时和数组分配
 
     Returns:
         包含曲面数据的字典，包括矩阵和类型特定数据
     """
+    if profiler is not None:
+        profiler.begin_record(surface_type, jcd_file.tell())
+
     # 读取矩阵
-    matrices = read_matrix_by_type(jcd_file, surface_type)
+    matrices, matrix_padding = read_matrix_by_type(jcd_file, surface_type, return_padding=True)
 
     # 根据类型读取特定数据
     type_data = {}
@@ -348,7 +369,7 @@ def read_by_surface_type(jcd_file, surface_type: SurfaceType) -> Dict[str, Any]:
     elif surface_type == SurfaceType.SURFACE:
         type_data = read_surface(jcd_file)
     elif surface_type == SurfaceType.BOOL_SURFACE:
-        type_data = read_bool_surface(jcd_file)
+        type_data = read_bool_surface(jcd_file, profiler)
     elif surface_type == SurfaceType.DIAMOND:
         type_data = read_diamond(jcd_file)
     elif surface_type == SurfaceType.FONT_SURFACE:
@@ -357,14 +378,189 @@ def read_by_surface_type(jcd_file, surface_type: SurfaceType) -> Dict[str, Any]:
         type_data = read_guide_line(jcd_file)
     elif surface_type == SurfaceType.QUAD_TYPE:
         type_data = read_quad_type(jcd_file)
+    else:
+        logger.warning('unsupported surface type %s at offset %d', surface_type, jcd_file.tell())
 
     # 合并矩阵和类型数据
-    return {
+    entity_data = {
         'surface_type': surface_type,
         'matrices': matrices,
+        'matrix_padding': matrix_padding,
         **type_data
     }
 
+    if profiler is not None:
+        profiler.end_record(jcd_file.tell(), entity_data)
+    return entity_data
+
+def _get_fixed_bytes(data: Dict[str, Any], key: str, size: int) -> bytes:
+    """获取定长的未知字节，缺失时补零"""
+    value = data.get(key) or b''
+    return bytes(value[:size]).ljust(size, b'\0')
+
+def write_matrix(jcd_file, matrices: np.ndarray, matrix_count: int, padding: bytes = b'') -> None:
+    """写入矩阵数据，与 read_matrix 对应
+
+    矩阵不足 matrix_count 个时以单位矩阵补齐，矩阵之间的填充字节缺失时补零
+
+    Args:
+        jcd_file: 文件对象
+        matrices: 矩阵数组 (n, 4, 4)
+        matrix_count: 写入的矩阵数量
+        padding: 矩阵之间的填充字节
+    """
+    if matrix_count == 0:
+        return
+
+    matrices = np.asarray(matrices, dtype='<f4').reshape(-1, 4, 4)[:matrix_count]
+    if len(matrices) < matrix_count:
+        identities = np.tile(np.eye(4, dtype='<f4'), (matrix_count - len(matrices), 1, 1))
+        matrices = np.concatenate([matrices, identities])
+
+    records = np.zeros((matrix_count, 68), dtype=np.uint8)
+    records[:, :64] = matrices.reshape(matrix_count, 16).view(np.uint8)
+    padding = bytes(padding[:4 * (matrix_count - 1)]).ljust(4 * (matrix_count - 1), b'\0')
+    records[:-1, 64:] = np.frombuffer(padding, dtype=np.uint8).reshape(-1, 4)
+    jcd_file.write(records.tobytes()[:-4])
+
+def write_points(jcd_file, points: np.ndarray, dtype: str = '<f4') -> None:
+    """写入点数据，与 read_points / read_int_points 对应
+
+    Args:
+        jcd_file: 文件对象
+        points: 点数组 (n, 4)
+        dtype: 数据类型，浮点点为'<f4'，顶点索引为'<i4'
+    """
+    points = np.asarray(points, dtype=dtype).reshape(-1, 4)
+    jcd_file.write(len(points).to_bytes(4, 'little'))
+    jcd_file.write(points.tobytes())
+
+def write_material(jcd_file, material_name: str) -> None:
+    """写入材质名称"""
+    material_name = (material_name or '').encode('utf-8')
+    jcd_file.write(len(material_name).to_bytes(4, 'little'))
+    jcd_file.write(material_name)
+
+def write_curve_header(jcd_file, data: Dict[str, Any]) -> None:
+    """写入曲线和曲面共有的材质、控制点、环数量和曲线类型"""
+    write_material(jcd_file, data.get('material_name', ''))
+    write_points(jcd_file, data.get('points', np.zeros((0, 4))))
+    jcd_file.write(int(data.get('ring_count', 0)).to_bytes(4, 'little'))
+    jcd_file.write(int(data.get('original_point_count', 0)).to_bytes(4, 'little'))
+    curve_type = data.get('curve_type')
+    jcd_file.write(bytes([0 if curve_type is None else curve_type.value]))
+
+def write_curve(jcd_file, data: Dict[str, Any]) -> None:
+    """写入曲线数据，与 read_curve 对应"""
+    write_curve_header(jcd_file, data)
+    jcd_file.write(_get_fixed_bytes(data, 'unknown_data', 9))
+
+def write_surface(jcd_file, data: Dict[str, Any]) -> None:
+    """写入曲面数据，与 read_surface 对应"""
+    write_curve_header(jcd_file, data)
+
+    unknown_data = _get_fixed_bytes(data, 'unknown_data', sum(SURFACE_UNKNOWN_SIZES))
+    chunks = np.split(np.frombuffer(unknown_data, dtype=np.uint8), np.cumsum(SURFACE_UNKNOWN_SIZES)[:-1])
+    jcd_file.write(chunks[0].tobytes())
+    jcd_file.write(bytes([1 if data.get('is_path_closed', False) else 0]))
+    jcd_file.write(chunks[1].tobytes())
+    jcd_file.write(bytes([1 if data.get('is_cross_section_closed', False) else 0]))
+    jcd_file.write(chunks[2].tobytes())
+    jcd_file.write(int(data.get('normal_direction', 1)).to_bytes(4, 'little', signed=True))
+    jcd_file.write(chunks[3].tobytes())
+
+def write_diamond(jcd_file, data: Dict[str, Any]) -> None:
+    """写入钻石数据，与 read_diamond 对应"""
+    write_material(jcd_file, data.get('material_name', ''))
+    write_matrix(jcd_file, data.get('matrix', np.eye(4)), 1)
+    diamond_type = data.get('diamond_type')
+    jcd_file.write(bytes([0 if diamond_type is None else diamond_type.value]))
+    jcd_file.write(_get_fixed_bytes(data, 'unknown_data', 3))
+
+def write_font_surface(jcd_file, data: Dict[str, Any]) -> None:
+    """写入字体面片数据，与 read_font_surface 对应"""
+    write_material(jcd_file, data.get('material_name', ''))
+    write_matrix(jcd_file, data.get('matrix', np.eye(4)), 1)
+
+    outline_sizes = np.asarray(data.get('outline_sizes', []), dtype='<i4').reshape(-1)
+    foreground_type = data.get('foreground_type')
+    background_type = data.get('background_type')
+    jcd_file.write(np.array([
+        len(outline_sizes),
+        data.get('type2', 0),
+        data.get('type3', 0),
+        data.get('type4', 0),
+        0 if foreground_type is None else foreground_type.value,
+        0 if background_type is None else background_type.value,
+    ], dtype='<i4').tobytes())
+    jcd_file.write(np.array([data.get('thickness', 0.0), data.get('radius', 0.0)], dtype='<f4').tobytes())
+
+    outline_records = np.zeros((len(outline_sizes), 2), dtype='<i4')
+    outline_records[:, 0] = outline_sizes
+    unknown_data = _get_fixed_bytes(data, 'unknown_data', 4 * len(outline_sizes))
+    outline_records[:, 1] = np.frombuffer(unknown_data, dtype='<i4')
+    jcd_file.write(outline_records.tobytes())
+
+    jcd_file.write(np.asarray(data.get('points', np.zeros((0, 3))), dtype='<f4').reshape(-1, 3).tobytes())
+
+def write_guide_line(jcd_file, data: Dict[str, Any]) -> None:
+    """写入辅助线数据，与 read_guide_line 对应"""
+    write_matrix(jcd_file, data.get('matrix', np.eye(4)), 1)
+    jcd_file.write(_get_fixed_bytes(data, 'unknown_data1', 4))
+    jcd_file.write(int(data.get('unknown_data2', 0)).to_bytes(4, 'little'))
+    jcd_file.write(int(data.get('unknown_data3', 0)).to_bytes(4, 'little'))
+
+def write_bool_header(jcd_file, data: Dict[str, Any], sub_surface_type: SurfaceType) -> None:
+    """写入布尔曲面中子曲面之前的布尔类型、子曲面类型和未知字节"""
+    bool_type = data.get('bool_type')
+    jcd_file.write(bytes([BoolType.UNION.value if bool_type is None else bool_type.value]))
+    jcd_file.write(_get_fixed_bytes(data, 'unknown_data1', 2))
+    jcd_file.write(bytes([sub_surface_type.value]))
+    jcd_file.write(_get_fixed_bytes(data, 'unknown_data2', 7))
+
+def write_bool_surface(jcd_file, data: Dict[str, Any]) -> None:
+    """写入布尔曲面数据，与 read_bool_surface 对应"""
+    sub_surface_data = data['sub_surface']
+    write_bool_header(jcd_file, data, sub_surface_data['surface_type'])
+
+    # 递归写入子曲面
+    write_by_surface_type(jcd_file, sub_surface_data)
+
+def write_quad_type(jcd_file, data: Dict[str, Any]) -> None:
+    """写入四边形面片数据，与 read_quad_type 对应"""
+    write_material(jcd_file, data.get('material_name', ''))
+    write_points(jcd_file, data.get('points', np.zeros((0, 4))))
+    write_points(jcd_file, data.get('indices', np.zeros((0, 4))), dtype='<i4')
+
+
+def write_by_surface_type(jcd_file, data: Dict[str, Any]) -> None:
+    """根据曲面类型写入对应数据，与 read_by_surface_type 对应
+
+    Args:
+        jcd_file: 文件对象
+        data: 曲面数据字典，必须包含 surface_type
+    """
+    surface_type = data['surface_type']
+
+    write_matrix(jcd_file, data.get('matrices', ()), MATRIX_COUNT_MAP.get(surface_type, 0), data.get('matrix_padding', b''))
+
+    if surface_type == SurfaceType.CURVE:
+        write_curve(jcd_file, data)
+    elif surface_type == SurfaceType.SURFACE:
+        write_surface(jcd_file, data)
+    elif surface_type == SurfaceType.BOOL_SURFACE:
+        write_bool_surface(jcd_file, data)
+    elif surface_type == SurfaceType.DIAMOND:
+        write_diamond(jcd_file, data)
+    elif surface_type == SurfaceType.FONT_SURFACE:
+        write_font_surface(jcd_file, data)
+    elif surface_type == SurfaceType.GUIDE_LINE:
+        write_guide_line(jcd_file, data)
+    elif surface_type == SurfaceType.QUAD_TYPE:
+        write_quad_type(jcd_file, data)
+    else:
+        raise ValueError(f"unsupported surface type: {surface_type}")
+
 def save_entities_to_text(all_entities: List[Dict[str, Any]], file_path: str) -> bool:
     """将实体数据保存到文本文件"""
     with open(file_path, 'w', encoding='utf-8') as f:
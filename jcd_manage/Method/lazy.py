@@ -0,0 +1,40 @@
+import sys
+import importlib.util
+from types import ModuleType
+
+
+class MissingModule(ModuleType):
+    """未安装的可选依赖，首次访问属性时才抛出ImportError"""
+
+    def __init__(self, module_name: str):
+        super().__init__(module_name)
+        self.__dict__['_missing_module_name'] = module_name
+
+    def __getattr__(self, name):
+        raise ImportError(f"module '{self._missing_module_name}' is required but not installed")
+
+
+def lazy_import(module_name: str) -> ModuleType:
+    """延迟导入模块，直到首次访问其属性时才真正执行导入
+
+    用于open3d等导入开销很大、只在渲染时才需要的依赖。
+
+    Args:
+        module_name: 模块名
+
+    Returns:
+        模块对象（可能尚未执行）
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        return MissingModule(module_name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
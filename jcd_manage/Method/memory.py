@@ -0,0 +1,242 @@
+"""JCD内存统计模块
+
+统计实体占用的numpy缓冲区字节数（共享同一缓冲区的数组只计一次）和估算的Python对象开销，
+按实体类、材质和布尔曲面DAG分类，并标记被提升为float64的数组和内容重复的数组。
+"""
+import sys
+import mmap
+import hashlib
+import numpy as np
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from jcd_manage.Data import JCDBaseData, JCDBoolSurface
+from jcd_manage.Data.dag import CSGDAG, Node, PrimitiveSurface
+
+
+# 文件中以float32存储的字段，float64说明被提升过
+FLOAT32_FIELDS = ('points', 'matrices', 'matrix')
+
+
+def _get_buffer_owner(array: np.ndarray):
+    """获取数组最终引用的缓冲区对象"""
+    base = array
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    return base if base.base is None else base.base
+
+
+def _get_buffer_size(owner) -> int:
+    if isinstance(owner, np.ndarray):
+        return owner.nbytes
+    if isinstance(owner, memoryview):
+        return owner.nbytes
+    return len(owner)
+
+
+class MemoryAccountant(object):
+    """内存统计器，记录已统计的对象和缓冲区，保证共享的数据只计一次"""
+
+    def __init__(self, check_duplicates: bool = True, min_duplicate_bytes: int = 1024):
+        self.check_duplicates = check_duplicates
+        self.min_duplicate_bytes = min_duplicate_bytes
+        self.visited_object_ids = set()
+        self.buffer_ids = set()
+        self.array_indices: Dict[int, Optional[int]] = {}  # 已统计数组的 id -> 首次引用它的实体序号
+        # 保持缓冲区对象存活，避免统计过程中 id 被复用
+        self.buffer_owners = []
+        self.mapped_bytes = 0
+        self.shared_array_bytes = 0
+        self.upcast_arrays: List[Dict[str, Any]] = []
+        self.array_digests: Dict[Tuple, List[Dict[str, Any]]] = {}
+
+    def add_array(self, array: np.ndarray, location: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+        """统计数组，返回 (对象头字节数, 新统计的缓冲区字节数)"""
+        header_bytes = sys.getsizeof(array) - (array.nbytes if array.flags.owndata else 0)
+        index = None if location is None else location['index']
+        if id(array) in self.array_indices:
+            # 同一实体的状态快照引用自身的数组不算共享
+            if self.array_indices[id(array)] != index:
+                self.shared_array_bytes += array.nbytes
+            return 0, 0
+        self.array_indices[id(array)] = index
+
+        if location is not None and array.dtype == np.float64 and location['field'] in FLOAT32_FIELDS:
+            self.upcast_arrays.append({**location, 'dtype': str(array.dtype), 'nbytes': array.nbytes,
+                                       'wasted_bytes': array.nbytes // 2})
+
+        owner = _get_buffer_owner(array)
+        if id(owner) in self.buffer_ids:
+            self.shared_array_bytes += array.nbytes
+            return header_bytes, 0
+        self.buffer_ids.add(id(owner))
+        self.buffer_owners.append(owner)
+
+        if location is not None and self.check_duplicates and array.nbytes >= self.min_duplicate_bytes:
+            digest = hashlib.blake2b(np.ascontiguousarray(array).view(np.uint8).reshape(-1), digest_size=16).digest()
+            self.array_digests.setdefault((str(array.dtype), array.shape, digest), []).append(
+                {**location, 'nbytes': array.nbytes}
+            )
+
+        buffer_size = _get_buffer_size(owner)
+        # 文件映射的缓冲区由页缓存承担，不计入进程私有内存
+        if isinstance(owner, mmap.mmap):
+            self.mapped_bytes += buffer_size
+            return header_bytes, 0
+        return header_bytes, buffer_size
+
+    def add_value(self, value, location: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+        """递归统计属性值，返回 (对象字节数, 缓冲区字节数)；实体和DAG由调用方单独统计"""
+        if value is None or isinstance(value, (bool, Enum, JCDBaseData, CSGDAG, Node)):
+            return 0, 0
+        if isinstance(value, np.ndarray):
+            return self.add_array(value, location)
+        if id(value) in self.visited_object_ids:
+            return 0, 0
+        self.visited_object_ids.add(id(value))
+
+        object_bytes = sys.getsizeof(value)
+        array_bytes = 0
+        if isinstance(value, dict):
+            items = list(value.keys()) + list(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            items = value
+        else:
+            items = ()
+        for item in items:
+            item_object_bytes, item_array_bytes = self.add_value(item, location)
+            object_bytes += item_object_bytes
+            array_bytes += item_array_bytes
+        return object_bytes, array_bytes
+
+    def add_entity(self, entity: JCDBaseData, index: int) -> Tuple[int, int]:
+        """统计实体自身的属性（不含布尔曲面的DAG），返回 (对象字节数, 缓冲区字节数)"""
+        if id(entity) in self.visited_object_ids:
+            return 0, 0
+        self.visited_object_ids.add(id(entity))
+
+        object_bytes = sys.getsizeof(entity) + sys.getsizeof(vars(entity))
+        array_bytes = 0
+        for name, value in vars(entity).items():
+            location = {'index': index, 'class': entity.__class__.__name__, 'field': name}
+            value_object_bytes, value_array_bytes = self.add_value(value, location)
+            object_bytes += value_object_bytes
+            array_bytes += value_array_bytes
+        return object_bytes, array_bytes
+
+    def add_dag(self, dag: CSGDAG) -> int:
+        """统计DAG容器和节点对象本身（不含原始曲面实体），返回对象字节数"""
+        if id(dag) in self.visited_object_ids:
+            return 0
+        self.visited_object_ids.add(id(dag))
+
+        object_bytes = sys.getsizeof(dag) + self.add_value(vars(dag))[0]
+        for node in dag.nodes.values():
+            if id(node) in self.visited_object_ids:
+                continue
+            self.visited_object_ids.add(id(node))
+            object_bytes += sys.getsizeof(node) + self.add_value(vars(node))[0]
+        return object_bytes
+
+    def get_duplicated_arrays(self) -> List[Dict[str, Any]]:
+        """内容相同但缓冲区不同的数组组"""
+        duplicated_arrays = []
+        for locations in self.array_digests.values():
+            if len(locations) < 2:
+                continue
+            duplicated_arrays.append({
+                'nbytes': locations[0]['nbytes'],
+                'wasted_bytes': locations[0]['nbytes'] * (len(locations) - 1),
+                'locations': [
+                    {key: location[key] for key in ('index', 'class', 'field')} for location in locations
+                ],
+            })
+        duplicated_arrays.sort(key=lambda item: -item['wasted_bytes'])
+        return duplicated_arrays
+
+
+def _add_breakdown(breakdown: Dict[str, Dict[str, int]], key: str, object_bytes: int, array_bytes: int):
+    item = breakdown.setdefault(key, {'count': 0, 'object_bytes': 0, 'array_bytes': 0})
+    item['count'] += 1
+    item['object_bytes'] += object_bytes
+    item['array_bytes'] += array_bytes
+
+
+def get_memory_report(
+    objects: List[JCDBaseData],
+    check_duplicates: bool = True,
+    min_duplicate_bytes: int = 1024,
+) -> Dict[str, Any]:
+    """统计实体列表的内存占用
+
+    Args:
+        objects: 顶层实体列表
+        check_duplicates: 是否通过内容哈希查找重复数组
+        min_duplicate_bytes: 参与重复检查的最小数组字节数
+
+    Returns:
+        {
+            'total_bytes', 'object_bytes', 'array_bytes', 'mapped_bytes', 'shared_array_bytes',
+            'by_class': {类名: {'count', 'object_bytes', 'array_bytes'}}（布尔曲面包含其DAG和原始曲面）,
+            'by_material': {材质: {...}}（按原始曲面统计，布尔曲面自身和DAG计入空材质）,
+            'bool_dags': [{'index', 'node_count', 'primitive_count', 'node_object_bytes',
+                           'primitive_object_bytes', 'primitive_array_bytes'}],
+            'upcast_arrays': [{'index', 'class', 'field', 'dtype', 'nbytes', 'wasted_bytes'}],
+            'duplicated_arrays': [{'nbytes', 'wasted_bytes', 'locations': [{'index', 'class', 'field'}]}],
+        }
+    """
+    accountant = MemoryAccountant(check_duplicates, min_duplicate_bytes)
+
+    by_class: Dict[str, Dict[str, int]] = {}
+    by_material: Dict[str, Dict[str, int]] = {}
+    bool_dags = []
+    object_bytes = sys.getsizeof(objects)
+    array_bytes = 0
+
+    for index, obj in enumerate(objects):
+        entity_object_bytes, entity_array_bytes = accountant.add_entity(obj, index)
+        class_object_bytes, class_array_bytes = entity_object_bytes, entity_array_bytes
+
+        if isinstance(obj, JCDBoolSurface):
+            dag_info = {
+                'index': index,
+                'node_count': len(obj.dag.nodes),
+                'primitive_count': 0,
+                'node_object_bytes': accountant.add_dag(obj.dag),
+                'primitive_object_bytes': 0,
+                'primitive_array_bytes': 0,
+            }
+            entity_object_bytes += dag_info['node_object_bytes']
+            for node in obj.dag.nodes.values():
+                if not isinstance(node, PrimitiveSurface):
+                    continue
+                primitive_object_bytes, primitive_array_bytes = accountant.add_entity(node.surface_data, index)
+                dag_info['primitive_count'] += 1
+                dag_info['primitive_object_bytes'] += primitive_object_bytes
+                dag_info['primitive_array_bytes'] += primitive_array_bytes
+                _add_breakdown(
+                    by_material, getattr(node.surface_data, 'material_name', ''),
+                    primitive_object_bytes, primitive_array_bytes,
+                )
+            bool_dags.append(dag_info)
+
+            class_object_bytes = entity_object_bytes + dag_info['primitive_object_bytes']
+            class_array_bytes = entity_array_bytes + dag_info['primitive_array_bytes']
+
+        _add_breakdown(by_class, obj.__class__.__name__, class_object_bytes, class_array_bytes)
+        _add_breakdown(by_material, getattr(obj, 'material_name', ''), entity_object_bytes, entity_array_bytes)
+        object_bytes += class_object_bytes
+        array_bytes += class_array_bytes
+
+    return {
+        'total_bytes': object_bytes + array_bytes,
+        'object_bytes': object_bytes,
+        'array_bytes': array_bytes,
+        'mapped_bytes': accountant.mapped_bytes,
+        'shared_array_bytes': accountant.shared_array_bytes,
+        'by_class': by_class,
+        'by_material': by_material,
+        'bool_dags': bool_dags,
+        'upcast_arrays': accountant.upcast_arrays,
+        'duplicated_arrays': accountant.get_duplicated_arrays(),
+    }
@@ -0,0 +1,622 @@
+"""JCD网格构建模块
+
+将JCD实体转换为三角网格，网格统一以 (vertices, triangles) 元组表示：
+vertices 为 (n, 3) 的 float64 数组，triangles 为 (m, 3) 的 int64 数组。
+"""
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from jcd_manage.Config.types import DiamondType
+from jcd_manage.Data.jcd_diamond import JCDDiamond
+from jcd_manage.Data.jcd_font_surface import JCDFontSurface
+from jcd_manage.Method.triangulate import get_signed_areas, group_outlines, triangulate_polygon
+
+
+def create_empty_mesh() -> Tuple[np.ndarray, np.ndarray]:
+    """创建空网格"""
+    return np.zeros((0, 3), dtype=np.float64), np.zeros((0, 3), dtype=np.int64)
+
+
+def merge_meshes(meshes: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """合并多个网格为一个网格
+
+    Args:
+        meshes: (vertices, triangles) 列表
+
+    Returns:
+        合并后的 (vertices, triangles)
+    """
+    meshes = [mesh for mesh in meshes if len(mesh[0]) > 0]
+    if len(meshes) == 0:
+        return create_empty_mesh()
+
+    vertex_counts = np.array([len(vertices) for vertices, _ in meshes], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(vertex_counts)[:-1]])
+
+    vertices = np.concatenate([mesh[0] for mesh in meshes], axis=0).astype(np.float64, copy=False)
+    triangles = np.concatenate(
+        [mesh[1].astype(np.int64, copy=False) + offset for mesh, offset in zip(meshes, offsets)],
+        axis=0,
+    )
+    return vertices, triangles
+
+
+def _get_plane_basis(points: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """使用Newell法估计轮廓平面，返回 (u, v, normal) 正交基，满足 u x v = normal"""
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    index = np.arange(len(points))
+    next_index = index + 1
+    next_index[starts + sizes - 1] = starts
+
+    current = points
+    following = points[next_index]
+    segment_normals = np.stack([
+        (current[:, 1] - following[:, 1]) * (current[:, 2] + following[:, 2]),
+        (current[:, 2] - following[:, 2]) * (current[:, 0] + following[:, 0]),
+        (current[:, 0] - following[:, 0]) * (current[:, 1] + following[:, 1]),
+    ], axis=1)
+    outline_normals = np.add.reduceat(segment_normals, starts, axis=0)
+
+    # 使用面积最大的轮廓决定平面法向
+    lengths = np.linalg.norm(outline_normals, axis=1)
+    normal = outline_normals[int(np.argmax(lengths))] if len(lengths) > 0 else np.zeros(3)
+    norm = np.linalg.norm(normal)
+    if norm < 1e-12:
+        normal = np.array([0.0, 0.0, 1.0])
+    else:
+        normal = normal / norm
+
+    # 法向尽量与局部Z轴同向
+    if normal[2] < 0:
+        normal = -normal
+
+    helper = np.array([1.0, 0.0, 0.0]) if abs(normal[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    u = helper - np.dot(helper, normal) * normal
+    u /= np.linalg.norm(u)
+    v = np.cross(normal, u)
+    return u, v, normal
+
+
+def _clean_outlines(points: np.ndarray, outline_sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """去除轮廓中连续重复的点以及与首点重复的闭合点"""
+    sizes = np.asarray(outline_sizes, dtype=np.int64)
+    total = int(np.sum(sizes))
+    points = points[:total]
+    if total == 0:
+        return points, sizes
+
+    outline_ids = np.repeat(np.arange(len(sizes)), sizes)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    ends = starts + sizes - 1
+
+    keep = np.ones(total, dtype=bool)
+    same_as_prev = np.zeros(total, dtype=bool)
+    same_as_prev[1:] = np.all(points[1:] == points[:-1], axis=1) & (outline_ids[1:] == outline_ids[:-1])
+    keep &= ~same_as_prev
+
+    # 尾点与首点重合时去除尾点
+    non_empty = sizes > 1
+    closing = np.all(points[ends[non_empty]] == points[starts[non_empty]], axis=1)
+    keep[ends[non_empty][closing]] = False
+
+    new_sizes = np.bincount(outline_ids[keep], minlength=len(sizes)).astype(np.int64)
+    return points[keep], new_sizes
+
+
+def create_font_surface_mesh(
+    font_surface: JCDFontSurface,
+    thickness: float = None,
+    apply_matrix: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """将字体面片三角化并拉伸为封闭网格
+
+    所有轮廓在一次批处理中完成：轮廓面积、侧壁索引与矩阵变换均为向量化计算，
+    只有顶/底面的耳切三角化按外轮廓逐个执行。顶面、底面与侧壁共享轮廓顶点，
+    因此在 thickness 非零时得到水密网格。
+
+    侧壁始终为垂直于轮廓平面的直壁：radius 以及 foreground_type/background_type
+    指定的倒角、圆角边缘轮廓暂不生成，结果与 BlockType.ANGLE 一致。
+
+    Args:
+        font_surface: JCDFontSurface对象
+        thickness: 拉伸厚度，默认使用字体面片自身的thickness
+        apply_matrix: 是否应用字体面片的变换（自身matrix和继承的matrices），
+            与 get_transformed_points 使用同一个 apply_transform，为 False 时为局部坐标
+
+    Returns:
+        (vertices, triangles)
+    """
+    if thickness is None:
+        thickness = float(font_surface.thickness)
+
+    points = font_surface.get_points()
+    if points is None or len(font_surface.outline_sizes) == 0:
+        return create_empty_mesh()
+
+    points, sizes = _clean_outlines(np.asarray(points, dtype=np.float64), font_surface.outline_sizes)
+    valid_outlines = sizes >= 3
+    if not np.any(valid_outlines):
+        return create_empty_mesh()
+
+    # 去掉点数不足的轮廓
+    outline_ids = np.repeat(np.arange(len(sizes)), sizes)
+    points = points[valid_outlines[outline_ids]]
+    sizes = sizes[valid_outlines]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+    # 投影到轮廓平面
+    u, v, normal = _get_plane_basis(points, sizes)
+    coords = np.stack([points @ u, points @ v], axis=1)
+
+    # 统一方向：外轮廓逆时针，洞顺时针
+    outlines_2d = [coords[start:start + size] for start, size in zip(starts, sizes)]
+    groups = group_outlines(outlines_2d)
+    areas = get_signed_areas(coords, sizes)
+
+    is_hole = np.zeros(len(sizes), dtype=bool)
+    for _, holes in groups:
+        is_hole[holes] = True
+    flip = np.where(is_hole, areas > 0, areas < 0)
+
+    order = np.arange(len(points))
+    for k in np.where(flip)[0]:
+        order[starts[k]:starts[k] + sizes[k]] = order[starts[k]:starts[k] + sizes[k]][::-1]
+    points = points[order]
+    coords = coords[order]
+
+    # 顶/底面三角化
+    caps = []
+    for outer, holes in groups:
+        outer_index = np.arange(starts[outer], starts[outer] + sizes[outer])
+        hole_indices = [np.arange(starts[h], starts[h] + sizes[h]) for h in holes]
+        caps.append(triangulate_polygon(coords, outer_index, hole_indices))
+    cap_triangles = np.concatenate(caps, axis=0) if caps else np.zeros((0, 3), dtype=np.int64)
+
+    point_count = len(points)
+    if thickness == 0:
+        vertices = points
+        triangles = cap_triangles
+    else:
+        offset = normal * thickness
+        vertices = np.concatenate([points, points + offset], axis=0)
+
+        # 侧壁：每条轮廓边生成一个四边形
+        index = np.arange(point_count, dtype=np.int64)
+        next_index = index + 1
+        next_index[starts + sizes - 1] = starts
+        walls = np.concatenate([
+            np.stack([index, next_index, next_index + point_count], axis=1),
+            np.stack([index, next_index + point_count, index + point_count], axis=1),
+        ], axis=0)
+
+        triangles = np.concatenate([
+            cap_triangles[:, ::-1],
+            cap_triangles + point_count,
+            walls,
+        ], axis=0)
+
+        # 负厚度时拉伸方向相反，需要翻转所有面片
+        if thickness < 0:
+            triangles = triangles[:, ::-1]
+
+    if apply_matrix:
+        vertices = np.asarray(font_surface.apply_transform(vertices), dtype=np.float64)
+
+    return vertices, np.ascontiguousarray(triangles, dtype=np.int64)
+
+
+def create_font_surfaces_mesh(
+    font_surfaces: List[JCDFontSurface],
+    apply_matrix: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """批量将多个字体面片转换为一个合并网格
+
+    Args:
+        font_surfaces: JCDFontSurface对象列表
+        apply_matrix: 是否应用各字体面片的变换
+
+    Returns:
+        合并后的 (vertices, triangles)
+    """
+    meshes = [
+        create_font_surface_mesh(font_surface, apply_matrix=apply_matrix)
+        for font_surface in font_surfaces
+    ]
+    return merge_meshes(meshes)
+
+
+def _get_girdle_outline(diamond_type: DiamondType) -> np.ndarray:
+    """获取钻石腰线轮廓（逆时针，位于局部XY平面，最大半径为1）"""
+    if diamond_type == DiamondType.MARQUISE:
+        # 两段圆弧相交的榄尖形，长宽比2:1
+        angles = np.linspace(np.arctan2(0.75, 1.0), np.arctan2(0.75, -1.0), 17)[:-1]
+        upper = np.stack([1.25 * np.cos(angles), 1.25 * np.sin(angles) - 0.75], axis=1)
+        outline = np.concatenate([upper, -upper], axis=0)
+    elif diamond_type == DiamondType.PEAR:
+        # 水滴形，尖端朝+X
+        t = np.linspace(0.0, 2.0 * np.pi, 32, endpoint=False)
+        outline = np.stack([np.cos(t), 0.65 * np.sin(t) * np.sin(t / 2.0)], axis=1)
+    elif diamond_type == DiamondType.HEART:
+        t = np.linspace(0.0, 2.0 * np.pi, 32, endpoint=False)
+        x = 16.0 * np.sin(t) ** 3
+        y = 13.0 * np.cos(t) - 5.0 * np.cos(2.0 * t) - 2.0 * np.cos(3.0 * t) - np.cos(4.0 * t)
+        outline = np.stack([x, y], axis=1)[::-1]
+    elif diamond_type == DiamondType.OCTAGON:
+        t = np.linspace(0.0, 2.0 * np.pi, 8, endpoint=False) + np.pi / 8.0
+        outline = np.stack([np.cos(t), np.sin(t)], axis=1)
+    elif diamond_type == DiamondType.SQUARE:
+        t = np.linspace(0.0, 2.0 * np.pi, 4, endpoint=False) + np.pi / 4.0
+        outline = np.stack([np.cos(t), np.sin(t)], axis=1)
+    elif diamond_type == DiamondType.TRIANGLE:
+        t = np.linspace(0.0, 2.0 * np.pi, 3, endpoint=False) + np.pi / 2.0
+        outline = np.stack([np.cos(t), np.sin(t)], axis=1)
+    else:
+        t = np.linspace(0.0, 2.0 * np.pi, 32, endpoint=False)
+        outline = np.stack([np.cos(t), np.sin(t)], axis=1)
+
+    # 居中并归一化到单位半径
+    outline = outline - (np.max(outline, axis=0) + np.min(outline, axis=0)) / 2.0
+    outline = outline / np.max(np.linalg.norm(outline, axis=1))
+    return outline
+
+
+@lru_cache(maxsize=None)
+def create_diamond_prototype(diamond_type: Optional[DiamondType]) -> Tuple[np.ndarray, np.ndarray]:
+    """创建指定钻石类型的切割原型网格（带缓存）
+
+    原型位于局部坐标系，台面朝+Z，腰线最大半径为1，与此前的单位球占位尺寸一致。
+    由台面、冠部、腰部和亭部组成的封闭网格，返回的数组为只读共享数据。
+
+    Args:
+        diamond_type: 钻石类型，None按圆形处理
+
+    Returns:
+        (vertices, triangles)
+    """
+    outline = _get_girdle_outline(diamond_type)
+    count = len(outline)
+
+    table_ratio = 0.55
+    crown_height = 0.3
+    girdle_half_height = 0.02
+    pavilion_depth = 0.86
+
+    center = np.mean(outline, axis=0)
+    table = center + (outline - center) * table_ratio
+    zeros = np.zeros((count, 1))
+
+    vertices = np.concatenate([
+        np.hstack([table, zeros + crown_height]),
+        np.hstack([outline, zeros + girdle_half_height]),
+        np.hstack([outline, zeros - girdle_half_height]),
+        [[center[0], center[1], -pavilion_depth]],
+    ], axis=0)
+
+    index = np.arange(count, dtype=np.int64)
+    next_index = (index + 1) % count
+    table_ids, upper_ids, lower_ids = index, index + count, index + 2 * count
+    culet_id = 3 * count
+
+    def _ring_band(bottom, top):
+        return np.concatenate([
+            np.stack([bottom, bottom[next_index], top[next_index]], axis=1),
+            np.stack([bottom, top[next_index], top], axis=1),
+        ], axis=0)
+
+    triangles = np.concatenate([
+        triangulate_polygon(vertices[:, :2], table_ids),
+        _ring_band(upper_ids, table_ids),
+        _ring_band(lower_ids, upper_ids),
+        np.stack([lower_ids[next_index], lower_ids, np.full(count, culet_id)], axis=1),
+    ], axis=0)
+
+    vertices.setflags(write=False)
+    triangles.setflags(write=False)
+    return vertices, triangles
+
+
+def get_diamond_matrices(diamonds: List[JCDDiamond]) -> np.ndarray:
+    """堆叠钻石的变换矩阵
+
+    Args:
+        diamonds: JCDDiamond对象列表
+
+    Returns:
+        矩阵数组 (n, 4, 4)
+    """
+    if len(diamonds) == 0:
+        return np.zeros((0, 4, 4), dtype=np.float64)
+    return np.stack([diamond.matrix for diamond in diamonds]).astype(np.float64, copy=False)
+
+
+def get_placed_diamond_matrices(diamonds: List[JCDDiamond]) -> np.ndarray:
+    """钻石在场景中的实例矩阵（行向量约定），与 tessellate_entity 的放置方式一致
+
+    自身 matrix（行向量约定）之后再应用实体的 apply_transform（继承的第一个 matrices，列向量约定），
+    合并为一个行向量矩阵，可直接用于 instance_mesh，平移行即钻石中心。
+
+    Args:
+        diamonds: JCDDiamond对象列表
+
+    Returns:
+        矩阵数组 (n, 4, 4)
+    """
+    matrices = get_diamond_matrices(diamonds).copy()
+    # instance_mesh 只使用前3列，第4列按仿射矩阵处理
+    matrices[:, :3, 3] = 0.0
+    matrices[:, 3, 3] = 1.0
+    for i, diamond in enumerate(diamonds):
+        if len(diamond.matrices) > 0:
+            matrices[i] = matrices[i] @ np.asarray(diamond.matrices[0], dtype=np.float64).T
+    return matrices
+
+
+def group_diamonds_by_type(diamonds: List[JCDDiamond]) -> Dict[Optional[DiamondType], np.ndarray]:
+    """按钻石类型分组并堆叠变换矩阵
+
+    Args:
+        diamonds: JCDDiamond对象列表
+
+    Returns:
+        {钻石类型: 矩阵数组 (n, 4, 4)}
+    """
+    grouped = {}
+    for diamond in diamonds:
+        grouped.setdefault(diamond.diamond_type, []).append(diamond)
+    return {
+        diamond_type: get_diamond_matrices(members)
+        for diamond_type, members in grouped.items()
+    }
+
+
+def instance_mesh(
+    vertices: np.ndarray,
+    triangles: np.ndarray,
+    matrices: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """通过一次批量矩阵变换将原型网格实例化到多个变换矩阵
+
+    Args:
+        vertices: 原型顶点 (v, 3)
+        triangles: 原型三角形 (t, 3)
+        matrices: 实例矩阵 (n, 4, 4)，行向量约定
+
+    Returns:
+        合并后的 (vertices, triangles)，形状分别为 (n*v, 3) 与 (n*t, 3)
+    """
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    instance_count = len(matrices)
+    if instance_count == 0 or len(vertices) == 0:
+        return create_empty_mesh()
+
+    instanced_vertices = np.matmul(vertices[None, :, :], matrices[:, :3, :3]) + matrices[:, None, 3, :3]
+    offsets = np.arange(instance_count, dtype=np.int64)[:, None, None] * len(vertices)
+    instanced_triangles = triangles[None, :, :] + offsets
+
+    return instanced_vertices.reshape(-1, 3), instanced_triangles.reshape(-1, 3)
+
+
+def create_diamond_mesh(diamond: JCDDiamond) -> Tuple[np.ndarray, np.ndarray]:
+    """创建单个钻石的网格
+
+    Args:
+        diamond: JCDDiamond对象
+
+    Returns:
+        (vertices, triangles)
+    """
+    vertices, triangles = create_diamond_prototype(diamond.diamond_type)
+    return instance_mesh(vertices, triangles, diamond.matrix)
+
+
+def create_diamonds_mesh(diamonds: List[JCDDiamond]) -> Tuple[np.ndarray, np.ndarray]:
+    """批量创建钻石合并网格，每种钻石类型只做一次批量实例化
+
+    Args:
+        diamonds: JCDDiamond对象列表
+
+    Returns:
+        合并后的 (vertices, triangles)
+    """
+    meshes = []
+    for diamond_type, matrices in group_diamonds_by_type(diamonds).items():
+        vertices, triangles = create_diamond_prototype(diamond_type)
+        meshes.append(instance_mesh(vertices, triangles, matrices))
+    return merge_meshes(meshes)
+
+
+def create_empty_lines() -> Tuple[np.ndarray, np.ndarray]:
+    """创建空线集"""
+    return np.zeros((0, 3), dtype=np.float64), np.zeros((0, 2), dtype=np.int64)
+
+
+def merge_lines(line_sets: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """合并多个线集为一个线集
+
+    Args:
+        line_sets: (points, lines) 列表
+
+    Returns:
+        合并后的 (points, lines)
+    """
+    line_sets = [line_set for line_set in line_sets if len(line_set[1]) > 0]
+    if len(line_sets) == 0:
+        return create_empty_lines()
+
+    point_counts = np.array([len(points) for points, _ in line_sets], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(point_counts)[:-1]])
+
+    points = np.concatenate([line_set[0] for line_set in line_sets], axis=0).astype(np.float64, copy=False)
+    lines = np.concatenate(
+        [line_set[1].astype(np.int64, copy=False) + offset for line_set, offset in zip(line_sets, offsets)],
+        axis=0,
+    )
+    return points, lines
+
+
+def _get_closed_ring_lines(sizes: np.ndarray) -> np.ndarray:
+    """为首尾相接存储的多条闭合折线生成线段索引"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    index = np.arange(int(np.sum(sizes)), dtype=np.int64)
+    next_index = index + 1
+    valid = sizes > 0
+    next_index[(starts + sizes - 1)[valid]] = starts[valid]
+    return np.stack([index, next_index], axis=1)
+
+
+def create_curve_lines(curve) -> Tuple[np.ndarray, np.ndarray]:
+    """创建曲线的线集数据
+
+    Args:
+        curve: JCDCurve对象
+
+    Returns:
+        (points, lines)
+    """
+    points = curve.get_points()
+    if points is None or len(points) < 2:
+        return create_empty_lines()
+
+    index = np.arange(len(points) - 1, dtype=np.int64)
+    lines = np.stack([index, index + 1], axis=1)
+
+    # 如果是闭合曲线，连接首尾
+    if curve.is_closed() and len(points) > 2:
+        lines = np.vstack([lines, [[len(points) - 1, 0]]])
+
+    return points, lines
+
+
+def create_surface_lines(surface) -> Tuple[np.ndarray, np.ndarray]:
+    """创建曲面控制网格的线集数据（U方向与V方向）
+
+    Args:
+        surface: JCDSurface对象
+
+    Returns:
+        (points, lines)
+    """
+    points = surface.get_points()
+    u_count, v_count = surface.u_count(), surface.v_count()
+    if points is None or u_count == 0 or v_count == 0 or len(points) < u_count * v_count:
+        return create_empty_lines()
+
+    grid = np.arange(u_count * v_count, dtype=np.int64).reshape(u_count, v_count)
+    lines = np.concatenate([
+        np.stack([grid[:, :-1].ravel(), grid[:, 1:].ravel()], axis=1),
+        np.stack([grid[:-1, :].ravel(), grid[1:, :].ravel()], axis=1),
+    ], axis=0)
+    return points[:u_count * v_count], lines
+
+
+def create_font_surface_lines(font_surface: JCDFontSurface) -> Tuple[np.ndarray, np.ndarray]:
+    """创建字体面片闭合轮廓的线集数据
+
+    Args:
+        font_surface: JCDFontSurface对象
+
+    Returns:
+        (points, lines)
+    """
+    points = font_surface.get_points()
+    if points is None or len(points) == 0:
+        return create_empty_lines()
+
+    # 丢弃越界的轮廓以及点数不足的轮廓
+    sizes = np.asarray(font_surface.outline_sizes, dtype=np.int64)
+    ends = np.cumsum(sizes)
+    sizes = sizes[ends <= len(points)]
+    outline_ids = np.repeat(np.arange(len(sizes)), sizes)
+    keep = (sizes >= 2)[outline_ids]
+
+    points = points[:len(outline_ids)][keep]
+    return points, _get_closed_ring_lines(sizes[sizes >= 2])
+
+
+def create_guide_line_lines(guide_line) -> Tuple[np.ndarray, np.ndarray]:
+    """创建辅助线的线集数据
+
+    Args:
+        guide_line: JCDGuideLine对象
+
+    Returns:
+        (points, lines)
+    """
+    points = guide_line.get_points()
+    if points is None or len(points) < 2:
+        return create_empty_lines()
+    return points, np.array([[0, 1]], dtype=np.int64)
+
+
+def create_surface_mesh(surface) -> Tuple[np.ndarray, np.ndarray]:
+    """将曲面控制网格三角化
+
+    控制点网格 (u_count, v_count) 的每个网格单元分为两个三角形，
+    is_path_closed 与 is_cross_section_closed 分别在U、V方向上首尾相连，
+    normal_direction 为负时翻转面片朝向。
+
+    Args:
+        surface: JCDSurface对象
+
+    Returns:
+        (vertices, triangles)
+    """
+    points = surface.get_points()
+    u_count, v_count = surface.u_count(), surface.v_count()
+    if points is None or u_count < 2 or v_count < 2 or len(points) < u_count * v_count:
+        return create_empty_mesh()
+
+    grid = np.arange(u_count * v_count, dtype=np.int64).reshape(u_count, v_count)
+    if surface.is_path_closed:
+        grid = np.vstack([grid, grid[:1]])
+    if surface.is_cross_section_closed:
+        grid = np.hstack([grid, grid[:, :1]])
+
+    a = grid[:-1, :-1].ravel()
+    b = grid[:-1, 1:].ravel()
+    c = grid[1:, 1:].ravel()
+    d = grid[1:, :-1].ravel()
+    triangles = np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)], axis=0)
+
+    if surface.normal_direction < 0:
+        triangles = triangles[:, ::-1]
+
+    return np.asarray(points[:u_count * v_count], dtype=np.float64), np.ascontiguousarray(triangles)
+
+
+def create_quad_type_mesh(quad_type) -> Tuple[np.ndarray, np.ndarray]:
+    """将四边形面片分解为三角网格
+
+    Args:
+        quad_type: JCDQuadType对象
+
+    Returns:
+        (vertices, triangles)
+    """
+    if quad_type.num_vertices() == 0 or quad_type.num_quads() == 0:
+        return create_empty_mesh()
+
+    vertices = quad_type.get_points()
+    quads = np.asarray(quad_type.indices, dtype=np.int64)
+    triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]], axis=0)
+    return np.asarray(vertices, dtype=np.float64), triangles
+
+
+def create_quad_type_lines(quad_type) -> Tuple[np.ndarray, np.ndarray]:
+    """创建四边形面片线框的线集数据（三角化后的去重边）
+
+    Args:
+        quad_type: JCDQuadType对象
+
+    Returns:
+        (points, lines)
+    """
+    vertices, triangles = create_quad_type_mesh(quad_type)
+    if len(triangles) == 0:
+        return create_empty_lines()
+
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]], axis=0)
+    edges = np.unique(np.sort(edges, axis=1), axis=0)
+    return vertices, edges
@@ -0,0 +1,242 @@
+"""CSG并行求值模块
+
+按DAG的依赖关系调度布尔曲面求值：布尔操作的左右操作数、曲面分组的各成员
+以及不同布尔曲面之间没有依赖，可以在进程池中同时计算。
+
+每个需要重算的节点是一个任务，所有子节点完成后才提交；
+就绪任务按其到根节点的最长路径排序，优先推进长链以缩短总耗时。
+中间网格通过共享内存在进程之间传递，任务参数中只包含共享内存块的名称，
+一个结果被所有依赖它的任务读取后立即释放。
+"""
+import os
+import heapq
+import itertools
+import numpy as np
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Method.csg import compute_node_mesh, evaluate_node
+from jcd_manage.Method.mesh import create_empty_mesh
+
+
+# 共享内存中的网格引用 (共享内存名称, 顶点数, 三角形数)，空网格的名称为 None
+EMPTY_MESH_REF = (None, 0, 0)
+
+
+def write_shared_mesh(mesh: Tuple[np.ndarray, np.ndarray]) -> tuple:
+    """将网格写入新的共享内存块，由读取方负责释放
+
+    Args:
+        mesh: (vertices, triangles)
+
+    Returns:
+        网格引用 (名称, 顶点数, 三角形数)
+    """
+    vertices = np.asarray(mesh[0], dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(mesh[1], dtype=np.int64).reshape(-1, 3)
+    if len(triangles) == 0:
+        return EMPTY_MESH_REF
+
+    shared_memory = SharedMemory(create=True, size=vertices.nbytes + triangles.nbytes)
+    try:
+        np.ndarray(vertices.shape, dtype=np.float64, buffer=shared_memory.buf)[:] = vertices
+        np.ndarray(triangles.shape, dtype=np.int64, buffer=shared_memory.buf, offset=vertices.nbytes)[:] = triangles
+    finally:
+        shared_memory.close()
+    return (shared_memory.name, len(vertices), len(triangles))
+
+
+def read_shared_mesh(mesh_ref: tuple) -> Tuple[np.ndarray, np.ndarray]:
+    """从共享内存复制出网格"""
+    name, vertex_count, triangle_count = mesh_ref
+    if name is None:
+        return create_empty_mesh()
+
+    shared_memory = SharedMemory(name=name)
+    try:
+        vertices = np.ndarray((vertex_count, 3), dtype=np.float64, buffer=shared_memory.buf).copy()
+        triangles = np.ndarray(
+            (triangle_count, 3), dtype=np.int64, buffer=shared_memory.buf, offset=vertices.nbytes,
+        ).copy()
+    finally:
+        shared_memory.close()
+    return vertices, triangles
+
+
+def release_shared_mesh(mesh_ref: tuple):
+    """释放网格占用的共享内存块"""
+    if mesh_ref[0] is None:
+        return
+    try:
+        shared_memory = SharedMemory(name=mesh_ref[0])
+    except FileNotFoundError:
+        return
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+def _detach_node(node):
+    """复制节点的计算所需字段，不携带父子链接和缓存结果"""
+    if isinstance(node, PrimitiveSurface):
+        return PrimitiveSurface(node.surface_data)
+    if isinstance(node, SurfaceGroup):
+        return SurfaceGroup(list(node.items))
+    return BooleanOp(node.op, node.left, node.right)
+
+
+def _run_node_task(node, input_refs: List[tuple], backend: str) -> tuple:
+    """工作进程中计算一个节点，输入和输出都是共享内存中的网格"""
+    child_meshes = [read_shared_mesh(mesh_ref) for mesh_ref in input_refs]
+    return write_shared_mesh(compute_node_mesh(node, child_meshes, backend))
+
+
+def evaluate_dags_parallel(
+    targets: List[Tuple[CSGDAG, Optional[int]]],
+    processes: Optional[int] = None,
+    backend: str = 'winding',
+    executor: Optional[Executor] = None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """在进程池中计算多个DAG节点的网格，结果同样保存在各节点的 cached_result 中
+
+    已计算且未失效的节点直接复用，与 evaluate_node 的结果一致。
+
+    Args:
+        targets: [(dag, 节点ID)]，节点ID为 None 时结果为空网格
+        processes: 进程数，默认为CPU核数，为1时在当前进程中依次计算
+        backend: 布尔运算后端
+        executor: 复用的进程池，给出时忽略 processes
+
+    Returns:
+        与 targets 对应的 (vertices, triangles) 列表
+    """
+    if executor is None and processes == 1:
+        return [
+            create_empty_mesh() if node_id is None else evaluate_node(dag, node_id, backend)
+            for dag, node_id in targets
+        ]
+
+    dags = []
+    for dag, _ in targets:
+        if all(dag is not other for other in dags):
+            dags.append(dag)
+
+    # 收集需要重算的节点，任务键为 (DAG下标, 节点ID)，列表顺序保证子节点在前
+    tasks = []
+    task_set = set()
+    for dag, node_id in targets:
+        if node_id is None:
+            continue
+        dag_index = next(i for i, other in enumerate(dags) if other is dag)
+        for current_id in dag.iter_postorder(node_id, expand=lambda node: node.dirty or node.cached_result is None):
+            key = (dag_index, current_id)
+            if key not in task_set:
+                task_set.add(key)
+                tasks.append(key)
+
+    def get_node(key):
+        return dags[key[0]].get(key[1])
+
+    def get_inputs(key):
+        return [(key[0], child_id) for child_id in get_node(key).children]
+
+    waiting_counts = {}
+    consumers: Dict[tuple, set] = {}
+    for key in tasks:
+        inputs = set(get_inputs(key))
+        waiting_counts[key] = sum(1 for child in inputs if child in task_set)
+        for child in inputs:
+            consumers.setdefault(child, set()).add(key)
+
+    # 优先级：到根节点的最长路径，越远越先计算
+    ranks = {}
+    for key in reversed(tasks):
+        ranks[key] = 1 + max((ranks[parent] for parent in consumers.get(key, ())), default=0)
+
+    counter = itertools.count()
+    ready = [(-ranks[key], next(counter), key) for key in tasks if waiting_counts[key] == 0]
+    heapq.heapify(ready)
+    mesh_refs: Dict[tuple, tuple] = {}
+
+    def get_input_ref(child):
+        # 未失效的子节点由主进程发布其缓存结果
+        if child not in mesh_refs:
+            mesh_refs[child] = write_shared_mesh(get_node(child).cached_result)
+        return mesh_refs[child]
+
+    def release_inputs(key):
+        for child in set(get_inputs(key)):
+            consumers[child].discard(key)
+            if len(consumers[child]) == 0 and child in mesh_refs:
+                release_shared_mesh(mesh_refs.pop(child))
+
+    owns_executor = executor is None
+    if owns_executor:
+        # Open3D与fork不兼容，使用spawn启动工作进程
+        executor = ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn'))
+    max_in_flight = 2 * (processes or os.cpu_count() or 1)
+
+    running = {}
+    try:
+        while ready or running:
+            while ready and len(running) < max_in_flight:
+                _, _, key = heapq.heappop(ready)
+                input_refs = [get_input_ref(child) for child in get_inputs(key)]
+                future = executor.submit(_run_node_task, _detach_node(get_node(key)), input_refs, backend)
+                running[future] = key
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                mesh_refs[key] = future.result()
+                node = get_node(key)
+                node.cached_result = read_shared_mesh(mesh_refs[key])
+                node.dirty = False
+
+                release_inputs(key)
+                if len(consumers.get(key, ())) == 0:
+                    release_shared_mesh(mesh_refs.pop(key))
+                for parent in consumers.get(key, ()):
+                    waiting_counts[parent] -= 1
+                    if waiting_counts[parent] == 0:
+                        heapq.heappush(ready, (-ranks[parent], next(counter), parent))
+    finally:
+        for future in running:
+            future.cancel()
+        # 出错时已提交的任务仍可能写出结果，等待结束后统一释放
+        for future in running:
+            if not future.cancelled() and future.exception() is None:
+                release_shared_mesh(future.result())
+        for mesh_ref in mesh_refs.values():
+            release_shared_mesh(mesh_ref)
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return [
+        create_empty_mesh() if node_id is None else dag.get(node_id).cached_result
+        for dag, node_id in targets
+    ]
+
+
+def evaluate_bool_surfaces_parallel(
+    bool_surfaces: List[JCDBoolSurface],
+    processes: Optional[int] = None,
+    backend: str = 'winding',
+    executor: Optional[Executor] = None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """并行计算多个布尔曲面的结果网格
+
+    Args:
+        bool_surfaces: 布尔曲面列表
+        processes: 进程数，默认为CPU核数，为1时在当前进程中依次计算
+        backend: 布尔运算后端
+        executor: 复用的进程池
+
+    Returns:
+        与 bool_surfaces 对应的 (vertices, triangles) 列表
+    """
+    targets = [(bool_surface.dag, bool_surface.root_node_id) for bool_surface in bool_surfaces]
+    return evaluate_dags_parallel(targets, processes, backend, executor)
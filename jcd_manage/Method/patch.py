@@ -0,0 +1,225 @@
+"""JCD文件原位修改模块
+
+通过内存映射直接修改已有JCD文件中的隐藏标志和矩阵，不解析、不重写几何数据。
+默认先复制到同目录的临时文件修改后再原子替换原文件；可选保留原文件备份。
+"""
+import os
+import mmap
+import shutil
+import numpy as np
+from typing import Dict, List, Optional
+
+from jcd_manage.Data import JCDBaseData, JCDBoolSurface
+from jcd_manage.Data.dag import PrimitiveSurface
+from jcd_manage.Method.columnar import get_surface_type
+from jcd_manage.Method.io import MATRIX_COUNT_MAP
+from jcd_manage.Method.scan import scan_jcd_file
+from jcd_manage.Method.writer import get_entity_state, is_entity_modified
+
+
+# 可以原位修改的属性
+PATCH_FIELDS = ('hide', 'meta_info', 'matrices', 'matrix')
+
+
+class JCDFilePatcher(object):
+    """JCD文件修改器，收集按偏移定位的修改，一次性写入"""
+
+    def __init__(self, jcd_file_path: str):
+        self.jcd_file_path = jcd_file_path
+        self.hide_patches: Dict[int, bool] = {}  # 元信息偏移 -> 是否隐藏
+        self.byte_patches: Dict[int, bytes] = {}  # 偏移 -> 写入的字节
+
+    def set_hide(self, meta_info_offset: int, hide: bool):
+        """设置隐藏标志（元信息第5个字节的第2位）"""
+        self.hide_patches[meta_info_offset] = hide
+
+    def set_matrices(self, matrices_offset: int, matrices: np.ndarray):
+        """写入矩阵块，相邻矩阵之间的4个填充字节保持不变"""
+        matrices = np.asarray(matrices, dtype='<f4').reshape(-1, 4, 4)
+        for i, matrix in enumerate(matrices):
+            self.byte_patches[matrices_offset + 68 * i] = matrix.tobytes()
+
+    def is_empty(self) -> bool:
+        return len(self.hide_patches) == 0 and len(self.byte_patches) == 0
+
+    def apply(self, backup: bool = False, atomic: bool = True) -> Dict[str, int]:
+        """写入所有修改
+
+        Args:
+            backup: 是否将原文件保留为 <文件名>.bak
+            atomic: 是否先修改临时副本再原子替换；为 False 时直接修改原文件
+
+        Returns:
+            统计 {'hide_count', 'matrix_count'}
+        """
+        file_size = os.path.getsize(self.jcd_file_path)
+        for offset in self.hide_patches:
+            if offset + 8 > file_size:
+                raise ValueError(f"meta info offset out of range: {offset}")
+        for offset, data in self.byte_patches.items():
+            if offset + len(data) > file_size:
+                raise ValueError(f"matrix offset out of range: {offset}")
+
+        target_file_path = self.jcd_file_path
+        if atomic:
+            target_file_path = self.jcd_file_path + '.tmp'
+            shutil.copyfile(self.jcd_file_path, target_file_path)
+
+        if backup:
+            backup_file_path = self.jcd_file_path + '.bak'
+            if os.path.exists(backup_file_path):
+                os.remove(backup_file_path)
+            if atomic:
+                # 原子替换时原文件本身不会被修改，硬链接即可作为备份
+                try:
+                    os.link(self.jcd_file_path, backup_file_path)
+                except OSError:
+                    shutil.copyfile(self.jcd_file_path, backup_file_path)
+            else:
+                shutil.copyfile(self.jcd_file_path, backup_file_path)
+
+        try:
+            with open(target_file_path, 'r+b') as f:
+                with mmap.mmap(f.fileno(), 0) as buffer:
+                    for offset, hide in self.hide_patches.items():
+                        if hide:
+                            buffer[offset + 4] |= 2
+                        else:
+                            buffer[offset + 4] &= ~2 & 0xFF
+                    for offset, data in self.byte_patches.items():
+                        buffer[offset:offset + len(data)] = data
+                    buffer.flush()
+        except BaseException:
+            if atomic and os.path.exists(target_file_path):
+                os.remove(target_file_path)
+            raise
+
+        if atomic:
+            os.replace(target_file_path, self.jcd_file_path)
+
+        stats = {
+            'hide_count': len(self.hide_patches),
+            'matrix_count': len(self.byte_patches),
+        }
+        self.hide_patches = {}
+        self.byte_patches = {}
+        return stats
+
+
+def patch_jcd_file(
+    jcd_file_path: str,
+    hide: Optional[Dict[int, bool]] = None,
+    matrices: Optional[Dict[int, np.ndarray]] = None,
+    matrix: Optional[Dict[int, np.ndarray]] = None,
+    backup: bool = False,
+    atomic: bool = True,
+) -> Dict[str, int]:
+    """按记录序号修改JCD文件，只扫描记录头，不解析几何数据
+
+    记录序号与 scan_jcd_file 返回的列表一致（每条 ':' 记录一个，布尔曲面的每条子记录各占一个）
+
+    Args:
+        jcd_file_path: 文件路径
+        hide: 记录序号 -> 是否隐藏
+        matrices: 记录序号 -> 记录开头的矩阵块 (k, 4, 4)
+        matrix: 记录序号 -> 钻石、字体面片、辅助线自身的变换矩阵 (4, 4)
+        backup: 是否保留原文件备份
+        atomic: 是否原子替换
+
+    Returns:
+        统计 {'hide_count', 'matrix_count'}
+    """
+    records = scan_jcd_file(jcd_file_path)
+    patcher = JCDFilePatcher(jcd_file_path)
+
+    for index, value in (hide or {}).items():
+        patcher.set_hide(records[index]['meta_info_offset'], value)
+    for index, value in (matrices or {}).items():
+        value = np.asarray(value).reshape(-1, 4, 4)
+        if len(value) > records[index]['matrix_count']:
+            raise ValueError(f"record {index} has only {records[index]['matrix_count']} matrices")
+        patcher.set_matrices(records[index]['matrices_offset'], value)
+    for index, value in (matrix or {}).items():
+        if 'matrix_offset' not in records[index]:
+            raise ValueError(f"record {index} has no transform matrix")
+        patcher.set_matrices(records[index]['matrix_offset'], value)
+
+    return patcher.apply(backup, atomic)
+
+
+def _flatten_entities(objects: List[JCDBaseData]) -> List[JCDBaseData]:
+    entities = []
+    for obj in objects:
+        entities.append(obj)
+        if isinstance(obj, JCDBoolSurface):
+            entities += [node.surface_data for node in obj.dag.nodes.values() if isinstance(node, PrimitiveSurface)]
+    return entities
+
+
+def patch_entities(
+    objects: List[JCDBaseData],
+    entities: Optional[List[JCDBaseData]] = None,
+    backup: bool = False,
+    atomic: bool = True,
+) -> Dict[str, int]:
+    """将实体当前的隐藏标志和矩阵原位写回其源文件
+
+    Args:
+        objects: 全部顶层实体，entities 为空时从中找出修改过的实体（含布尔曲面的原始曲面）
+        entities: 需要写回的实体，默认为隐藏标志或矩阵被修改过（含数组原地修改）、以及调用过 mark_modified() 的实体
+        backup: 是否保留原文件备份
+        atomic: 是否原子替换
+
+    Returns:
+        统计 {'file_count', 'entity_count', 'hide_count', 'matrix_count'}
+    """
+    if entities is None:
+        entities = []
+        for entity in _flatten_entities(objects):
+            if entity.source_span is None:
+                raise ValueError(f"entity has no source record: {entity}")
+            if is_entity_modified(entity):
+                entities.append(entity)
+
+    # 其他属性被修改的实体无法原位写回
+    for entity in entities:
+        if entity.source_span is None or len(entity.source_offsets) == 0:
+            raise ValueError(f"entity has no source record: {entity}")
+        if entity.source_state is not None:
+            other_fields = tuple(name for name, _ in entity.source_state if name not in PATCH_FIELDS)
+            if is_entity_modified(entity, fields=other_fields):
+                raise ValueError(f"entity modified beyond hide flag and matrices: {entity}")
+
+    patchers: Dict[str, JCDFilePatcher] = {}
+    for entity in entities:
+        source_file_path = entity.source_span[0]
+        patcher = patchers.setdefault(source_file_path, JCDFilePatcher(source_file_path))
+        offsets = entity.source_offsets
+
+        if 'meta_info' in offsets:
+            patcher.set_hide(offsets['meta_info'], entity.hide)
+        if 'matrices' in offsets:
+            matrix_count = MATRIX_COUNT_MAP.get(get_surface_type(entity), 0)
+            matrices = np.asarray(entity.matrices).reshape(-1, 4, 4)
+            if len(matrices) > matrix_count:
+                raise ValueError(f"entity has {len(matrices)} matrices, source record holds {matrix_count}: {entity}")
+            patcher.set_matrices(offsets['matrices'], matrices)
+        if 'matrix' in offsets:
+            patcher.set_matrices(offsets['matrix'], entity.matrix)
+
+    stats = {'file_count': len(patchers), 'entity_count': len(entities), 'hide_count': 0, 'matrix_count': 0}
+    for patcher in patchers.values():
+        patcher_stats = patcher.apply(backup, atomic)
+        stats['hide_count'] += patcher_stats['hide_count']
+        stats['matrix_count'] += patcher_stats['matrix_count']
+
+    # 源文件已与实体一致，更新元信息和状态快照
+    for entity in entities:
+        if 'meta_info' in entity.source_offsets and len(entity.meta_info) > 4:
+            meta_info = bytearray(entity.meta_info)
+            meta_info[4] = (meta_info[4] | 2) if entity.hide else (meta_info[4] & ~2 & 0xFF)
+            entity.meta_info = bytes(meta_info)
+        if entity.source_state is not None:
+            entity.source_state = get_entity_state(entity)
+
+    return stats
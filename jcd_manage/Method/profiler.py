@@ -0,0 +1,131 @@
+"""JCD加载性能分析模块
+
+按曲面类型统计加载时的记录数量、消耗字节数、解码耗时、数组分配字节数和创建的DAG节点数，
+并可在每条记录解码完成后调用用户注册的回调。未传入分析器时加载流程不做任何额外工作。
+"""
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
+
+from jcd_manage.Config.types import SurfaceType
+
+
+STAT_KEYS = ('count', 'byte_count', 'decode_seconds', 'build_seconds', 'array_byte_count', 'dag_node_count')
+
+
+def get_array_byte_count(entity_data: Dict[str, Any]) -> int:
+    """统计解码结果中numpy数组占用的字节数（不含嵌套的子曲面）"""
+    return sum(value.nbytes for value in entity_data.values() if isinstance(value, np.ndarray))
+
+
+class LoadProfiler(object):
+    """加载性能分析器
+
+    传给 JCDLoader.loadJCDFile 或 read_by_surface_type 的 profiler 参数。
+    布尔曲面的统计只包含布尔头本身，嵌套子曲面计入各自的类型。
+
+    回调参数为事件字典：
+        {'event': 'record', 'surface_type', 'offset', 'byte_count', 'decode_seconds', 'array_byte_count', 'depth'}
+        {'event': 'build', 'surface_type', 'build_seconds'}
+        {'event': 'dag', 'surface_type', 'dag_node_count'}
+    """
+
+    def __init__(self, hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None):
+        self.hooks: List[Callable[[Dict[str, Any]], None]] = list(hooks or [])
+        self.stats: Dict[SurfaceType, Dict[str, float]] = {}
+        self.total_seconds = 0.0
+        self.file_size = 0
+        # 正在解码的记录栈 [类型, 起始偏移, 开始时间, 子记录耗时, 子记录字节数]
+        self.stack: List[list] = []
+        self.load_start_time: Optional[float] = None
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        self.hooks.append(hook)
+
+    def _get_stats(self, surface_type: SurfaceType) -> Dict[str, float]:
+        if surface_type not in self.stats:
+            self.stats[surface_type] = {key: 0 for key in STAT_KEYS}
+        return self.stats[surface_type]
+
+    def _emit(self, event: Dict[str, Any]):
+        for hook in self.hooks:
+            hook(event)
+
+    def start_load(self, file_size: int):
+        self.file_size += file_size
+        self.load_start_time = time.perf_counter()
+
+    def finish_load(self):
+        if self.load_start_time is not None:
+            self.total_seconds += time.perf_counter() - self.load_start_time
+            self.load_start_time = None
+
+    def begin_record(self, surface_type: SurfaceType, offset: int):
+        self.stack.append([surface_type, offset, time.perf_counter(), 0.0, 0])
+
+    def end_record(self, offset: int, entity_data: Dict[str, Any]):
+        seconds_end = time.perf_counter()
+        surface_type, start, start_time, child_seconds, child_byte_count = self.stack.pop()
+
+        seconds = seconds_end - start_time
+        byte_count = offset - start
+        if len(self.stack) > 0:
+            self.stack[-1][3] += seconds
+            self.stack[-1][4] += byte_count
+
+        event = {
+            'event': 'record',
+            'surface_type': surface_type,
+            'offset': start,
+            'byte_count': byte_count - child_byte_count,
+            'decode_seconds': seconds - child_seconds,
+            'array_byte_count': get_array_byte_count(entity_data),
+            'depth': len(self.stack),
+        }
+
+        stats = self._get_stats(surface_type)
+        stats['count'] += 1
+        stats['byte_count'] += event['byte_count']
+        stats['decode_seconds'] += event['decode_seconds']
+        stats['array_byte_count'] += event['array_byte_count']
+
+        if self.hooks:
+            self._emit(event)
+
+    def add_build_time(self, surface_type: SurfaceType, seconds: float):
+        """记录由解码结果构建数据类实例的耗时"""
+        self._get_stats(surface_type)['build_seconds'] += seconds
+        if self.hooks:
+            self._emit({'event': 'build', 'surface_type': surface_type, 'build_seconds': seconds})
+
+    def add_dag_nodes(self, surface_type: SurfaceType, count: int):
+        """记录创建的DAG节点数"""
+        self._get_stats(surface_type)['dag_node_count'] += count
+        if self.hooks:
+            self._emit({'event': 'dag', 'surface_type': surface_type, 'dag_node_count': count})
+
+    def get_report(self) -> Dict[str, Any]:
+        """获取结构化报告
+
+        Returns:
+            {'file_size', 'total_seconds', 'types': {类型名: {统计项...}}}，按解码耗时降序排列
+        """
+        types = sorted(self.stats.items(), key=lambda item: -item[1]['decode_seconds'])
+        return {
+            'file_size': self.file_size,
+            'total_seconds': self.total_seconds,
+            'types': {surface_type.name: dict(stats) for surface_type, stats in types},
+        }
+
+    def print_report(self):
+        report = self.get_report()
+        print(f"\n{'='*60}")
+        print(f"JCD加载性能分析 (文件大小: {report['file_size']} 字节, 总耗时: {report['total_seconds'] * 1000:.1f} ms)")
+        print(f"{'='*60}")
+        print(f"{'类型':<16}{'数量':>8}{'字节':>12}{'解码ms':>10}{'构建ms':>10}{'数组字节':>12}{'DAG节点':>10}")
+        for name, stats in report['types'].items():
+            print(
+                f"{name:<16}{stats['count']:>8}{stats['byte_count']:>12}"
+                f"{stats['decode_seconds'] * 1000:>10.2f}{stats['build_seconds'] * 1000:>10.2f}"
+                f"{stats['array_byte_count']:>12}{stats['dag_node_count']:>10}"
+            )
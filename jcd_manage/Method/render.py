@@ -1,10 +1,11 @@
 """JCD数据可视化模块
 
-使用Open3D进行JCD数据的通用可视化
+使用Open3D进行JCD数据的通用可视化，open3d在首次实际渲染时才会加载
 """
+from __future__ import annotations
+
 import numpy as np
-import open3d as o3d
-from typing import List, Union, Optional, Tuple
+from typing import Dict, List, Union, Optional, Tuple
 from jcd_manage.Data.jcd_base import JCDBaseData
 from jcd_manage.Data.jcd_curve import JCDCurve
 from jcd_manage.Data.jcd_surface import JCDSurface
@@ -13,6 +14,14 @@ from jcd_manage.Data.jcd_font_surface import JCDFontSurface
 from jcd_manage.Data.jcd_guide_line import JCDGuideLine
 from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
 from jcd_manage.Data.jcd_quad_type import JCDQuadType
+from jcd_manage.Method.lazy import lazy_import
+from jcd_manage.Method.mesh import (
+    create_font_surface_mesh, create_diamond_prototype, group_diamonds_by_type, instance_mesh,
+    create_quad_type_mesh, merge_lines, create_curve_lines, create_surface_lines,
+    create_font_surface_lines, create_guide_line_lines, create_quad_type_lines
+)
+
+o3d = lazy_import('open3d')
 
 
 class JCDRenderer:
@@ -33,15 +42,21 @@ class JCDRenderer:
         'control_point': [1.0, 0.5, 0.0],# 橙色
         'normal': [0.8, 0.8, 0.8],       # 浅灰色
     }
+
+    # 四边形面片线框颜色
+    WIREFRAME_COLOR = [0.3, 0.3, 0.3]
     
     def __init__(self):
         """初始化渲染器"""
         self.geometries: List[o3d.geometry.Geometry] = []
         self.coordinate_frame = None
+        # 按颜色分组累积的线集数据，渲染前合并为每组一个LineSet
+        self.line_groups: Dict[Tuple[float, float, float], List[Tuple[np.ndarray, np.ndarray]]] = {}
         
     def clear(self):
         """清空所有几何体"""
         self.geometries.clear()
+        self.line_groups.clear()
         self.coordinate_frame = None
     
     def add_coordinate_frame(self, size: float = 10.0, origin: Optional[np.ndarray] = None):
@@ -58,101 +73,73 @@ class JCDRenderer:
             size=size, origin=origin
         )
         self.geometries.append(self.coordinate_frame)
-    
-    def _create_curve_geometry(self, curve: JCDCurve, color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
-        """创建曲线几何体
-        
+
+    def _create_line_set(self, points: np.ndarray, lines: np.ndarray,
+                         color: List[float]) -> Optional[o3d.geometry.LineSet]:
+        """由线集数据创建LineSet
+
         Args:
-            curve: JCDCurve对象
-            color: 颜色RGB，默认使用预设颜色
-            
+            points: 点数组 (n, 3)
+            lines: 线段索引 (m, 2)
+            color: 颜色RGB
+
         Returns:
-            几何体列表
+            LineSet对象，没有线段时返回None
         """
-        if color is None:
-            color = self.COLORS['curve']
-        
-        geometries = []
-        
-        points_3d = curve.get_points()
-        if points_3d is None or len(points_3d) < 2:
-            return geometries
-        
-        # 创建LineSet
+        if len(lines) == 0:
+            return None
+
         line_set = o3d.geometry.LineSet()
-        line_set.points = o3d.utility.Vector3dVector(points_3d)
-        
-        # 创建线段索引
-        lines = [[i, i + 1] for i in range(len(points_3d) - 1)]
-        
-        # 如果是闭合曲线，连接首尾
-        if curve.is_closed() and len(points_3d) > 2:
-            lines.append([len(points_3d) - 1, 0])
-        
-        line_set.lines = o3d.utility.Vector2iVector(lines)
-        
-        # 设置颜色
-        colors = [color for _ in range(len(lines))]
-        line_set.colors = o3d.utility.Vector3dVector(colors)
-        
-        geometries.append(line_set)
-        
-        return geometries
+        line_set.points = o3d.utility.Vector3dVector(np.asarray(points, dtype=np.float64))
+        line_set.lines = o3d.utility.Vector2iVector(np.asarray(lines, dtype=np.int32))
+        line_set.paint_uniform_color(color)
+        return line_set
+
+    def _get_color(self, color: Optional[List[float]], key: str) -> List[float]:
+        """获取自定义颜色，未指定时使用预设颜色"""
+        return self.COLORS[key] if color is None else color
+
+    def _add_lines(self, line_data: Tuple[np.ndarray, np.ndarray], color: List[float]):
+        """将线集数据加入对应颜色分组
+
+        Args:
+            line_data: (points, lines)
+            color: 颜色RGB
+        """
+        if len(line_data[1]) == 0:
+            return
+        self.line_groups.setdefault(tuple(float(c) for c in color), []).append(line_data)
+
+    def _flush_line_groups(self):
+        """将每个颜色分组的线集合并为一个LineSet"""
+        for color, line_data_list in self.line_groups.items():
+            points, lines = merge_lines(line_data_list)
+            line_set = self._create_line_set(points, lines, list(color))
+            if line_set is not None:
+                self.geometries.append(line_set)
+        self.line_groups.clear()
     
-    def _create_surface_geometry(self, surface: JCDSurface, color: Optional[List[float]] = None,
-                                show_wireframe: bool = True) -> List[o3d.geometry.Geometry]:
-        """创建曲面几何体
+    def _create_diamond_geometry(self, diamond: JCDDiamond, color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
+        """创建钻石几何体
 
         Args:
-            surface: JCDSurface对象
+            diamond: JCDDiamond对象
             color: 颜色RGB，默认使用预设颜色
-            show_wireframe: 是否显示网格线
 
         Returns:
             几何体列表
         """
-        if color is None:
-            color = self.COLORS['surface']
+        return self._create_diamonds_geometry([diamond], color)
 
-        geometries = []
-
-        all_points = surface.get_points()
-
-        if all_points is None or surface.u_count() == 0 or surface.v_count() == 0:
-            return geometries
+    def _create_diamonds_geometry(self, diamonds: List[JCDDiamond],
+                                  color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
+        """批量创建钻石几何体
 
-        # 重构网格结构
-        grid = all_points.reshape(surface.u_count(), surface.v_count(), 3)
-
-        # 创建网格线（U方向和V方向）
-        if show_wireframe:
-            # U方向曲线
-            for i in range(surface.u_count()):
-                points_3d = grid[i, :, :]
-                line_set = o3d.geometry.LineSet()
-                line_set.points = o3d.utility.Vector3dVector(points_3d)
-                lines = [[j, j + 1] for j in range(len(points_3d) - 1)]
-                line_set.lines = o3d.utility.Vector2iVector(lines)
-                line_set.paint_uniform_color(color)
-                geometries.append(line_set)
-
-            # V方向曲线
-            for j in range(surface.v_count()):
-                points_3d = grid[:, j, :]
-                line_set = o3d.geometry.LineSet()
-                line_set.points = o3d.utility.Vector3dVector(points_3d)
-                lines = [[i, i + 1] for i in range(len(points_3d) - 1)]
-                line_set.lines = o3d.utility.Vector2iVector(lines)
-                line_set.paint_uniform_color(color)
-                geometries.append(line_set)
-
-        return geometries
-
-    def _create_diamond_geometry(self, diamond: JCDDiamond, color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
-        """创建钻石几何体
+        每种钻石类型使用缓存的切割原型网格，通过一次批量矩阵变换实例化为一个网格，
+        几何体数量与钻石类型数量相同，而不是与钻石数量相同。
 
         Args:
-            diamond: JCDDiamond对象
+            diamonds: JCDDiamond对象列表
             color: 颜色RGB，默认使用预设颜色
 
         Returns:
@@ -163,23 +150,25 @@ class JCDRenderer:
 
         geometries = []
 
-        # 根据钻石类型创建不同的几何体
-        # 这里使用简化的表示：一个球体
-        sphere = o3d.geometry.TriangleMesh.create_sphere(radius=1.0, resolution=20)
-        sphere.paint_uniform_color(color)
-        sphere.compute_vertex_normals()
+        for diamond_type, matrices in group_diamonds_by_type(diamonds).items():
+            prototype_vertices, prototype_triangles = create_diamond_prototype(diamond_type)
+            vertices, triangles = instance_mesh(prototype_vertices, prototype_triangles, matrices)
+            if len(triangles) == 0:
+                continue
 
-        # 应用钻石的完整变换矩阵
-        transform_matrix = diamond.matrix.T
-        sphere.transform(transform_matrix)
+            mesh = o3d.geometry.TriangleMesh()
+            mesh.vertices = o3d.utility.Vector3dVector(vertices)
+            mesh.triangles = o3d.utility.Vector3iVector(triangles)
+            mesh.paint_uniform_color(color)
+            mesh.compute_vertex_normals()
 
-        geometries.append(sphere)
+            geometries.append(mesh)
 
         return geometries
 
-    def _create_font_surface_geometry(self, font_surface: JCDFontSurface, 
-                                     color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
-        """创建字体面片几何体
+    def _create_font_surface_solid_geometry(self, font_surface: JCDFontSurface,
+                                            color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
+        """创建字体面片按厚度拉伸后的实体几何体
 
         Args:
             font_surface: JCDFontSurface对象
@@ -191,71 +180,17 @@ class JCDRenderer:
         if color is None:
             color = self.COLORS['font_surface']
 
-        geometries = []
-        
-        all_points = font_surface.get_points()
-        if all_points is None or len(all_points) == 0:
-            return geometries
-        
-        # 按轮廓分割点
-        outline_sizes = font_surface.outline_sizes
-        start_idx = 0
-        
-        for size in outline_sizes:
-            if start_idx + size > len(all_points):
-                break
-            
-            outline = all_points[start_idx:start_idx + size]
-            start_idx += size
-            
-            if len(outline) < 2:
-                continue
-            
-            # 创建闭合轮廓线
-            line_set = o3d.geometry.LineSet()
-            line_set.points = o3d.utility.Vector3dVector(outline)
-            
-            # 创建闭合轮廓
-            lines = [[i, i + 1] for i in range(len(outline) - 1)]
-            lines.append([len(outline) - 1, 0])  # 闭合
-            
-            line_set.lines = o3d.utility.Vector2iVector(lines)
-            line_set.paint_uniform_color(color)
-            
-            geometries.append(line_set)
-        
-        return geometries
-    
-    def _create_guide_line_geometry(self, guide_line: JCDGuideLine, 
-                                   color: Optional[List[float]] = None,
-                                   length: float = 10.0) -> List[o3d.geometry.Geometry]:
-        """创建辅助线几何体
-        
-        Args:
-            guide_line: JCDGuideLine对象
-            color: 颜色RGB，默认使用预设颜色
-            length: 线段长度（该参数已由get_points()内部处理）
-            
-        Returns:
-            几何体列表
-        """
-        if color is None:
-            color = self.COLORS['guide_line']
-        
-        geometries = []
-        
-        points = guide_line.get_points()
-        if points is None or len(points) < 2:
-            return geometries
-        
-        line_set = o3d.geometry.LineSet()
-        line_set.points = o3d.utility.Vector3dVector(points)
-        line_set.lines = o3d.utility.Vector2iVector([[0, 1]])
-        line_set.paint_uniform_color(color)
-        
-        geometries.append(line_set)
-        
-        return geometries
+        # 拉伸实体，与轮廓线保持同一坐标系
+        vertices, triangles = create_font_surface_mesh(font_surface, apply_matrix=False)
+        if len(triangles) == 0:
+            return []
+
+        mesh = o3d.geometry.TriangleMesh()
+        mesh.vertices = o3d.utility.Vector3dVector(vertices)
+        mesh.triangles = o3d.utility.Vector3iVector(triangles)
+        mesh.paint_uniform_color(color)
+        mesh.compute_vertex_normals()
+        return [mesh]
     
     def _create_bool_surface_geometry(self, bool_surface: JCDBoolSurface, 
                                      color: Optional[List[float]] = None) -> List[o3d.geometry.Geometry]:
@@ -300,37 +235,26 @@ class JCDRenderer:
             color = self.COLORS['quad_type']
         
         geometries = []
-        
-        if quad_type.num_vertices() == 0 or quad_type.num_quads() == 0:
-            return geometries
-        
-        vertices = quad_type.get_points()
-        if vertices is None:
+
+        vertices, triangles = create_quad_type_mesh(quad_type)
+        if len(triangles) == 0:
             return geometries
-        
-        # 将四边形分解为三角形
-        triangles = []
-        for i in range(quad_type.num_quads()):
-            quad_indices = quad_type.indices[i]
-            # 将四边形分为两个三角形
-            triangles.append([quad_indices[0], quad_indices[1], quad_indices[2]])
-            triangles.append([quad_indices[0], quad_indices[2], quad_indices[3]])
-        
+
         # 创建TriangleMesh
         mesh = o3d.geometry.TriangleMesh()
         mesh.vertices = o3d.utility.Vector3dVector(vertices)
         mesh.triangles = o3d.utility.Vector3iVector(triangles)
         mesh.paint_uniform_color(color)
         mesh.compute_vertex_normals()
-        
+
         geometries.append(mesh)
-        
+
         # 添加线框
         if show_wireframe:
-            line_set = o3d.geometry.LineSet.create_from_triangle_mesh(mesh)
-            line_set.paint_uniform_color([0.3, 0.3, 0.3])
-            geometries.append(line_set)
-        
+            line_set = self._create_line_set(*create_quad_type_lines(quad_type), self.WIREFRAME_COLOR)
+            if line_set is not None:
+                geometries.append(line_set)
+
         return geometries
     
     def add_data(self, data: Union[JCDBaseData, List[JCDBaseData]], 
@@ -343,9 +267,15 @@ class JCDRenderer:
             color: 自定义颜色RGB，默认使用类型对应的颜色
             **kwargs: 其他渲染参数
         """
-        # 处理列表
+        # 处理列表，钻石统一批量实例化
         if isinstance(data, list):
+            diamonds = [item for item in data if isinstance(item, JCDDiamond) and not item.hide]
+            if len(diamonds) > 0:
+                self.geometries.extend(self._create_diamonds_geometry(diamonds, color))
+
             for item in data:
+                if isinstance(item, JCDDiamond):
+                    continue
                 self.add_data(item, color, **kwargs)
             return
         
@@ -353,30 +283,33 @@ class JCDRenderer:
         if data.hide:
             return
         
-        # 根据类型创建几何体
+        # 线类几何体按颜色分组累积，渲染前统一合并
         if isinstance(data, JCDCurve):
-            geometries = self._create_curve_geometry(data, color)
+            self._add_lines(create_curve_lines(data), self._get_color(color, 'curve'))
+            return
         elif isinstance(data, JCDSurface):
-            geometries = self._create_surface_geometry(
-                data, color, 
-                show_wireframe=kwargs.get('show_wireframe', True)
-            )
-        elif isinstance(data, JCDDiamond):
-            geometries = self._create_diamond_geometry(data, color)
+            if kwargs.get('show_wireframe', True):
+                self._add_lines(create_surface_lines(data), self._get_color(color, 'surface'))
+            return
         elif isinstance(data, JCDFontSurface):
-            geometries = self._create_font_surface_geometry(data, color)
+            self._add_lines(create_font_surface_lines(data), self._get_color(color, 'font_surface'))
+            if kwargs.get('show_font_solid', False):
+                self.geometries.extend(self._create_font_surface_solid_geometry(data, color))
+            return
         elif isinstance(data, JCDGuideLine):
-            geometries = self._create_guide_line_geometry(
-                data, color, 
-                length=kwargs.get('guide_line_length', 10.0)
-            )
+            self._add_lines(create_guide_line_lines(data), self._get_color(color, 'guide_line'))
+            return
+
+        # 根据类型创建几何体
+        if isinstance(data, JCDDiamond):
+            geometries = self._create_diamond_geometry(data, color)
         elif isinstance(data, JCDBoolSurface):
             geometries = self._create_bool_surface_geometry(data, color)
         elif isinstance(data, JCDQuadType):
-            geometries = self._create_quad_type_geometry(
-                data, color,
-                show_wireframe=kwargs.get('show_wireframe', True)
-            )
+            show_wireframe = kwargs.get('show_wireframe', True)
+            geometries = self._create_quad_type_geometry(data, color, show_wireframe=False)
+            if show_wireframe:
+                self._add_lines(create_quad_type_lines(data), self.WIREFRAME_COLOR)
         else:
             print(f"警告: 不支持的数据类型 {type(data)}")
             return
@@ -396,6 +329,7 @@ class JCDRenderer:
             show_coordinate_frame: 是否显示坐标系
             coordinate_frame_size: 坐标系大小
         """
+        self._flush_line_groups()
         if len(self.geometries) == 0:
             print("警告: 没有几何体可以渲染")
             return
@@ -428,6 +362,7 @@ class JCDRenderer:
         Args:
             filename: 保存的文件名（支持png, jpg等格式）
         """
+        self._flush_line_groups()
         if len(self.geometries) == 0:
             print("警告: 没有几何体可以保存")
             return
@@ -448,6 +383,7 @@ class JCDRenderer:
         Returns:
             (min_point, max_point) 或 None
         """
+        self._flush_line_groups()
         if len(self.geometries) == 0:
             return None
         
@@ -494,6 +430,7 @@ def renderData(data: Union[JCDBaseData, List[JCDBaseData]],
         **kwargs: 其他渲染参数
             - show_wireframe: bool, 是否显示网格线（用于曲面和四边形）
             - guide_line_length: float, 辅助线长度
+            - show_font_solid: bool, 是否显示字体面片的拉伸实体
     
     示例:
         >>> from jcd_manage.Module.jcd_loader import JCDLoader
@@ -0,0 +1,157 @@
+"""JCD记录扫描模块
+
+只解析记录头和长度字段，跳过控制点、索引和轮廓点等几何数据，
+快速得到每条记录的字节范围以及元信息、矩阵在文件中的偏移，供原位修改等只需定位字段的场景使用。
+"""
+import mmap
+import struct
+from typing import Any, Dict, List
+
+from jcd_manage.Config.constant import JCD_HEADER
+from jcd_manage.Config.types import SurfaceType
+from jcd_manage.Method.io import MATRIX_COUNT_MAP, SURFACE_UNKNOWN_SIZES
+
+
+def _skip_material(buffer, offset: int) -> tuple:
+    """跳过材质名称，返回 (材质名称, 新偏移)"""
+    size = struct.unpack_from('<I', buffer, offset)[0]
+    offset += 4
+    return bytes(buffer[offset:offset + size]).decode('utf-8'), offset + size
+
+
+def _skip_points(buffer, offset: int) -> int:
+    """跳过 (n, 4) 的点数组"""
+    point_size = struct.unpack_from('<I', buffer, offset)[0]
+    return offset + 4 + 16 * point_size
+
+
+def scan_entity(buffer, offset: int, surface_type: SurfaceType, info: Dict[str, Any]) -> int:
+    """扫描一个实体的数据，将字段偏移写入 info，返回实体数据的结束偏移
+
+    Args:
+        buffer: 文件内容（bytes 或 mmap）
+        offset: 实体数据（矩阵块）的起始偏移
+        surface_type: 曲面类型
+        info: 记录信息字典
+
+    Returns:
+        结束偏移
+    """
+    matrix_count = MATRIX_COUNT_MAP.get(surface_type, 0)
+    info.setdefault('matrices_offset', offset)
+    info.setdefault('matrix_count', matrix_count)
+    if matrix_count > 0:
+        offset += 68 * matrix_count - 4
+
+    if surface_type in (SurfaceType.CURVE, SurfaceType.SURFACE):
+        info['material_name'], offset = _skip_material(buffer, offset)
+        offset = _skip_points(buffer, offset) + 8 + 1
+        offset += 9 if surface_type == SurfaceType.CURVE else sum(SURFACE_UNKNOWN_SIZES) + 1 + 1 + 4
+    elif surface_type == SurfaceType.DIAMOND:
+        info['material_name'], offset = _skip_material(buffer, offset)
+        info['matrix_offset'] = offset
+        offset += 64 + 1 + 3
+    elif surface_type == SurfaceType.FONT_SURFACE:
+        info['material_name'], offset = _skip_material(buffer, offset)
+        info['matrix_offset'] = offset
+        offset += 64
+        outline_count = struct.unpack_from('<I', buffer, offset)[0]
+        offset += 4 * 8
+        outline_sizes = struct.unpack_from(f"<{2 * outline_count}i", buffer, offset)[0::2]
+        offset += 8 * outline_count + 12 * sum(outline_sizes)
+    elif surface_type == SurfaceType.GUIDE_LINE:
+        info['matrix_offset'] = offset
+        offset += 64 + 12
+    elif surface_type == SurfaceType.QUAD_TYPE:
+        info['material_name'], offset = _skip_material(buffer, offset)
+        offset = _skip_points(buffer, offset)
+        offset = _skip_points(buffer, offset)
+    elif surface_type == SurfaceType.BOOL_SURFACE:
+        sub_surface_type = SurfaceType(buffer[offset + 3])
+        offset += 1 + 2 + 1 + 7
+        info['bool_depth'] = info.get('bool_depth', 0) + 1
+        info['sub_surface_type'] = sub_surface_type
+        info['sub_surface_offset'] = offset
+        sub_info = {}
+        offset = scan_entity(buffer, offset, sub_surface_type, sub_info)
+        info['sub_matrices_offset'] = sub_info['matrices_offset']
+        info['sub_matrix_count'] = sub_info['matrix_count']
+        # 嵌套的布尔头继续向下，保留最底层曲面的信息
+        for key in (
+            'material_name', 'matrix_offset', 'sub_surface_type', 'sub_surface_offset',
+            'sub_matrices_offset', 'sub_matrix_count',
+        ):
+            if key in sub_info:
+                info[key] = sub_info[key]
+        info['bool_depth'] += sub_info.get('bool_depth', 0)
+    else:
+        raise ValueError(f"unsupported surface type: {surface_type}")
+
+    return offset
+
+
+def scan_jcd_buffer(buffer) -> List[Dict[str, Any]]:
+    """扫描JCD文件内容，返回每条 ':' 记录的信息
+
+    Args:
+        buffer: 文件内容（bytes 或 mmap）
+
+    Returns:
+        记录信息列表，每条记录包含：
+            start / end: 记录（含标志位）的字节范围
+            surface_type / hide / meta_info_offset: 类型、隐藏标志及元信息偏移（隐藏标志位于 meta_info_offset + 4）
+            matrices_offset / matrix_count: 记录开头矩阵块的偏移和矩阵数量（相邻矩阵间隔4字节）
+            matrix_offset: 钻石、字体面片、辅助线自身变换矩阵的偏移
+            material_name: 材质名称
+            bool_depth / sub_surface_type / sub_surface_offset / sub_matrices_offset: 布尔记录的嵌套深度和最底层曲面信息
+            bool_level: 记录所在的布尔分组层数，0 表示普通记录
+    """
+    header = JCD_HEADER.encode('utf-8')
+    if bytes(buffer[:len(header)]) != header:
+        raise ValueError('jcd header not matched')
+
+    records = []
+    bool_level = 0
+    offset = len(header)
+    size = len(buffer)
+    while offset < size:
+        flag = buffer[offset]
+        if flag == ord('#'):
+            break
+        if flag == ord('%'):
+            bool_level -= 1
+            offset += 1
+            continue
+        if flag != ord(':'):
+            raise ValueError(f"unknown flag {flag:#x} at offset {offset}")
+
+        surface_type = SurfaceType(buffer[offset + 1])
+        info = {
+            'start': offset,
+            'surface_type': surface_type,
+            'hide': (buffer[offset + 5] & 2) == 2,
+            'meta_info_offset': offset + 1,
+        }
+        end = scan_entity(buffer, offset + 9, surface_type, info)
+        info['end'] = end
+        info['bool_level'] = bool_level
+        bool_level += info.get('bool_depth', 0)
+
+        records.append(info)
+        offset = end
+
+    return records
+
+
+def scan_jcd_file(jcd_file_path: str) -> List[Dict[str, Any]]:
+    """通过内存映射扫描JCD文件，不读取几何数据
+
+    Args:
+        jcd_file_path: 文件路径
+
+    Returns:
+        记录信息列表，见 scan_jcd_buffer
+    """
+    with open(jcd_file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return scan_jcd_buffer(buffer)
@@ -0,0 +1,633 @@
+"""JCD精确B-Rep转换与STEP导出模块
+
+基于pythonocc-core将JCD实体转换为OCC形体：
+- 曲线、曲面的控制点直接作为B样条的控制顶点，闭合方向使用周期B样条
+- 四边形面片逐面构建平面后缝合，封闭时生成实体
+- 钻石、字体面片没有精确曲面，由与CSG相同的三角网格缝合为实体
+- 布尔曲面按DAG自底向上使用OCC布尔运算求值，操作数必须是实体，
+  无法转换的原始曲面或非实体的操作数会使求值失败，而不是被忽略
+控制点先按实体的第一个变换矩阵放置，B样条在仿射变换下不变，结果与变换形体一致。
+STEP文件先写入同目录的临时文件再替换目标文件，失败或被终止时不会留下不完整的文件。
+
+OCC布尔运算的耗时从毫秒到数分钟不等，且可能直接崩溃，批量导出时每个文件在独立进程中执行，
+超时的进程会被终止，所有文件的结果汇总为错误报告。
+"""
+import os
+import json
+import time
+import importlib.util
+import numpy as np
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDCurve, JCDSurface, JCDQuadType, JCDFontSurface, JCDDiamond, JCDBoolSurface, JCDBaseData
+from jcd_manage.Data.dag import PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Method.csg import tessellate_entity
+
+
+STEP_FILE_FORMATS = ['step', 'stp']
+
+# 缝合与建面的几何容差
+SEWING_TOLERANCE = 1e-4
+
+
+def is_occ_available() -> bool:
+    """pythonocc-core是否已安装"""
+    return importlib.util.find_spec('OCC') is not None
+
+
+def get_bspline_knots(pole_count: int, degree: int, periodic: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """计算均匀B样条的节点及其重数
+
+    开放B样条两端节点重数为 degree + 1，曲线经过首末控制点；
+    周期B样条所有节点重数为1，节点数为控制点数 + 1。
+
+    Args:
+        pole_count: 控制点数
+        degree: 次数
+        periodic: 是否周期
+
+    Returns:
+        (knots, multiplicities)
+    """
+    if periodic:
+        knots = np.linspace(0.0, 1.0, pole_count + 1)
+        multiplicities = np.ones(pole_count + 1, dtype=np.int32)
+        return knots, multiplicities
+
+    knots = np.linspace(0.0, 1.0, pole_count - degree + 1)
+    multiplicities = np.ones(len(knots), dtype=np.int32)
+    multiplicities[[0, -1]] = degree + 1
+    return knots, multiplicities
+
+
+def get_bspline_degree(pole_count: int, max_degree: int = 3) -> int:
+    """控制点数允许的最高次数"""
+    return max(1, min(max_degree, pole_count - 1))
+
+
+def _to_occ_array1(values: np.ndarray, array_class, item_class=None):
+    array = array_class(1, len(values))
+    for i, value in enumerate(values.tolist()):
+        array.SetValue(i + 1, value if item_class is None else item_class(*value))
+    return array
+
+
+def create_bspline_curve(points: np.ndarray, closed: bool, max_degree: int = 3):
+    """由控制点创建OCC B样条曲线
+
+    Args:
+        points: 控制点 (n, 3)
+        closed: 是否闭合
+        max_degree: 最高次数
+
+    Returns:
+        Geom_BSplineCurve，控制点不足时为 None
+    """
+    from OCC.Core.gp import gp_Pnt
+    from OCC.Core.Geom import Geom_BSplineCurve
+    from OCC.Core.TColgp import TColgp_Array1OfPnt
+    from OCC.Core.TColStd import TColStd_Array1OfReal, TColStd_Array1OfInteger
+
+    if len(points) < 2:
+        return None
+    degree = get_bspline_degree(len(points), max_degree)
+    knots, multiplicities = get_bspline_knots(len(points), degree, closed)
+    return Geom_BSplineCurve(
+        _to_occ_array1(np.asarray(points, dtype=np.float64), TColgp_Array1OfPnt, gp_Pnt),
+        _to_occ_array1(knots, TColStd_Array1OfReal),
+        _to_occ_array1(multiplicities, TColStd_Array1OfInteger),
+        degree,
+        closed,
+    )
+
+
+def create_bspline_surface(grid: np.ndarray, u_closed: bool, v_closed: bool, max_degree: int = 3):
+    """由控制点网格创建OCC B样条曲面
+
+    Args:
+        grid: 控制点网格 (u_count, v_count, 3)
+        u_closed: U方向是否闭合
+        v_closed: V方向是否闭合
+        max_degree: 最高次数
+
+    Returns:
+        Geom_BSplineSurface，控制点不足时为 None
+    """
+    from OCC.Core.gp import gp_Pnt
+    from OCC.Core.Geom import Geom_BSplineSurface
+    from OCC.Core.TColgp import TColgp_Array2OfPnt
+    from OCC.Core.TColStd import TColStd_Array1OfReal, TColStd_Array1OfInteger
+
+    u_count, v_count = grid.shape[:2]
+    if u_count < 2 or v_count < 2:
+        return None
+
+    poles = TColgp_Array2OfPnt(1, u_count, 1, v_count)
+    for i, row in enumerate(np.asarray(grid, dtype=np.float64).tolist()):
+        for j, point in enumerate(row):
+            poles.SetValue(i + 1, j + 1, gp_Pnt(*point))
+
+    u_degree = get_bspline_degree(u_count, max_degree)
+    v_degree = get_bspline_degree(v_count, max_degree)
+    u_knots, u_multiplicities = get_bspline_knots(u_count, u_degree, u_closed)
+    v_knots, v_multiplicities = get_bspline_knots(v_count, v_degree, v_closed)
+    return Geom_BSplineSurface(
+        poles,
+        _to_occ_array1(u_knots, TColStd_Array1OfReal),
+        _to_occ_array1(v_knots, TColStd_Array1OfReal),
+        _to_occ_array1(u_multiplicities, TColStd_Array1OfInteger),
+        _to_occ_array1(v_multiplicities, TColStd_Array1OfInteger),
+        u_degree,
+        v_degree,
+        u_closed,
+        v_closed,
+    )
+
+
+def create_compound(shapes: list):
+    """将多个形体合并为一个复合体，没有形体时为 None"""
+    from OCC.Core.BRep import BRep_Builder
+    from OCC.Core.TopoDS import TopoDS_Compound
+
+    shapes = [shape for shape in shapes if shape is not None]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+
+    builder = BRep_Builder()
+    compound = TopoDS_Compound()
+    builder.MakeCompound(compound)
+    for shape in shapes:
+        builder.Add(compound, shape)
+    return compound
+
+
+def _make_solid(shape):
+    """封闭的壳生成实体，并由ShapeFix统一为外法向"""
+    from OCC.Core.BRep import BRep_Builder, BRep_Tool
+    from OCC.Core.ShapeFix import ShapeFix_Solid
+    from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_SHELL
+    from OCC.Core.TopoDS import TopoDS_Shell, topods
+
+    if shape.ShapeType() == TopAbs_FACE:
+        shell = TopoDS_Shell()
+        builder = BRep_Builder()
+        builder.MakeShell(shell)
+        builder.Add(shell, shape)
+    elif shape.ShapeType() == TopAbs_SHELL:
+        shell = topods.Shell(shape)
+    else:
+        return shape
+
+    if not BRep_Tool.IsClosed(shell):
+        return shape
+    return ShapeFix_Solid().SolidFromShell(shell)
+
+
+def is_solid_shape(shape) -> bool:
+    """形体是否为实体，或只由实体组成的复合体"""
+    from OCC.Core.TopAbs import TopAbs_SOLID, TopAbs_COMPSOLID, TopAbs_COMPOUND
+    from OCC.Core.TopoDS import TopoDS_Iterator
+
+    if shape.ShapeType() in (TopAbs_SOLID, TopAbs_COMPSOLID):
+        return True
+    if shape.ShapeType() != TopAbs_COMPOUND:
+        return False
+
+    iterator = TopoDS_Iterator(shape)
+    if not iterator.More():
+        return False
+    while iterator.More():
+        if not is_solid_shape(iterator.Value()):
+            return False
+        iterator.Next()
+    return True
+
+
+def _add_polygon_face(sewing, occ_points: list, indices: List[int]) -> bool:
+    """由顶点围成的平面多边形建面并加入缝合，顶点共线或不共面时返回 False"""
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakePolygon, BRepBuilderAPI_MakeFace
+
+    polygon = BRepBuilderAPI_MakePolygon()
+    for index in indices:
+        polygon.Add(occ_points[index])
+    polygon.Close()
+    if not polygon.IsDone():
+        return False
+    face = BRepBuilderAPI_MakeFace(polygon.Wire(), True)
+    if not face.IsDone():
+        return False
+    sewing.Add(face.Face())
+    return True
+
+
+def create_curve_shape(curve: JCDCurve):
+    """将曲线转换为边的复合体，每条曲线一条边"""
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+
+    points = curve.get_transformed_points()
+    if points is None:
+        return None
+
+    edges = []
+    for i in range(curve.ring_count):
+        start = i * curve.original_point_count
+        bspline_curve = create_bspline_curve(points[start:start + curve.original_point_count], curve.is_closed())
+        if bspline_curve is not None:
+            edges.append(BRepBuilderAPI_MakeEdge(bspline_curve).Edge())
+    return create_compound(edges)
+
+
+def create_surface_shape(surface: JCDSurface):
+    """将曲面转换为B样条面，两个方向都闭合时生成实体"""
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeFace
+
+    points = surface.get_transformed_points()
+    u_count, v_count = surface.u_count(), surface.v_count()
+    if points is None or len(points) < u_count * v_count:
+        return None
+
+    grid = points[:u_count * v_count].reshape(u_count, v_count, 3)
+    bspline_surface = create_bspline_surface(grid, surface.is_path_closed, surface.is_cross_section_closed)
+    if bspline_surface is None:
+        return None
+
+    face = BRepBuilderAPI_MakeFace(bspline_surface, SEWING_TOLERANCE).Face()
+    if surface.normal_direction < 0:
+        face.Reverse()
+    if surface.is_path_closed and surface.is_cross_section_closed:
+        return _make_solid(face)
+    return face
+
+
+def create_quad_type_shape(quad_type: JCDQuadType):
+    """将四边形面片逐面建面后缝合，封闭时生成实体"""
+    from OCC.Core.gp import gp_Pnt
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Sewing
+
+    points = quad_type.get_transformed_points()
+    if points is None or quad_type.num_quads() == 0:
+        return None
+
+    occ_points = [gp_Pnt(*point) for point in np.asarray(points, dtype=np.float64).tolist()]
+    sewing = BRepBuilderAPI_Sewing(SEWING_TOLERANCE)
+    for quad in np.asarray(quad_type.indices, dtype=np.int64).tolist():
+        # 不共面的四边形拆分为两个三角形
+        if not _add_polygon_face(sewing, occ_points, quad):
+            _add_polygon_face(sewing, occ_points, [quad[0], quad[1], quad[2]])
+            _add_polygon_face(sewing, occ_points, [quad[0], quad[2], quad[3]])
+
+    sewing.Perform()
+    return _make_solid(sewing.SewedShape())
+
+
+def create_mesh_shape(vertices: np.ndarray, triangles: np.ndarray):
+    """将三角网格逐面建面后缝合，封闭时生成实体，没有三角形时为 None"""
+    from OCC.Core.gp import gp_Pnt
+    from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Sewing
+
+    if len(triangles) == 0:
+        return None
+
+    occ_points = [gp_Pnt(*point) for point in np.asarray(vertices, dtype=np.float64).tolist()]
+    sewing = BRepBuilderAPI_Sewing(SEWING_TOLERANCE)
+    for triangle in np.asarray(triangles, dtype=np.int64).tolist():
+        _add_polygon_face(sewing, occ_points, triangle)
+
+    sewing.Perform()
+    return _make_solid(sewing.SewedShape())
+
+
+def create_entity_shape(entity: JCDBaseData):
+    """将单个实体转换为OCC形体，不支持的实体返回 None"""
+    if isinstance(entity, JCDBoolSurface):
+        return evaluate_bool_surface_shape(entity)
+    if isinstance(entity, JCDSurface):
+        return create_surface_shape(entity)
+    if isinstance(entity, JCDQuadType):
+        return create_quad_type_shape(entity)
+    if isinstance(entity, (JCDDiamond, JCDFontSurface)):
+        return create_mesh_shape(*tessellate_entity(entity))
+    if isinstance(entity, JCDCurve):
+        return create_curve_shape(entity)
+    return None
+
+
+def boolean_shape(left, right, op: DAGBoolType):
+    """OCC布尔运算，None 表示空形体
+
+    Raises:
+        RuntimeError: 操作数不是实体，或OCC布尔运算失败
+    """
+    from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Fuse, BRepAlgoAPI_Common, BRepAlgoAPI_Cut
+
+    if left is None or right is None:
+        if op == DAGBoolType.UNION:
+            return right if left is None else left
+        if op == DAGBoolType.DIFFERENCE:
+            return left
+        return None
+    for shape in (left, right):
+        if not is_solid_shape(shape):
+            raise RuntimeError(f"occ boolean {op.value} operand is not a solid")
+
+    algorithm_class = {
+        DAGBoolType.UNION: BRepAlgoAPI_Fuse,
+        DAGBoolType.INTERSECT: BRepAlgoAPI_Common,
+        DAGBoolType.DIFFERENCE: BRepAlgoAPI_Cut,
+    }[op]
+    algorithm = algorithm_class(left, right)
+    if not algorithm.IsDone():
+        raise RuntimeError(f"occ boolean {op.value} failed")
+    return algorithm.Shape()
+
+
+def evaluate_bool_surface_shape(bool_surface: JCDBoolSurface):
+    """自底向上使用OCC布尔运算求值布尔曲面的DAG
+
+    Returns:
+        结果形体，空结果为 None
+
+    Raises:
+        RuntimeError: 原始曲面无法转换、布尔操作数不是实体或OCC布尔运算失败
+    """
+    if bool_surface.root_node_id is None:
+        return None
+
+    dag = bool_surface.dag
+    shapes = {}
+    for node_id in dag.iter_postorder(bool_surface.root_node_id):
+        node = dag.get(node_id)
+        if isinstance(node, PrimitiveSurface):
+            shapes[node_id] = create_entity_shape(node.surface_data)
+            if shapes[node_id] is None:
+                raise RuntimeError(f"primitive {node_id} ({type(node.surface_data).__name__}) has no shape")
+        elif isinstance(node, SurfaceGroup):
+            shapes[node_id] = create_compound([shapes[item] for item in node.items])
+        elif isinstance(node, BooleanOp):
+            shapes[node_id] = boolean_shape(shapes[node.left], shapes[node.right], node.op)
+    return shapes[bool_surface.root_node_id]
+
+
+def save_step_file(
+    objects: List[JCDBaseData],
+    step_file_path: str,
+    include_hidden: bool = False,
+) -> Dict[str, int]:
+    """将实体转换为OCC形体并写出STEP（AP214）文件
+
+    Args:
+        objects: 实体列表
+        step_file_path: STEP文件路径
+        include_hidden: 是否包含隐藏实体
+
+    Returns:
+        统计信息 {'shape_count', 'skipped_count'}
+
+    Raises:
+        RuntimeError: 没有可导出的形体、布尔运算失败或写出失败
+    """
+    from OCC.Core.IFSelect import IFSelect_RetDone
+    from OCC.Core.Interface import Interface_Static
+    from OCC.Core.STEPControl import STEPControl_Writer, STEPControl_AsIs
+
+    shapes = []
+    skipped_count = 0
+    for obj in objects:
+        if obj.hide and not include_hidden:
+            continue
+        shape = create_entity_shape(obj)
+        if shape is None:
+            skipped_count += 1
+            continue
+        shapes.append(shape)
+
+    compound = create_compound(shapes)
+    if compound is None:
+        raise RuntimeError("no shape to export")
+
+    writer = STEPControl_Writer()
+    Interface_Static.SetCVal('write.step.schema', 'AP214')
+    writer.Transfer(compound, STEPControl_AsIs)
+
+    # 写完后整体替换，已存在的文件在失败时保持不变
+    temp_file_path = get_step_temp_path(step_file_path)
+    try:
+        if writer.Write(temp_file_path) != IFSelect_RetDone:
+            raise RuntimeError("write step file failed")
+        os.replace(temp_file_path, step_file_path)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+    return {'shape_count': len(shapes), 'skipped_count': skipped_count}
+
+
+def get_step_path(jcd_file_path: str, save_folder_path: str, root_folder_path: Optional[str] = None) -> str:
+    """STEP文件路径：<保存文件夹>/<相对根文件夹的路径>.step，未指定根文件夹时为 <保存文件夹>/<文件名>.step"""
+    if root_folder_path is None:
+        relative_path = os.path.basename(jcd_file_path)
+    else:
+        relative_path = os.path.relpath(os.path.abspath(jcd_file_path), root_folder_path)
+    return os.path.join(save_folder_path, os.path.splitext(relative_path)[0] + '.step')
+
+
+def get_step_paths(jcd_file_paths: List[str], save_folder_path: str) -> List[str]:
+    """批量导出的STEP文件路径，在保存文件夹中镜像各JCD文件相对其公共文件夹的目录结构
+
+    不同文件夹中的同名文件因此写到不同的STEP文件
+    """
+    if len(jcd_file_paths) == 0:
+        return []
+    root_folder_path = os.path.commonpath([
+        os.path.dirname(os.path.abspath(jcd_file_path)) for jcd_file_path in jcd_file_paths
+    ])
+    return [get_step_path(jcd_file_path, save_folder_path, root_folder_path) for jcd_file_path in jcd_file_paths]
+
+
+def get_step_temp_path(step_file_path: str) -> str:
+    """写出过程中使用的临时文件路径：<文件名>.part<扩展名>"""
+    root, extension = os.path.splitext(step_file_path)
+    return root + '.part' + extension
+
+
+def export_step_file(jcd_file_path: str, step_file_path: str) -> Dict[str, Any]:
+    """将单个JCD文件导出为STEP文件
+
+    Returns:
+        导出结果 {'jcd_file_path', 'step_file_path', 'status', 'shape_count', 'skipped_count', 'time', 'error'}
+    """
+    from jcd_manage.Module.jcd_loader import JCDLoader
+
+    result = {
+        'jcd_file_path': jcd_file_path,
+        'step_file_path': step_file_path,
+        'status': 'exported',
+        'shape_count': 0,
+        'skipped_count': 0,
+        'time': 0.0,
+        'error': None,
+    }
+
+    start = time.perf_counter()
+    try:
+        jcd_loader = JCDLoader()
+        if not jcd_loader.loadJCDFile(jcd_file_path):
+            result['status'] = 'failed'
+            result['error'] = 'load jcd file failed'
+        else:
+            folder_path = os.path.dirname(step_file_path)
+            if folder_path != '':
+                os.makedirs(folder_path, exist_ok=True)
+            result.update(save_step_file(jcd_loader.objects, step_file_path))
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+    result['time'] = time.perf_counter() - start
+    return result
+
+
+def _run_export_task(connection, jcd_file_path: str, step_file_path: str):
+    """工作进程入口，结果通过管道返回"""
+    try:
+        connection.send(export_step_file(jcd_file_path, step_file_path))
+    finally:
+        connection.close()
+
+
+def get_step_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总批量导出结果
+
+    Returns:
+        {'summary': 状态 -> 文件数, 'errors': 未成功导出的结果, 'files': 全部结果}
+    """
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    errors = [result for result in results if result['status'] in ('failed', 'timeout')]
+    return {'summary': summary, 'errors': errors, 'files': results}
+
+
+def export_step_files(
+    jcd_file_paths: List[str],
+    save_folder_path: str,
+    timeout: Optional[float] = 600.0,
+    processes: Optional[int] = None,
+    overwrite: bool = False,
+    report_file_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """批量导出STEP文件
+
+    每个文件在独立的进程中导出：超时的进程被终止并删除未写完的临时文件，
+    OCC崩溃导致进程异常退出时记录其退出码，均不影响其他文件。
+    STEP文件路径见 get_step_paths；启动工作进程前检查路径冲突，与前面的文件写到同一路径的文件记为失败。
+
+    Args:
+        jcd_file_paths: JCD文件路径列表
+        save_folder_path: STEP文件保存文件夹
+        timeout: 单个文件的超时秒数，None 表示不限制
+        processes: 同时运行的进程数，默认为CPU核数
+        overwrite: 是否覆盖已存在的STEP文件
+        report_file_path: 错误报告（JSON）保存路径
+
+    Returns:
+        与 jcd_file_paths 对应的导出结果列表
+    """
+    processes = processes or os.cpu_count() or 1
+    # OCC与fork不兼容，使用spawn启动工作进程
+    context = get_context('spawn')
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jcd_file_paths)
+    step_file_paths = get_step_paths(jcd_file_paths, save_folder_path)
+    running = {}
+
+    def set_result(index: int, status: str, error: Optional[str] = None, elapsed: float = 0.0):
+        results[index] = {
+            'jcd_file_path': jcd_file_paths[index],
+            'step_file_path': step_file_paths[index],
+            'status': status,
+            'shape_count': 0,
+            'skipped_count': 0,
+            'time': elapsed,
+            'error': error,
+        }
+
+    # 同一输出路径只导出第一个文件，避免多个进程写同一个文件
+    pending = []
+    path_indices = {}
+    for index, jcd_file_path in enumerate(jcd_file_paths):
+        path_key = os.path.normcase(os.path.abspath(step_file_paths[index]))
+        if path_key in path_indices:
+            set_result(index, 'failed', f'step file path collides with {jcd_file_paths[path_indices[path_key]]}')
+            continue
+        path_indices[path_key] = index
+        pending.append((index, jcd_file_path))
+    pending.reverse()
+
+    try:
+        while pending or running:
+            while pending and len(running) < processes:
+                index, jcd_file_path = pending.pop()
+                step_file_path = step_file_paths[index]
+                if os.path.exists(step_file_path) and not overwrite:
+                    set_result(index, 'cached')
+                    continue
+
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_run_export_task, args=(sender, jcd_file_path, step_file_path), daemon=True,
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (index, process, time.monotonic())
+
+            if not running:
+                continue
+
+            wait_time = None
+            if timeout is not None:
+                oldest = min(start for _, _, start in running.values())
+                wait_time = max(0.0, oldest + timeout - time.monotonic())
+
+            for receiver in wait(list(running), wait_time):
+                index, process, start = running.pop(receiver)
+                try:
+                    results[index] = receiver.recv()
+                except EOFError:
+                    process.join()
+                    set_result(
+                        index, 'failed', f'worker exited with code {process.exitcode}', time.monotonic() - start,
+                    )
+                receiver.close()
+                process.join()
+
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for receiver, (index, process, start) in list(running.items()):
+                if now - start < timeout:
+                    continue
+                running.pop(receiver)
+                process.kill()
+                process.join()
+                receiver.close()
+                temp_file_path = get_step_temp_path(step_file_paths[index])
+                if os.path.exists(temp_file_path):
+                    os.remove(temp_file_path)
+                set_result(index, 'timeout', f'timeout after {timeout} seconds', now - start)
+    finally:
+        for receiver, (_, process, _) in running.items():
+            process.kill()
+            process.join()
+            receiver.close()
+
+    if report_file_path is not None:
+        folder_path = os.path.dirname(report_file_path)
+        if folder_path != '':
+            os.makedirs(folder_path, exist_ok=True)
+        with open(report_file_path, 'w', encoding='utf-8') as f:
+            json.dump(get_step_report(results), f, ensure_ascii=False, indent=2)
+    return results
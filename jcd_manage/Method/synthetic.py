@@ -0,0 +1,221 @@
+"""合成JCD文件生成模块
+
+按指定的数量和规模生成各类实体并通过 writer 的编码器写出为合法的JCD文件，
+用于基准测试和没有真实文件时的回归测试。
+"""
+import numpy as np
+from typing import Dict, List, Optional
+
+from jcd_manage.Config.types import BlockType, BoolType, CurveType, DAGBoolType, DiamondType
+from jcd_manage.Data import (
+    JCDBaseData, JCDCurve, JCDSurface, JCDDiamond, JCDFontSurface,
+    JCDGuideLine, JCDBoolSurface, JCDQuadType,
+)
+from jcd_manage.Method.io import MATRIX_COUNT_MAP
+from jcd_manage.Method.writer import get_surface_type, save_jcd_file
+
+
+# 预设的合成文件规模，分别侧重不同的解析路径
+SYNTHETIC_PRESETS: Dict[str, Dict[str, int]] = {
+    'diamonds': {'diamond_count': 20000},
+    'quad_mesh': {'quad_count': 1, 'quad_grid_size': 400},
+    'bool_nesting': {'bool_count': 20, 'bool_depth': 32, 'surface_ring_count': 8, 'surface_point_count': 16},
+    'font_outlines': {'font_count': 50, 'font_outline_count': 4, 'font_outline_size': 2000},
+    'mixed': {
+        'curve_count': 200, 'surface_count': 200, 'diamond_count': 2000, 'quad_count': 20, 'quad_grid_size': 50,
+        'font_count': 20, 'font_outline_size': 200, 'guide_line_count': 20, 'bool_count': 10, 'bool_depth': 4,
+    },
+}
+
+DAG_BOOL_TYPES = [DAGBoolType.UNION, DAGBoolType.DIFFERENCE, DAGBoolType.INTERSECT]
+
+
+def _get_identity_matrices(entity: JCDBaseData) -> np.ndarray:
+    return np.tile(np.eye(4, dtype=np.float32), (MATRIX_COUNT_MAP[get_surface_type(entity)], 1, 1))
+
+
+def _get_translation_matrix(position: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    matrix = np.diag([scale, scale, scale, 1.0]).astype(np.float32)
+    matrix[3, :3] = position
+    return matrix
+
+
+def create_synthetic_curve(rng: np.random.Generator, ring_count: int, point_count: int) -> JCDCurve:
+    curve = JCDCurve()
+    curve.material_name = 'gold'
+    curve.ring_count = ring_count
+    curve.original_point_count = point_count
+    curve.points = np.ones((ring_count * point_count, 4), dtype=np.float32)
+    curve.points[:, :3] = rng.normal(size=(len(curve.points), 3)).cumsum(axis=0)
+    curve.curve_type = CurveType.CLOSED_CURVE
+    return curve
+
+
+def create_synthetic_surface(rng: np.random.Generator, ring_count: int, point_count: int) -> JCDSurface:
+    """生成一个沿Z轴扫掠的环形截面曲面"""
+    surface = JCDSurface()
+    surface.material_name = 'gold'
+    surface.ring_count = ring_count
+    surface.original_point_count = point_count
+
+    angles = np.linspace(0.0, 2.0 * np.pi, point_count, endpoint=False)
+    radius = 1.0 + rng.random(ring_count)[:, None]
+    points = np.ones((ring_count, point_count, 4), dtype=np.float32)
+    points[:, :, 0] = radius * np.cos(angles)
+    points[:, :, 1] = radius * np.sin(angles)
+    points[:, :, 2] = np.arange(ring_count)[:, None]
+    points[:, :, :3] += rng.normal(size=3)
+    surface.points = points.reshape(-1, 4)
+
+    surface.curve_type = CurveType.OPEN_CURVE
+    surface.is_cross_section_closed = True
+    return surface
+
+
+def create_synthetic_diamond(rng: np.random.Generator) -> JCDDiamond:
+    diamond = JCDDiamond()
+    diamond.material_name = 'diamond'
+    diamond.diamond_type = list(DiamondType)[rng.integers(len(DiamondType))]
+    diamond.matrix = _get_translation_matrix(rng.uniform(-20.0, 20.0, size=3), rng.uniform(0.5, 2.0))
+    return diamond
+
+
+def create_synthetic_quad_type(rng: np.random.Generator, grid_size: int) -> JCDQuadType:
+    """生成 grid_size x grid_size 个面的起伏网格"""
+    quad_type = JCDQuadType()
+    quad_type.material_name = 'silver'
+
+    x, y = np.meshgrid(np.arange(grid_size + 1), np.arange(grid_size + 1), indexing='ij')
+    points = np.ones((grid_size + 1, grid_size + 1, 4), dtype=np.float32)
+    points[:, :, 0] = x
+    points[:, :, 1] = y
+    points[:, :, 2] = rng.random((grid_size + 1, grid_size + 1))
+    quad_type.points = points.reshape(-1, 4)
+
+    corner = (x[:-1, :-1] * (grid_size + 1) + y[:-1, :-1]).reshape(-1)
+    quad_type.indices = np.stack(
+        [corner, corner + grid_size + 1, corner + grid_size + 2, corner + 1], axis=1
+    ).astype(np.int32)
+    return quad_type
+
+
+def create_synthetic_font_surface(rng: np.random.Generator, outline_count: int, outline_size: int) -> JCDFontSurface:
+    """生成由互不相交的星形轮廓组成的字体面片"""
+    font_surface = JCDFontSurface()
+    font_surface.material_name = 'gold'
+    font_surface.matrix = _get_translation_matrix(rng.uniform(-20.0, 20.0, size=3))
+
+    angles = np.linspace(0.0, 2.0 * np.pi, outline_size, endpoint=False)
+    radius = 1.0 + 0.3 * np.cos(angles * 5.0)
+    outlines = []
+    for i in range(outline_count):
+        outline = np.zeros((outline_size, 3), dtype=np.float32)
+        outline[:, 0] = radius * np.cos(angles) + 3.0 * i
+        outline[:, 1] = radius * np.sin(angles)
+        outlines.append(outline)
+
+    font_surface.outline_count = outline_count
+    font_surface.outline_sizes = np.full(outline_count, outline_size, dtype=np.int32)
+    font_surface.points = np.concatenate(outlines, axis=0)
+    font_surface.foreground_type = BlockType.ANGLE
+    font_surface.background_type = BlockType.ANGLE
+    font_surface.thickness = 0.2
+    return font_surface
+
+
+def create_synthetic_guide_line(rng: np.random.Generator) -> JCDGuideLine:
+    guide_line = JCDGuideLine()
+    guide_line.matrix = _get_translation_matrix(rng.uniform(-20.0, 20.0, size=3))
+    return guide_line
+
+
+def create_synthetic_bool_surface(
+    rng: np.random.Generator,
+    depth: int,
+    ring_count: int,
+    point_count: int,
+) -> JCDBoolSurface:
+    """生成嵌套深度为 depth 的布尔曲面，相邻层使用不同的布尔操作以避免被合并为同一分组"""
+    bool_surface = JCDBoolSurface()
+    bool_surface.bool_type = BoolType.UNION
+    bool_surface.matrices = _get_identity_matrices(bool_surface)
+
+    surfaces = [create_synthetic_surface(rng, ring_count, point_count) for _ in range(depth + 1)]
+    node_ids = []
+    for surface in surfaces:
+        surface.matrices = _get_identity_matrices(surface)
+        node_ids.append(bool_surface.add_surface(surface))
+
+    root_id = node_ids[0]
+    for i, node_id in enumerate(node_ids[1:]):
+        root_id = bool_surface.apply_boolean_operation(DAG_BOOL_TYPES[i % len(DAG_BOOL_TYPES)], root_id, node_id)
+    return bool_surface
+
+
+def create_synthetic_objects(
+    curve_count: int = 0,
+    surface_count: int = 0,
+    diamond_count: int = 0,
+    quad_count: int = 0,
+    font_count: int = 0,
+    guide_line_count: int = 0,
+    bool_count: int = 0,
+    curve_ring_count: int = 2,
+    curve_point_count: int = 32,
+    surface_ring_count: int = 16,
+    surface_point_count: int = 32,
+    quad_grid_size: int = 32,
+    font_outline_count: int = 2,
+    font_outline_size: int = 64,
+    bool_depth: int = 2,
+    seed: Optional[int] = 0,
+) -> List[JCDBaseData]:
+    """生成合成实体列表
+
+    Args:
+        *_count: 各类实体数量
+        curve_ring_count / curve_point_count: 每条曲线的环数和每环点数
+        surface_ring_count / surface_point_count: 每个曲面的环数和每环点数（布尔曲面的原始曲面相同）
+        quad_grid_size: 每个四边形面片的网格边长，面数为其平方
+        font_outline_count / font_outline_size: 每个字体面片的轮廓数和每个轮廓的点数
+        bool_depth: 每个布尔曲面的嵌套深度
+        seed: 随机种子
+
+    Returns:
+        实体列表
+    """
+    rng = np.random.default_rng(seed)
+
+    objects: List[JCDBaseData] = []
+    objects += [create_synthetic_curve(rng, curve_ring_count, curve_point_count) for _ in range(curve_count)]
+    objects += [create_synthetic_surface(rng, surface_ring_count, surface_point_count) for _ in range(surface_count)]
+    objects += [create_synthetic_diamond(rng) for _ in range(diamond_count)]
+    objects += [create_synthetic_quad_type(rng, quad_grid_size) for _ in range(quad_count)]
+    objects += [
+        create_synthetic_font_surface(rng, font_outline_count, font_outline_size) for _ in range(font_count)
+    ]
+    objects += [create_synthetic_guide_line(rng) for _ in range(guide_line_count)]
+
+    for obj in objects:
+        obj.matrices = _get_identity_matrices(obj)
+
+    objects += [
+        create_synthetic_bool_surface(rng, bool_depth, surface_ring_count, surface_point_count)
+        for _ in range(bool_count)
+    ]
+    return objects
+
+
+def write_synthetic_jcd_file(save_jcd_file_path: str, **kwargs) -> List[JCDBaseData]:
+    """生成合成实体并写出为JCD文件
+
+    Args:
+        save_jcd_file_path: 保存路径
+        **kwargs: 传给 create_synthetic_objects 的参数
+
+    Returns:
+        写出的实体列表
+    """
+    objects = create_synthetic_objects(**kwargs)
+    save_jcd_file(objects, save_jcd_file_path)
+    return objects
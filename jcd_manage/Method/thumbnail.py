@@ -0,0 +1,586 @@
+"""JCD缩略图批量渲染模块
+
+基于JCDRenderer的无头缩略图渲染：优先使用Open3D离屏渲染器，
+不可用时回退到基于numpy的软件光栅化，不依赖显示服务器。
+软件光栅化直接由实体生成图元，绘制内容与JCDRenderer一致，完全不需要Open3D。
+"""
+from __future__ import annotations
+
+import os
+import sys
+import zlib
+import struct
+import subprocess
+import numpy as np
+from functools import lru_cache
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, Union
+
+from jcd_manage.Data.jcd_base import JCDBaseData
+from jcd_manage.Data.jcd_curve import JCDCurve
+from jcd_manage.Data.jcd_surface import JCDSurface
+from jcd_manage.Data.jcd_diamond import JCDDiamond
+from jcd_manage.Data.jcd_font_surface import JCDFontSurface
+from jcd_manage.Data.jcd_guide_line import JCDGuideLine
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Data.jcd_quad_type import JCDQuadType
+from jcd_manage.Method.lazy import lazy_import
+from jcd_manage.Method.mesh import (
+    create_font_surface_mesh, create_diamonds_mesh, create_quad_type_mesh, create_curve_lines,
+    create_surface_lines, create_font_surface_lines, create_guide_line_lines, create_quad_type_lines
+)
+from jcd_manage.Method.render import JCDRenderer
+
+o3d = lazy_import('open3d')
+
+
+# 视角：(相机相对于中心的方向, 上方向)
+VIEW_DIRECTIONS = {
+    'front': ([0.0, 0.0, 1.0], [0.0, 1.0, 0.0]),
+    'back': ([0.0, 0.0, -1.0], [0.0, 1.0, 0.0]),
+    'left': ([-1.0, 0.0, 0.0], [0.0, 1.0, 0.0]),
+    'right': ([1.0, 0.0, 0.0], [0.0, 1.0, 0.0]),
+    'top': ([0.0, 1.0, 0.0], [0.0, 0.0, -1.0]),
+    'bottom': ([0.0, -1.0, 0.0], [0.0, 0.0, 1.0]),
+    'iso': ([1.0, 1.0, 1.0], [0.0, 1.0, 0.0]),
+}
+
+
+def get_view_camera(
+    bbox: Tuple[np.ndarray, np.ndarray],
+    view: str,
+    fov: float = 30.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """根据边界框计算能完整容纳模型的相机
+
+    Args:
+        bbox: (min_point, max_point)
+        view: 视角名称，见VIEW_DIRECTIONS
+        fov: 垂直视场角（度）
+
+    Returns:
+        (eye, center, up)
+    """
+    direction, up = VIEW_DIRECTIONS[view]
+    direction = np.asarray(direction, dtype=np.float64)
+    direction /= np.linalg.norm(direction)
+
+    min_point, max_point = (np.asarray(p, dtype=np.float64)[:3] for p in bbox)
+    center = (min_point + max_point) / 2.0
+    radius = max(float(np.linalg.norm(max_point - min_point)) / 2.0, 1e-6)
+
+    # 包围球完整落在视锥内
+    distance = radius / np.sin(np.radians(fov) / 2.0) * 1.05
+    eye = center + direction * distance
+    return eye, center, np.asarray(up, dtype=np.float64)
+
+
+def save_png(file_path: str, image: np.ndarray) -> bool:
+    """将RGB图像保存为PNG（不依赖图像库）
+
+    Args:
+        file_path: 保存路径
+        image: uint8图像 (h, w, 3)
+
+    Returns:
+        是否成功
+    """
+    height, width = image.shape[:2]
+    raw = np.concatenate([
+        np.zeros((height, 1), dtype=np.uint8),
+        np.ascontiguousarray(image[:, :, :3], dtype=np.uint8).reshape(height, width * 3),
+    ], axis=1).tobytes()
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    png = b'\x89PNG\r\n\x1a\n'
+    png += _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    png += _chunk(b'IDAT', zlib.compress(raw, 6))
+    png += _chunk(b'IEND', b'')
+
+    # 先写临时文件再替换，避免缓存检查读到半写的文件
+    tmp_file_path = file_path + '.tmp'
+    with open(tmp_file_path, 'wb') as f:
+        f.write(png)
+    os.replace(tmp_file_path, file_path)
+    return True
+
+
+def rasterize(
+    primitives: List[Tuple[str, np.ndarray, np.ndarray, np.ndarray]],
+    eye: np.ndarray,
+    center: np.ndarray,
+    up: np.ndarray,
+    fov: float,
+    width: int,
+    height: int,
+    background_color: List[float],
+    max_samples: int = 8_000_000,
+) -> np.ndarray:
+    """基于采样与深度缓冲的软件光栅化
+
+    三角形按投影面积、线段按投影长度均匀采样，所有采样点一次性做深度排序，
+    每个像素保留最近的采样。全部为向量化计算，没有逐图元的Python循环。
+
+    Args:
+        primitives: [(类型, 点 (n, 3), 索引, 每点颜色 (n, 3))]，类型为 'triangles' / 'lines' / 'points'
+        eye: 相机位置
+        center: 观察中心
+        up: 上方向
+        fov: 垂直视场角（度）
+        width: 图像宽度
+        height: 图像高度
+        background_color: 背景颜色RGB
+        max_samples: 采样点总数上限
+
+    Returns:
+        uint8图像 (height, width, 3)
+    """
+    forward = center - eye
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, up)
+    if np.linalg.norm(right) < 1e-12:
+        right = np.cross(forward, [1.0, 0.0, 0.0])
+    right /= np.linalg.norm(right)
+    camera_up = np.cross(right, forward)
+    rotation = np.stack([right, camera_up, forward], axis=1)
+    focal = (height / 2.0) / np.tan(np.radians(fov) / 2.0)
+
+    def _project(points):
+        camera = (points - eye) @ rotation
+        depth = np.maximum(camera[:, 2], 1e-9)
+        x = width / 2.0 + focal * camera[:, 0] / depth
+        y = height / 2.0 - focal * camera[:, 1] / depth
+        return np.stack([x, y], axis=1), camera[:, 2]
+
+    sample_points = []
+    sample_colors = []
+
+    for kind, points, indices, colors in primitives:
+        if len(points) == 0:
+            continue
+        points = np.asarray(points, dtype=np.float64)
+        colors = np.asarray(colors, dtype=np.float64)
+        screen, _ = _project(points)
+
+        if kind == 'triangles' and len(indices) > 0:
+            v0, v1, v2 = (points[indices[:, k]] for k in range(3))
+            s0, s1, s2 = (screen[indices[:, k]] for k in range(3))
+            area = 0.5 * np.abs((s1[:, 0] - s0[:, 0]) * (s2[:, 1] - s0[:, 1]) - (s1[:, 1] - s0[:, 1]) * (s2[:, 0] - s0[:, 0]))
+            counts = np.clip(np.ceil(area * 3.0), 1, 4096).astype(np.int64)
+
+            # 平面着色：法向与视线夹角越小越亮
+            normals = np.cross(v1 - v0, v2 - v0)
+            normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+            shade = 0.35 + 0.65 * np.abs(normals @ forward)
+            face_colors = colors[indices].mean(axis=1) * shade[:, None]
+
+            triangle_ids = np.repeat(np.arange(len(indices)), counts)
+            rng = np.random.default_rng(0)
+            r1 = np.sqrt(rng.random(len(triangle_ids)))
+            r2 = rng.random(len(triangle_ids))
+            w0 = 1.0 - r1
+            w1 = r1 * (1.0 - r2)
+            w2 = r1 * r2
+            sample_points.append(
+                v0[triangle_ids] * w0[:, None] + v1[triangle_ids] * w1[:, None] + v2[triangle_ids] * w2[:, None]
+            )
+            sample_colors.append(face_colors[triangle_ids])
+        elif kind == 'lines' and len(indices) > 0:
+            p0, p1 = points[indices[:, 0]], points[indices[:, 1]]
+            length = np.linalg.norm(screen[indices[:, 1]] - screen[indices[:, 0]], axis=1)
+            counts = np.clip(np.ceil(length * 1.5), 1, 4096).astype(np.int64) + 1
+
+            line_ids = np.repeat(np.arange(len(indices)), counts)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            t = (np.arange(len(line_ids)) - starts[line_ids]) / np.maximum(counts[line_ids] - 1, 1)
+            sample_points.append(p0[line_ids] + (p1[line_ids] - p0[line_ids]) * t[:, None])
+            sample_colors.append((colors[indices[:, 0]])[line_ids])
+        elif kind == 'points':
+            sample_points.append(points)
+            sample_colors.append(colors)
+
+    image = np.empty((height, width, 3), dtype=np.float64)
+    image[:, :] = background_color
+    if len(sample_points) == 0:
+        return (np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+    sample_points = np.concatenate(sample_points, axis=0)
+    sample_colors = np.concatenate(sample_colors, axis=0)
+    if len(sample_points) > max_samples:
+        keep = np.linspace(0, len(sample_points) - 1, max_samples).astype(np.int64)
+        sample_points = sample_points[keep]
+        sample_colors = sample_colors[keep]
+
+    screen, depth = _project(sample_points)
+    ix = np.floor(screen[:, 0]).astype(np.int64)
+    iy = np.floor(screen[:, 1]).astype(np.int64)
+    visible = (depth > 1e-6) & (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+
+    pixel = iy[visible] * width + ix[visible]
+    depth = depth[visible]
+    sample_colors = sample_colors[visible]
+
+    # 深度测试：每个像素保留最近的采样
+    order = np.lexsort((depth, pixel))
+    pixel = pixel[order]
+    first = np.ones(len(pixel), dtype=bool)
+    first[1:] = pixel[1:] != pixel[:-1]
+    image.reshape(-1, 3)[pixel[first]] = sample_colors[order][first]
+
+    return (np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def is_offscreen_available() -> bool:
+    """探测Open3D离屏渲染是否可用
+
+    离屏渲染器在缺少EGL/OSMesa时可能直接崩溃，因此在子进程中探测，每个进程只探测一次。
+    """
+    probe = (
+        "import open3d as o3d;"
+        "r = o3d.visualization.rendering.OffscreenRenderer(8, 8);"
+        "r.render_to_image()"
+    )
+    try:
+        result = subprocess.run(
+            [sys.executable, '-c', probe],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=60,
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
+
+
+class JCDThumbnailRenderer(JCDRenderer):
+    """JCD无头缩略图渲染器
+
+    复用JCDRenderer的几何体构建，按模型边界框自动放置相机，支持多视角输出
+    """
+
+    def __init__(
+        self,
+        width: int = 256,
+        height: int = 256,
+        fov: float = 30.0,
+        background_color: Optional[List[float]] = None,
+        backend: str = 'auto',
+    ):
+        """初始化缩略图渲染器
+
+        Args:
+            width: 图像宽度
+            height: 图像高度
+            fov: 垂直视场角（度）
+            background_color: 背景颜色RGB，默认白色
+            backend: 'auto' / 'offscreen' / 'software'
+        """
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.fov = fov
+        self.background_color = [1.0, 1.0, 1.0] if background_color is None else background_color
+        self.backend = backend
+        # 记录的 (data, color, kwargs)
+        self.items: List[Tuple[Union[JCDBaseData, List[JCDBaseData]], Optional[List[float]], Dict[str, Any]]] = []
+
+    def get_backend(self) -> str:
+        """获取实际使用的渲染后端"""
+        if self.backend != 'auto':
+            return self.backend
+
+        # 无头环境下Open3D使用EGL的无表面平台
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+        return 'offscreen' if is_offscreen_available() else 'software'
+
+    def clear(self):
+        """清空所有数据和几何体"""
+        super().clear()
+        self.items.clear()
+
+    def add_data(self, data: Union[JCDBaseData, List[JCDBaseData]],
+                 color: Optional[List[float]] = None,
+                 **kwargs):
+        """记录要渲染的数据，渲染时再按后端生成Open3D几何体或软件光栅化图元
+
+        Args:
+            data: JCDBaseData对象或对象列表
+            color: 自定义颜色RGB，默认使用类型对应的颜色
+            **kwargs: 其他渲染参数，同JCDRenderer.add_data
+        """
+        self.items.append((data, color, kwargs))
+
+    def _create_geometries(self):
+        """由记录的数据生成Open3D几何体"""
+        super().clear()
+        for data, color, kwargs in self.items:
+            super().add_data(data, color, **kwargs)
+        self._flush_line_groups()
+
+    @staticmethod
+    def _create_primitive(kind: str, points: np.ndarray, indices: Optional[np.ndarray],
+                          color: List[float]) -> Tuple[str, np.ndarray, np.ndarray, np.ndarray]:
+        points = np.asarray(points, dtype=np.float64)
+        return kind, points, indices, np.tile(np.asarray(color, dtype=np.float64), (len(points), 1))
+
+    def _add_primitives(self, primitives: List[Tuple[str, np.ndarray, np.ndarray, np.ndarray]],
+                        data: Union[JCDBaseData, List[JCDBaseData]],
+                        color: Optional[List[float]] = None,
+                        **kwargs):
+        """由实体生成软件光栅化使用的图元，绘制内容与JCDRenderer.add_data一致"""
+        if isinstance(data, list):
+            diamonds = [item for item in data if isinstance(item, JCDDiamond) and not item.hide]
+            if len(diamonds) > 0:
+                mesh = create_diamonds_mesh(diamonds)
+                primitives.append(self._create_primitive('triangles', *mesh, self._get_color(color, 'diamond')))
+
+            for item in data:
+                if isinstance(item, JCDDiamond):
+                    continue
+                self._add_primitives(primitives, item, color, **kwargs)
+            return
+
+        if data.hide:
+            return
+
+        if isinstance(data, JCDCurve):
+            line_data = create_curve_lines(data)
+            primitives.append(self._create_primitive('lines', *line_data, self._get_color(color, 'curve')))
+        elif isinstance(data, JCDSurface):
+            if kwargs.get('show_wireframe', True):
+                line_data = create_surface_lines(data)
+                primitives.append(self._create_primitive('lines', *line_data, self._get_color(color, 'surface')))
+        elif isinstance(data, JCDFontSurface):
+            line_data = create_font_surface_lines(data)
+            primitives.append(self._create_primitive('lines', *line_data, self._get_color(color, 'font_surface')))
+            if kwargs.get('show_font_solid', False):
+                mesh = create_font_surface_mesh(data, apply_matrix=False)
+                primitives.append(self._create_primitive('triangles', *mesh, self._get_color(color, 'font_surface')))
+        elif isinstance(data, JCDGuideLine):
+            line_data = create_guide_line_lines(data)
+            primitives.append(self._create_primitive('lines', *line_data, self._get_color(color, 'guide_line')))
+        elif isinstance(data, JCDDiamond):
+            mesh = create_diamonds_mesh([data])
+            primitives.append(self._create_primitive('triangles', *mesh, self._get_color(color, 'diamond')))
+        elif isinstance(data, JCDBoolSurface):
+            points = data.get_points()
+            if points is not None and len(points) > 0:
+                primitives.append(self._create_primitive('points', points, None, self._get_color(color, 'bool_surface')))
+        elif isinstance(data, JCDQuadType):
+            mesh = create_quad_type_mesh(data)
+            primitives.append(self._create_primitive('triangles', *mesh, self._get_color(color, 'quad_type')))
+            if kwargs.get('show_wireframe', True):
+                primitives.append(self._create_primitive('lines', *create_quad_type_lines(data), self.WIREFRAME_COLOR))
+
+    def _get_primitives(self) -> List[Tuple[str, np.ndarray, np.ndarray, np.ndarray]]:
+        """将记录的数据转换为软件光栅化使用的图元"""
+        primitives = []
+        for data, color, kwargs in self.items:
+            self._add_primitives(primitives, data, color, **kwargs)
+        return [primitive for primitive in primitives if len(primitive[1]) > 0]
+
+    @staticmethod
+    def _get_primitives_bounding_box(
+        primitives: List[Tuple[str, np.ndarray, np.ndarray, np.ndarray]],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """计算图元中被使用的点的边界框"""
+        points = [points if indices is None else points[np.unique(indices)]
+                  for _, points, indices, _ in primitives]
+        points = [p for p in points if len(p) > 0]
+        if len(points) == 0:
+            return None
+        points = np.concatenate(points, axis=0)
+        return points.min(axis=0), points.max(axis=0)
+
+    def _render_offscreen(self, cameras: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """使用Open3D离屏渲染器渲染所有视角"""
+        rendering = o3d.visualization.rendering
+        renderer = rendering.OffscreenRenderer(self.width, self.height)
+        renderer.scene.set_background(list(self.background_color) + [1.0])
+
+        for i, geometry in enumerate(self.geometries):
+            material = rendering.MaterialRecord()
+            if isinstance(geometry, o3d.geometry.LineSet):
+                material.shader = 'unlitLine'
+                material.line_width = 1.5
+            elif isinstance(geometry, o3d.geometry.PointCloud):
+                material.shader = 'defaultUnlit'
+                material.point_size = 3.0
+            else:
+                material.shader = 'defaultLit'
+            renderer.scene.add_geometry(f'geometry_{i}', geometry, material)
+
+        images = {}
+        for view, (eye, center, up) in cameras.items():
+            renderer.setup_camera(self.fov, center, eye, up)
+            images[view] = np.asarray(renderer.render_to_image())[:, :, :3].copy()
+        return images
+
+    def render_views(
+        self,
+        views: List[str],
+        bbox: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """渲染多个视角的缩略图
+
+        Args:
+            views: 视角名称列表
+            bbox: 用于放置相机的边界框，默认使用所有几何体的边界框
+
+        Returns:
+            {视角名称: uint8图像 (h, w, 3)}
+        """
+        if self.get_backend() == 'offscreen':
+            try:
+                self._create_geometries()
+                if bbox is None:
+                    bbox = self.get_bounding_box()
+                if bbox is None:
+                    return {}
+                cameras = {view: get_view_camera(bbox, view, self.fov) for view in views}
+                return self._render_offscreen(cameras)
+            except Exception as e:
+                print('[WARN][JCDThumbnailRenderer::render_views]')
+                print('\t offscreen rendering failed, fallback to software!')
+                print('\t error:', e)
+
+        primitives = self._get_primitives()
+        if bbox is None:
+            bbox = self._get_primitives_bounding_box(primitives)
+        if bbox is None:
+            return {}
+
+        cameras = {view: get_view_camera(bbox, view, self.fov) for view in views}
+        return {
+            view: rasterize(primitives, eye, center, up, self.fov,
+                            self.width, self.height, self.background_color)
+            for view, (eye, center, up) in cameras.items()
+        }
+
+
+def get_thumbnail_path(jcd_file_path: str, save_folder_path: str, view: str) -> str:
+    """获取缩略图保存路径"""
+    file_name = os.path.splitext(os.path.basename(jcd_file_path))[0]
+    return os.path.join(save_folder_path, f"{file_name}_{view}.png")
+
+
+def is_thumbnail_cached(jcd_file_path: str, thumbnail_file_paths: List[str]) -> bool:
+    """判断缩略图是否都存在且不早于源文件"""
+    source_mtime = os.path.getmtime(jcd_file_path)
+    for thumbnail_file_path in thumbnail_file_paths:
+        if not os.path.exists(thumbnail_file_path):
+            return False
+        if os.path.getmtime(thumbnail_file_path) < source_mtime:
+            return False
+    return True
+
+
+def render_thumbnail_file(
+    jcd_file_path: str,
+    save_folder_path: str,
+    views: Tuple[str, ...] = ('iso',),
+    width: int = 256,
+    height: int = 256,
+    backend: str = 'auto',
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """为单个JCD文件渲染缩略图
+
+    Args:
+        jcd_file_path: JCD文件路径
+        save_folder_path: 缩略图保存文件夹
+        views: 视角名称列表
+        width: 图像宽度
+        height: 图像高度
+        backend: 渲染后端
+        overwrite: 是否忽略缓存重新渲染
+
+    Returns:
+        渲染结果 {'jcd_file_path', 'status', 'thumbnails', 'error'}
+    """
+    from jcd_manage.Module.jcd_loader import JCDLoader
+
+    thumbnail_file_paths = [get_thumbnail_path(jcd_file_path, save_folder_path, view) for view in views]
+    result = {
+        'jcd_file_path': jcd_file_path,
+        'status': 'rendered',
+        'thumbnails': thumbnail_file_paths,
+        'error': None,
+    }
+
+    try:
+        if not overwrite and is_thumbnail_cached(jcd_file_path, thumbnail_file_paths):
+            result['status'] = 'cached'
+            return result
+
+        jcd_loader = JCDLoader()
+        if not jcd_loader.loadJCDFile(jcd_file_path):
+            result['status'] = 'failed'
+            result['error'] = 'load jcd file failed'
+            return result
+
+        # 所有类型的实体都按JCDRenderer的预设颜色绘制
+        renderer = JCDThumbnailRenderer(width, height, backend=backend)
+        renderer.add_data(jcd_loader.objects, show_font_solid=True)
+
+        images = renderer.render_views(list(views), jcd_loader.get_overall_bounding_box())
+        if len(images) == 0:
+            result['status'] = 'failed'
+            result['error'] = 'no geometry to render'
+            return result
+
+        os.makedirs(save_folder_path, exist_ok=True)
+        for view, thumbnail_file_path in zip(views, thumbnail_file_paths):
+            save_png(thumbnail_file_path, images[view])
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+
+    return result
+
+
+def render_thumbnails(
+    jcd_file_paths: List[str],
+    save_folder_path: str,
+    views: Tuple[str, ...] = ('iso',),
+    width: int = 256,
+    height: int = 256,
+    backend: str = 'auto',
+    overwrite: bool = False,
+    processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """使用进程池批量渲染缩略图，已缓存且未过期的文件会被跳过
+
+    Args:
+        jcd_file_paths: JCD文件路径列表
+        save_folder_path: 缩略图保存文件夹
+        views: 视角名称列表
+        width: 图像宽度
+        height: 图像高度
+        backend: 渲染后端
+        overwrite: 是否忽略缓存重新渲染
+        processes: 进程数，默认为CPU核数，为1时在当前进程中执行
+
+    Returns:
+        每个文件的渲染结果列表
+    """
+    for view in views:
+        if view not in VIEW_DIRECTIONS:
+            print('[ERROR][thumbnail::render_thumbnails]')
+            print('\t unknown view!')
+            print('\t view:', view)
+            return []
+
+    args = (save_folder_path, tuple(views), width, height, backend, overwrite)
+
+    if processes == 1:
+        return [render_thumbnail_file(jcd_file_path, *args) for jcd_file_path in jcd_file_paths]
+
+    # Open3D与fork不兼容，使用spawn启动工作进程
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn')) as executor:
+        futures = [executor.submit(render_thumbnail_file, jcd_file_path, *args) for jcd_file_path in jcd_file_paths]
+        return [future.result() for future in futures]
@@ -0,0 +1,644 @@
+"""多边形三角化模块
+
+基于耳切法（ear clipping）的带洞多边形三角化，洞通过桥接边合并到外轮廓中。
+多边形以双向链表表示，切除耳朵后只重新检查受影响的顶点；顶点较多时凹顶点按均匀网格哈希，
+判断耳朵时只检查与其包围盒相交的网格单元，避免逐耳遍历全部顶点。
+"""
+import heapq
+import itertools
+import math
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+# 多边形顶点数超过该值时使用网格哈希查找耳朵内部的凹顶点
+INDEX_THRESHOLD = 80
+
+
+def get_signed_area(points_2d: np.ndarray) -> float:
+    """计算二维多边形的有向面积（逆时针为正）
+
+    Args:
+        points_2d: 多边形顶点 (n, 2)
+
+    Returns:
+        有向面积
+    """
+    if len(points_2d) < 3:
+        return 0.0
+
+    x = points_2d[:, 0]
+    y = points_2d[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def get_signed_areas(points_2d: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """批量计算多个首尾相接存储的多边形的有向面积
+
+    Args:
+        points_2d: 所有多边形顶点 (n, 2)
+        sizes: 每个多边形的顶点数 (k,)
+
+    Returns:
+        有向面积数组 (k,)
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if len(sizes) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    index = np.arange(len(points_2d))
+    next_index = index + 1
+    valid = sizes > 0
+    next_index[(starts + sizes - 1)[valid]] = starts[valid]
+
+    x = points_2d[:, 0]
+    y = points_2d[:, 1]
+    cross = x * y[next_index] - x[next_index] * y
+
+    areas = np.zeros(len(sizes), dtype=np.float64)
+    areas[valid] = 0.5 * np.add.reduceat(cross, starts[valid])
+    return areas
+
+
+def is_point_in_polygon(point: np.ndarray, polygon: np.ndarray) -> bool:
+    """奇偶规则判断点是否在多边形内部
+
+    Args:
+        point: 二维点 (2,)
+        polygon: 多边形顶点 (n, 2)
+
+    Returns:
+        是否在内部
+    """
+    x, y = point[0], point[1]
+    xi = polygon[:, 0]
+    yi = polygon[:, 1]
+    xj = np.roll(xi, 1)
+    yj = np.roll(yi, 1)
+
+    crossing = (yi > y) != (yj > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+    inside = crossing & (x < x_cross)
+    return bool(np.count_nonzero(inside) % 2 == 1)
+
+
+def group_outlines(outlines_2d: List[np.ndarray]) -> List[Tuple[int, List[int]]]:
+    """按嵌套深度将轮廓分组为外轮廓和洞
+
+    深度为偶数的轮廓为外轮廓，深度为奇数的轮廓为洞，
+    洞归属于直接包含它的外轮廓（支持字中字等多层嵌套）。
+
+    Args:
+        outlines_2d: 二维轮廓列表
+
+    Returns:
+        [(外轮廓索引, [洞索引, ...]), ...]
+    """
+    outline_count = len(outlines_2d)
+    abs_areas = np.array([abs(get_signed_area(outline)) for outline in outlines_2d])
+
+    # 按面积从大到小排序，包含者一定先于被包含者
+    order = np.argsort(-abs_areas, kind='stable')
+    parents = [-1] * outline_count
+    depths = [0] * outline_count
+
+    for rank, i in enumerate(order):
+        if len(outlines_2d[i]) == 0:
+            continue
+        probe = outlines_2d[i][0]
+        # 从面积最小的候选开始找直接父轮廓
+        for j in order[:rank][::-1]:
+            if len(outlines_2d[j]) < 3:
+                continue
+            if is_point_in_polygon(probe, outlines_2d[j]):
+                parents[i] = int(j)
+                depths[i] = depths[j] + 1
+                break
+
+    groups = {}
+    for i in order:
+        i = int(i)
+        if depths[i] % 2 == 0:
+            groups[i] = []
+    for i in order:
+        i = int(i)
+        if depths[i] % 2 == 1 and parents[i] in groups:
+            groups[parents[i]].append(i)
+
+    return [(outer, holes) for outer, holes in groups.items()]
+
+
+class _Node:
+    """耳切使用的双向链表节点"""
+    __slots__ = ('i', 'x', 'y', 'prev', 'next', 'slot', 'steiner', 'removed', 'watchers', 'version')
+
+    def __init__(self, i: int, x: float, y: float) -> None:
+        self.i = i
+        self.x = x
+        self.y = y
+        self.prev = None
+        self.next = None
+        # 在凹顶点索引中所属的网格单元，None 表示不在索引中
+        self.slot = None
+        self.steiner = False
+        self.removed = False
+        # 因本顶点位于其三角形内而暂不是耳朵的顶点
+        self.watchers = None
+        # 每次入队时递增，用于跳过队列中过期的条目
+        self.version = 0
+
+
+def _area(p: _Node, q: _Node, r: _Node) -> float:
+    # 与叉积符号相反：逆时针转向（凸顶点）为负
+    return (q.y - p.y) * (r.x - q.x) - (q.x - p.x) * (r.y - q.y)
+
+
+def _equals(p1: _Node, p2: _Node) -> bool:
+    return p1.x == p2.x and p1.y == p2.y
+
+
+def _point_in_triangle(ax, ay, bx, by, cx, cy, px, py) -> bool:
+    return ((cx - px) * (ay - py) >= (ax - px) * (cy - py)
+            and (ax - px) * (by - py) >= (bx - px) * (ay - py)
+            and (bx - px) * (cy - py) >= (cx - px) * (by - py))
+
+
+def _insert_node(i: int, x: float, y: float, last: Optional[_Node]) -> _Node:
+    p = _Node(i, x, y)
+    if last is None:
+        p.prev = p
+        p.next = p
+    else:
+        p.next = last.next
+        p.prev = last
+        last.next.prev = p
+        last.next = p
+    return p
+
+
+def _remove_node(p: _Node) -> None:
+    p.removed = True
+    p.next.prev = p.prev
+    p.prev.next = p.next
+
+
+def _linked_list(coords: np.ndarray, ring: np.ndarray, ccw: bool) -> Optional[_Node]:
+    """由顶点索引创建环形链表，并调整为指定方向"""
+    if (get_signed_area(coords[ring]) > 0) != ccw:
+        ring = ring[::-1]
+
+    last = None
+    for i, (x, y) in zip(ring.tolist(), coords[ring].tolist()):
+        last = _insert_node(i, x, y, last)
+    if last is not None and _equals(last, last.next):
+        _remove_node(last)
+        last = last.next
+    return last
+
+
+def _filter_points(start: Optional[_Node], end: Optional[_Node] = None) -> Optional[_Node]:
+    """删除重合点和共线点"""
+    if start is None:
+        return start
+    if end is None:
+        end = start
+
+    p = start
+    while True:
+        again = False
+        if not p.steiner and (_equals(p, p.next) or _area(p.prev, p, p.next) == 0):
+            _remove_node(p)
+            p = end = p.prev
+            if p is p.next:
+                break
+            again = True
+        else:
+            p = p.next
+        if not again and p is end:
+            break
+    return end
+
+
+class _ReflexIndex:
+    """按均匀网格哈希的凹顶点索引
+
+    耳切只会减小剩余顶点的内角，凸顶点不会再变为凹顶点，因此只需索引开始时的凹顶点，
+    并在其变为凸顶点或被删除时移出网格。查找耳朵内的凹顶点时只遍历与耳朵包围盒
+    相交的网格单元，网格大小使每个单元平均约有一个凹顶点。
+    """
+
+    def __init__(self, start: _Node) -> None:
+        nodes = []
+        p = start
+        while True:
+            p.slot = None
+            if _area(p.prev, p, p.next) >= 0:
+                nodes.append(p)
+            p = p.next
+            if p is start:
+                break
+
+        self.cells = {}
+        if len(nodes) == 0:
+            return
+
+        self.min_x = min(node.x for node in nodes)
+        self.min_y = min(node.y for node in nodes)
+        size = max(max(node.x for node in nodes) - self.min_x, max(node.y for node in nodes) - self.min_y)
+        self.inv_cell_size = math.ceil(math.sqrt(len(nodes))) / size if size > 0 else 0.0
+        for node in nodes:
+            node.slot = self._get_cell(node.x, node.y)
+            self.cells.setdefault(node.slot, []).append(node)
+
+    def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int((x - self.min_x) * self.inv_cell_size), int((y - self.min_y) * self.inv_cell_size)
+
+    def update(self, node: _Node) -> None:
+        """顶点被删除或相邻顶点变化后，不再是凹顶点时移出网格"""
+        if node.slot is not None and (node.removed or _area(node.prev, node, node.next) < 0):
+            self.cells[node.slot].remove(node)
+            node.slot = None
+
+    def find(self, a: _Node, b: _Node, c: _Node) -> Optional[_Node]:
+        """查找位于三角形 (a, b, c) 内的凹顶点"""
+        if len(self.cells) == 0:
+            return None
+
+        ax, ay, bx, by, cx, cy = a.x, a.y, b.x, b.y, c.x, c.y
+        x0, x1 = min(ax, bx, cx), max(ax, bx, cx)
+        y0, y1 = min(ay, by, cy), max(ay, by, cy)
+        i0, j0 = self._get_cell(x0, y0)
+        i1, j1 = self._get_cell(x1, y1)
+        cells = self.cells
+        for i in range(max(i0, 0), i1 + 1):
+            for j in range(max(j0, 0), j1 + 1):
+                for p in cells.get((i, j), ()):
+                    if (x0 <= p.x <= x1 and y0 <= p.y <= y1 and p is not a and p is not c
+                            and _point_in_triangle(ax, ay, bx, by, cx, cy, p.x, p.y)):
+                        return p
+        return None
+
+
+def _get_ear_blocker(ear: _Node, index: Optional[_ReflexIndex]) -> Optional[_Node]:
+    """判断顶点是否为耳朵
+
+    Args:
+        ear: 待检查的顶点
+        index: 凹顶点索引，为 None 时逐个检查多边形的顶点
+
+    Returns:
+        是耳朵时返回 None；凹顶点返回自身；否则返回位于三角形内的一个凹顶点
+    """
+    a, b, c = ear.prev, ear, ear.next
+    if _area(a, b, c) >= 0:
+        return ear
+    if index is not None:
+        return index.find(a, b, c)
+
+    ax, ay, bx, by, cx, cy = a.x, a.y, b.x, b.y, c.x, c.y
+    x0, x1 = min(ax, bx, cx), max(ax, bx, cx)
+    y0, y1 = min(ay, by, cy), max(ay, by, cy)
+
+    # 三角形内不能包含其他凹顶点
+    p = c.next
+    while p is not a:
+        if (x0 <= p.x <= x1 and y0 <= p.y <= y1 and _point_in_triangle(ax, ay, bx, by, cx, cy, p.x, p.y)
+                and _area(p.prev, p, p.next) >= 0):
+            return p
+        p = p.next
+    return None
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def _on_segment(p: _Node, q: _Node, r: _Node) -> bool:
+    return min(p.x, r.x) <= q.x <= max(p.x, r.x) and min(p.y, r.y) <= q.y <= max(p.y, r.y)
+
+
+def _intersects(p1: _Node, q1: _Node, p2: _Node, q2: _Node) -> bool:
+    o1 = _sign(_area(p1, q1, p2))
+    o2 = _sign(_area(p1, q1, q2))
+    o3 = _sign(_area(p2, q2, p1))
+    o4 = _sign(_area(p2, q2, q1))
+
+    if o1 != o2 and o3 != o4:
+        return True
+    if o1 == 0 and _on_segment(p1, p2, q1):
+        return True
+    if o2 == 0 and _on_segment(p1, q2, q1):
+        return True
+    if o3 == 0 and _on_segment(p2, p1, q2):
+        return True
+    if o4 == 0 and _on_segment(p2, q1, q2):
+        return True
+    return False
+
+
+def _intersects_polygon(a: _Node, b: _Node) -> bool:
+    p = a
+    while True:
+        if (p.i != a.i and p.next.i != a.i and p.i != b.i and p.next.i != b.i
+                and _intersects(p, p.next, a, b)):
+            return True
+        p = p.next
+        if p is a:
+            return False
+
+
+def _locally_inside(a: _Node, b: _Node) -> bool:
+    if _area(a.prev, a, a.next) < 0:
+        return _area(a, b, a.next) >= 0 and _area(a, a.prev, b) >= 0
+    return _area(a, b, a.prev) < 0 or _area(a, a.next, b) < 0
+
+
+def _middle_inside(a: _Node, b: _Node) -> bool:
+    p = a
+    inside = False
+    px = (a.x + b.x) / 2.0
+    py = (a.y + b.y) / 2.0
+    while True:
+        if ((p.y > py) != (p.next.y > py) and p.next.y != p.y
+                and px < (p.next.x - p.x) * (py - p.y) / (p.next.y - p.y) + p.x):
+            inside = not inside
+        p = p.next
+        if p is a:
+            return inside
+
+
+def _is_valid_diagonal(a: _Node, b: _Node) -> bool:
+    if a.next.i == b.i or a.prev.i == b.i or _intersects_polygon(a, b):
+        return False
+    if (_locally_inside(a, b) and _locally_inside(b, a) and _middle_inside(a, b)
+            and (_area(a.prev, a, b.prev) != 0 or _area(a, b.prev, b) != 0)):
+        return True
+    return _equals(a, b) and _area(a.prev, a, a.next) > 0 and _area(b.prev, b, b.next) > 0
+
+
+def _split_polygon(a: _Node, b: _Node) -> _Node:
+    """沿对角线a-b将多边形分为两个，返回第二个多边形中b的副本"""
+    a2 = _Node(a.i, a.x, a.y)
+    b2 = _Node(b.i, b.x, b.y)
+    an = a.next
+    bp = b.prev
+
+    a.next = b
+    b.prev = a
+    a2.next = an
+    an.prev = a2
+    b2.next = a2
+    a2.prev = b2
+    bp.next = b2
+    b2.prev = bp
+    return b2
+
+
+def _cure_local_intersections(start: _Node, triangles: List[Tuple[int, int, int]]) -> Optional[_Node]:
+    """切除局部自交处的三角形"""
+    p = start
+    while True:
+        a = p.prev
+        b = p.next.next
+        if not _equals(a, b) and _intersects(a, p, p.next, b) and _locally_inside(a, b) and _locally_inside(b, a):
+            triangles.append((a.i, p.i, b.i))
+            _remove_node(p)
+            _remove_node(p.next)
+            p = start = b
+        p = p.next
+        if p is start:
+            break
+    return _filter_points(p)
+
+
+def _split_earcut(
+    start: _Node,
+    triangles: List[Tuple[int, int, int]],
+    use_index: bool,
+) -> None:
+    """寻找一条有效对角线将多边形一分为二，分别耳切"""
+    a = start
+    while True:
+        b = a.next.next
+        while b is not a.prev:
+            if a.i != b.i and _is_valid_diagonal(a, b):
+                c = _split_polygon(a, b)
+                a = _filter_points(a, a.next)
+                c = _filter_points(c, c.next)
+                _ear_clip_linked(a, triangles, use_index)
+                _ear_clip_linked(c, triangles, use_index)
+                return
+            b = b.next
+        a = a.next
+        if a is start:
+            return
+
+
+def _ear_clip_linked(
+    ear: Optional[_Node],
+    triangles: List[Tuple[int, int, int]],
+    use_index: bool,
+    stage: int = 0,
+) -> None:
+    """对链表表示的逆时针多边形执行耳切
+
+    待检查的顶点放在优先队列中：切除耳朵后只重新检查两个相邻顶点，以及此前被这两个顶点
+    遮挡的顶点（顶点是否为耳朵只在相邻顶点或遮挡它的凹顶点变化时改变），
+    不必每轮遍历整个多边形。队列为空仍未完成时依次：删除重合/共线点后重试，
+    切除局部自交后重试，沿对角线拆分多边形。
+
+    Args:
+        ear: 多边形中的任一节点
+        triangles: 输出的三角形列表
+        use_index: 是否使用凹顶点网格索引，否则逐个检查多边形的顶点
+        stage: 当前所处的退化处理阶段
+    """
+    if ear is None:
+        return
+    index = _ReflexIndex(ear) if use_index else None
+
+    # 按耳朵包围盒大小排序，先切除小的耳朵，大耳朵检查时多数凹顶点已被消除
+    # 入队序号使大小相同的耳朵按确定的顺序切除
+    queue = []
+    counter = itertools.count()
+
+    def push(node: _Node) -> None:
+        node.version += 1
+        a, b, c = node.prev, node, node.next
+        size = max(a.x, b.x, c.x) - min(a.x, b.x, c.x) + max(a.y, b.y, c.y) - min(a.y, b.y, c.y)
+        heapq.heappush(queue, (size, next(counter), node.version, node))
+
+    p = ear
+    while True:
+        p.watchers = None
+        push(p)
+        p = p.next
+        if p is ear:
+            break
+
+    while ear.prev is not ear.next:
+        if len(queue) == 0:
+            if stage == 0:
+                _ear_clip_linked(_filter_points(ear), triangles, use_index, 1)
+            elif stage == 1:
+                ear = _cure_local_intersections(_filter_points(ear), triangles)
+                _ear_clip_linked(ear, triangles, use_index, 2)
+            elif stage == 2:
+                _split_earcut(ear, triangles, use_index)
+            return
+
+        _, _, version, node = heapq.heappop(queue)
+        if node.removed or version != node.version:
+            continue
+        blocker = _get_ear_blocker(node, index)
+        if blocker is not None:
+            if blocker.watchers is None:
+                blocker.watchers = []
+            blocker.watchers.append(node)
+            continue
+
+        prev = node.prev
+        nxt = node.next
+        triangles.append((prev.i, node.i, nxt.i))
+        _remove_node(node)
+        ear = nxt
+        for changed in (prev, nxt):
+            if index is not None:
+                index.update(changed)
+            push(changed)
+            if changed.watchers is not None:
+                for watcher in changed.watchers:
+                    if not watcher.removed:
+                        push(watcher)
+                changed.watchers = None
+
+
+def _get_leftmost(start: _Node) -> _Node:
+    p = start
+    leftmost = start
+    while True:
+        if p.x < leftmost.x or (p.x == leftmost.x and p.y < leftmost.y):
+            leftmost = p
+        p = p.next
+        if p is start:
+            return leftmost
+
+
+def _sector_contains_sector(m: _Node, p: _Node) -> bool:
+    return _area(m.prev, m, p.prev) < 0 and _area(p.next, m, m.next) < 0
+
+
+def _find_hole_bridge(hole: _Node, outer: _Node) -> Optional[_Node]:
+    """查找洞最左顶点向左可见的外轮廓顶点（Eberly桥接算法）
+
+    Args:
+        hole: 洞中x最小的顶点
+        outer: 外轮廓中的任一节点
+
+    Returns:
+        桥接顶点，找不到时返回 None
+    """
+    hx, hy = hole.x, hole.y
+    qx = -np.inf
+    m = None
+
+    # 向-x方向发射射线，寻找最近的相交边，取边上x较小的端点
+    p = outer
+    while True:
+        if p.y >= hy >= p.next.y and p.next.y != p.y:
+            x = p.x + (hy - p.y) * (p.next.x - p.x) / (p.next.y - p.y)
+            if qx < x <= hx:
+                qx = x
+                m = p if p.x < p.next.x else p.next
+                if x == hx:
+                    return m
+        p = p.next
+        if p is outer:
+            break
+    if m is None:
+        return None
+
+    # 三角形(洞顶点, 交点, m)内的顶点会遮挡m，取与射线夹角最小者
+    stop = m
+    mx, my = m.x, m.y
+    tan_min = np.inf
+    p = m
+    while True:
+        if (hx >= p.x >= mx and hx != p.x
+                and _point_in_triangle(hx if hy < my else qx, hy, mx, my, qx if hy < my else hx, hy, p.x, p.y)):
+            tan = abs(hy - p.y) / (hx - p.x)
+            if _locally_inside(p, hole) and (
+                    tan < tan_min or (tan == tan_min and (p.x > m.x or (p.x == m.x and _sector_contains_sector(m, p))))):
+                m = p
+                tan_min = tan
+        p = p.next
+        if p is stop:
+            return m
+
+
+def _eliminate_hole(hole: _Node, outer: _Node) -> _Node:
+    """通过一对往返的桥接边把洞合并到外轮廓中"""
+    bridge = _find_hole_bridge(hole, outer)
+    if bridge is None:
+        return outer
+
+    bridge_reverse = _split_polygon(bridge, hole)
+    _filter_points(bridge_reverse, bridge_reverse.next)
+    return _filter_points(bridge, bridge.next)
+
+
+def triangulate_polygon(
+    coords: np.ndarray,
+    outer: np.ndarray,
+    holes: Optional[List[np.ndarray]] = None,
+) -> np.ndarray:
+    """三角化带洞的二维多边形
+
+    外轮廓会被调整为逆时针、洞调整为顺时针，返回的三角形均为逆时针朝向。
+    顶点数超过 INDEX_THRESHOLD 时，耳朵内部的顶点检查只遍历与耳朵包围盒相交的
+    网格单元中的凹顶点，不再随多边形顶点数平方增长。
+
+    Args:
+        coords: 所有顶点坐标 (n, 2)
+        outer: 外轮廓顶点索引 (k,)
+        holes: 洞的顶点索引列表
+
+    Returns:
+        三角形顶点索引 (m, 3)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    outer = np.asarray(outer, dtype=np.int64)
+    outer_node = _linked_list(coords, outer, True) if len(outer) >= 3 else None
+    if outer_node is None or outer_node.next is outer_node.prev:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    # 按最左顶点的x从小到大依次桥接洞
+    hole_nodes = []
+    vertex_count = len(outer)
+    for hole in holes or []:
+        hole = np.asarray(hole, dtype=np.int64)
+        if len(hole) < 3:
+            continue
+        hole_node = _linked_list(coords, hole, False)
+        if hole_node is None:
+            continue
+        if hole_node is hole_node.next:
+            hole_node.steiner = True
+        hole_nodes.append(_get_leftmost(hole_node))
+        vertex_count += len(hole)
+    hole_nodes.sort(key=lambda node: node.x)
+    for hole_node in hole_nodes:
+        outer_node = _eliminate_hole(hole_node, outer_node)
+
+    triangles = []
+    _ear_clip_linked(outer_node, triangles, vertex_count > INDEX_THRESHOLD)
+    if len(triangles) == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    triangles = np.asarray(triangles, dtype=np.int64)
+    # 只去掉有重复顶点的三角形；共线的耳朵与相邻三角形共享边，去掉会在面上留下缝隙，
+    # 面积阈值又与坐标尺度有关，会误删细长但有效的三角形
+    valid = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 2] != triangles[:, 0])
+    return triangles[valid]
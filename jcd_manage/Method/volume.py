@@ -0,0 +1,267 @@
+"""JCD金属体积与重量估算模块
+
+对封闭的三角网格使用散度定理计算体积：每个三角形与原点构成的有向四面体体积之和，
+整个求和为一次numpy批量运算，没有逐三角形的Python循环。
+
+参与计算的几何体：
+- 曲面、四边形面片和拉伸后的字体面片，与CSG使用相同的三角化
+- 布尔曲面，使用CSG求值后的结果网格（复用DAG节点上的缓存），封闭的操作数得到封闭的结果
+- 钻石：原型网格体积乘以放置矩阵（与网格导出相同的 get_placed_diamond_matrices）线性部分行列式的绝对值，
+  按类型批量计算
+
+按 material_name 分组汇总体积，重量 = 体积 (mm³) × 密度 (g/cm³) / 1000。
+钻石的体积从其中心所在的金属中扣除（中心落在多个材质的边界框内时取体积最大的材质），
+近似镶口中被宝石占据的金属；中心取自放置矩阵，与金属网格经过相同的 matrices 变换。
+"""
+import numpy as np
+from functools import lru_cache
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from jcd_manage.Config.constant import MATERIAL_DENSITIES
+from jcd_manage.Config.types import DiamondType
+from jcd_manage.Data import JCDSurface, JCDQuadType, JCDFontSurface, JCDDiamond, JCDBoolSurface, JCDBaseData
+from jcd_manage.Method.csg import get_mesh_volume, tessellate_entity, evaluate_bool_surface
+from jcd_manage.Method.mesh import create_diamond_prototype, get_placed_diamond_matrices
+
+
+def is_mesh_closed(vertices: np.ndarray, triangles: np.ndarray, tolerance: float = 1e-6) -> bool:
+    """判断网格是否封闭：按位置合并顶点后，每条边被偶数个三角形共用
+
+    按位置合并使退化的极点、首尾重合的控制点不会被误判为开口
+
+    Args:
+        vertices: 顶点 (n, 3)
+        triangles: 三角形 (t, 3)
+        tolerance: 顶点合并的量化步长
+
+    Returns:
+        是否封闭
+    """
+    if len(triangles) == 0:
+        return False
+
+    _, vertex_ids = np.unique(
+        np.round(np.asarray(vertices, dtype=np.float64) / tolerance).astype(np.int64), axis=0, return_inverse=True,
+    )
+    vertex_ids = vertex_ids.reshape(-1)
+    edges = vertex_ids[triangles][:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if len(edges) == 0:
+        return False
+    edges.sort(axis=1)
+
+    _, counts = np.unique(edges[:, 0] * (int(vertex_ids.max()) + 1) + edges[:, 1], return_counts=True)
+    return bool(np.all(counts % 2 == 0))
+
+
+@lru_cache(maxsize=None)
+def get_prototype_volume(diamond_type: Optional[DiamondType]) -> float:
+    """钻石原型网格的体积（腰线半径为1）"""
+    return abs(get_mesh_volume(*create_diamond_prototype(diamond_type)))
+
+
+def get_stone_volumes(type_codes: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    """由钻石类型编码和变换矩阵批量计算钻石体积
+
+    Args:
+        type_codes: DiamondType 的值 (n,)，-1 表示未知类型（按圆形处理）
+        matrices: 变换矩阵 (n, 4, 4)
+
+    Returns:
+        体积 (n,)，单位与矩阵坐标的立方一致
+    """
+    type_codes = np.asarray(type_codes).reshape(-1)
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    scales = np.abs(np.linalg.det(matrices[:, :3, :3])) if len(matrices) > 0 else np.zeros(0)
+    prototype_volumes = np.empty(len(type_codes), dtype=np.float64)
+    for type_code in np.unique(type_codes).tolist():
+        diamond_type = None if type_code < 0 else DiamondType(type_code)
+        prototype_volumes[type_codes == type_code] = get_prototype_volume(diamond_type)
+    return prototype_volumes * scales
+
+
+def get_diamond_volumes(diamonds: List[JCDDiamond], matrices: Optional[np.ndarray] = None) -> np.ndarray:
+    """批量计算钻石体积，与 diamonds 一一对应
+
+    Args:
+        diamonds: 钻石列表
+        matrices: 已计算的放置矩阵 (n,4,4)，默认由 get_placed_diamond_matrices 计算
+    """
+    type_codes = np.asarray([-1 if diamond.diamond_type is None else diamond.diamond_type.value for diamond in diamonds])
+    if matrices is None:
+        matrices = get_placed_diamond_matrices(diamonds)
+    return get_stone_volumes(type_codes, matrices)
+
+
+def get_density(material_name: str, densities: Optional[Dict[str, float]] = None) -> Optional[float]:
+    """查找材质密度 (g/cm³)，未知材质返回 None"""
+    if densities is None:
+        densities = MATERIAL_DENSITIES
+    if material_name in densities:
+        return densities[material_name]
+    lower_densities = {name.lower(): density for name, density in densities.items()}
+    return lower_densities.get(material_name.strip().lower())
+
+
+def _get_entity_mesh(entity: JCDBaseData) -> Tuple[np.ndarray, np.ndarray]:
+    if isinstance(entity, JCDBoolSurface):
+        return evaluate_bool_surface(entity)
+    return tessellate_entity(entity)
+
+
+def estimate_weights(
+    objects: List[JCDBaseData],
+    densities: Optional[Dict[str, float]] = None,
+    include_hidden: bool = False,
+    subtract_stones: bool = True,
+) -> Dict[str, Any]:
+    """按材质估算金属体积与重量
+
+    Args:
+        objects: 实体列表
+        densities: 材质名称 -> 密度 (g/cm³)，默认使用 MATERIAL_DENSITIES
+        include_hidden: 是否包含隐藏实体
+        subtract_stones: 是否从金属中扣除钻石体积
+
+    Returns:
+        {
+            'materials': {材质名称: {'volume', 'stone_volume', 'net_volume', 'density', 'weight', 'entity_count'}},
+            'stones': {'count', 'volume'},
+            'open_count': 网格未封闭而未计入的实体数,
+            'total_weight': 已知密度材质的总重量 (g),
+            'unknown_materials': 没有密度的材质名称,
+        }
+        体积单位为 mm³，未知密度材质的 weight 为 None
+    """
+    materials = {}
+    bounding_boxes = {}
+    diamonds = []
+    open_count = 0
+
+    for obj in objects:
+        if obj.hide and not include_hidden:
+            continue
+        if isinstance(obj, JCDDiamond):
+            diamonds.append(obj)
+            continue
+        if not isinstance(obj, (JCDSurface, JCDQuadType, JCDFontSurface, JCDBoolSurface)):
+            continue
+
+        vertices, triangles = _get_entity_mesh(obj)
+        if len(triangles) == 0:
+            continue
+        # 布尔曲面的操作数不封闭时结果也不封闭，与其他实体一样不计入
+        if not is_mesh_closed(vertices, triangles):
+            open_count += 1
+            continue
+
+        used_vertices = vertices[np.unique(triangles)]
+        box = np.stack([used_vertices.min(axis=0), used_vertices.max(axis=0)])
+
+        # 以边界框中心为原点求和，减小模型远离原点时的舍入误差
+        material_name = obj.get_material_name()
+        material = materials.setdefault(material_name, {'volume': 0.0, 'entity_count': 0})
+        material['volume'] += abs(get_mesh_volume(vertices - box.mean(axis=0), triangles))
+        material['entity_count'] += 1
+
+        if material_name in bounding_boxes:
+            box = np.stack([np.minimum(box[0], bounding_boxes[material_name][0]),
+                            np.maximum(box[1], bounding_boxes[material_name][1])])
+        bounding_boxes[material_name] = box
+
+    diamond_matrices = get_placed_diamond_matrices(diamonds)
+    stone_volumes = get_diamond_volumes(diamonds, diamond_matrices)
+    names = list(materials)
+    assigned_stone_volumes = np.zeros(len(names), dtype=np.float64)
+    if subtract_stones and len(diamonds) > 0 and len(names) > 0:
+        centers = diamond_matrices[:, 3, :3]
+        boxes = np.stack([bounding_boxes[name] for name in names])
+        inside = np.all((centers[:, None, :] >= boxes[None, :, 0]) & (centers[:, None, :] <= boxes[None, :, 1]), axis=2)
+
+        # 每个钻石归属于包含其中心的体积最大的材质
+        volumes = np.asarray([materials[name]['volume'] for name in names])
+        scores = np.where(inside, volumes[None, :] + 1.0, 0.0)
+        owners = np.argmax(scores, axis=1)
+        has_owner = np.any(inside, axis=1)
+        assigned_stone_volumes = np.bincount(
+            owners[has_owner], weights=stone_volumes[has_owner], minlength=len(names),
+        )
+
+    total_weight = 0.0
+    unknown_materials = []
+    for i, name in enumerate(names):
+        material = materials[name]
+        material['stone_volume'] = float(min(assigned_stone_volumes[i], material['volume']))
+        material['net_volume'] = material['volume'] - material['stone_volume']
+        material['density'] = get_density(name, densities)
+        if material['density'] is None:
+            material['weight'] = None
+            unknown_materials.append(name)
+        else:
+            material['weight'] = material['net_volume'] * material['density'] / 1000.0
+            total_weight += material['weight']
+
+    return {
+        'materials': materials,
+        'stones': {'count': len(diamonds), 'volume': float(np.sum(stone_volumes))},
+        'open_count': open_count,
+        'total_weight': total_weight,
+        'unknown_materials': unknown_materials,
+    }
+
+
+def estimate_weight_file(
+    jcd_file_path: str,
+    densities: Optional[Dict[str, float]] = None,
+    subtract_stones: bool = True,
+) -> Dict[str, Any]:
+    """估算单个JCD文件的金属重量
+
+    Returns:
+        {'jcd_file_path', 'status', 'error'} 以及 estimate_weights 的结果
+    """
+    from jcd_manage.Module.jcd_loader import JCDLoader
+
+    result = {'jcd_file_path': jcd_file_path, 'status': 'estimated', 'error': None}
+    try:
+        jcd_loader = JCDLoader()
+        if not jcd_loader.loadJCDFile(jcd_file_path):
+            result['status'] = 'failed'
+            result['error'] = 'load jcd file failed'
+            return result
+        result.update(estimate_weights(jcd_loader.objects, densities, subtract_stones=subtract_stones))
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+    return result
+
+
+def estimate_weight_files(
+    jcd_file_paths: List[str],
+    densities: Optional[Dict[str, float]] = None,
+    subtract_stones: bool = True,
+    processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """使用进程池批量估算金属重量
+
+    Args:
+        jcd_file_paths: JCD文件路径列表
+        densities: 材质名称 -> 密度 (g/cm³)
+        subtract_stones: 是否从金属中扣除钻石体积
+        processes: 进程数，默认为CPU核数，为1时在当前进程中执行
+
+    Returns:
+        每个文件的估算结果列表
+    """
+    if processes == 1:
+        return [estimate_weight_file(jcd_file_path, densities, subtract_stones) for jcd_file_path in jcd_file_paths]
+
+    # Open3D与fork不兼容，使用spawn启动工作进程
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context('spawn')) as executor:
+        futures = [
+            executor.submit(estimate_weight_file, jcd_file_path, densities, subtract_stones)
+            for jcd_file_path in jcd_file_paths
+        ]
+        return [future.result() for future in futures]
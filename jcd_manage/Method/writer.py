@@ -0,0 +1,463 @@
+"""JCD文件写出模块
+
+将实体列表写回 SILKIDEASIGN0100 格式：
+- 从JCD文件加载且未修改的实体直接复制源文件中的原始字节，相邻记录合并为一次复制
+- 修改过或新建的实体通过 Method/io.py 中的 write_* 函数重新编码，未知字节和矩阵填充字节沿用读取时保存的值
+- 布尔曲面仅原始曲面被修改时逐段写出，只重新编码修改过的原始曲面；DAG结构被修改时根据DAG重新生成记录序列
+"""
+import os
+import zlib
+import numpy as np
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jcd_manage.Config.constant import JCD_HEADER
+from jcd_manage.Config.types import SurfaceType, BoolType, DAGBoolType
+from jcd_manage.Data import JCDBaseData, JCDBoolSurface
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Method.columnar import get_surface_type
+from jcd_manage.Method.io import (
+    MATRIX_COUNT_MAP, read_by_surface_type, write_by_surface_type, write_matrix, write_bool_header
+)
+
+
+# 不参与修改检测的属性
+SOURCE_FIELDS = {'source_span', 'source_state', 'source_segments', 'source_offsets'}
+
+DAG_BOOL_TYPE_MAP = {
+    DAGBoolType.UNION: BoolType.UNION,
+    DAGBoolType.INTERSECT: BoolType.INTERSECTION,
+    DAGBoolType.DIFFERENCE: BoolType.DIFFERENCE,
+}
+
+# 记录开头的标志位和元信息长度
+RECORD_PREFIX_SIZE = 9
+
+# 布尔头长度：3个矩阵及其间隔 + 布尔类型(1) + 未知(2) + 子曲面类型(1) + 未知(7)
+BOOL_HEADER_SIZE = 3 * 64 + 2 * 4 + 1 + 2 + 1 + 7
+
+
+class ArrayState(object):
+    """数组在快照时的引用、形状和类型，以及延迟计算的内容摘要
+
+    快照时不读取数组内容；第一次比较时与源文件中重新解码的数组逐字节比较，
+    一致则记录原始字节的CRC32，之后只计算摘要比较，用于检测原地修改
+    """
+
+    __slots__ = ('array', 'shape', 'dtype', 'digest')
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.digest: Optional[int] = None
+
+    def is_equal(self, array, get_source_array: Callable[[], Optional[np.ndarray]]) -> bool:
+        if array is not self.array or array.shape != self.shape or array.dtype != self.dtype:
+            return False
+        if self.digest is not None:
+            return get_array_digest(array) == self.digest
+
+        source_array = get_source_array()
+        if not _is_array_bytes_equal(array, source_array):
+            return False
+        self.digest = get_array_digest(array)
+        return True
+
+
+def get_array_digest(array: np.ndarray) -> int:
+    """数组原始字节的CRC32摘要"""
+    if not array.flags.c_contiguous:
+        array = np.ascontiguousarray(array)
+    return zlib.crc32(array.reshape(-1).view(np.uint8))
+
+
+def _is_array_bytes_equal(array: np.ndarray, source_array: Optional[np.ndarray]) -> bool:
+    if not isinstance(source_array, np.ndarray):
+        return False
+    if source_array.shape != array.shape or source_array.dtype != array.dtype:
+        return False
+    return np.ascontiguousarray(array).tobytes() == np.ascontiguousarray(source_array).tobytes()
+
+
+def read_source_entity(entity: JCDBaseData) -> Optional[JCDBaseData]:
+    """从源文件重新解码实体记录，源文件不可读或记录无法解码时返回None"""
+    if entity.source_span is None or 'matrices' not in entity.source_offsets:
+        return None
+    try:
+        with open(entity.source_span[0], 'rb') as source_file:
+            source_file.seek(entity.source_offsets['matrices'])
+            entity_data = read_by_surface_type(source_file, get_surface_type(entity))
+        return type(entity).from_dict(entity_data)
+    except Exception:
+        return None
+
+
+def get_entity_state(entity: JCDBaseData) -> Tuple[Tuple[str, Any], ...]:
+    """获取实体的状态快照
+
+    数组只保存引用、形状和类型，内容在第一次比较时才与源文件核对（重新赋值和原地修改均可被检测），
+    其他对象按引用保存，其余属性按值保存
+
+    Args:
+        entity: 实体
+
+    Returns:
+        ((属性名, 值), ...)
+    """
+    state = []
+    for name, value in vars(entity).items():
+        if name in SOURCE_FIELDS:
+            continue
+        if isinstance(value, np.ndarray):
+            value = ArrayState(value)
+        elif isinstance(value, CSGDAG):
+            value = (value, tuple(value.nodes))
+        state.append((name, value))
+    return tuple(state)
+
+
+def _is_value_equal(value, source_value, get_source_array: Callable[[], Optional[np.ndarray]]) -> bool:
+    if isinstance(source_value, ArrayState):
+        return isinstance(value, np.ndarray) and source_value.is_equal(value, get_source_array)
+    if isinstance(value, tuple) and isinstance(source_value, tuple):
+        return len(value) == len(source_value) and all(
+            _is_value_equal(item, source_item, get_source_array) for item, source_item in zip(value, source_value)
+        )
+    if value is None or isinstance(value, (bytes, str, int, float, Enum)):
+        return type(value) is type(source_value) and value == source_value
+    return value is source_value
+
+
+def is_entity_modified(entity: JCDBaseData, fields: Optional[Tuple[str, ...]] = None) -> bool:
+    """判断实体自加载以来是否被修改（没有源文件信息的实体视为已修改）
+
+    先比较属性名和标量值，再逐个比较数组，遇到第一个不同的属性即返回；
+    数组第一次比较时从源文件重新解码该实体，之后只比较摘要
+
+    Args:
+        entity: 实体
+        fields: 只比较这些属性，默认比较全部属性
+
+    Returns:
+        是否已修改
+    """
+    if entity.source_span is None or entity.source_state is None:
+        return True
+
+    names = [name for name in vars(entity) if name not in SOURCE_FIELDS]
+    if names != [name for name, _ in entity.source_state]:
+        return True
+
+    items = [
+        (name, source_value) for name, source_value in entity.source_state
+        if fields is None or name in fields
+    ]
+    # 数组放在最后比较，标量已不同时不必计算摘要
+    items.sort(key=lambda item: isinstance(item[1], ArrayState))
+
+    # 源文件中的实体只在需要时解码一次
+    source_entities = []
+
+    def get_source_array(name: str) -> Optional[np.ndarray]:
+        if len(source_entities) == 0:
+            source_entities.append(read_source_entity(entity))
+        return getattr(source_entities[0], name, None)
+
+    for name, source_value in items:
+        value = getattr(entity, name)
+        if isinstance(value, CSGDAG):
+            value = (value, tuple(value.nodes))
+        if not _is_value_equal(value, source_value, lambda name=name: get_source_array(name)):
+            return True
+    return False
+
+
+def encode_meta_info(entity: JCDBaseData, surface_type: Optional[SurfaceType] = None) -> bytes:
+    """编码8字节元信息，保留原有元信息中的未知位，更新类型和隐藏标志"""
+    meta_info = bytearray(bytes(entity.meta_info)[:8].ljust(8, b'\0'))
+    meta_info[0] = (surface_type or get_surface_type(entity)).value
+    if entity.hide:
+        meta_info[4] |= 2
+    else:
+        meta_info[4] &= ~2 & 0xFF
+    return bytes(meta_info)
+
+
+def get_entity_data(entity: JCDBaseData) -> Dict[str, Any]:
+    """获取用于编码的实体数据字典"""
+    data = entity.to_dict()
+    data['surface_type'] = get_surface_type(entity)
+    return data
+
+
+class SourceCopier(object):
+    """从源文件复制字节范围，相邻范围合并为一次复制"""
+
+    def __init__(self, target_file):
+        self.target_file = target_file
+        self.source_files = {}
+        self.pending: Optional[List] = None
+        self.byte_count = 0
+
+    def copy(self, source_file_path: str, start: int, end: int):
+        if self.pending is not None and self.pending[0] == source_file_path and self.pending[2] == start:
+            self.pending[2] = end
+            return
+        self.flush()
+        self.pending = [source_file_path, start, end]
+
+    def read(self, source_file_path: str, start: int, end: int) -> bytes:
+        source_file = self._get_source_file(source_file_path)
+        source_file.seek(start)
+        return source_file.read(end - start)
+
+    def write(self, data: bytes):
+        self.flush()
+        self.target_file.write(data)
+
+    def _get_source_file(self, source_file_path: str):
+        if source_file_path not in self.source_files:
+            self.source_files[source_file_path] = open(source_file_path, 'rb')
+        return self.source_files[source_file_path]
+
+    def flush(self):
+        if self.pending is None:
+            return
+        source_file_path, start, end = self.pending
+        self.pending = None
+        self.byte_count += end - start
+
+        source_file = self._get_source_file(source_file_path)
+        self.target_file.flush()
+        if hasattr(os, 'copy_file_range'):
+            try:
+                offset = start
+                while offset < end:
+                    copied = os.copy_file_range(source_file.fileno(), self.target_file.fileno(), end - offset, offset)
+                    if copied == 0:
+                        raise EOFError(f"unexpected end of file: {source_file_path}")
+                    offset += copied
+                self.target_file.seek(0, os.SEEK_END)
+                return
+            except OSError:
+                self.target_file.seek(0, os.SEEK_END)
+                start = offset
+
+        source_file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = source_file.read(min(remaining, 16 * 1024 * 1024))
+            if not chunk:
+                raise EOFError(f"unexpected end of file: {source_file_path}")
+            self.target_file.write(chunk)
+            remaining -= len(chunk)
+
+    def close(self):
+        self.flush()
+        for source_file in self.source_files.values():
+            source_file.close()
+        self.source_files = {}
+
+
+def _get_bool_operands(dag: CSGDAG, node_id: int):
+    """将DAG转换为布尔分组树 (BoolType, [操作数])，操作数为原始曲面实体或子分组
+
+    相同操作的左结合链合并为一个分组，与加载时按分组从左到右折叠的规则互逆；
+    SurfaceGroup 作为并集分组写出。JCD格式无法表示空分组，无成员的 SurfaceGroup 视为空集：
+    并集和差集的减体中的空操作数被省略，交集或被减体为空时整个分组为空，空结果返回None
+    """
+    # 按后序迭代计算，左结合的长布尔链不会超出递归深度
+    operands = {}
+    for current_id in dag.iter_postorder(node_id):
+        node = dag.get(current_id)
+        if isinstance(node, PrimitiveSurface):
+            operands[current_id] = node.surface_data
+            continue
+        if isinstance(node, SurfaceGroup):
+            items = [operands[item] for item in node.items if operands[item] is not None]
+            operands[current_id] = (BoolType.UNION, items) if len(items) > 0 else None
+            continue
+
+        bool_type = DAG_BOOL_TYPE_MAP[node.op]
+        left, right = operands[node.left], operands[node.right]
+        if left is None or right is None:
+            if node.op == DAGBoolType.UNION:
+                operand = right if left is None else left
+            elif node.op == DAGBoolType.DIFFERENCE:
+                operand = left
+            else:
+                operand = None
+            # 复制分组，后续对左结合链的追加不影响其他引用
+            operands[current_id] = (operand[0], list(operand[1])) if isinstance(operand, tuple) else operand
+            continue
+        if isinstance(left, tuple) and left[0] == bool_type and isinstance(dag.get(node.left), BooleanOp):
+            # 左节点只被当前节点引用时直接追加，避免长链上的平方级复制
+            if len(dag.get(node.left).parents) == 1:
+                left[1].append(right)
+                operands[current_id] = left
+            else:
+                operands[current_id] = (bool_type, left[1] + [right])
+        else:
+            operands[current_id] = (bool_type, [left, right])
+    return operands[node_id]
+
+
+def _write_bool_surface_from_dag(copier: SourceCopier, bool_surface: JCDBoolSurface):
+    """根据DAG重新生成布尔曲面的记录序列，结果为空集时不写出任何记录"""
+    if bool_surface.root_node_id is None:
+        return
+
+    root = _get_bool_operands(bool_surface.dag, bool_surface.root_node_id)
+    if root is None:
+        return
+    if not isinstance(root, tuple):
+        root = (bool_surface.bool_type or BoolType.UNION, [root])
+
+    is_first_record = [True]
+
+    def write_group(group, headers: List[BoolType]):
+        bool_type, operands = group
+        for i, operand in enumerate(operands):
+            operand_headers = headers + [bool_type] if i == 0 else []
+            if isinstance(operand, tuple):
+                write_group(operand, operand_headers)
+                continue
+
+            if len(operand_headers) == 0:
+                copier.write(b':' + encode_meta_info(operand))
+                write_by_surface_type(copier.target_file, get_entity_data(operand))
+                continue
+
+            # 嵌套的布尔头，第一条记录的最外层使用布尔曲面自身的矩阵和未知字节
+            data = get_entity_data(operand)
+            for j, header_bool_type in reversed(list(enumerate(operand_headers))):
+                header = {
+                    'surface_type': SurfaceType.BOOL_SURFACE,
+                    'bool_type': header_bool_type,
+                    'sub_surface': data,
+                }
+                if j == 0 and is_first_record[0]:
+                    header.update({
+                        'matrices': bool_surface.matrices,
+                        'matrix_padding': bool_surface.matrix_padding,
+                        'unknown_data1': bool_surface.unknown_data1,
+                        'unknown_data2': bool_surface.unknown_data2,
+                    })
+                data = header
+
+            copier.write(b':' + encode_meta_info(bool_surface, SurfaceType.BOOL_SURFACE))
+            write_by_surface_type(copier.target_file, data)
+            is_first_record[0] = False
+        copier.write(b'%')
+
+    write_group(root, [])
+
+
+def _write_bool_surface_by_segments(copier: SourceCopier, bool_surface: JCDBoolSurface, is_header_modified: bool):
+    """逐段写出布尔曲面：原样复制未修改的片段，只重新编码修改过的原始曲面和元信息"""
+    source_file_path = bool_surface.source_span[0]
+    segments = bool_surface.source_segments
+
+    for i, (start, end, primitive) in enumerate(segments):
+        if primitive is not None:
+            if is_entity_modified(primitive):
+                copier.flush()
+                write_by_surface_type(copier.target_file, get_entity_data(primitive))
+            else:
+                copier.copy(source_file_path, start, end)
+            continue
+
+        next_primitive = segments[i + 1][2] if i + 1 < len(segments) else None
+        is_plain_record = end - start == RECORD_PREFIX_SIZE
+        if next_primitive is not None and is_plain_record and is_entity_modified(next_primitive):
+            copier.write(b':' + encode_meta_info(next_primitive))
+        elif i == 0 and is_header_modified:
+            # 第一条记录包含布尔曲面自身的元信息和最外层布尔头
+            prefix = copier.read(source_file_path, start, end)
+            sub_surface_type = SurfaceType(prefix[RECORD_PREFIX_SIZE + BOOL_HEADER_SIZE - 8])
+            copier.write(b':' + encode_meta_info(bool_surface, SurfaceType.BOOL_SURFACE))
+            write_matrix(
+                copier.target_file, bool_surface.matrices,
+                MATRIX_COUNT_MAP[SurfaceType.BOOL_SURFACE], bool_surface.matrix_padding,
+            )
+            write_bool_header(copier.target_file, bool_surface.to_dict(), sub_surface_type)
+            copier.target_file.write(prefix[RECORD_PREFIX_SIZE + BOOL_HEADER_SIZE:])
+        else:
+            copier.copy(source_file_path, start, end)
+
+
+def write_bool_entity(copier: SourceCopier, bool_surface: JCDBoolSurface) -> bool:
+    """写出布尔曲面，返回是否直接复制了原始字节"""
+    primitives = [node.surface_data for node in bool_surface.dag.nodes.values() if isinstance(node, PrimitiveSurface)]
+    is_modified = is_entity_modified(bool_surface)
+
+    if not is_modified and not any(is_entity_modified(primitive) for primitive in primitives):
+        copier.copy(*bool_surface.source_span)
+        return True
+
+    is_dag_modified = is_modified and is_entity_modified(bool_surface, fields=('dag', 'root_node_id'))
+    if bool_surface.source_span is not None and len(bool_surface.source_segments) > 0 and not is_dag_modified:
+        _write_bool_surface_by_segments(copier, bool_surface, is_modified)
+    else:
+        _write_bool_surface_from_dag(copier, bool_surface)
+    return False
+
+
+def detach_source(objects: List[JCDBaseData], source_file_path: str):
+    """清除来自指定源文件的实体的源文件信息（例如该文件已被覆盖），之后这些实体将重新编码"""
+    for obj in objects:
+        if isinstance(obj, JCDBoolSurface):
+            primitives = [node.surface_data for node in obj.dag.nodes.values() if isinstance(node, PrimitiveSurface)]
+            detach_source(primitives, source_file_path)
+            if obj.source_span is not None and obj.source_span[0] == source_file_path:
+                obj.source_segments = []
+        if obj.source_span is not None and obj.source_span[0] == source_file_path:
+            obj.source_span = None
+            obj.source_state = None
+            obj.source_offsets = {}
+
+
+def save_jcd_file(objects: List[JCDBaseData], save_jcd_file_path: str) -> Dict[str, int]:
+    """将实体列表写出为JCD文件
+
+    Args:
+        objects: 实体列表（可来自多个源文件）
+        save_jcd_file_path: 保存路径
+
+    Returns:
+        写出统计 {'copied_count', 'encoded_count', 'copied_byte_count'}
+    """
+    copied_count = 0
+    encoded_count = 0
+
+    with open(save_jcd_file_path, 'wb') as jcd_file:
+        copier = SourceCopier(jcd_file)
+        try:
+            copier.write(JCD_HEADER.encode('utf-8'))
+
+            for obj in objects:
+                if isinstance(obj, JCDBoolSurface):
+                    is_copied = write_bool_entity(copier, obj)
+                elif not is_entity_modified(obj):
+                    copier.copy(*obj.source_span)
+                    is_copied = True
+                else:
+                    copier.write(b':' + encode_meta_info(obj))
+                    write_by_surface_type(jcd_file, get_entity_data(obj))
+                    is_copied = False
+
+                if is_copied:
+                    copied_count += 1
+                else:
+                    encoded_count += 1
+
+            copier.write(b'#')
+        finally:
+            copier.close()
+
+    return {
+        'copied_count': copied_count,
+        'encoded_count': encoded_count,
+        'copied_byte_count': copier.byte_count,
+    }
@@ -1,4 +1,6 @@
 import os
+import time
+import logging
 from typing import Union, List, Optional
 
 from jcd_manage.Config.constant import JCD_HEADER
@@ -8,11 +10,19 @@ from jcd_manage.Data import (
     JCDGuideLine, JCDBoolSurface, JCDQuadType, JCDBaseData
 )
 from jcd_manage.Method.io import read_by_surface_type, save_entities_to_text
-from jcd_manage.Method.info import print_entity_summary, print_overall_summary
+from jcd_manage.Method.columnar import COLUMNAR_FILE_FORMATS, save_columnar_file, read_columnar_file, columns_to_entities
+from jcd_manage.Method.export import MESH_FILE_FORMATS, save_mesh_file
+from jcd_manage.Method.gltf import save_glb_file
+from jcd_manage.Method.writer import get_entity_state, save_jcd_file, detach_source
+from jcd_manage.Method.patch import patch_entities
+from jcd_manage.Method.profiler import LoadProfiler
+from jcd_manage.Method.memory import get_memory_report
+from jcd_manage.Method.info import get_entity_summary, get_overall_summary
 from jcd_manage.Method.path import createFileFolder, removeFile
-from jcd_manage.Method.render import renderMultipleGroups
 
 
+logger = logging.getLogger(__name__)
+
 
 class JCDLoader(object):
     """JCD文件加载器
@@ -35,41 +45,88 @@ class JCDLoader(object):
         self,
         jcd_file_path: Union[str, None]=None,
         output_info: bool = False,
+        profiler: Optional[LoadProfiler] = None,
     ) -> None:
         self.objects: List[JCDBaseData] = []  # 现在存储数据类实例
 
         if jcd_file_path is not None:
-            self.loadJCDFile(jcd_file_path, output_info)
+            self.loadJCDFile(jcd_file_path, output_info, profiler)
         return
 
     def loadJCDFile(
         self,
         jcd_file_path: str,
         output_info: bool = False,
+        profiler: Optional[LoadProfiler] = None,
     ) -> bool:
+        """加载JCD文件
+
+        Args:
+            jcd_file_path: 文件路径
+            output_info: 是否以INFO级别记录每个实体的摘要（会明显拖慢加载），日志级别低于INFO时忽略
+            profiler: 可选的 LoadProfiler，按曲面类型统计加载开销，为 None 时不做任何统计
+
+        Returns:
+            是否成功
+        """
         if not os.path.exists(jcd_file_path):
-            print('[ERROR][JCDLoader::loadTXTFile]')
-            print('\t jcd file not exist!')
-            print('\t jcd_file_path:', jcd_file_path)
+            logger.error('[JCDLoader::loadJCDFile] jcd file not exist: %s', jcd_file_path)
             return False
 
+        # 未启用INFO级别时走静默路径，不构建任何摘要
+        output_info = output_info and logger.isEnabledFor(logging.INFO)
+
         # 存储所有实体数据
         self.objects = []
         # 当前正在构建的布尔曲面
         current_bool_surface: Optional[JCDBoolSurface] = None
         bool_operation_stack : List[(BoolType, List[int])] = []
 
+        # 记录每个实体在源文件中的字节范围，写出时未修改的实体直接复制原始字节
+        source_file_path = os.path.abspath(jcd_file_path)
+        bool_surface_start = 0
+
+        def set_source(entity: JCDBaseData, start: int, end: int):
+            entity.source_span = (source_file_path, start, end)
+            entity.source_state = get_entity_state(entity)
+
+        def get_source_offsets(record_start: int, data_start: int, entity_data: dict) -> dict:
+            # 布尔头之后的子曲面没有自己的元信息
+            source_offsets = {'matrices': data_start}
+            if data_start == record_start + 9:
+                source_offsets['meta_info'] = record_start + 1
+            if 'matrix_offset' in entity_data:
+                source_offsets['matrix'] = entity_data['matrix_offset']
+            return source_offsets
+
+        def create_entity(entity_data: dict) -> JCDBaseData:
+            surface_type = entity_data['surface_type']
+            entity_class = self.TYPE_CLASS_MAP.get(surface_type, JCDBaseData)
+            if profiler is None:
+                return entity_class.from_dict(entity_data)
+
+            build_start = time.perf_counter()
+            entity = entity_class.from_dict(entity_data)
+            profiler.add_build_time(surface_type, time.perf_counter() - build_start)
+            return entity
+
+        if profiler is not None:
+            profiler.start_load(os.path.getsize(jcd_file_path))
+
         with open(jcd_file_path, 'rb') as jcd_file:
             # 读取并验证文件头
             jcd_header_str = JCD_HEADER
             header = jcd_file.read(len(jcd_header_str)).decode('utf-8')
 
             if header != jcd_header_str:
-                print(f'Header error, expected: {jcd_header_str}, got: {header}')
+                logger.error('[JCDLoader::loadJCDFile] header error, expected: %r, got: %r', jcd_header_str, header)
+                if profiler is not None:
+                    profiler.finish_load()
                 return False
 
             while True:
                 # 读取标志位
+                record_start = jcd_file.tell()
                 end_flag = jcd_file.read(1)
 
                 if not end_flag:
@@ -84,13 +141,22 @@ class JCDLoader(object):
                     # 文件结束标志
                     break
                 elif flag_char == '%':
+                    if current_bool_surface is None or len(bool_operation_stack) == 0:
+                        logger.error('[JCDLoader::loadJCDFile] 未匹配的布尔结束标志, offset: %d', record_start)
+                        if profiler is not None:
+                            profiler.finish_load()
+                        return False
+
                     # 开始构建bool曲面节点
                     bool_type_mapping = {
                         BoolType.UNION: DAGBoolType.UNION,
                         BoolType.INTERSECTION: DAGBoolType.INTERSECT,
                         BoolType.DIFFERENCE: DAGBoolType.DIFFERENCE
                     }
+                    current_bool_surface.source_segments.append((record_start, record_start + 1, None))
                     bool_operation_element = bool_operation_stack.pop() #弹出栈顶元素，标记上一个bool操作结束
+                    if profiler is not None:
+                        profiler.add_dag_nodes(SurfaceType.BOOL_SURFACE, max(len(bool_operation_element[1]) - 1, 0))
                     root_node_id = None
                     for node_id in bool_operation_element[1]:
                         if root_node_id is None:
@@ -101,6 +167,7 @@ class JCDLoader(object):
 
                     if len(bool_operation_stack) == 0:
                         # 所有bool操作结束，添加到对象列表
+                        set_source(current_bool_surface, bool_surface_start, jcd_file.tell())
                         self.objects.append(current_bool_surface)
                         current_bool_surface = None
                     else:
@@ -108,7 +175,7 @@ class JCDLoader(object):
                         bool_operation_stack[-1][1].append(root_node_id)
                     continue
                 else:
-                    print(f"未知标志位: {end_flag.hex()}")
+                    logger.error('[JCDLoader::loadJCDFile] 未知标志位: %s, offset: %d', end_flag.hex(), record_start)
                     break
 
                 # 读取元信息
@@ -117,67 +184,82 @@ class JCDLoader(object):
                 surface_type = SurfaceType(int.from_bytes(meta_info[0:1], 'little'))
 
                 # 读取曲面数据
-                entity_data = read_by_surface_type(jcd_file, surface_type)
+                entity_data = read_by_surface_type(jcd_file, surface_type, profiler)
 
                 # 添加元信息
                 entity_data['meta_info'] = meta_info
                 entity_data['hide'] = hide
 
+                record_end = jcd_file.tell()
+                # 子曲面数据在源文件中的起始位置
+                sub_surface_start = record_start + 9
+
                 # 处理布尔曲面的特殊逻辑
                 if surface_type == SurfaceType.BOOL_SURFACE:
                     # 创建一个新的布尔曲面对象
                     if current_bool_surface == None:
                         current_bool_surface = JCDBoolSurface()
                         current_bool_surface._load_from_dict(entity_data)
+                        current_bool_surface.source_offsets = get_source_offsets(record_start, record_start + 9, {})
+                        bool_surface_start = record_start
                     # 读取到最底层曲面
                     while True:
                         bool_operation_stack.append((entity_data['bool_type'], []))
+                        sub_surface_start = entity_data['sub_surface_offset']
                         entity_data = entity_data['sub_surface'] #取出子曲面的实际数据，矩阵信息被舍弃
 
                         if not 'bool_type' in entity_data:
                             break
 
                     if output_info:
-                        print(f"创建新的布尔曲面，类型: {current_bool_surface.get_bool_type_name()}")
+                        logger.info('创建新的布尔曲面，类型: %s', current_bool_surface.get_bool_type_name())
 
                 if current_bool_surface is not None:
                     # 如果当前正在构建布尔曲面，则将此曲面添加为子曲面
                     # 确定布尔操作类型映射
 
                     # 将曲面添加到DAG中
-                    surface_type = entity_data['surface_type']
-                    entity_class = self.TYPE_CLASS_MAP.get(surface_type, JCDBaseData)
-                    entity_instance = entity_class.from_dict(entity_data)
+                    entity_instance = create_entity(entity_data)
+                    entity_instance.source_offsets = get_source_offsets(record_start, sub_surface_start, entity_data)
+                    set_source(entity_instance, sub_surface_start, record_end)
+                    current_bool_surface.source_segments += [
+                        (record_start, sub_surface_start, None),
+                        (sub_surface_start, record_end, entity_instance),
+                    ]
                     surface_node_id = current_bool_surface.add_surface(entity_instance)
+                    if profiler is not None:
+                        profiler.add_dag_nodes(SurfaceType.BOOL_SURFACE, 1)
                     bool_operation_stack[-1][1].append(surface_node_id)
 
                     if output_info:
-                        print(f"  添加子曲面到布尔曲面，节点ID: {surface_node_id}")
+                        logger.debug('添加子曲面到布尔曲面，节点ID: %d', surface_node_id)
                 else:
                     # 普通曲面，正常处理
                     # 转换为数据类实例
-                    entity_class = self.TYPE_CLASS_MAP.get(surface_type, JCDBaseData)
-                    entity_instance = entity_class.from_dict(entity_data)
+                    entity_instance = create_entity(entity_data)
+                    entity_instance.source_offsets = get_source_offsets(record_start, sub_surface_start, entity_data)
+                    set_source(entity_instance, record_start, record_end)
 
                     # 保存到列表
                     self.objects.append(entity_instance)
 
                     if output_info:
-                        # 打印摘要
-                        print_entity_summary(entity_data)
+                        logger.info('实体摘要: %s', get_entity_summary(entity_data))
 
             # 处理可能未闭合的布尔曲面
             if current_bool_surface is not None:
+                set_source(current_bool_surface, bool_surface_start, jcd_file.tell())
                 self.objects.append(current_bool_surface)
-                if output_info:
-                    print(f"布尔曲面处理完成，添加到对象列表")
-                    current_bool_surface.print_dag_structure()
+                logger.warning(
+                    '[JCDLoader::loadJCDFile] 布尔曲面未闭合，已添加到对象列表, offset: %d, 曲面数量: %d',
+                    bool_surface_start, current_bool_surface.get_surface_count(),
+                )
+
+        if profiler is not None:
+            profiler.finish_load()
 
         if output_info:
-            # 打印总体统计
-            # 将对象转换回字典格式以便与现有的print函数兼容
-            objects_as_dict = [obj.to_dict() for obj in self.objects]
-            print_overall_summary(objects_as_dict)
+            logger.info('总体统计: %s', self.get_summary())
 
         return True
 
@@ -214,6 +296,275 @@ class JCDLoader(object):
 
         return True
 
+    def saveAsJCDFile(
+        self,
+        save_jcd_file_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        """保存为JCD文件
+
+        未修改的实体直接复制源文件中的原始字节，修改过或新建的实体重新编码；
+        数组的原地修改通过加载时记录的内容摘要检测，不需要调用 mark_modified()
+
+        Args:
+            save_jcd_file_path: 保存路径
+            overwrite: 是否覆盖
+
+        Returns:
+            是否成功
+        """
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::saveAsJCDFile]')
+            print('\t valid data not found!')
+            return False
+
+        if os.path.exists(save_jcd_file_path) and not overwrite:
+            return True
+
+        createFileFolder(save_jcd_file_path)
+
+        # 先写入临时文件再替换，目标文件可以是当前实体的源文件
+        tmp_jcd_file_path = save_jcd_file_path + '.tmp'
+        save_jcd_file(self.objects, tmp_jcd_file_path)
+        os.replace(tmp_jcd_file_path, save_jcd_file_path)
+
+        # 源文件已被替换，其中的字节范围不再有效
+        detach_source(self.objects, os.path.abspath(save_jcd_file_path))
+
+        return True
+
+    def patchJCDFile(
+        self,
+        entities: Optional[List[JCDBaseData]] = None,
+        backup: bool = False,
+        atomic: bool = True,
+    ) -> bool:
+        """将隐藏标志和矩阵的修改原位写回源文件，不重写几何数据
+
+        只支持修改 hide、matrices 以及钻石、字体面片、辅助线的 matrix；
+        新建的实体或其他属性的修改需使用 saveAsJCDFile
+
+        Args:
+            entities: 需要写回的实体，默认自动检测修改过的实体（含布尔曲面的原始曲面）
+            backup: 是否将原文件保留为 <文件名>.bak
+            atomic: 是否先修改临时副本再原子替换
+
+        Returns:
+            是否成功
+        """
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::patchJCDFile]')
+            print('\t valid data not found!')
+            return False
+
+        try:
+            patch_entities(self.objects, entities, backup, atomic)
+        except ValueError as e:
+            print('[ERROR][JCDLoader::patchJCDFile]')
+            print('\t patch jcd file failed!')
+            print('\t', e)
+            return False
+
+        return True
+
+    def saveAsMeshFile(
+        self,
+        save_mesh_file_path: str,
+        overwrite: bool = False,
+        include_hidden: bool = False,
+        expand_bool_surfaces: bool = False,
+    ) -> bool:
+        """保存为网格文件（二进制PLY、OBJ或二进制STL，按扩展名判断）
+
+        曲面、四边形面片、字体面片、布尔曲面的求值结果和钻石按材质分组流式写出，内存占用与场景大小无关
+
+        Args:
+            save_mesh_file_path: 保存路径
+            overwrite: 是否覆盖
+            include_hidden: 是否包含隐藏对象
+            expand_bool_surfaces: 是否导出布尔曲面的原始曲面而不是求值结果
+
+        Returns:
+            是否成功
+        """
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::saveAsMeshFile]')
+            print('\t valid data not found!')
+            return False
+
+        file_format = os.path.splitext(save_mesh_file_path)[1][1:].lower()
+        if file_format not in MESH_FILE_FORMATS:
+            print('[ERROR][JCDLoader::saveAsMeshFile]')
+            print('\t mesh file format not supported!')
+            print('\t save_mesh_file_path:', save_mesh_file_path)
+            return False
+
+        if os.path.exists(save_mesh_file_path):
+            if not overwrite:
+                return True
+
+            removeFile(save_mesh_file_path)
+
+        createFileFolder(save_mesh_file_path)
+
+        save_mesh_file(
+            self.objects, save_mesh_file_path, file_format, include_hidden, expand_bool_surfaces=expand_bool_surfaces,
+        )
+
+        return True
+
+    def saveAsGLBFile(self, save_glb_file_path: str, overwrite: bool = False) -> bool:
+        """保存为二进制glTF（GLB）文件
+
+        每个材质一个网格，每种钻石类型一个原型网格，钻石通过 EXT_mesh_gpu_instancing 实例化，隐藏对象不导出
+
+        Args:
+            save_glb_file_path: 保存路径
+            overwrite: 是否覆盖
+
+        Returns:
+            是否成功
+        """
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::saveAsGLBFile]')
+            print('\t valid data not found!')
+            return False
+
+        if save_glb_file_path[-4:].lower() != '.glb':
+            print('[ERROR][JCDLoader::saveAsGLBFile]')
+            print('\t save_glb_file_path must be a .glb file!')
+            print('\t save_glb_file_path:', save_glb_file_path)
+            return False
+
+        if os.path.exists(save_glb_file_path):
+            if not overwrite:
+                return True
+
+            removeFile(save_glb_file_path)
+
+        createFileFolder(save_glb_file_path)
+
+        save_glb_file(self.objects, save_glb_file_path)
+
+        return True
+
+    def saveAsStepFile(
+        self,
+        save_step_file_path: str,
+        overwrite: bool = False,
+        include_hidden: bool = False,
+    ) -> bool:
+        """保存为STEP文件（需要pythonocc-core）
+
+        曲线、曲面转换为B样条，四边形面片、钻石和字体面片缝合为实体，布尔曲面使用OCC布尔运算求值
+
+        Args:
+            save_step_file_path: 保存路径
+            overwrite: 是否覆盖
+            include_hidden: 是否包含隐藏对象
+
+        Returns:
+            是否成功
+        """
+        from jcd_manage.Method.step import STEP_FILE_FORMATS, is_occ_available, save_step_file
+
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::saveAsStepFile]')
+            print('\t valid data not found!')
+            return False
+
+        file_format = os.path.splitext(save_step_file_path)[1][1:].lower()
+        if file_format not in STEP_FILE_FORMATS:
+            print('[ERROR][JCDLoader::saveAsStepFile]')
+            print('\t step file format not supported!')
+            print('\t save_step_file_path:', save_step_file_path)
+            return False
+
+        if not is_occ_available():
+            print('[ERROR][JCDLoader::saveAsStepFile]')
+            print('\t pythonocc-core not installed!')
+            return False
+
+        # 已存在的文件由写出完成后的替换覆盖，失败时保持不变
+        if os.path.exists(save_step_file_path) and not overwrite:
+            return True
+
+        createFileFolder(save_step_file_path)
+
+        try:
+            save_step_file(self.objects, save_step_file_path, include_hidden)
+        except RuntimeError as e:
+            print('[ERROR][JCDLoader::saveAsStepFile]')
+            print('\t save_step_file failed!')
+            print('\t error:', e)
+            return False
+
+        return True
+
+    def saveAsColumnarFile(self, save_columnar_file_path: str, overwrite: bool = False) -> bool:
+        """保存为列式二进制文件（.jcdc或.npz，按扩展名判断）
+
+        所有实体（包括布尔曲面的原始曲面和DAG结构）无损保存，可通过 loadColumnarFile 读回
+
+        Args:
+            save_columnar_file_path: 保存路径
+            overwrite: 是否覆盖
+
+        Returns:
+            是否成功
+        """
+        if len(self.objects) == 0:
+            print('[ERROR][JCDLoader::saveAsColumnarFile]')
+            print('\t valid data not found!')
+            return False
+
+        file_format = os.path.splitext(save_columnar_file_path)[1][1:].lower()
+        if file_format not in COLUMNAR_FILE_FORMATS:
+            print('[ERROR][JCDLoader::saveAsColumnarFile]')
+            print('\t columnar file format not supported!')
+            print('\t save_columnar_file_path:', save_columnar_file_path)
+            return False
+
+        if os.path.exists(save_columnar_file_path):
+            if not overwrite:
+                return True
+
+            removeFile(save_columnar_file_path)
+
+        createFileFolder(save_columnar_file_path)
+
+        save_columnar_file(self.objects, save_columnar_file_path)
+
+        return True
+
+    def loadColumnarFile(self, columnar_file_path: str) -> bool:
+        """加载列式二进制文件
+
+        .jcdc文件以只读内存映射方式加载，实体的数组均为映射视图，不做解码和复制
+
+        Args:
+            columnar_file_path: 文件路径
+
+        Returns:
+            是否成功
+        """
+        if not os.path.exists(columnar_file_path):
+            print('[ERROR][JCDLoader::loadColumnarFile]')
+            print('\t columnar file not exist!')
+            print('\t columnar_file_path:', columnar_file_path)
+            return False
+
+        try:
+            columns, strings = read_columnar_file(columnar_file_path)
+        except ValueError as e:
+            print('[ERROR][JCDLoader::loadColumnarFile]')
+            print('\t read columnar file failed!')
+            print('\t', e)
+            return False
+
+        self.objects = columns_to_entities(columns, strings)
+        return True
+
     def get_by_type(self, surface_type: SurfaceType) -> List[JCDBaseData]:
         """根据类型获取对象
 
@@ -242,15 +593,11 @@ class JCDLoader(object):
         return [obj for obj in self.objects if isinstance(obj, JCDFontSurface)]
 
     def get_bool_surfaces(self) -> List[Union[JCDDiamond, JCDSurface]]:
-        """获取所有布尔曲面"""
+        """获取所有布尔曲面中的原始曲面"""
         entity_list = []
         for obj in self.objects:
-            if not isinstance(obj, JCDBoolSurface):
-                continue
-
-            surfaces = obj.get_surfaces()
-            entity_list += surfaces
-
+            if isinstance(obj, JCDBoolSurface):
+                entity_list += obj.get_surfaces()
         return entity_list
 
     def get_visible_objects(self) -> List[JCDBaseData]:
@@ -287,7 +634,78 @@ class JCDLoader(object):
 
         return overall_min, overall_max
 
+    def memory_report(self, check_duplicates: bool = True) -> dict:
+        """统计所有实体的内存占用
+
+        numpy缓冲区按实际字节数统计（共享的缓冲区只计一次，内存映射的缓冲区单独统计），
+        Python对象开销按 sys.getsizeof 估算；同时列出被提升为float64的数组和内容重复的数组
+
+        Args:
+            check_duplicates: 是否通过内容哈希查找重复数组（需要读取所有较大的数组）
+
+        Returns:
+            统计结果，见 get_memory_report
+        """
+        return get_memory_report(self.objects, check_duplicates)
+
+    def estimate_weights(
+        self,
+        densities: Optional[dict] = None,
+        include_hidden: bool = False,
+        subtract_stones: bool = True,
+    ) -> dict:
+        """按材质估算金属体积与重量，钻石体积从所在金属中扣除
+
+        Args:
+            densities: 材质名称 -> 密度 (g/cm³)，默认使用 MATERIAL_DENSITIES
+            include_hidden: 是否包含隐藏对象
+            subtract_stones: 是否从金属中扣除钻石体积
+
+        Returns:
+            估算结果，见 jcd_manage.Method.volume.estimate_weights
+        """
+        from jcd_manage.Method.volume import estimate_weights
+
+        return estimate_weights(self.objects, densities, include_hidden, subtract_stones)
+
+    def get_stone_inventory(self, size_step: float = 0.1, include_hidden: bool = False) -> dict:
+        """按钻石类型和尺寸分档统计宝石数量及估算克拉重量
+
+        Args:
+            size_step: 尺寸分档步长 (mm)
+            include_hidden: 是否包含隐藏的钻石
+
+        Returns:
+            宝石清单，见 jcd_manage.Method.inventory.get_stone_inventory
+        """
+        from jcd_manage.Method.inventory import get_diamond_arrays, get_stone_inventory
+
+        return get_stone_inventory(*get_diamond_arrays(self.get_diamonds(), include_hidden), size_step)
+
+    def evaluate_bool_surfaces(
+        self,
+        processes: Optional[int] = None,
+        backend: str = 'winding',
+    ) -> list:
+        """计算所有布尔曲面的结果网格，相互独立的子树和布尔曲面在进程池中并行计算
+
+        Args:
+            processes: 进程数，默认为CPU核数，为1时在当前进程中依次计算
+            backend: 布尔运算后端，见 jcd_manage.Method.csg.boolean_mesh
+
+        Returns:
+            与 objects 中布尔曲面顺序对应的 (vertices, triangles) 列表
+        """
+        # 进程池和共享内存只在实际求值时才需要
+        from jcd_manage.Method.parallel_csg import evaluate_bool_surfaces_parallel
+
+        bool_surfaces = [obj for obj in self.objects if isinstance(obj, JCDBoolSurface)]
+        return evaluate_bool_surfaces_parallel(bool_surfaces, processes, backend)
+
     def renderAllData(self) -> bool:
+        # 渲染依赖（open3d）只在实际渲染时加载，纯解析进程无需承担其导入开销
+        from jcd_manage.Method.render import renderMultipleGroups
+
         groups = [
             (self.get_curves(), [1.0, 0.0, 0.0]),      # 红色曲线
             (self.get_surfaces(), [0.0, 1.0, 0.0]),    # 绿色曲面
@@ -297,6 +715,20 @@ class JCDLoader(object):
         renderMultipleGroups(groups)
         return True
 
+    def get_summary(self) -> dict:
+        """获取结构化的摘要信息
+
+        Returns:
+            {'object_count', 'visible_count', 'hidden_count', 'type_counts', 'total_point_count', 'materials'}
+        """
+        summary = {
+            'object_count': len(self.objects),
+            'visible_count': len(self.get_visible_objects()),
+            'hidden_count': len(self.get_hidden_objects()),
+        }
+        summary.update(get_overall_summary([obj.to_dict() for obj in self.objects]))
+        return summary
+
     def print_summary(self):
         """打印摘要信息"""
         print(f"\n{'='*60}")
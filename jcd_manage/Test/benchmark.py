@@ -0,0 +1,43 @@
+import json
+
+import jcd_manage.Method.render as render
+
+from jcd_manage.Method.benchmark import run_benchmarks, scale_preset, build_render_geometries, create_open3d_stub
+from jcd_manage.Method.synthetic import SYNTHETIC_PRESETS, create_synthetic_objects
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+
+
+def test():
+    # 非零数量按比例缩放且至少保留1个，单个实体的规模不变
+    preset = scale_preset(SYNTHETIC_PRESETS['quad_mesh'], 0.01)
+    assert preset['quad_count'] == 1 and preset['quad_grid_size'] == SYNTHETIC_PRESETS['quad_mesh']['quad_grid_size']
+
+    objects = create_synthetic_objects(diamond_count=3, bool_count=1, bool_depth=5)
+    assert len(objects) == 4
+    assert isinstance(objects[-1], JCDBoolSurface) and objects[-1].get_surface_count() == 6
+
+    presets = {
+        'small': {
+            'curve_count': 2, 'surface_count': 2, 'diamond_count': 10, 'quad_count': 1, 'quad_grid_size': 4,
+            'font_count': 1, 'font_outline_size': 16, 'guide_line_count': 1, 'bool_count': 2, 'bool_depth': 6,
+        },
+    }
+    report = json.loads(json.dumps(run_benchmarks(presets, repeat=1)))
+    scenario = report['scenarios']['small']
+    assert scenario['entity_count'] == 19
+    # 每个布尔曲面的每个原始曲面各占一条记录
+    assert scenario['record_count'] == 17 + 2 * 7
+    for name in ['load', 'read', 'transformed_points', 'bounding_box']:
+        stage = scenario['stages'][name]
+        assert stage['seconds'] >= 0.0 and stage['peak_memory_mb'] >= 0.0 and stage['entities_per_s'] > 0.0
+    assert scenario['stages']['load']['mb_per_s'] > 0.0
+    # open3d不可用时使用替身模块，仍然测量几何体构建
+    stage = scenario['stages']['render_geometry']
+    assert stage['seconds'] >= 0.0 and stage['entities_per_s'] > 0.0 and isinstance(stage['stubbed'], bool)
+
+    # 替身模块只在构建期间替换open3d：每种钻石类型一个网格，布尔曲面一个点云
+    module = render.o3d
+    diamond_types = {obj.diamond_type for obj in objects[:3]}
+    assert build_render_geometries(objects, create_open3d_stub()) == len(diamond_types) + 1
+    assert render.o3d is module
+    return True
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Method.synthetic import create_synthetic_bool_surface, create_synthetic_surface, write_synthetic_jcd_file
+from jcd_manage.Method.writer import save_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test():
+    rng = np.random.default_rng(0)
+    bool_surface = create_synthetic_bool_surface(rng, 2, 2, 8)
+    surfaces = bool_surface.get_surfaces()
+    assert len(surfaces) == 3
+    # 只遍历DAG，不生成聚合几何
+    assert 'aggregated_geometry' not in bool_surface.dag.cache
+
+    # 拼接的变换后点、每个曲面的偏移和整体边界框
+    geometry = bool_surface.get_aggregated_geometry()
+    assert geometry['offsets'].tolist() == [0, 16, 32, 48]
+    for i, surface in enumerate(surfaces):
+        start, end = geometry['offsets'][i], geometry['offsets'][i + 1]
+        assert np.allclose(geometry['points'][start:end], surface.get_transformed_points())
+    all_points = np.concatenate([surface.get_transformed_points() for surface in surfaces])
+    assert np.allclose(bool_surface.get_bounding_box()[0], all_points.min(axis=0))
+    assert bool_surface.get_points() is geometry['points']
+    assert not geometry['points'].flags.writeable
+
+    # 缓存在DAG变化前一直有效
+    assert bool_surface.get_aggregated_geometry() is geometry
+    surface = create_synthetic_surface(rng, 2, 8)
+    surface.points[:, :3] += 100.0
+    surface_count = bool_surface.get_surface_count()
+    node_id = bool_surface.add_surface(surface)
+    assert bool_surface.add_surface(surface) == node_id and bool_surface.get_surface_count() == surface_count + 1
+    bool_surface.apply_boolean_operation(DAGBoolType.UNION, bool_surface.root_node_id, node_id)
+    geometry = bool_surface.get_aggregated_geometry()
+    assert geometry['offsets'][-1] == 64 and bool_surface.get_bounding_box()[1][0] > 100.0
+
+    surface.points[:, :3] -= 100.0
+    assert bool_surface.get_aggregated_geometry() is geometry
+    bool_surface.update_surface(node_id)
+    assert bool_surface.get_bounding_box()[1][0] < 100.0
+    assert JCDBoolSurface().get_points() is None and JCDBoolSurface().get_bounding_box() is None
+
+    # 聚合缓存不影响未修改实体的原样写出
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'synthetic.jcd')
+        write_synthetic_jcd_file(jcd_file_path, surface_count=1, bool_count=2)
+        jcd_loader = JCDLoader(jcd_file_path)
+        assert jcd_loader.get_overall_bounding_box() is not None
+        assert len(jcd_loader.get_bool_surfaces()) == 6
+        stats = save_jcd_file(jcd_loader.objects, os.path.join(folder_path, 'copy.jcd'))
+        assert stats['encoded_count'] == 0
+    return True
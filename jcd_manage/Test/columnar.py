@@ -0,0 +1,102 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import BoolType, DAGBoolType, SurfaceType
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Data.jcd_guide_line import JCDGuideLine
+from jcd_manage.Data.dag import PrimitiveSurface, BooleanOp
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.export import create_loader
+
+
+def create_bool_surface(surfaces, use_group=True):
+    bool_surface = JCDBoolSurface()
+    bool_surface.bool_type = BoolType.DIFFERENCE
+    bool_surface.meta_info = bytes([SurfaceType.BOOL_SURFACE.value, 0, 0, 0, 2, 0, 0, 0])
+    bool_surface.hide = True
+    node_ids = [bool_surface.add_surface(surface) for surface in surfaces]
+    if use_group:
+        left_id = bool_surface.create_surface_group(node_ids[:2])
+    else:
+        left_id = bool_surface.apply_boolean_operation(DAGBoolType.UNION, node_ids[0], node_ids[1])
+    bool_surface.apply_boolean_operation(DAGBoolType.DIFFERENCE, left_id, node_ids[2])
+    return bool_surface
+
+
+def assert_entity_equal(source, target):
+    assert type(source) is type(target)
+    assert source.hide == target.hide
+    # 新建的原始曲面没有元信息，写出时才生成；隐藏标志位单独比较
+    if len(source.meta_info) > 0:
+        source_meta_info = np.frombuffer(bytes(source.meta_info), dtype=np.uint8).copy()
+        target_meta_info = np.frombuffer(bytes(target.meta_info), dtype=np.uint8).copy()
+        source_meta_info[4] &= ~2 & 0xFF
+        target_meta_info[4] &= ~2 & 0xFF
+        assert np.array_equal(source_meta_info, target_meta_info)
+    assert np.allclose(np.asarray(source.matrices).reshape(-1, 4, 4), target.matrices)
+    for name in [
+        'material_name', 'ring_count', 'original_point_count', 'curve_type', 'is_path_closed',
+        'is_cross_section_closed', 'normal_direction', 'diamond_type', 'outline_count',
+        'foreground_type', 'background_type', 'thickness', 'bool_type', 'surface_count',
+    ]:
+        if not hasattr(source, name):
+            continue
+        if isinstance(getattr(source, name), float):
+            assert np.float32(getattr(source, name)) == np.float32(getattr(target, name)), name
+        else:
+            assert getattr(source, name) == getattr(target, name), name
+    for name in ['matrix', 'points', 'indices', 'outline_sizes']:
+        if hasattr(source, name):
+            assert np.array_equal(np.asarray(getattr(source, name), dtype=np.float32).ravel(),
+                                  np.asarray(getattr(target, name), dtype=np.float32).ravel()), name
+
+
+def assert_dag_equal(source_dag, source_id, target_dag, target_id):
+    source_node = source_dag.get(source_id)
+    target_node = target_dag.get(target_id)
+    assert source_node.type == target_node.type
+    if isinstance(source_node, PrimitiveSurface):
+        assert_entity_equal(source_node.surface_data, target_node.surface_data)
+    elif isinstance(source_node, BooleanOp):
+        assert source_node.op == target_node.op
+        assert_dag_equal(source_dag, source_node.left, target_dag, target_node.left)
+        assert_dag_equal(source_dag, source_node.right, target_dag, target_node.right)
+    else:
+        assert len(source_node.items) == len(target_node.items)
+        for source_item, target_item in zip(source_node.items, target_node.items):
+            assert_dag_equal(source_dag, source_item, target_dag, target_item)
+
+
+def assert_loader_equal(source_loader, target_loader):
+    assert len(source_loader.objects) == len(target_loader.objects)
+    for source, target in zip(source_loader.objects, target_loader.objects):
+        assert_entity_equal(source, target)
+        if isinstance(source, JCDBoolSurface):
+            assert_dag_equal(source.dag, source.root_node_id, target.dag, target.root_node_id)
+
+
+def test():
+    jcd_loader = create_loader()
+    surfaces = [obj for obj in jcd_loader.objects if obj.__class__.__name__ == 'JCDSurface'] * 3
+    guide_line = JCDGuideLine()
+    guide_line.matrix = np.diag([1.0, 2.0, 3.0, 1.0]).astype(np.float32)
+    jcd_loader.objects += [create_bool_surface(surfaces), guide_line]
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        for file_name in ['model.jcdc', 'model.npz']:
+            file_path = os.path.join(folder_path, file_name)
+            assert jcd_loader.saveAsColumnarFile(file_path)
+
+            reload_loader = JCDLoader()
+            assert reload_loader.loadColumnarFile(file_path)
+            assert_loader_equal(jcd_loader, reload_loader)
+
+            if file_name.endswith('.jcdc'):
+                # 数组为内存映射视图，不可写
+                points = reload_loader.objects[0].points
+                assert not points.flags.writeable
+            del reload_loader
+
+        assert not jcd_loader.saveAsColumnarFile(os.path.join(folder_path, 'model.txt'))
+    return True
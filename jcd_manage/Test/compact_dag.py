@@ -0,0 +1,76 @@
+import io
+import pickle
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data.dag import CSGDAG, PrimitiveSurface, SurfaceGroup, BooleanOp
+from jcd_manage.Data.compact_dag import CompactDAG
+from jcd_manage.Method.synthetic import create_synthetic_bool_surface
+
+
+def assert_same_structure(source_dag, source_id, target_dag, target_id):
+    pairs = [(source_id, target_id)]
+    while pairs:
+        source_id, target_id = pairs.pop()
+        source_node, target_node = source_dag.get(source_id), target_dag.get(target_id)
+        assert type(source_node) is type(target_node)
+        if isinstance(source_node, PrimitiveSurface):
+            assert source_node.surface_data is target_node.surface_data
+        elif isinstance(source_node, BooleanOp):
+            assert source_node.op == target_node.op
+            pairs += [(source_node.left, target_node.left), (source_node.right, target_node.right)]
+        else:
+            assert len(source_node.items) == len(target_node.items)
+            pairs += list(zip(source_node.items, target_node.items))
+
+
+def test():
+    bool_surface = create_synthetic_bool_surface(np.random.default_rng(0), 4, 2, 8)
+    dag = bool_surface.dag
+    group = dag.add(SurfaceGroup([0, 1, 2]))
+    root = bool_surface.apply_boolean_operation(DAGBoolType.INTERSECT, bool_surface.root_node_id, group)
+
+    # 原始曲面以实体下标引用，已有实体复用下标
+    entities = ['other', dag.get(3).surface_data]
+    compact_dag = CompactDAG.from_bool_surface(bool_surface, entities)
+    assert len(compact_dag) == len(dag.nodes) and len(entities) == 6
+    assert sorted(compact_dag.refs[compact_dag.get_primitive_indices()].tolist()) == [1, 2, 3, 4, 5]
+    assert compact_dag.get_children(compact_dag.root) == [compact_dag.root - 2, compact_dag.root - 1]
+    assert compact_dag.get_depths()[compact_dag.root] == dag.get_depth(root)
+    assert compact_dag.get_reachable_mask().all()
+    # 前三个原始曲面同时被分组引用
+    primitive_indices = compact_dag.get_primitive_indices()
+    assert compact_dag.get_parent_counts()[primitive_indices].tolist() == [2, 2, 2, 1, 1]
+
+    restored_dag, restored_root = compact_dag.to_dag(entities)
+    assert_same_structure(dag, root, restored_dag, restored_root)
+
+    # 单个缓冲区读写与序列化
+    file = io.BytesIO()
+    assert compact_dag.write(file) == len(compact_dag.to_bytes())
+    loaded_dag = CompactDAG.from_bytes(file.getvalue())
+    for name in ['node_types', 'ops', 'lefts', 'rights', 'refs', 'group_offsets', 'group_items']:
+        assert np.array_equal(getattr(loaded_dag, name), getattr(compact_dag, name))
+    assert loaded_dag.root == compact_dag.root
+    pickled_dag = pickle.loads(pickle.dumps(compact_dag))
+    assert_same_structure(dag, root, *pickled_dag.to_dag(entities))
+
+    try:
+        CompactDAG.from_bytes(file.getvalue()[:-8])
+        assert False
+    except ValueError:
+        pass
+
+    # 长布尔链：紧凑表示远小于对象图
+    chain_dag = CSGDAG()
+    chain_entities = list(range(20000))
+    chain_root = chain_dag.add(PrimitiveSurface(chain_entities[0]))
+    for entity in chain_entities[1:]:
+        chain_root = chain_dag.add(BooleanOp(DAGBoolType.UNION, chain_root, chain_dag.add(PrimitiveSurface(entity))))
+    chain_compact = CompactDAG.from_dag(chain_dag, chain_root, chain_entities)
+    assert len(chain_entities) == 20000
+    assert chain_compact.get_depths()[-1] == 20000
+    assert len(pickle.dumps(chain_compact)) < len(pickle.dumps(chain_dag)) // 4
+    subtree_root = chain_compact.lefts[chain_compact.root]
+    assert chain_compact.get_reachable_mask(subtree_root).sum() == len(chain_compact) - 2
+    return True
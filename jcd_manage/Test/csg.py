@@ -0,0 +1,127 @@
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Data.jcd_quad_type import JCDQuadType
+from jcd_manage.Method.csg import (
+    evaluate_bool_surface, evaluate_node, clear_cached_results, get_mesh_volume, boolean_mesh, tessellate_entity,
+)
+from jcd_manage.Method.volume import is_mesh_closed
+
+
+def create_box(min_point, max_point, resolution=8, inward=False):
+    """由每面 resolution x resolution 个四边形组成的封闭长方体"""
+    min_point, max_point = np.asarray(min_point, dtype=np.float64), np.asarray(max_point, dtype=np.float64)
+    points = []
+    quads = []
+    t = np.linspace(0.0, 1.0, resolution + 1)
+    u, v = np.meshgrid(t, t, indexing='ij')
+    grid = np.arange((resolution + 1) ** 2).reshape(resolution + 1, resolution + 1)
+    cell = np.stack([grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]], axis=-1).reshape(-1, 4)
+
+    for axis in range(3):
+        for side in (0.0, 1.0):
+            face = np.zeros((resolution + 1, resolution + 1, 3))
+            face[:, :, axis] = side
+            face[:, :, (axis + 1) % 3] = u
+            face[:, :, (axis + 2) % 3] = v
+            face_quads = cell + len(points) * (resolution + 1) ** 2
+            # 使每个面的法向朝外
+            if side == 0.0:
+                face_quads = face_quads[:, ::-1]
+            points.append(face.reshape(-1, 3))
+            quads.append(face_quads)
+
+    quad_type = JCDQuadType()
+    vertices = min_point + np.concatenate(points) * (max_point - min_point)
+    quad_type.points = np.hstack([vertices, np.ones((len(vertices), 1))]).astype(np.float32)
+    quad_type.indices = np.concatenate(quads).astype(np.int32)
+    if inward:
+        quad_type.indices = quad_type.indices[:, ::-1].copy()
+    return quad_type
+
+
+def create_boolean(op, box_a, box_b):
+    bool_surface = JCDBoolSurface()
+    a = bool_surface.add_surface(box_a)
+    b = bool_surface.add_surface(box_b)
+    bool_surface.apply_boolean_operation(op, a, b)
+    return bool_surface
+
+
+def test():
+    box_a = create_box([0.0, 0.0, 0.0], [2.0, 2.0, 2.0])
+    # 朝向向内的操作数会先统一为外法向
+    box_b = create_box([1.0, 1.0, 1.0], [3.0, 3.0, 3.0], inward=True)
+
+    for op, volume in [(DAGBoolType.UNION, 15.0), (DAGBoolType.INTERSECT, 1.0), (DAGBoolType.DIFFERENCE, 7.0)]:
+        vertices, triangles = evaluate_bool_surface(create_boolean(op, box_a, box_b))
+        assert np.isclose(get_mesh_volume(vertices, triangles), volume), (op, get_mesh_volume(vertices, triangles))
+        assert is_mesh_closed(vertices, triangles)
+
+    # 倾斜的操作数：结果封闭，且满足 |A∪B| + |A∩B| = |A| + |B|、|A-B| + |A∩B| = |A|
+    box_d = create_box([0.5, 0.5, 0.5], [2.5, 2.5, 2.5], resolution=3)
+    angle = np.radians(30.0)
+    rotation = np.array([[np.cos(angle), np.sin(angle), 0.0], [-np.sin(angle), np.cos(angle), 0.0], [0.0, 0.0, 1.0]])
+    box_d.points[:, :3] = (box_d.points[:, :3] - 1.5) @ rotation.T + np.array([1.6, 1.2, 1.4])
+    mesh_a, mesh_d = tessellate_entity(box_a), tessellate_entity(box_d)
+    volumes = {}
+    for op in (DAGBoolType.UNION, DAGBoolType.INTERSECT, DAGBoolType.DIFFERENCE):
+        vertices, triangles = boolean_mesh(mesh_a, mesh_d, op)
+        assert is_mesh_closed(vertices, triangles), op
+        volumes[op] = get_mesh_volume(vertices, triangles)
+    volume_a, volume_d = get_mesh_volume(*mesh_a), get_mesh_volume(*mesh_d)
+    assert np.isclose(volumes[DAGBoolType.UNION] + volumes[DAGBoolType.INTERSECT], volume_a + volume_d)
+    assert np.isclose(volumes[DAGBoolType.DIFFERENCE] + volumes[DAGBoolType.INTERSECT], volume_a)
+    assert 0.0 < volumes[DAGBoolType.INTERSECT] < min(volume_a, volume_d)
+
+    # 分离的操作数：交集为空，差集保持不变
+    box_c = create_box([5.0, 5.0, 5.0], [6.0, 6.0, 6.0], resolution=2)
+    assert len(evaluate_bool_surface(create_boolean(DAGBoolType.INTERSECT, box_a, box_c))[1]) == 0
+    vertices, triangles = evaluate_bool_surface(create_boolean(DAGBoolType.DIFFERENCE, box_a, box_c))
+    assert np.isclose(get_mesh_volume(vertices, triangles), 8.0)
+
+    # 共享子树只计算一次，结果保存在节点上
+    bool_surface = JCDBoolSurface()
+    a = bool_surface.add_surface(box_a)
+    b = bool_surface.add_surface(box_b)
+    c = bool_surface.add_surface(box_c)
+    shared = bool_surface.apply_boolean_operation(DAGBoolType.UNION, a, b)
+    group = bool_surface.create_surface_group([shared, c])
+    cutter = bool_surface.add_surface(create_box([-0.7, -0.7, 1.6], [6.9, 6.9, 6.9], resolution=5))
+    root = bool_surface.apply_boolean_operation(DAGBoolType.DIFFERENCE, group, cutter)
+    vertices, triangles = evaluate_bool_surface(bool_surface)
+    assert abs(get_mesh_volume(vertices, triangles) - 8.2) < 0.3
+    assert is_mesh_closed(vertices, triangles)
+
+    shared_result = bool_surface.dag.get(shared).cached_result
+    assert all(node.cached_result is not None for node in bool_surface.dag.nodes.values())
+    other = bool_surface.apply_boolean_operation(DAGBoolType.INTERSECT, shared, cutter)
+    vertices, triangles = evaluate_node(bool_surface.dag, other)
+    assert abs(get_mesh_volume(vertices, triangles) - (15.0 - 8.2)) < 0.3
+    assert bool_surface.dag.get(shared).cached_result is shared_result
+    assert evaluate_node(bool_surface.dag, root) is bool_surface.dag.get(root).cached_result
+    bool_surface.set_root_node_id(root)
+
+    # 修改一个原始曲面只重算其到根节点的路径
+    cached_results = {node_id: node.cached_result for node_id, node in bool_surface.dag.nodes.items()}
+    box_c.points[:, :3] -= 1.0
+    invalidated = bool_surface.update_surface(c)
+    assert sorted(invalidated) == sorted([c, group, root]) and bool_surface.is_dirty()
+    vertices, triangles = evaluate_bool_surface(bool_surface)
+    assert abs(get_mesh_volume(vertices, triangles) - 8.2) < 0.3
+    assert not bool_surface.is_dirty()
+    for node_id, node in bool_surface.dag.nodes.items():
+        assert (node.cached_result is cached_results[node_id]) == (node_id not in invalidated)
+
+    # 将 c 移入切割体下方后结果包含 c
+    box_c.points[:, :3] -= 4.0
+    bool_surface.update_surface(c)
+    vertices, triangles = evaluate_bool_surface(bool_surface)
+    assert abs(get_mesh_volume(vertices, triangles) - 9.2) < 0.3
+
+    clear_cached_results(bool_surface.dag, [shared])
+    assert bool_surface.dag.get(a).cached_result is not None and bool_surface.is_dirty()
+    clear_cached_results(bool_surface.dag)
+    assert all(node.cached_result is None for node in bool_surface.dag.nodes.values())
+    return True
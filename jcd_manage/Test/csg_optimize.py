@@ -0,0 +1,128 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Data.dag import BooleanOp, SurfaceGroup
+from jcd_manage.Method.csg import evaluate_node, evaluate_bool_surface, get_mesh_volume
+from jcd_manage.Method.csg_optimize import optimize_dag, optimize_bool_surface, get_overlapping_components
+from jcd_manage.Method.io import MATRIX_COUNT_MAP
+from jcd_manage.Method.writer import encode_meta_info, get_surface_type
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.csg import create_box
+
+
+def create_chain_bool_surface() -> JCDBoolSurface:
+    bool_surface = JCDBoolSurface()
+
+    def add_box(min_point, max_point):
+        return bool_surface.add_surface(create_box(min_point, max_point, resolution=3))
+
+    # 加载器折叠出的左结合并集链：前8个长方体依次相交，最后一个远离其他长方体
+    boxes = [add_box([1.5 * k, 0.05 * k, 0.07 * k], [1.5 * k + 2.0, 2.0 + 0.05 * k, 2.0 + 0.07 * k]) for k in range(8)]
+    boxes.append(add_box([100.0, 0.0, 0.0], [101.0, 1.0, 1.0]))
+    root = boxes[0]
+    for box in boxes[1:]:
+        root = bool_surface.apply_boolean_operation(DAGBoolType.UNION, root, box)
+
+    # 差集链，后两个减体与被减体不相交
+    cutters = [
+        add_box([2.3, -1.1, 1.3], [4.1, 3.3, 3.3]),
+        add_box([50.0, 0.0, 0.0], [51.0, 1.0, 1.0]),
+        add_box([-20.0, 0.0, 0.0], [-19.0, 1.0, 1.0]),
+    ]
+    for cutter in cutters:
+        root = bool_surface.apply_boolean_operation(DAGBoolType.DIFFERENCE, root, cutter)
+
+    # 不相交的交集结果为空
+    empty = bool_surface.apply_boolean_operation(DAGBoolType.INTERSECT, boxes[0], boxes[-1])
+    bool_surface.apply_boolean_operation(DAGBoolType.UNION, root, empty)
+    return bool_surface
+
+
+def test():
+    assert get_overlapping_components([
+        ([0, 0, 0], [1, 1, 1]), ([5, 0, 0], [6, 1, 1]), None, ([0.5, 0.5, 0.5], [2, 2, 2]),
+    ]) == [[0, 3], [1], [2]]
+
+    bool_surface = create_chain_bool_surface()
+    node_count = len(bool_surface.dag.nodes)
+    dag, root_node_id, stats = optimize_dag(bool_surface.dag, bool_surface.root_node_id)
+    assert len(bool_surface.dag.nodes) == node_count
+
+    # 两个不相交的减体、交集的两个操作数及其空结果被删除
+    assert stats['pruned_operand_count'] == 5
+    assert stats['depth'] == 13 and stats['optimized_depth'] <= 6
+    assert stats['optimized_node_count'] < stats['node_count']
+    assert stats['bounding_box'][1][0] == 101.0
+
+    # 远离的长方体单独成组，差集只作用于相交的部分，减体只剩一个
+    root = dag.get(root_node_id)
+    assert isinstance(root, SurfaceGroup) and len(root.items) == 2
+    assert dag.get(root.items[0]).op == DAGBoolType.DIFFERENCE
+    assert sum(isinstance(node, BooleanOp) and node.op == DAGBoolType.DIFFERENCE for node in dag.nodes.values()) == 1
+
+    expected_volume = get_mesh_volume(*evaluate_bool_surface(bool_surface))
+    optimized_volume = get_mesh_volume(*evaluate_node(dag, root_node_id))
+    assert abs(optimized_volume - expected_volume) < 0.02 * expected_volume, (optimized_volume, expected_volume)
+
+    # 只平衡、不删除时保留所有操作数
+    _, _, stats = optimize_dag(bool_surface.dag, bool_surface.root_node_id, prune=False)
+    assert stats['pruned_operand_count'] == 0 and stats['optimized_depth'] < stats['depth']
+
+    # 原地优化
+    bool_surface = create_chain_bool_surface()
+    stats = optimize_bool_surface(bool_surface)
+    assert bool_surface.dag.get_depth(bool_surface.root_node_id) == stats['optimized_depth']
+    assert len(bool_surface.get_surfaces()) == 10
+    assert abs(get_mesh_volume(*evaluate_bool_surface(bool_surface)) - expected_volume) < 0.02 * expected_volume
+    assert optimize_bool_surface(JCDBoolSurface()) == {}
+
+    test_empty_result()
+    return True
+
+
+def create_disjoint_bool_surface() -> JCDBoolSurface:
+    bool_surface = JCDBoolSurface()
+    surfaces = [create_box([0.0, 0.0, 0.0], [1.0, 1.0, 1.0]), create_box([5.0, 0.0, 0.0], [6.0, 1.0, 1.0])]
+    for surface in surfaces:
+        surface.meta_info = encode_meta_info(surface)
+        surface.matrices = np.tile(np.eye(4, dtype=np.float32), (MATRIX_COUNT_MAP[get_surface_type(surface)], 1, 1))
+    bool_surface.meta_info = encode_meta_info(bool_surface)
+    bool_surface.apply_boolean_operation(
+        DAGBoolType.INTERSECT, bool_surface.add_surface(surfaces[0]), bool_surface.add_surface(surfaces[1]),
+    )
+    return bool_surface
+
+
+def test_empty_result():
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'empty.jcd')
+
+        # 不相交的交集优化为空，原地优化保持原DAG，写出后可以重新加载
+        bool_surface = create_disjoint_bool_surface()
+        root_node_id = bool_surface.root_node_id
+        stats = optimize_bool_surface(bool_surface)
+        assert stats['is_empty'] and bool_surface.root_node_id == root_node_id
+        jcd_loader = JCDLoader()
+        jcd_loader.objects = [bool_surface]
+        assert jcd_loader.saveAsJCDFile(jcd_file_path)
+        reloaded_loader = JCDLoader(jcd_file_path)
+        assert len(reloaded_loader.objects) == 1
+        assert len(reloaded_loader.objects[0].get_surfaces()) == 2
+
+        # 直接使用空DAG时不写出该布尔曲面
+        dag, root_node_id, _ = optimize_dag(bool_surface.dag, bool_surface.root_node_id)
+        bool_surface.dag = dag
+        bool_surface.root_node_id = root_node_id
+        assert jcd_loader.saveAsJCDFile(jcd_file_path, overwrite=True)
+        assert JCDLoader(jcd_file_path).objects == []
+
+        # 未匹配的布尔结束标志
+        with open(jcd_file_path, 'rb') as f:
+            data = f.read()
+        with open(jcd_file_path, 'wb') as f:
+            f.write(data[:-1] + b'%#')
+        assert not JCDLoader().loadJCDFile(jcd_file_path)
+    return True
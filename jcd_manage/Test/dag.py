@@ -1,3 +1,7 @@
+import io
+import sys
+import contextlib
+
 from jcd_manage.Config.types import DAGBoolType
 from jcd_manage.Data.dag import PrimitiveSurface, SurfaceGroup, BooleanOp, CSGDAG
 
@@ -20,4 +24,54 @@ def test():
 
     # print structure
     dag.print_tree(Y)
+
+    # parent links and dirty propagation
+    assert dag.get(A).parents == {G1} and dag.get(X).parents == {Y}
+    assert dag.get_ancestors(A) == [G1, X, Y]
+    for node in dag.nodes.values():
+        node.cached_result = node.id
+        node.dirty = False
+    assert dag.update_primitive(C, "cone") == [C, X, Y]
+    assert dag.get(C).surface_data == "cone"
+    assert dag.get(G1).cached_result == G1 and not dag.get(G1).dirty
+    assert sorted(dag.get_dirty_nodes(Y)) == sorted([C, X, Y])
+
+    # ancestors already dirty stop the propagation
+    assert dag.mark_dirty(A) == [A, G1]
+
+    # ids are compact and local to each DAG
+    assert [A, B, C, D, G1, X, Y] == list(range(7))
+    other_dag = CSGDAG()
+    assert other_dag.add(PrimitiveSurface(surface_data="plane")) == 0
+
+    # identical subexpressions collapse to one node
+    assert dag.add(BooleanOp(DAGBoolType.UNION, G1, C)) == X
+    assert dag.add(SurfaceGroup([A, B])) == G1
+    assert dag.add(BooleanOp(DAGBoolType.UNION, C, G1)) != X
+    duplicate = PrimitiveSurface(surface_data=dag.get(A).surface_data)
+    assert dag.add(duplicate) == A and duplicate.id == A and dag.get(A) is not duplicate
+    plain_dag = CSGDAG(hash_consing=False)
+    data = object()
+    assert plain_dag.add(PrimitiveSurface(data)) != plain_dag.add(PrimitiveSurface(data))
+
+    # children always come before their parents
+    order = dag.topological_order()
+    assert sorted(order) == sorted(dag.nodes)
+    for node_id in order:
+        assert all(order.index(child) < order.index(node_id) for child in dag.get(node_id).children)
+    assert list(dag.iter_postorder(X)) == [A, B, G1, C, X]
+    assert dag.get_roots() == [Y, 7]
+    assert dag.remove_unreachable([Y]) == [7] and dag.get(C).parents == {X}
+    assert dag.get_depth(Y) == 4
+
+    # long left-deep chains do not hit the recursion limit
+    chain_dag = CSGDAG()
+    root = chain_dag.add(PrimitiveSurface(surface_data=0))
+    for i in range(1, sys.getrecursionlimit() * 2):
+        root = chain_dag.add(BooleanOp(DAGBoolType.UNION, root, chain_dag.add(PrimitiveSurface(surface_data=i))))
+    assert chain_dag.get_depth(root) == sys.getrecursionlimit() * 2
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        chain_dag.print_tree(root)
+    assert len(output.getvalue().splitlines()) == len(chain_dag.nodes)
     return True
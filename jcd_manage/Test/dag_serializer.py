@@ -0,0 +1,82 @@
+import io
+import pickle
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Data.dag import PrimitiveSurface, SurfaceGroup
+from jcd_manage.Data.compact_dag import CompactDAG
+from jcd_manage.Method.dag_serializer import (
+    BOOL_SURFACE_HEADER, serialize_bool_surface, deserialize_bool_surface, write_bool_surfaces, read_bool_surfaces,
+)
+from jcd_manage.Method.synthetic import create_synthetic_bool_surface
+
+
+def assert_same_bool_surface(source: JCDBoolSurface, target: JCDBoolSurface):
+    assert target.bool_type == source.bool_type and target.surface_count == source.surface_count
+    assert np.array_equal(target.matrices, source.matrices)
+
+    source_primitives, target_primitives = [], []
+    source_dag = CompactDAG.from_bool_surface(source, source_primitives)
+    target_dag = CompactDAG.from_bool_surface(target, target_primitives)
+    for name in ['node_types', 'ops', 'lefts', 'rights', 'refs', 'group_offsets', 'group_items']:
+        assert np.array_equal(getattr(source_dag, name), getattr(target_dag, name))
+    assert source_dag.root == target_dag.root
+
+    assert len(source_primitives) == len(target_primitives)
+    for source_surface, target_surface in zip(source_primitives, target_primitives):
+        assert type(source_surface) is type(target_surface)
+        assert np.array_equal(source_surface.points, target_surface.points)
+
+
+def test():
+    rng = np.random.default_rng(0)
+    bool_surface = create_synthetic_bool_surface(rng, 4, 2, 8)
+    dag = bool_surface.dag
+    group = dag.add(SurfaceGroup([0, 1, 2]))
+    bool_surface.apply_boolean_operation(DAGBoolType.UNION, bool_surface.root_node_id, group)
+
+    data = serialize_bool_surface(bool_surface)
+    assert len(data) % 64 == 0
+    restored, end = deserialize_bool_surface(data)
+    assert end == len(data)
+    assert_same_bool_surface(bool_surface, restored)
+    assert restored.get_surfaces()[0].points.base is not None
+
+    # 帧可以直接嵌入pickle等其他容器
+    restored, _ = deserialize_bool_surface(pickle.loads(pickle.dumps(data)))
+    assert_same_bool_surface(bool_surface, restored)
+
+    # 多帧首尾相接写入同一个流，逐帧读取
+    bool_surfaces = [bool_surface, create_synthetic_bool_surface(rng, 2, 2, 8), JCDBoolSurface()]
+    stream = io.BytesIO()
+    size = write_bool_surfaces(stream, bool_surfaces)
+    assert size == stream.tell()
+    stream.seek(0)
+    restored_surfaces = list(read_bool_surfaces(stream))
+    assert len(restored_surfaces) == 3
+    for source, target in zip(bool_surfaces, restored_surfaces):
+        assert_same_bool_surface(source, target)
+    assert restored_surfaces[2].root_node_id is None and len(restored_surfaces[2].dag.nodes) == 0
+
+    # 从同一缓冲区的任意帧开始解码
+    buffer = stream.getvalue()
+    _, offset = deserialize_bool_surface(buffer)
+    second, _ = deserialize_bool_surface(buffer, offset)
+    assert_same_bool_surface(bool_surfaces[1], second)
+    assert all(isinstance(node, PrimitiveSurface) or node.dirty for node in second.dag.nodes.values())
+
+    # 版本不匹配、截断的数据给出明确错误
+    for broken in [data[:-64], b'JCDBOOL\0' + np.uint32(99).tobytes() + data[12:], data[:BOOL_SURFACE_HEADER.size - 1]]:
+        try:
+            deserialize_bool_surface(broken)
+        except ValueError:
+            continue
+        assert False
+    try:
+        list(read_bool_surfaces(io.BytesIO(data[:-64])))
+    except ValueError:
+        pass
+    else:
+        assert False
+    return True
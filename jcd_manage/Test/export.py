@@ -0,0 +1,138 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DiamondType, DAGBoolType
+from jcd_manage.Data.jcd_surface import JCDSurface
+from jcd_manage.Data.jcd_quad_type import JCDQuadType
+from jcd_manage.Method.csg import tessellate_entity, evaluate_bool_surface, get_mesh_volume
+from jcd_manage.Method.export import OBJMeshWriter, collect_mesh_entities, iter_mesh_chunks
+from jcd_manage.Method.mesh import create_diamond_prototype, merge_meshes
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.csg import create_box, create_boolean
+from jcd_manage.Test.mesh import create_diamond, create_font_surface, create_square
+
+
+def create_loader():
+    surface = JCDSurface()
+    surface.material_name = 'gold'
+    surface.ring_count = 4
+    surface.original_point_count = 5
+    surface.points = np.random.rand(20, 4).astype(np.float32)
+    surface.is_cross_section_closed = True
+
+    quad_type = JCDQuadType()
+    quad_type.material_name = 'silver'
+    quad_type.points = np.random.rand(6, 4).astype(np.float32)
+    quad_type.indices = np.array([[0, 1, 2, 3], [2, 3, 4, 5]], dtype=np.int32)
+
+    hidden_quad_type = JCDQuadType()
+    hidden_quad_type.material_name = 'hidden'
+    hidden_quad_type.points = quad_type.points
+    hidden_quad_type.indices = quad_type.indices
+    hidden_quad_type.hide = True
+
+    font_surface = create_font_surface([create_square((0.0, 0.0), 2.0)], thickness=0.2)
+    font_surface.material_name = 'gold'
+
+    diamonds = [create_diamond(DiamondType.ROUND, 1.0, [i, 0.0, 0.0]) for i in range(5)]
+    for diamond in diamonds:
+        diamond.material_name = 'diamond'
+
+    jcd_loader = JCDLoader()
+    jcd_loader.objects = [surface, quad_type, hidden_quad_type, font_surface] + diamonds
+    return jcd_loader
+
+
+def read_ply_header(ply_file_path):
+    header = {}
+    with open(ply_file_path, 'rb') as f:
+        while True:
+            line = f.readline().decode('utf-8').strip()
+            if line == 'end_header':
+                break
+            words = line.split()
+            if words[0] == 'element':
+                header[words[1]] = int(words[2])
+        header['data_offset'] = f.tell()
+    return header
+
+
+def test():
+    jcd_loader = create_loader()
+
+    # 4x5网格V向闭合：3*5*2，四边形：2*2，方块：2+2+4*2，钻石：5*原型
+    prototype_triangle_count = len(create_diamond_prototype(DiamondType.ROUND)[1])
+    expected_triangle_count = 30 + 4 + 12 + 5 * prototype_triangle_count
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        ply_file_path = os.path.join(folder_path, 'mesh.ply')
+        assert jcd_loader.saveAsMeshFile(ply_file_path)
+        header = read_ply_header(ply_file_path)
+        assert header['face'] == expected_triangle_count
+        face_size = 1 + 12 + 2
+        expected_size = header['data_offset'] + header['vertex'] * 12 + header['face'] * face_size
+        assert os.path.getsize(ply_file_path) == expected_size
+
+        stl_file_path = os.path.join(folder_path, 'mesh.stl')
+        assert jcd_loader.saveAsMeshFile(stl_file_path)
+        with open(stl_file_path, 'rb') as f:
+            f.seek(80)
+            assert int(np.frombuffer(f.read(4), dtype='<u4')[0]) == expected_triangle_count
+        assert os.path.getsize(stl_file_path) == 84 + 50 * expected_triangle_count
+
+        obj_file_path = os.path.join(folder_path, 'mesh.obj')
+        assert jcd_loader.saveAsMeshFile(obj_file_path)
+        with open(obj_file_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert sum(line.startswith('f ') for line in lines) == expected_triangle_count
+        assert [line for line in lines if line.startswith('usemtl')] == [
+            'usemtl diamond', 'usemtl gold', 'usemtl silver'
+        ]
+        assert os.path.exists(os.path.join(folder_path, 'mesh.mtl'))
+
+        # 分段写出的内容与一次写出一致
+        chunk_size = OBJMeshWriter.CHUNK_SIZE
+        OBJMeshWriter.CHUNK_SIZE = 7
+        try:
+            chunked_obj_file_path = os.path.join(folder_path, 'chunked.obj')
+            assert jcd_loader.saveAsMeshFile(chunked_obj_file_path)
+        finally:
+            OBJMeshWriter.CHUNK_SIZE = chunk_size
+        with open(chunked_obj_file_path, 'r', encoding='utf-8') as f:
+            assert f.read().splitlines()[1:] == lines[1:]
+
+        assert not jcd_loader.saveAsMeshFile(os.path.join(folder_path, 'mesh.xyz'))
+
+    test_entity_placement()
+    return True
+
+
+def test_entity_placement():
+    # 网格与CSG、体积估算使用同一变换：实体的 matrices 和字体、钻石自身的 matrix
+    matrices = np.eye(4, dtype=np.float32).reshape(1, 4, 4).copy()
+    matrices[0, :3, 3] = [10.0, 20.0, 30.0]
+    jcd_loader = create_loader()
+    entities = [obj for obj in jcd_loader.objects if not obj.hide]
+    for entity in entities:
+        entity.matrices = matrices
+    entities[2].matrix = np.eye(4, dtype=np.float32)
+    entities[2].matrix[:3, 3] = [0.0, 0.0, 5.0]
+    for entity in entities:
+        vertices, triangles = merge_meshes(list(iter_mesh_chunks([entity])))
+        expected_vertices, expected_triangles = tessellate_entity(entity)
+        assert np.allclose(vertices, expected_vertices) and np.array_equal(triangles, expected_triangles)
+    assert np.allclose(merge_meshes(list(iter_mesh_chunks([entities[2]])))[0].min(axis=0), [9.0, 19.0, 35.0])
+
+    # 布尔曲面默认导出求值结果，差集的切割体不作为实体导出
+    bool_surface = create_boolean(
+        DAGBoolType.DIFFERENCE, create_box([0.0, 0.0, 0.0], [2.0, 2.0, 2.0], resolution=2),
+        create_box([1.0, -1.0, -1.0], [3.0, 3.0, 3.0], resolution=2),
+    )
+    assert collect_mesh_entities([bool_surface]) == [bool_surface]
+    vertices, triangles = merge_meshes(list(iter_mesh_chunks([bool_surface])))
+    assert np.isclose(get_mesh_volume(vertices, triangles), 4.0)
+    assert np.isclose(get_mesh_volume(*evaluate_bool_surface(bool_surface)), 4.0)
+    assert collect_mesh_entities([bool_surface], expand_bool_surfaces=True) == bool_surface.get_surfaces()
+    return True
+
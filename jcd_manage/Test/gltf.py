@@ -0,0 +1,128 @@
+import os
+import json
+import struct
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DiamondType
+from jcd_manage.Method.csg import tessellate_entity
+from jcd_manage.Method.gltf import INSTANCING_EXTENSION, compose_matrices, decompose_matrices, is_trs_matrices
+from jcd_manage.Test.export import create_loader
+from jcd_manage.Test.mesh import create_diamond
+
+
+def read_glb(glb_file_path):
+    with open(glb_file_path, 'rb') as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from('<III', data, 0)
+    assert magic == 0x46546C67 and version == 2 and length == len(data)
+    json_length, _ = struct.unpack_from('<II', data, 12)
+    gltf = json.loads(data[20:20 + json_length])
+    bin_length, _ = struct.unpack_from('<II', data, 20 + json_length)
+    bin_data = data[28 + json_length:28 + json_length + bin_length]
+    return gltf, bin_data
+
+
+def test_decompose():
+    angles = np.random.rand(10) * np.pi * 2
+    matrices = np.tile(np.eye(4), (10, 1, 1))
+    matrices[:, 0, 0] = np.cos(angles)
+    matrices[:, 0, 1] = np.sin(angles)
+    matrices[:, 1, 0] = -np.sin(angles)
+    matrices[:, 1, 1] = np.cos(angles)
+    matrices[:, :3, :3] *= (np.random.rand(10, 1, 1) + 0.5)
+    matrices[5, :3, 2] *= -1.0
+    matrices[:, 3, :3] = np.random.rand(10, 3)
+
+    translations, rotations, scales = decompose_matrices(matrices)
+    assert np.allclose(compose_matrices(translations, rotations, scales), matrices)
+    assert np.all(is_trs_matrices(matrices))
+
+    # 切变无法用平移/旋转/缩放表示
+    matrices[3, 1, 0] = 0.5
+    assert is_trs_matrices(matrices).tolist() == [index != 3 for index in range(10)]
+    return True
+
+
+def read_accessor(gltf, bin_data, accessor_index, dtype, width):
+    accessor = gltf['accessors'][accessor_index]
+    buffer_view = gltf['bufferViews'][accessor['bufferView']]
+    return np.frombuffer(
+        bin_data, dtype=dtype, count=accessor['count'] * width, offset=buffer_view['byteOffset']
+    ).reshape(accessor['count'], width)
+
+
+def test_diamond_groups(folder_path):
+    jcd_loader = create_loader()
+    diamonds = [create_diamond(DiamondType.ROUND, 1.0, [i, 5.0, 0.0]) for i in range(3)]
+    for diamond in diamonds:
+        diamond.material_name = 'gold'
+    # 第三颗钻石带切变，且整体平移
+    diamonds[2].matrix[1, 0] = 0.5
+    diamonds[2].matrices = [np.array([[1, 0, 0, 10], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=np.float64)]
+    jcd_loader.objects += diamonds
+
+    glb_file_path = os.path.join(folder_path, 'groups.glb')
+    assert jcd_loader.saveAsGLBFile(glb_file_path)
+    gltf, bin_data = read_glb(glb_file_path)
+
+    # 与金属同名但颜色不同的钻石材质单独创建
+    gold_materials = [material for material in gltf['materials'] if material['name'] == 'gold']
+    assert len(gold_materials) == 2
+    assert gold_materials[0]['pbrMetallicRoughness']['baseColorFactor'] != \
+        gold_materials[1]['pbrMetallicRoughness']['baseColorFactor']
+
+    # 两种材质的钻石网格共用同一份原型数据
+    diamond_meshes = [mesh for mesh in gltf['meshes'] if mesh['name'] == 'diamond_ROUND']
+    assert len(diamond_meshes) == 2
+    primitives = [mesh['primitives'][0] for mesh in diamond_meshes]
+    assert primitives[0]['attributes']['POSITION'] == primitives[1]['attributes']['POSITION']
+    assert primitives[0]['indices'] == primitives[1]['indices']
+    assert primitives[0]['material'] != primitives[1]['material']
+
+    instanced_nodes = [node for node in gltf['nodes'] if 'extensions' in node]
+    counts = [
+        gltf['accessors'][node['extensions'][INSTANCING_EXTENSION]['attributes']['TRANSLATION']]['count']
+        for node in instanced_nodes
+    ]
+    assert counts == [5, 2]
+
+    # 切变钻石写出变换后的网格
+    baked_nodes = [node for node in gltf['nodes'] if node['name'] == 'diamonds_ROUND_gold_baked']
+    assert len(baked_nodes) == 1
+    baked_mesh = gltf['meshes'][baked_nodes[0]['mesh']]
+    positions = read_accessor(gltf, bin_data, baked_mesh['primitives'][0]['attributes']['POSITION'], '<f4', 3)
+    assert np.allclose(positions, tessellate_entity(diamonds[2])[0], atol=1e-5)
+    return True
+
+
+def test():
+    test_decompose()
+
+    jcd_loader = create_loader()
+    with tempfile.TemporaryDirectory() as folder_path:
+        glb_file_path = os.path.join(folder_path, 'model.glb')
+        assert jcd_loader.saveAsGLBFile(glb_file_path)
+        gltf, bin_data = read_glb(glb_file_path)
+
+        assert gltf['extensionsUsed'] == [INSTANCING_EXTENSION]
+        assert len(bin_data) == gltf['buffers'][0]['byteLength']
+        # gold、silver两个材质网格和一个钻石原型网格，隐藏对象不导出
+        assert [mesh['name'] for mesh in gltf['meshes']] == ['gold', 'silver', 'diamond_ROUND']
+        assert 'hidden' not in [material['name'] for material in gltf['materials']]
+
+        instanced_nodes = [node for node in gltf['nodes'] if 'extensions' in node]
+        assert len(instanced_nodes) == 1
+        attributes = instanced_nodes[0]['extensions'][INSTANCING_EXTENSION]['attributes']
+        translation_accessor = gltf['accessors'][attributes['TRANSLATION']]
+        assert translation_accessor['count'] == 5
+        buffer_view = gltf['bufferViews'][translation_accessor['bufferView']]
+        translations = np.frombuffer(
+            bin_data, dtype='<f4', count=15, offset=buffer_view['byteOffset']
+        ).reshape(5, 3)
+        assert np.allclose(translations[:, 0], np.arange(5))
+
+        assert not jcd_loader.saveAsGLBFile(os.path.join(folder_path, 'model.gltf'))
+
+        test_diamond_groups(folder_path)
+    return True
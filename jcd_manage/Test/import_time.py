@@ -0,0 +1,38 @@
+import sys
+import time
+import subprocess
+
+
+PROBE_CODE = """
+import sys, time, resource
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+open3d = sys.modules.get('open3d')
+loaded = open3d is not None and type(open3d).__name__ != '_LazyModule'
+print(elapsed, loaded, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_import(module: str) -> tuple:
+    """在新进程中导入模块，返回 (导入耗时秒, 是否加载了open3d, 峰值RSS KB)"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE_CODE.format(module=module)],
+        capture_output=True, text=True, check=True,
+    )
+    elapsed, loaded, max_rss = result.stdout.split()
+    return float(elapsed), loaded == 'True', int(max_rss)
+
+
+def test():
+    for module in [
+        'jcd_manage.Module.jcd_loader',
+        'jcd_manage.Method.render',
+        'jcd_manage.Method.thumbnail',
+    ]:
+        start = time.perf_counter()
+        elapsed, loaded, max_rss = measure_import(module)
+        total = time.perf_counter() - start
+        print(f"import {module}: {elapsed * 1000:.1f} ms (process {total * 1000:.1f} ms, max rss {max_rss / 1024:.1f} MB)")
+        assert not loaded, f"{module} should not load open3d at import time"
+    return True
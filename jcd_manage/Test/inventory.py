@@ -0,0 +1,73 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import SurfaceType, DiamondType
+from jcd_manage.Method.inventory import (
+    UNKNOWN_DIAMOND_TYPE, get_diamond_sizes, get_diamond_carats, get_stone_inventory, merge_stone_inventories,
+    read_diamond_arrays, get_stone_inventories,
+)
+from jcd_manage.Method.scan import scan_jcd_buffer
+from jcd_manage.Method.synthetic import write_synthetic_jcd_file
+from jcd_manage.Method.volume import get_prototype_volume
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test():
+    # 直径为局部X、Y轴长度较大者的2倍，克拉重量随缩放的立方增长
+    matrices = np.tile(np.eye(4), (3, 1, 1))
+    matrices[0, :3, :3] *= 1.5
+    matrices[1, :3, :3] *= 3.0
+    matrices[2, 0, :3] *= 2.0
+    assert np.allclose(get_diamond_sizes(matrices), [3.0, 6.0, 4.0])
+    type_codes = np.asarray([DiamondType.ROUND.value, DiamondType.ROUND.value, DiamondType.PEAR.value])
+    carats = get_diamond_carats(type_codes, matrices)
+    assert np.isclose(carats[1] / carats[0], 8.0)
+    assert np.isclose(carats[2], get_prototype_volume(DiamondType.PEAR) * 2.0 * 3.51 / 1000.0 / 0.2)
+
+    inventory = get_stone_inventory(type_codes, matrices, size_step=0.5)
+    assert inventory['count'] == 3 and np.isclose(inventory['carat'], carats.sum())
+    assert inventory['stones']['ROUND']['3.00']['count'] == 1 and inventory['stones']['PEAR']['4.00']['count'] == 1
+    merged = merge_stone_inventories([inventory, inventory, get_stone_inventory(type_codes[:0], matrices[:0])])
+    assert merged['count'] == 6 and merged['stones']['ROUND']['6.00']['count'] == 2
+    assert np.isclose(merged['stones']['ROUND']['6.00']['carat'], 2 * carats[1])
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_paths = []
+        for i in range(3):
+            jcd_file_path = os.path.join(folder_path, f'model_{i}.jcd')
+            write_synthetic_jcd_file(jcd_file_path, surface_count=2, diamond_count=20 + i, bool_count=1, seed=i)
+            jcd_file_paths.append(jcd_file_path)
+
+        # 扫描读取的钻石与完整加载一致
+        jcd_loader = JCDLoader(jcd_file_paths[0])
+        diamonds = jcd_loader.get_diamonds()
+        type_codes, matrices = read_diamond_arrays(jcd_file_paths[0])
+        assert type_codes.tolist() == [diamond.diamond_type.value for diamond in diamonds]
+        assert np.array_equal(matrices, np.stack([diamond.matrix for diamond in diamonds]))
+        assert get_stone_inventory(type_codes, matrices) == jcd_loader.get_stone_inventory()
+
+        results = get_stone_inventories(jcd_file_paths + [os.path.join(folder_path, 'missing.jcd')], processes=2)
+        assert results['failed_count'] == 1 and results['total']['count'] == 63
+        expected = merge_stone_inventories([JCDLoader(path).get_stone_inventory() for path in jcd_file_paths])
+        assert results['total']['stones'].keys() == expected['stones'].keys()
+        assert np.isclose(results['total']['carat'], expected['carat'])
+        assert results == get_stone_inventories(jcd_file_paths + [os.path.join(folder_path, 'missing.jcd')], processes=1)
+
+        # 不属于 DiamondType 的类型编码记为-1，按未知类型统计
+        with open(jcd_file_paths[0], 'rb') as f:
+            buffer = bytearray(f.read())
+        records = [
+            record for record in scan_jcd_buffer(bytes(buffer))
+            if record['surface_type'] == SurfaceType.DIAMOND and record['bool_level'] == 0 and not record['hide']
+        ]
+        buffer[records[0]['matrix_offset'] + 64] = 5
+        unknown_file_path = os.path.join(folder_path, 'unknown.jcd')
+        with open(unknown_file_path, 'wb') as f:
+            f.write(buffer)
+        unknown_type_codes, unknown_matrices = read_diamond_arrays(unknown_file_path)
+        assert unknown_type_codes[0] == -1 and np.array_equal(unknown_type_codes[1:], type_codes[1:])
+        assert np.array_equal(unknown_matrices, matrices)
+        inventory = get_stone_inventory(unknown_type_codes, unknown_matrices)
+        assert sum(item['count'] for item in inventory['stones'][UNKNOWN_DIAMOND_TYPE].values()) == 1
+    return True
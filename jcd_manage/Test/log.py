@@ -0,0 +1,63 @@
+import io
+import os
+import logging
+import tempfile
+import contextlib
+
+from jcd_manage.Config.types import SurfaceType
+from jcd_manage.Method.synthetic import write_synthetic_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@contextlib.contextmanager
+def capture_logs(level):
+    handler = RecordHandler()
+    logger = logging.getLogger('jcd_manage')
+    old_level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    try:
+        yield handler.records
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(old_level)
+
+
+def test():
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'synthetic.jcd')
+        write_synthetic_jcd_file(jcd_file_path, curve_count=2, diamond_count=3, bool_count=1)
+
+        # 加载过程不再写标准输出；日志级别低于INFO时即使 output_info 也不记录
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), capture_logs(logging.WARNING) as records:
+            jcd_loader = JCDLoader(jcd_file_path, output_info=True)
+        assert stdout.getvalue() == '' and records == []
+
+        with contextlib.redirect_stdout(stdout), capture_logs(logging.INFO) as records:
+            JCDLoader(jcd_file_path, output_info=True)
+        assert stdout.getvalue() == ''
+        summaries = [record.args for record in records if record.msg.startswith('实体摘要')]
+        assert len(summaries) == 5
+        assert summaries[0]['surface_type'] == SurfaceType.CURVE and summaries[0]['point_count'] == 64
+
+        # 结构化的总体摘要
+        summary = jcd_loader.get_summary()
+        assert summary['object_count'] == 6 and summary['visible_count'] == 6
+        assert summary['materials'] == ['diamond', 'gold']
+
+        # 错误路径通过日志报告
+        with capture_logs(logging.WARNING) as records:
+            assert not JCDLoader().loadJCDFile(os.path.join(folder_path, 'missing.jcd'))
+            assert SurfaceType(123) == SurfaceType.UNKNOWN
+        assert [record.levelno for record in records] == [logging.ERROR, logging.WARNING]
+    return True
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Method.synthetic import create_synthetic_objects, write_synthetic_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test():
+    objects = create_synthetic_objects(surface_count=3, quad_count=2, quad_grid_size=16, bool_count=1, bool_depth=2)
+    surfaces, quad_types, bool_surface = objects[:3], objects[3:5], objects[5]
+
+    # 共享的数组只计一次，拷贝的数组标记为重复，float64的点标记为提升
+    quad_types[1].points = quad_types[0].points
+    quad_types[1].indices = quad_types[0].indices.copy()
+    surfaces[0].points = surfaces[0].points.astype(np.float64)
+
+    jcd_loader = JCDLoader()
+    jcd_loader.objects = objects
+    report = jcd_loader.memory_report()
+
+    assert report['shared_array_bytes'] == quad_types[0].points.nbytes
+    assert report['by_class']['JCDQuadType']['array_bytes'] == (
+        quad_types[0].points.nbytes + 2 * quad_types[0].indices.nbytes + 2 * quad_types[0].matrices.nbytes
+    )
+    assert [(item['index'], item['field']) for item in report['upcast_arrays']] == [(0, 'points')]
+    assert report['upcast_arrays'][0]['wasted_bytes'] == surfaces[0].points.nbytes // 2
+    assert any(
+        {(location['index'], location['field']) for location in item['locations']} == {(3, 'indices'), (4, 'indices')}
+        for item in report['duplicated_arrays']
+    )
+
+    # 布尔曲面的DAG节点和原始曲面单独统计，并计入布尔曲面类
+    dag_info = report['bool_dags'][0]
+    assert dag_info['index'] == 5 and dag_info['node_count'] == 5 and dag_info['primitive_count'] == 3
+    primitive_points_bytes = sum(surface.points.nbytes for surface in bool_surface.get_surfaces())
+    assert dag_info['primitive_array_bytes'] >= primitive_points_bytes
+    assert report['by_class']['JCDBoolSurface']['array_bytes'] >= primitive_points_bytes
+    assert dag_info['node_object_bytes'] > 0
+
+    assert report['array_bytes'] == sum(item['array_bytes'] for item in report['by_class'].values())
+    assert report['array_bytes'] == sum(item['array_bytes'] for item in report['by_material'].values())
+    assert report['total_bytes'] == report['array_bytes'] + report['object_bytes']
+
+    # 从文件加载的数组以读取缓冲区为单位统计，不重复计数
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'synthetic.jcd')
+        write_synthetic_jcd_file(jcd_file_path, diamond_count=10, quad_count=1, bool_count=1)
+        jcd_loader = JCDLoader(jcd_file_path)
+        report = jcd_loader.memory_report()
+        assert report['upcast_arrays'] == []
+        assert report['by_class']['JCDDiamond']['count'] == 10
+        assert report['array_bytes'] >= sum(obj.matrix.nbytes for obj in jcd_loader.get_diamonds())
+    return True
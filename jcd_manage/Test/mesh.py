@@ -0,0 +1,147 @@
+import numpy as np
+
+from jcd_manage.Config.types import BlockType, DiamondType
+from jcd_manage.Data.jcd_diamond import JCDDiamond
+from jcd_manage.Data.jcd_font_surface import JCDFontSurface
+from jcd_manage.Method.mesh import (
+    create_font_surface_mesh, create_font_surfaces_mesh,
+    create_diamond_prototype, create_diamond_mesh, create_diamonds_mesh
+)
+from jcd_manage.Method.triangulate import get_signed_area
+
+
+def create_square(center, size, clockwise=False):
+    cx, cy = center
+    h = size / 2.0
+    square = np.array([
+        [cx - h, cy - h, 0.0],
+        [cx + h, cy - h, 0.0],
+        [cx + h, cy + h, 0.0],
+        [cx - h, cy + h, 0.0],
+    ], dtype=np.float32)
+    if clockwise:
+        square = square[::-1]
+    return square
+
+
+def create_font_surface(outlines, thickness):
+    font_surface = JCDFontSurface()
+    font_surface.outline_count = len(outlines)
+    font_surface.outline_sizes = np.array([len(outline) for outline in outlines], dtype=np.int32)
+    font_surface.points = np.concatenate(outlines, axis=0)
+    font_surface.thickness = thickness
+    font_surface.foreground_type = BlockType.ANGLE
+    font_surface.background_type = BlockType.ANGLE
+    return font_surface
+
+
+def is_watertight(triangles):
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]], axis=0)
+    directed = {tuple(edge) for edge in edges.tolist()}
+    if len(directed) != len(edges):
+        return False
+    return all((b, a) in directed for a, b in directed)
+
+
+def get_volume(vertices, triangles):
+    v0, v1, v2 = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    return float(np.sum(np.einsum('ij,ij->i', v0, np.cross(v1, v2)))) / 6.0
+
+
+def create_diamond(diamond_type, scale, position):
+    diamond = JCDDiamond()
+    diamond.diamond_type = diamond_type
+    diamond.matrix = np.diag([scale, scale, scale, 1.0]).astype(np.float32)
+    diamond.matrix[3, :3] = position
+    return diamond
+
+
+def test_font_surface_mesh():
+    # 带洞的方块（外轮廓顺时针，检验方向自动修正）与一个独立字形
+    outer = create_square((0.0, 0.0), 4.0, clockwise=True)
+    hole = create_square((0.0, 0.0), 2.0)
+    glyph = create_square((10.0, 0.0), 2.0)
+    font_surface = create_font_surface([outer, hole, glyph], thickness=0.5)
+
+    vertices, triangles = create_font_surface_mesh(font_surface)
+    assert is_watertight(triangles)
+    assert np.isclose(get_volume(vertices, triangles), (16.0 - 4.0 + 4.0) * 0.5)
+
+    # 网格与 get_transformed_points 使用同一变换：自身matrix（平移位于第4列）后接继承的matrices
+    font_surface.matrix = np.eye(4, dtype=np.float32)
+    font_surface.matrix[:3, 3] = [1.0, 2.0, 3.0]
+    font_surface.matrices = np.eye(4, dtype=np.float32).reshape(1, 4, 4).copy()
+    font_surface.matrices[0, :3, :3] = [[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+    font_surface.matrices[0, :3, 3] = [10.0, 0.0, 0.0]
+    moved_vertices, moved_triangles = create_font_surface_mesh(font_surface)
+    assert np.array_equal(moved_triangles, triangles)
+    assert np.allclose(moved_vertices, font_surface.apply_transform(vertices))
+    outline_points = font_surface.get_transformed_points()
+    assert np.allclose(moved_vertices.min(axis=0)[:2], outline_points.min(axis=0)[:2])
+    assert np.allclose(moved_vertices.max(axis=0)[:2], outline_points.max(axis=0)[:2])
+    assert np.allclose(outline_points.min(axis=0)[:2], [6.0, -1.0])
+    font_surface.matrix = np.eye(4, dtype=np.float32)
+    font_surface.matrices = np.zeros((0, 4, 4), dtype=np.float32)
+
+    # 顶/底面的三角形不因坐标尺度小而被丢弃
+    small_font_surface = create_font_surface([outer * 1e-7, hole * 1e-7, glyph * 1e-7], thickness=0.5e-7)
+    small_vertices, small_triangles = create_font_surface_mesh(small_font_surface)
+    assert is_watertight(small_triangles) and len(small_triangles) == len(triangles)
+    assert np.isclose(get_volume(small_vertices, small_triangles) * 1e21, 8.0)
+
+    # 负厚度同样保持外法向
+    font_surface.thickness = -0.5
+    vertices, triangles = create_font_surface_mesh(font_surface)
+    assert is_watertight(triangles)
+    assert np.isclose(get_volume(vertices, triangles), 8.0)
+
+    # 多个字体面片批量合并
+    vertices, triangles = create_font_surfaces_mesh([font_surface, font_surface])
+    assert is_watertight(triangles)
+    assert np.isclose(get_volume(vertices, triangles), 16.0)
+    return True
+
+
+def test_large_outline_mesh():
+    # 顶点较多的波浪形外轮廓加两个圆形洞，检验网格索引下的三角化
+    t = np.linspace(0.0, 2.0 * np.pi, 3000, endpoint=False)
+    radius = 10.0 + 3.0 * np.sin(7.0 * t)
+    outer = np.stack([radius * np.cos(t), radius * np.sin(t), np.zeros_like(t)], axis=1)
+    t = np.linspace(0.0, 2.0 * np.pi, 500, endpoint=False)
+    holes = [np.stack([x + 1.5 * np.cos(t), 1.5 * np.sin(t), np.zeros_like(t)], axis=1) for x in [-3.0, 3.0]]
+    font_surface = create_font_surface([outer] + holes, thickness=1.0)
+
+    vertices, triangles = create_font_surface_mesh(font_surface)
+    assert is_watertight(triangles)
+    expected_area = get_signed_area(outer[:, :2]) - 2.0 * get_signed_area(holes[0][:, :2])
+    assert np.isclose(get_volume(vertices, triangles), expected_area, rtol=1e-6)
+    return True
+
+
+def test_diamond_mesh():
+    for diamond_type in DiamondType:
+        vertices, triangles = create_diamond_prototype(diamond_type)
+        assert create_diamond_prototype(diamond_type)[0] is vertices
+        assert is_watertight(triangles)
+        assert get_volume(vertices, triangles) > 0
+
+    diamonds = [
+        create_diamond(diamond_type, 0.5 + i, [i * 10.0, 0.0, 0.0])
+        for i, diamond_type in enumerate(list(DiamondType) * 3)
+    ]
+    vertices, triangles = create_diamonds_mesh(diamonds)
+    assert is_watertight(triangles)
+
+    expected_volume = 0.0
+    for diamond in diamonds:
+        single_vertices, single_triangles = create_diamond_mesh(diamond)
+        expected_volume += get_volume(single_vertices, single_triangles)
+    assert np.isclose(get_volume(vertices, triangles), expected_volume)
+    return True
+
+
+def test():
+    test_font_surface_mesh()
+    test_large_outline_mesh()
+    test_diamond_mesh()
+    return True
@@ -0,0 +1,83 @@
+import os
+import numpy as np
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Method.csg import evaluate_bool_surface, get_mesh_volume, clear_cached_results
+from jcd_manage.Method.parallel_csg import (
+    evaluate_bool_surfaces_parallel, write_shared_mesh, read_shared_mesh, release_shared_mesh,
+)
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.csg import create_box
+
+
+def get_shared_memory_names() -> set:
+    if not os.path.isdir('/dev/shm'):
+        return set()
+    return set(os.listdir('/dev/shm'))
+
+
+def create_bool_surfaces():
+    # 两个互相独立的布尔曲面，第一个的左右操作数也互相独立
+    first = JCDBoolSurface()
+    union = first.apply_boolean_operation(
+        DAGBoolType.UNION,
+        first.add_surface(create_box([0.0, 0.0, 0.0], [2.0, 2.0, 2.0], resolution=8)),
+        first.add_surface(create_box([1.0, 1.0, 1.0], [3.0, 3.0, 3.0], resolution=8)),
+    )
+    cutter = first.apply_boolean_operation(
+        DAGBoolType.UNION,
+        first.add_surface(create_box([-0.7, -0.7, 1.6], [6.9, 6.9, 6.9], resolution=5)),
+        first.add_surface(create_box([10.0, 10.0, 10.0], [11.0, 11.0, 11.0], resolution=2)),
+    )
+    first.apply_boolean_operation(DAGBoolType.DIFFERENCE, union, cutter)
+
+    second = JCDBoolSurface()
+    second.apply_boolean_operation(
+        DAGBoolType.DIFFERENCE,
+        second.add_surface(create_box([0.0, 0.0, 0.0], [2.0, 2.0, 2.0], resolution=8)),
+        second.add_surface(create_box([1.1, -1.1, -1.1], [3.1, 3.1, 3.1], resolution=8)),
+    )
+    return [first, second, JCDBoolSurface()]
+
+
+def test():
+    vertices = np.arange(12, dtype=np.float64).reshape(4, 3)
+    triangles = np.array([[0, 1, 2], [0, 2, 3]])
+    mesh_ref = write_shared_mesh((vertices, triangles))
+    read_vertices, read_triangles = read_shared_mesh(mesh_ref)
+    assert np.array_equal(read_vertices, vertices) and np.array_equal(read_triangles, triangles)
+    release_shared_mesh(mesh_ref)
+    assert write_shared_mesh((np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)))[0] is None
+
+    expected_volumes = []
+    for bool_surface in create_bool_surfaces()[:2]:
+        expected_volumes.append(get_mesh_volume(*evaluate_bool_surface(bool_surface)))
+    assert abs(expected_volumes[0] - 8.2) < 0.3 and abs(expected_volumes[1] - 4.4) < 0.2
+
+    shared_memory_names = get_shared_memory_names()
+    bool_surfaces = create_bool_surfaces()
+    with ProcessPoolExecutor(max_workers=2, mp_context=get_context('spawn')) as executor:
+        meshes = evaluate_bool_surfaces_parallel(bool_surfaces, executor=executor)
+        assert [round(get_mesh_volume(*mesh), 6) for mesh in meshes] == [round(v, 6) for v in expected_volumes] + [0.0]
+        assert all(node.cached_result is not None and not node.dirty for node in bool_surfaces[0].dag.nodes.values())
+
+        # 只重算失效路径，未失效的子树保留原有结果
+        cached_results = {node_id: node.cached_result for node_id, node in bool_surfaces[0].dag.nodes.items()}
+        invalidated = bool_surfaces[0].update_surface(0)
+        meshes = evaluate_bool_surfaces_parallel(bool_surfaces, executor=executor)
+        assert round(get_mesh_volume(*meshes[0]), 6) == round(expected_volumes[0], 6)
+        for node_id, node in bool_surfaces[0].dag.nodes.items():
+            assert (node.cached_result is cached_results[node_id]) == (node_id not in invalidated)
+    assert get_shared_memory_names() == shared_memory_names
+
+    # 单进程时直接在当前进程中计算
+    jcd_loader = JCDLoader()
+    jcd_loader.objects = create_bool_surfaces()
+    for bool_surface in jcd_loader.objects:
+        clear_cached_results(bool_surface.dag)
+    meshes = jcd_loader.evaluate_bool_surfaces(processes=1)
+    assert len(meshes) == 3 and abs(get_mesh_volume(*meshes[1]) - expected_volumes[1]) < 1e-9
+    return True
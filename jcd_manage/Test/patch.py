@@ -0,0 +1,60 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Method.patch import patch_jcd_file
+from jcd_manage.Method.scan import scan_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.writer import create_jcd_loader, read_file
+
+
+def test():
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'source.jcd')
+        assert create_jcd_loader().saveAsJCDFile(jcd_file_path)
+        source_bytes = read_file(jcd_file_path)
+
+        # 扫描得到的顶层记录偏移与完整加载记录的偏移一致
+        records = [record for record in scan_jcd_file(jcd_file_path) if record['bool_level'] == 0]
+        jcd_loader = JCDLoader(jcd_file_path)
+        assert len(records) == len(jcd_loader.objects)
+        for record, obj in zip(records, jcd_loader.objects):
+            assert record['hide'] == obj.hide
+            assert record['start'] == obj.source_span[1]
+            assert record['meta_info_offset'] == obj.source_offsets['meta_info']
+            assert record['matrices_offset'] == obj.source_offsets['matrices']
+            assert record.get('matrix_offset') == obj.source_offsets.get('matrix')
+
+        # 按记录序号修改，文件大小不变且保留备份
+        matrix = np.eye(4, dtype=np.float32)
+        matrix[3, :3] = [1.0, 2.0, 3.0]
+        stats = patch_jcd_file(jcd_file_path, hide={0: True, 2: False}, matrix={4: matrix}, backup=True)
+        assert stats == {'hide_count': 2, 'matrix_count': 1}
+        assert read_file(jcd_file_path + '.bak') == source_bytes
+        assert len(read_file(jcd_file_path)) == len(source_bytes)
+
+        patched_loader = JCDLoader(jcd_file_path)
+        assert patched_loader.objects[0].hide
+        assert not patched_loader.objects[2].hide
+        assert np.allclose(patched_loader.objects[4].matrix, matrix)
+
+        # 通过加载器自动检测修改并写回，包括布尔曲面的原始曲面
+        patched_loader.objects[0].hide = False
+        patched_loader.objects[5].matrix = matrix * 2.0
+        patched_loader.objects[1].matrices = patched_loader.objects[1].matrices * 3.0
+        primitive = patched_loader.objects[-1].get_surfaces()[1]
+        primitive.matrices = primitive.matrices * 0.5
+        assert patched_loader.patchJCDFile()
+        assert len(read_file(jcd_file_path)) == len(source_bytes)
+
+        reloaded_loader = JCDLoader(jcd_file_path)
+        assert not reloaded_loader.objects[0].hide
+        assert np.allclose(reloaded_loader.objects[5].matrix, matrix * 2.0)
+        assert np.allclose(reloaded_loader.objects[1].matrices, patched_loader.objects[1].matrices)
+        assert np.allclose(reloaded_loader.objects[-1].get_surfaces()[1].matrices, primitive.matrices)
+        assert reloaded_loader.objects[0].meta_info == patched_loader.objects[0].meta_info
+
+        # 写回后状态已刷新，不再视为修改；几何属性的修改无法原位写回
+        patched_loader.objects[3].material_name = 'platinum'
+        assert not patched_loader.patchJCDFile()
+    return True
@@ -0,0 +1,52 @@
+import os
+import tempfile
+from collections import Counter
+
+from jcd_manage.Config.types import SurfaceType
+from jcd_manage.Data.jcd_bool_surface import JCDBoolSurface
+from jcd_manage.Method.profiler import LoadProfiler
+from jcd_manage.Method.scan import scan_jcd_file
+from jcd_manage.Method.synthetic import write_synthetic_jcd_file
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test():
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'synthetic.jcd')
+        write_synthetic_jcd_file(
+            jcd_file_path, curve_count=3, surface_count=2, diamond_count=20, quad_count=2, quad_grid_size=8,
+            font_count=2, guide_line_count=1, bool_count=2, bool_depth=3,
+        )
+
+        events = []
+        profiler = LoadProfiler(hooks=[events.append])
+        jcd_loader = JCDLoader(jcd_file_path, profiler=profiler)
+        report = profiler.get_report()
+
+        # 每条记录按类型计数，布尔头和其中的子曲面分别计入各自类型
+        records = scan_jcd_file(jcd_file_path)
+        counter = Counter(record['surface_type'].name for record in records)
+        counter['BOOL_SURFACE'] = 0
+        for record in records:
+            if record['surface_type'] == SurfaceType.BOOL_SURFACE:
+                counter['BOOL_SURFACE'] += record['bool_depth']
+                counter[record['sub_surface_type'].name] += 1
+        assert {name: stats['count'] for name, stats in report['types'].items()} == +counter
+
+        # 消耗的字节数之和等于所有记录除标志位和元信息之外的字节数
+        byte_count = sum(stats['byte_count'] for stats in report['types'].values())
+        assert byte_count == sum(record['end'] - record['start'] - 9 for record in records)
+        assert report['file_size'] == os.path.getsize(jcd_file_path)
+        assert report['types']['QUAD_TYPE']['array_byte_count'] >= 2 * 81 * 16
+
+        dag_node_count = sum(len(obj.dag.nodes) for obj in jcd_loader.objects if isinstance(obj, JCDBoolSurface))
+        assert report['types']['BOOL_SURFACE']['dag_node_count'] == dag_node_count
+
+        record_events = [event for event in events if event['event'] == 'record']
+        assert len(record_events) == sum(counter.values())
+        assert any(event['depth'] > 0 for event in record_events)
+        assert sum(event['build_seconds'] for event in events if event['event'] == 'build') > 0.0
+
+        # 不传分析器时加载结果相同
+        assert len(JCDLoader(jcd_file_path).objects) == len(jcd_loader.objects)
+    return True
@@ -0,0 +1,56 @@
+import numpy as np
+
+from jcd_manage.Method.mesh import (
+    merge_lines, create_curve_lines, create_surface_lines, create_font_surface_lines, create_guide_line_lines,
+)
+from jcd_manage.Method.render import JCDRenderer, o3d
+from jcd_manage.Method.synthetic import (
+    create_synthetic_curve, create_synthetic_surface, create_synthetic_font_surface, create_synthetic_guide_line,
+)
+
+
+def is_open3d_available() -> bool:
+    try:
+        o3d.geometry
+    except ImportError:
+        return False
+    return True
+
+
+def test():
+    rng = np.random.default_rng(0)
+    curves = [create_synthetic_curve(rng, 2, 16) for _ in range(3)]
+    surfaces = [create_synthetic_surface(rng, 4, 8) for _ in range(2)]
+    font_surfaces = [create_synthetic_font_surface(rng, 3, 12) for _ in range(2)]
+    guide_lines = [create_synthetic_guide_line(rng) for _ in range(2)]
+    hidden_curve = create_synthetic_curve(rng, 1, 8)
+    hidden_curve.hide = True
+
+    renderer = JCDRenderer()
+    renderer.add_data(curves + surfaces + [hidden_curve] + font_surfaces + guide_lines)
+    renderer.add_data(surfaces[0], color=JCDRenderer.COLORS['curve'])
+
+    # 每种颜色一组，合并结果与逐实体生成的线集一致（顶点、线段数与颜色）
+    expected = {
+        'curve': [create_curve_lines(curve) for curve in curves] + [create_surface_lines(surfaces[0])],
+        'surface': [create_surface_lines(surface) for surface in surfaces],
+        'font_surface': [create_font_surface_lines(font_surface) for font_surface in font_surfaces],
+        'guide_line': [create_guide_line_lines(guide_line) for guide_line in guide_lines],
+    }
+    assert set(renderer.line_groups) == {tuple(JCDRenderer.COLORS[key]) for key in expected}
+    for key, line_data_list in expected.items():
+        points, lines = merge_lines(renderer.line_groups[tuple(JCDRenderer.COLORS[key])])
+        assert len(points) == sum(len(line_data[0]) for line_data in line_data_list)
+        assert len(lines) == sum(len(line_data[1]) for line_data in line_data_list)
+        assert np.allclose(points, np.concatenate([line_data[0] for line_data in line_data_list]))
+        assert np.allclose(points[lines], np.concatenate([line_data[0][line_data[1]] for line_data in line_data_list]))
+
+    if is_open3d_available():
+        line_counts = {key: sum(len(line_data[1]) for line_data in line_data_list)
+                       for key, line_data_list in expected.items()}
+        renderer._flush_line_groups()
+        assert len(renderer.geometries) == len(expected) and len(renderer.line_groups) == 0
+        for key, line_set in zip(expected, renderer.geometries):
+            assert len(np.asarray(line_set.lines)) == line_counts[key]
+            assert np.allclose(np.asarray(line_set.colors), JCDRenderer.COLORS[key])
+    return True
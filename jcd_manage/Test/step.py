@@ -0,0 +1,110 @@
+import os
+import json
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType
+from jcd_manage.Data import JCDBoolSurface
+from jcd_manage.Method.step import (
+    is_occ_available, get_bspline_knots, get_bspline_degree, get_step_path, get_step_paths, get_step_temp_path,
+    export_step_files, create_entity_shape, is_solid_shape, boolean_shape, evaluate_bool_surface_shape,
+)
+from jcd_manage.Method.synthetic import (
+    create_synthetic_diamond, create_synthetic_font_surface, create_synthetic_surface, write_synthetic_jcd_file,
+)
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test_occ_shapes():
+    # 钻石、字体面片缝合为实体，可作为布尔运算的切割体
+    rng = np.random.default_rng(0)
+    diamond = create_synthetic_diamond(rng)
+    font_surface = create_synthetic_font_surface(rng, 2, 12)
+    for entity in (diamond, font_surface):
+        assert is_solid_shape(create_entity_shape(entity))
+
+    # 两端开口的扫掠曲面不是实体，不能参与布尔运算
+    surface = create_synthetic_surface(rng, 3, 8)
+    surface_shape = create_entity_shape(surface)
+    assert surface_shape is not None and not is_solid_shape(surface_shape)
+    try:
+        boolean_shape(surface_shape, create_entity_shape(diamond), DAGBoolType.DIFFERENCE)
+        assert False
+    except RuntimeError as e:
+        assert 'not a solid' in str(e)
+
+    bool_surface = JCDBoolSurface()
+    body = bool_surface.add_surface(create_synthetic_diamond(rng))
+    cutter = bool_surface.add_surface(diamond)
+    bool_surface.apply_boolean_operation(DAGBoolType.UNION, body, cutter)
+    assert is_solid_shape(evaluate_bool_surface_shape(bool_surface))
+    return True
+
+
+def test():
+    # 开放B样条节点重数之和为 控制点数 + 次数 + 1，周期B样条节点数为 控制点数 + 1
+    knots, multiplicities = get_bspline_knots(5, 3, False)
+    assert knots.tolist() == [0.0, 0.5, 1.0] and multiplicities.tolist() == [4, 1, 4]
+    knots, multiplicities = get_bspline_knots(5, 3, True)
+    assert len(knots) == 6 and multiplicities.tolist() == [1] * 6
+    assert get_bspline_degree(2) == 1 and get_bspline_degree(10) == 3
+    assert get_step_temp_path(os.path.join('step', 'model.step')) == os.path.join('step', 'model.part.step')
+    if is_occ_available():
+        test_occ_shapes()
+
+    # 不同文件夹中的同名文件按相对路径写到不同的STEP文件
+    step_file_paths = get_step_paths([os.path.join('jcd', 'a', 'ring.jcd'), os.path.join('jcd', 'b', 'ring.jcd')], 'step')
+    assert step_file_paths == [os.path.join('step', 'a', 'ring.step'), os.path.join('step', 'b', 'ring.step')]
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_paths = []
+        for i in range(2):
+            jcd_file_path = os.path.join(folder_path, f'model_{i}.jcd')
+            write_synthetic_jcd_file(jcd_file_path, surface_count=2, quad_count=1, diamond_count=2, font_count=1)
+            jcd_file_paths.append(jcd_file_path)
+        jcd_file_paths.append(os.path.join(folder_path, 'missing.jcd'))
+        # 布尔曲面的操作数是开口曲面
+        jcd_file_paths.append(os.path.join(folder_path, 'open_bool.jcd'))
+        write_synthetic_jcd_file(jcd_file_paths[3], surface_count=1, bool_count=1)
+
+        save_folder_path = os.path.join(folder_path, 'step')
+        report_file_path = os.path.join(save_folder_path, 'report.json')
+        results = export_step_files(jcd_file_paths, save_folder_path, processes=2, report_file_path=report_file_path)
+        assert [result['jcd_file_path'] for result in results] == jcd_file_paths
+
+        # 单个文件失败不影响其他文件，失败原因写入报告，不留下临时文件或不完整的文件
+        assert results[2]['status'] == 'failed' and results[2]['error'] == 'load jcd file failed'
+        expected_status = 'exported' if is_occ_available() else 'failed'
+        assert [result['status'] for result in results[:2]] == [expected_status] * 2
+        assert results[3]['status'] == 'failed' and not os.path.exists(results[3]['step_file_path'])
+        if is_occ_available():
+            assert 'not a solid' in results[3]['error']
+        for result in results[:2]:
+            assert os.path.exists(result['step_file_path']) == is_occ_available()
+            if is_occ_available():
+                assert result['shape_count'] == 6 and result['skipped_count'] == 0
+        assert not any(name.endswith('.part.step') for name in os.listdir(save_folder_path))
+
+        with open(report_file_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert sum(report['summary'].values()) == 4 and len(report['files']) == 4
+        assert len(report['errors']) == 4 - report['summary'].get('exported', 0)
+
+        # 已存在的STEP文件被跳过，超时的进程被终止
+        open(get_step_path(jcd_file_paths[0], save_folder_path), 'w').close()
+        if os.path.exists(get_step_path(jcd_file_paths[1], save_folder_path)):
+            os.remove(get_step_path(jcd_file_paths[1], save_folder_path))
+        results = export_step_files(jcd_file_paths[:2], save_folder_path, timeout=0.0, processes=1, overwrite=False)
+        assert results[0]['status'] == 'cached'
+        assert results[1]['status'] == 'timeout' and not os.path.exists(results[1]['step_file_path'])
+
+        # 输出路径冲突的文件在启动工作进程前记为失败
+        results = export_step_files([jcd_file_paths[0]] * 2, save_folder_path, timeout=0.0, processes=1, overwrite=False)
+        assert results[0]['status'] == 'cached'
+        assert results[1]['status'] == 'failed' and 'collides' in results[1]['error']
+
+        jcd_loader = JCDLoader(jcd_file_paths[0])
+        assert not jcd_loader.saveAsStepFile(os.path.join(folder_path, 'model.obj'))
+        if not is_occ_available():
+            assert not jcd_loader.saveAsStepFile(os.path.join(folder_path, 'model.step'))
+    return True
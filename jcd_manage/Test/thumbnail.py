@@ -0,0 +1,88 @@
+import os
+import tempfile
+import numpy as np
+
+import jcd_manage.Method.render as render
+import jcd_manage.Method.thumbnail as thumbnail
+from jcd_manage.Method.lazy import MissingModule
+from jcd_manage.Method.synthetic import write_synthetic_jcd_file
+from jcd_manage.Method.thumbnail import (
+    VIEW_DIRECTIONS, JCDThumbnailRenderer, get_view_camera, get_thumbnail_path, is_thumbnail_cached, render_thumbnails,
+)
+from jcd_manage.Module.jcd_loader import JCDLoader
+
+
+def test_view_camera(jcd_loader: JCDLoader):
+    # 边界框的8个角点都落在视锥内
+    fov = 30.0
+    bbox = jcd_loader.get_overall_bounding_box()
+    corners = np.array([[x, y, z] for x in [bbox[0][0], bbox[1][0]]
+                        for y in [bbox[0][1], bbox[1][1]] for z in [bbox[0][2], bbox[1][2]]])
+    for view in VIEW_DIRECTIONS:
+        eye, center, up = get_view_camera(bbox, view, fov)
+        assert np.allclose(center, (np.asarray(bbox[0]) + np.asarray(bbox[1])) / 2.0)
+        forward = (center - eye) / np.linalg.norm(center - eye)
+        directions = corners - eye
+        cosines = directions @ forward / np.linalg.norm(directions, axis=1)
+        assert np.all(cosines >= np.cos(np.radians(fov) / 2.0))
+    return True
+
+
+def test_software_render(jcd_loader: JCDLoader):
+    # 软件光栅化不访问open3d，并绘制所有类型的实体
+    modules = render.o3d, thumbnail.o3d
+    render.o3d = thumbnail.o3d = MissingModule('open3d')
+    try:
+        renderer = JCDThumbnailRenderer(64, 48, backend='software')
+        renderer.add_data(jcd_loader.objects, show_font_solid=True)
+        kinds = [primitive[0] for primitive in renderer._get_primitives()]
+        assert {'triangles', 'lines', 'points'} == set(kinds)
+
+        images = renderer.render_views(['iso', 'top'])
+        assert images['iso'].shape == (48, 64, 3) and images['iso'].dtype == np.uint8
+        for image in images.values():
+            colors = np.unique(image.reshape(-1, 3), axis=0)
+            assert len(colors) > 2 and np.any(np.all(image != 255, axis=2))
+
+        renderer.clear()
+        assert renderer.render_views(['iso']) == {}
+    finally:
+        render.o3d, thumbnail.o3d = modules
+    return True
+
+
+def test_thumbnail_cache(jcd_file_path: str, save_folder_path: str):
+    thumbnail_file_paths = [get_thumbnail_path(jcd_file_path, save_folder_path, view) for view in ['iso', 'front']]
+    assert not is_thumbnail_cached(jcd_file_path, thumbnail_file_paths)
+
+    kwargs = {'views': ('iso', 'front'), 'width': 32, 'height': 32, 'backend': 'software', 'processes': 1}
+    results = render_thumbnails([jcd_file_path], save_folder_path, **kwargs)
+    assert results[0]['status'] == 'rendered' and results[0]['thumbnails'] == thumbnail_file_paths
+    assert is_thumbnail_cached(jcd_file_path, thumbnail_file_paths)
+    assert render_thumbnails([jcd_file_path], save_folder_path, **kwargs)[0]['status'] == 'cached'
+    assert render_thumbnails([jcd_file_path], save_folder_path, overwrite=True, **kwargs)[0]['status'] == 'rendered'
+
+    # 源文件比缩略图新，或缺少某个视角时重新渲染
+    source_mtime = os.path.getmtime(thumbnail_file_paths[0]) + 10.0
+    os.utime(jcd_file_path, (source_mtime, source_mtime))
+    assert not is_thumbnail_cached(jcd_file_path, thumbnail_file_paths)
+    assert render_thumbnails([jcd_file_path], save_folder_path, **kwargs)[0]['status'] == 'rendered'
+    os.remove(thumbnail_file_paths[1])
+    assert not is_thumbnail_cached(jcd_file_path, thumbnail_file_paths)
+    return True
+
+
+def test():
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'model.jcd')
+        write_synthetic_jcd_file(
+            jcd_file_path, curve_count=1, surface_count=1, diamond_count=3, quad_count=1, font_count=1,
+            guide_line_count=1, bool_count=1, surface_ring_count=4, surface_point_count=8, quad_grid_size=4,
+            font_outline_size=16,
+        )
+        jcd_loader = JCDLoader(jcd_file_path)
+
+        test_view_camera(jcd_loader)
+        test_software_render(jcd_loader)
+        test_thumbnail_cache(jcd_file_path, os.path.join(folder_path, 'thumbnails'))
+    return True
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import numpy as np
+
+from jcd_manage.Config.types import DAGBoolType, DiamondType
+from jcd_manage.Data import JCDBoolSurface, JCDDiamond
+from jcd_manage.Method.csg import get_mesh_volume
+from jcd_manage.Method.mesh import create_diamond_prototype, create_surface_mesh
+from jcd_manage.Method.synthetic import create_synthetic_surface, create_synthetic_bool_surface, write_synthetic_jcd_file
+from jcd_manage.Method.volume import is_mesh_closed, get_diamond_volumes, estimate_weights, estimate_weight_files
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.csg import create_box
+
+
+def create_diamond(diamond_type, center, scale) -> JCDDiamond:
+    diamond = JCDDiamond()
+    diamond.material_name = 'diamond'
+    diamond.diamond_type = diamond_type
+    diamond.matrix = np.diag([scale, scale, scale, 1.0])
+    diamond.matrix[3, :3] = center
+    return diamond
+
+
+def test():
+    # 长方体各面的顶点不共享，按位置合并后封闭；侧面开口的曲面不封闭
+    box = create_box([0.0, 0.0, 0.0], [2.0, 3.0, 4.0], resolution=2)
+    assert is_mesh_closed(box.get_points(), np.concatenate([box.indices[:, [0, 1, 2]], box.indices[:, [0, 2, 3]]]))
+    surface = create_synthetic_surface(np.random.default_rng(0), 3, 8)
+    assert not is_mesh_closed(*create_surface_mesh(surface))
+
+    # 钻石体积为原型体积乘以缩放的立方
+    diamonds = [create_diamond(DiamondType.ROUND, [1.0, 1.5, 2.0], 0.5), create_diamond(DiamondType.PEAR, [50.0, 0.0, 0.0], 2.0)]
+    prototype_volumes = [abs(get_mesh_volume(*create_diamond_prototype(t))) for t in [DiamondType.ROUND, DiamondType.PEAR]]
+    assert np.allclose(get_diamond_volumes(diamonds), [prototype_volumes[0] * 0.125, prototype_volumes[1] * 8.0])
+
+    box.material_name = 'Gold'
+    other_box = create_box([10.0, 0.0, 0.0], [11.0, 1.0, 1.0], resolution=1)
+    other_box.material_name = 'unobtainium'
+
+    bool_surface = JCDBoolSurface()
+    base = create_box([20.0, 0.0, 0.0], [22.0, 2.0, 2.0], resolution=4)
+    base.material_name = 'silver'
+    bool_surface.apply_boolean_operation(
+        DAGBoolType.DIFFERENCE,
+        bool_surface.add_surface(base),
+        bool_surface.add_surface(create_box([21.1, -1.1, -1.1], [23.1, 3.1, 3.1], resolution=4)),
+    )
+
+    # 操作数开口的布尔曲面结果不封闭，与开口曲面一样计入 open_count
+    open_bool_surface = create_synthetic_bool_surface(np.random.default_rng(1), 0, 3, 8)
+    result = estimate_weights([box, other_box, bool_surface, open_bool_surface, surface] + diamonds)
+    materials = result['materials']
+    assert result['open_count'] == 2 and result['unknown_materials'] == ['unobtainium']
+    assert result['stones']['count'] == 2
+
+    # 只有中心落在金属内的钻石被扣除
+    assert abs(materials['Gold']['volume'] - 24.0) < 1e-4
+    assert abs(materials['Gold']['stone_volume'] - prototype_volumes[0] * 0.125) < 1e-9
+    assert abs(materials['Gold']['weight'] - materials['Gold']['net_volume'] * 19.32 / 1000.0) < 1e-12
+    assert materials['unobtainium']['weight'] is None
+    assert abs(materials['silver']['volume'] - 4.4) < 1e-4 and materials['silver']['entity_count'] == 1
+    assert abs(result['total_weight'] - materials['Gold']['weight'] - materials['silver']['weight']) < 1e-12
+
+    result = estimate_weights([box] + diamonds, densities={'gold': 10.0}, subtract_stones=False)
+    assert result['materials']['Gold']['stone_volume'] == 0.0
+    assert abs(result['total_weight'] - 0.24) < 1e-6
+
+    # 整体平移并放大的镶口：金属和钻石经过相同的 matrices 变换，钻石仍落在金属内
+    setting_matrix = np.diag([2.0, 2.0, 2.0, 1.0])
+    setting_matrix[:3, 3] = [100.0, 0.0, 0.0]
+    setting_box = create_box([0.0, 0.0, 0.0], [2.0, 3.0, 4.0], resolution=2)
+    setting_box.material_name = 'gold'
+    setting_diamond = create_diamond(DiamondType.ROUND, [1.0, 1.5, 2.0], 0.5)
+    for entity in (setting_box, setting_diamond):
+        entity.matrices = [setting_matrix]
+    result = estimate_weights([setting_box, setting_diamond])
+    assert abs(result['materials']['gold']['volume'] - 24.0 * 8.0) < 1e-3
+    assert abs(result['materials']['gold']['stone_volume'] - prototype_volumes[0] * 0.125 * 8.0) < 1e-9
+    assert np.allclose(get_diamond_volumes([setting_diamond]), [prototype_volumes[0] * 0.125 * 8.0])
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        jcd_file_path = os.path.join(folder_path, 'synthetic.jcd')
+        write_synthetic_jcd_file(jcd_file_path, surface_count=2, diamond_count=3, quad_count=1, font_count=1)
+        results = estimate_weight_files([jcd_file_path, os.path.join(folder_path, 'missing.jcd')], processes=1)
+        assert results[0]['status'] == 'estimated' and results[1]['status'] == 'failed'
+        assert results[0]['stones']['count'] == 3
+        assert results[0] == {'jcd_file_path': jcd_file_path, 'status': 'estimated', 'error': None,
+                              **JCDLoader(jcd_file_path).estimate_weights()}
+    return True
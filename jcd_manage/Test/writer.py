@@ -0,0 +1,106 @@
+import os
+import copy
+import tempfile
+import numpy as np
+
+from jcd_manage.Data.jcd_curve import JCDCurve
+from jcd_manage.Data.dag import BooleanOp
+from jcd_manage.Config.types import CurveType, DAGBoolType
+from jcd_manage.Method.io import MATRIX_COUNT_MAP
+from jcd_manage.Method.writer import ArrayState, encode_meta_info, get_surface_type, save_jcd_file, is_entity_modified
+from jcd_manage.Module.jcd_loader import JCDLoader
+from jcd_manage.Test.export import create_loader
+from jcd_manage.Test.columnar import create_bool_surface, assert_loader_equal
+
+
+def create_jcd_loader():
+    jcd_loader = create_loader()
+
+    curve = JCDCurve()
+    curve.material_name = 'curve'
+    curve.points = np.random.rand(6, 4).astype(np.float32)
+    curve.ring_count = 2
+    curve.original_point_count = 3
+    curve.curve_type = CurveType.CLOSED_CURVE
+
+    surface = [obj for obj in jcd_loader.objects if obj.__class__.__name__ == 'JCDSurface'][0]
+    surfaces = [copy.copy(surface) for _ in range(3)]
+    jcd_loader.objects += [curve, create_bool_surface(surfaces, use_group=False)]
+
+    # 新建实体没有元信息和矩阵，写出时分别生成元信息和单位矩阵
+    for obj in jcd_loader.objects + surfaces:
+        if obj not in surfaces:
+            obj.meta_info = encode_meta_info(obj)
+        if hasattr(obj, 'curve_type') and obj.curve_type is None:
+            obj.curve_type = CurveType.OPEN_CURVE
+        obj.matrices = np.tile(np.eye(4, dtype=np.float32), (MATRIX_COUNT_MAP[get_surface_type(obj)], 1, 1))
+    return jcd_loader
+
+
+def read_file(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def test():
+    with tempfile.TemporaryDirectory() as folder_path:
+        source_file_path = os.path.join(folder_path, 'source.jcd')
+        copy_file_path = os.path.join(folder_path, 'copy.jcd')
+        modified_file_path = os.path.join(folder_path, 'modified.jcd')
+
+        # 新建实体全部重新编码，读回后与原实体一致
+        jcd_loader = create_jcd_loader()
+        assert jcd_loader.saveAsJCDFile(source_file_path)
+        source_loader = JCDLoader(source_file_path)
+        assert_loader_equal(jcd_loader, source_loader)
+
+        # 未修改的实体直接复制，输出与源文件逐字节一致
+        assert source_loader.saveAsJCDFile(copy_file_path)
+        assert read_file(copy_file_path) == read_file(source_file_path)
+
+        # 加载时不计算数组摘要；首次检查前的原地修改与源文件比较后可被检测到
+        state_loader = JCDLoader(source_file_path)
+        array_states = [value for _, value in state_loader.objects[0].source_state if isinstance(value, ArrayState)]
+        assert len(array_states) > 0 and all(state.digest is None for state in array_states)
+        state_loader.objects[0].points[0, 0] += 1.0
+        assert is_entity_modified(state_loader.objects[0])
+        assert not is_entity_modified(state_loader.objects[1])
+        assert all(
+            value.digest is not None for _, value in state_loader.objects[1].source_state if isinstance(value, ArrayState)
+        )
+
+        # 修改隐藏标志、替换点数组、原地修改钻石矩阵并删除一个对象
+        source_loader.objects[0].hide = True
+        source_loader.objects[1].points = source_loader.objects[1].points * 2.0
+        # 原地修改不调用 mark_modified 也能通过数组摘要检测到
+        diamond = source_loader.objects[4]
+        assert not is_entity_modified(diamond)
+        diamond.matrix[3, :3] += 10.0
+        assert is_entity_modified(diamond)
+        assert not is_entity_modified(diamond, fields=('hide', 'material_name'))
+        bool_surface = source_loader.objects[-1]
+        bool_surface.hide = False
+        bool_surface.get_surfaces()[1].material_name = 'platinum'
+        del source_loader.objects[2]
+
+        stats = save_jcd_file(source_loader.objects, modified_file_path)
+        assert stats['encoded_count'] == 4
+        assert stats['copied_count'] == len(source_loader.objects) - 4
+
+        assert source_loader.saveAsJCDFile(modified_file_path, overwrite=True)
+        modified_loader = JCDLoader(modified_file_path)
+        assert_loader_equal(source_loader, modified_loader)
+        assert modified_loader.objects[0].hide
+        assert not modified_loader.objects[-1].hide
+        assert modified_loader.objects[-1].get_surfaces()[1].material_name == 'platinum'
+
+        # 修改DAG结构后根据DAG重新生成布尔记录
+        bool_surface = modified_loader.objects[-1]
+        root = bool_surface.dag.get(bool_surface.root_node_id)
+        bool_surface.apply_boolean_operation(DAGBoolType.UNION, root.left, root.right)
+        modified_loader.saveAsJCDFile(modified_file_path, overwrite=True)
+        dag_loader = JCDLoader(modified_file_path)
+        root = dag_loader.objects[-1].dag.get(dag_loader.objects[-1].root_node_id)
+        assert isinstance(root, BooleanOp) and root.op == DAGBoolType.UNION
+        assert len(dag_loader.objects[-1].get_surfaces()) == 3
+    return True
@@ -1,4 +1,48 @@
 from jcd_manage.Test.dag import test as test_dag
+from jcd_manage.Test.mesh import test as test_mesh
+from jcd_manage.Test.render import test as test_render
+from jcd_manage.Test.thumbnail import test as test_thumbnail
+from jcd_manage.Test.import_time import test as test_import_time
+from jcd_manage.Test.export import test as test_export
+from jcd_manage.Test.gltf import test as test_gltf
+from jcd_manage.Test.columnar import test as test_columnar
+from jcd_manage.Test.writer import test as test_writer
+from jcd_manage.Test.patch import test as test_patch
+from jcd_manage.Test.benchmark import test as test_benchmark
+from jcd_manage.Test.profiler import test as test_profiler
+from jcd_manage.Test.memory import test as test_memory
+from jcd_manage.Test.log import test as test_log
+from jcd_manage.Test.csg import test as test_csg
+from jcd_manage.Test.compact_dag import test as test_compact_dag
+from jcd_manage.Test.parallel_csg import test as test_parallel_csg
+from jcd_manage.Test.csg_optimize import test as test_csg_optimize
+from jcd_manage.Test.bool_geometry import test as test_bool_geometry
+from jcd_manage.Test.dag_serializer import test as test_dag_serializer
+from jcd_manage.Test.step import test as test_step
+from jcd_manage.Test.volume import test as test_volume
+from jcd_manage.Test.inventory import test as test_inventory
 
 if __name__ == '__main__':
     test_dag()
+    test_mesh()
+    test_render()
+    test_thumbnail()
+    test_import_time()
+    test_export()
+    test_gltf()
+    test_columnar()
+    test_writer()
+    test_patch()
+    test_benchmark()
+    test_profiler()
+    test_memory()
+    test_log()
+    test_csg()
+    test_compact_dag()
+    test_parallel_csg()
+    test_csg_optimize()
+    test_bool_geometry()
+    test_dag_serializer()
+    test_step()
+    test_volume()
+    test_inventory()